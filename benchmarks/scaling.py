@@ -0,0 +1,112 @@
+"""
+Worker-scaling benchmark for bulk character generation.
+
+Generates the same seeded job on one backend with an increasing number of
+workers and reports throughput, speedup over a single worker and peak resident
+memory. On a free-threaded build (``python3.14t``) thread speedup should track
+the worker count up to the number of cores; on a GIL build it stays close to
+1x. Run it once per backend to compare them on a host.
+
+Peak memory is the high-water mark of this process and of its largest child
+process so far, so it only grows as the worker count increases.
+
+Usage:
+    python benchmarks/scaling.py [--count N] [--max-workers N]
+                                 [--backend thread|process|interpreter]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import sys
+import time
+
+from rpgcharacters.bulk import BACKENDS, BulkJob, iter_characters
+
+
+def gil_enabled() -> bool:
+    """Return whether the running interpreter has the GIL enabled.
+
+    Returns:
+        bool: ``False`` only on free-threaded builds running without the GIL.
+    """
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else bool(check())
+
+
+def time_run(job: BulkJob, count: int, workers: int, backend: str) -> float:
+    """Time one bulk run.
+
+    Args:
+        job (BulkJob): Bulk job parameters.
+        count (int): Number of characters to generate.
+        workers (int): Number of workers.
+        backend (str): Worker backend.
+
+    Returns:
+        float: Elapsed wall-clock seconds.
+    """
+    start = time.perf_counter()
+    for _ in iter_characters(job, count, workers=workers, backend=backend):  # type: ignore[arg-type]
+        pass
+    return time.perf_counter() - start
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process or any child.
+
+    Returns:
+        float: Peak memory in megabytes.
+    """
+    scale = 1 if sys.platform == "darwin" else 1024
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return peak * scale / 1_000_000
+
+
+def worker_counts(max_workers: int) -> list[int]:
+    """Return the worker counts to benchmark: powers of two up to ``max_workers``.
+
+    Args:
+        max_workers (int): Largest worker count.
+
+    Returns:
+        list[int]: Increasing worker counts, always ending at ``max_workers``.
+    """
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--backend", choices=BACKENDS, default="thread")
+    parser.add_argument("--seed", type=int, default=2024)
+    args = parser.parse_args()
+
+    job = BulkJob(seed=args.seed)
+    print(f"Python {sys.version.split()[0]}, GIL enabled: {gil_enabled()}")
+    print(f"{args.count} characters, {args.backend} backend")
+    print(f"{'workers':>8} {'seconds':>9} {'chars/s':>10} {'speedup':>8} {'peak MB':>8}")
+    baseline = None
+    for workers in worker_counts(args.max_workers):
+        seconds = time_run(job, args.count, workers, args.backend)
+        baseline = baseline or seconds
+        print(
+            f"{workers:>8} {seconds:>9.3f} {args.count / seconds:>10.0f} "
+            f"{baseline / seconds:>7.2f}x {peak_rss_mb():>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Fantasy rules, including ability rolling, race and class validation, and derived
 combat statistics.
 """
 
+from .aio import agenerate_character, agenerate_characters
 from .character_generator import (
     AbilityScores,
     Character,
@@ -14,12 +15,18 @@ from .character_generator import (
 )
 from .classes import ClassName
 from .races import RaceName
+from .rules import CompiledRules, activate_rules, load_rules_pack
 
 __all__ = [
     "AbilityScores",
     "Character",
     "ClassName",
+    "CompiledRules",
     "RaceName",
+    "activate_rules",
+    "agenerate_character",
+    "agenerate_characters",
     "generate_character",
+    "load_rules_pack",
     "roll_abilities",
 ]
@@ -0,0 +1,369 @@
+"""
+Ability score generation methods.
+
+Basic Fantasy rolls ``3d6`` for each ability in order, and that stays the
+default. Other common methods are registered alongside it and selected by
+name, so the choice can travel in a :class:`~rpgcharacters.bulk.BulkJob`
+to worker processes:
+
+- ``3d6``: three dice per ability.
+- ``4d6-drop-lowest``: four dice per ability, keeping the highest three.
+- ``3d6-reroll-ones``: three dice per ability, rerolling any 1 until it
+  is not a 1.
+- ``standard-array``: the scores 15, 14, 13, 12, 10 and 8 in random order.
+
+Every method knows the exact distribution of a single score
+(:attr:`AbilityMethod.score_weights`), which conditional sampling uses to
+draw qualifying scores directly. It also knows the exact probability that a
+roll satisfies per-ability bounds (:meth:`AbilityMethod.probability`).
+:meth:`AbilityMethod.roll_batch` rolls one set of scores per roller into a
+flat ``N x 6`` array, so each index of a seeded job keeps its own roller.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from functools import cache
+from itertools import accumulate, permutations, product
+from typing import Final
+
+from diceroller.core import DiceRoller
+
+from rpgcharacters.rules import ABILITY_NAMES, ABILITY_SCORE_MAX, ABILITY_SCORE_MIN
+
+# --- Constants ---
+
+DEFAULT_ABILITY_METHOD: Final = "3d6"
+STANDARD_ARRAY: Final[tuple[int, ...]] = (15, 14, 13, 12, 10, 8)
+SCORE_RANGE: Final = range(ABILITY_SCORE_MIN, ABILITY_SCORE_MAX + 1)
+
+Bounds = Sequence[tuple[int, int]]
+"""Inclusive ``(low, high)`` score bounds per ability, in ``ABILITY_NAMES`` order."""
+
+
+def dice_weights(dice: int, keep: int | None = None, lowest_face: int = 1) -> tuple[int, ...]:
+    """Count the d6 outcomes that give each score from 3 to 18.
+
+    Args:
+        dice (int): Number of six-sided dice rolled.
+        keep (int | None): Number of highest dice summed, or ``None`` for
+            all of them.
+        lowest_face (int): Smallest face that can be kept; ``2`` models
+            rerolling ones until they are not ones.
+
+    Returns:
+        tuple[int, ...]: Outcome count per score from 3 to 18.
+    """
+    counts = [0] * len(SCORE_RANGE)
+    for faces in product(range(lowest_face, 7), repeat=dice):
+        score = sum(sorted(faces)[dice - (keep or dice):])
+        if score in SCORE_RANGE:
+            counts[score - ABILITY_SCORE_MIN] += 1
+    return tuple(counts)
+
+
+@cache
+def score_table(weights: tuple[int, ...], low: int, high: int) -> tuple[tuple[int, ...], int]:
+    """Build the cumulative weights of a score distribution truncated to bounds.
+
+    Args:
+        weights (tuple[int, ...]): Integer weights for scores 3 to 18.
+        low (int): Smallest allowed score.
+        high (int): Largest allowed score.
+
+    Returns:
+        tuple[tuple[int, ...], int]: Cumulative weights and the score of the
+            first entry.
+
+    Raises:
+        ValueError: If no score within the bounds has a positive weight.
+    """
+    low = max(low, ABILITY_SCORE_MIN)
+    high = min(high, ABILITY_SCORE_MAX)
+    window = weights[low - ABILITY_SCORE_MIN:high - ABILITY_SCORE_MIN + 1] if low <= high else ()
+    if not any(window):
+        raise ValueError(f"No ability scores between {low} and {high} can be rolled.")
+    return tuple(accumulate(window)), low
+
+
+def draw_score(rng: DiceRoller, weights: tuple[int, ...], low: int, high: int) -> int:
+    """Draw one score from a distribution truncated to ``[low, high]``.
+
+    Args:
+        rng (DiceRoller): Dice roller whose generator makes the draw.
+        weights (tuple[int, ...]): Integer weights for scores 3 to 18.
+        low (int): Smallest allowed score.
+        high (int): Largest allowed score.
+
+    Returns:
+        int: Score within the bounds.
+
+    Raises:
+        ValueError: If no score within the bounds has a positive weight.
+    """
+    cumulative, first = score_table(weights, low, high)
+    return first + bisect_left(cumulative, rng.rng.randint(1, cumulative[-1]))
+
+
+# --- Methods ---
+
+class AbilityMethod(ABC):
+    """A way of generating the six ability scores.
+
+    Attributes:
+        name: Registry name.
+        description: One-line description for help text.
+        score_weights: Exact distribution of a single score, as integer
+            weights for scores 3 to 18.
+    """
+
+    name: str
+    description: str
+    score_weights: tuple[int, ...]
+
+    @abstractmethod
+    def roll(self, rng: DiceRoller) -> tuple[int, ...]:
+        """Roll six scores, one per ability in the order they are rolled."""
+
+    def roll_batch(self, rollers: Iterable[DiceRoller]) -> array[int]:
+        """Roll one set of scores per roller into a flat row-major ``N x 6`` array.
+
+        Row ``i`` is exactly what :meth:`roll` returns for the ``i``-th
+        roller, so passing ``create_indexed_roller(seed, index)`` for a range
+        of indices gives the scores those characters start from.
+
+        Args:
+            rollers (Iterable[DiceRoller]): One roller per row.
+
+        Returns:
+            array[int]: Unsigned byte array of ``6 * N`` scores.
+        """
+        scores = array("B")
+        roll = self.roll
+        for rng in rollers:
+            scores.extend(roll(rng))
+        return scores
+
+    @abstractmethod
+    def sample_bounded(self, rng: DiceRoller, bounds: Bounds) -> tuple[int, ...]:
+        """Draw scores from the method's distribution conditioned on ``bounds``.
+
+        Raises:
+            ValueError: If no roll satisfies the bounds.
+        """
+
+    @abstractmethod
+    def probability(self, bounds: Bounds) -> float:
+        """Return the exact probability that a roll satisfies ``bounds``."""
+
+    def score_probabilities(self) -> tuple[float, ...]:
+        """Return the probability of each score from 3 to 18."""
+        total = sum(self.score_weights)
+        return tuple(weight / total for weight in self.score_weights)
+
+    def mean_score(self) -> float:
+        """Return the expected value of a single score."""
+        return sum(
+            score * p for score, p in zip(SCORE_RANGE, self.score_probabilities(), strict=True)
+        )
+
+
+class DiceMethod(AbilityMethod):
+    """Method that rolls every ability independently."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        roll_score: Callable[[DiceRoller], int],
+        score_weights: tuple[int, ...],
+    ) -> None:
+        """Create a method.
+
+        Args:
+            name (str): Registry name.
+            description (str): One-line description.
+            roll_score (Callable[[DiceRoller], int]): Rolls one score.
+            score_weights (tuple[int, ...]): Exact weights of the scores
+                ``roll_score`` produces, for scores 3 to 18.
+        """
+        self.name = name
+        self.description = description
+        self.roll_score = roll_score
+        self.score_weights = score_weights
+
+    def roll(self, rng: DiceRoller) -> tuple[int, ...]:
+        roll_score = self.roll_score
+        return tuple(roll_score(rng) for _ in ABILITY_NAMES)
+
+    def roll_batch(self, rollers: Iterable[DiceRoller]) -> array[int]:
+        scores = array("B")
+        append = scores.append
+        roll_score = self.roll_score
+        for rng in rollers:
+            for _ in ABILITY_NAMES:
+                append(roll_score(rng))
+        return scores
+
+    def sample_bounded(self, rng: DiceRoller, bounds: Bounds) -> tuple[int, ...]:
+        return tuple(draw_score(rng, self.score_weights, low, high) for low, high in bounds)
+
+    def probability(self, bounds: Bounds) -> float:
+        total = sum(self.score_weights)
+        result = 1.0
+        for low, high in bounds:
+            low, high = max(low, ABILITY_SCORE_MIN), min(high, ABILITY_SCORE_MAX)
+            if low > high:
+                return 0.0
+            window = self.score_weights[low - ABILITY_SCORE_MIN:high - ABILITY_SCORE_MIN + 1]
+            result *= sum(window) / total
+        return result
+
+
+class ArrayMethod(AbilityMethod):
+    """Method that deals a fixed set of scores to the abilities in random order."""
+
+    def __init__(self, name: str, description: str, scores: tuple[int, ...]) -> None:
+        """Create a method.
+
+        Args:
+            name (str): Registry name.
+            description (str): One-line description.
+            scores (tuple[int, ...]): One score per ability.
+
+        Raises:
+            ValueError: If there is not one score per ability or a score is
+                outside 3 to 18.
+        """
+        if len(scores) != len(ABILITY_NAMES):
+            raise ValueError(f"A score array needs {len(ABILITY_NAMES)} scores.")
+        if any(score not in SCORE_RANGE for score in scores):
+            raise ValueError("Array scores must be between 3 and 18.")
+        self.name = name
+        self.description = description
+        self.scores = scores
+        self.score_weights = tuple(scores.count(score) for score in SCORE_RANGE)
+        self._orders = tuple(permutations(scores))
+        self._qualifying_orders: dict[tuple[tuple[int, int], ...], tuple[tuple[int, ...], ...]] = {}
+
+    def roll(self, rng: DiceRoller) -> tuple[int, ...]:
+        # Fisher-Yates shuffle driven by the roller's dice.
+        scores = list(self.scores)
+        for last in range(len(scores) - 1, 0, -1):
+            pick = rng.roll(f"1d{last + 1}") - 1
+            scores[last], scores[pick] = scores[pick], scores[last]
+        return tuple(scores)
+
+    def _qualifying(self, bounds: tuple[tuple[int, int], ...]) -> tuple[tuple[int, ...], ...]:
+        qualifying = self._qualifying_orders.get(bounds)
+        if qualifying is None:
+            qualifying = self._qualifying_orders[bounds] = tuple(
+                order
+                for order in self._orders
+                if all(low <= score <= high for score, (low, high) in zip(order, bounds))
+            )
+        return qualifying
+
+    def sample_bounded(self, rng: DiceRoller, bounds: Bounds) -> tuple[int, ...]:
+        qualifying = self._qualifying(tuple(bounds))
+        if not qualifying:
+            raise ValueError(f"No order of the {self.name} scores satisfies the bounds.")
+        return qualifying[rng.rng.randint(0, len(qualifying) - 1)]
+
+    def probability(self, bounds: Bounds) -> float:
+        return len(self._qualifying(tuple(bounds))) / len(self._orders)
+
+
+def _roll_dropping_lowest(rng: DiceRoller) -> int:
+    dice: list[int] = [rng.roll("1d6") for _ in range(4)]
+    return sum(dice) - min(dice)
+
+
+def _roll_rerolling_ones(rng: DiceRoller) -> int:
+    total = 0
+    for _ in range(3):
+        die = rng.roll("1d6")
+        while die == 1:
+            die = rng.roll("1d6")
+        total += die
+    return total
+
+
+# --- Registry ---
+
+ABILITY_METHODS: dict[str, AbilityMethod] = {}
+
+
+def register_ability_method(method: AbilityMethod, replace: bool = False) -> None:
+    """Make a method available by name.
+
+    Worker processes started with ``spawn`` or ``forkserver`` only know the
+    built-in methods, unless the module that registers a custom one is
+    imported by the workers too.
+
+    Args:
+        method (AbilityMethod): Method to register.
+        replace (bool): Whether an existing method of the same name may be
+            replaced.
+
+    Raises:
+        ValueError: If the name is taken and ``replace`` is false.
+    """
+    if method.name in ABILITY_METHODS and not replace:
+        raise ValueError(f"Ability method '{method.name}' is already registered.")
+    ABILITY_METHODS[method.name] = method
+
+
+def get_ability_method(name: str) -> AbilityMethod:
+    """Look up a registered method.
+
+    Args:
+        name (str): Method name.
+
+    Returns:
+        AbilityMethod: The method.
+
+    Raises:
+        ValueError: If no method has that name.
+    """
+    try:
+        return ABILITY_METHODS[name]
+    except KeyError:
+        known = ", ".join(ABILITY_METHODS)
+        raise ValueError(f"Unknown ability method: '{name}'. Expected one of: {known}") from None
+
+
+register_ability_method(
+    DiceMethod(
+        "3d6",
+        "3d6 for each ability in order (the Basic Fantasy rule).",
+        lambda rng: rng.roll("3d6"),
+        dice_weights(3),
+    )
+)
+register_ability_method(
+    DiceMethod(
+        "4d6-drop-lowest",
+        "4d6 for each ability, keeping the highest three dice.",
+        _roll_dropping_lowest,
+        dice_weights(4, keep=3),
+    )
+)
+register_ability_method(
+    DiceMethod(
+        "3d6-reroll-ones",
+        "3d6 for each ability, rerolling ones.",
+        _roll_rerolling_ones,
+        dice_weights(3, lowest_face=2),
+    )
+)
+register_ability_method(
+    ArrayMethod(
+        "standard-array",
+        "15, 14, 13, 12, 10 and 8 assigned to the abilities in random order.",
+        STANDARD_ARRAY,
+    )
+)
@@ -0,0 +1,162 @@
+"""
+Character generation for asyncio applications.
+
+Generation is CPU-bound, so calling it inline blocks the event loop. These
+coroutines run it on an executor instead: the loop's default thread pool, or
+any :class:`~concurrent.futures.Executor` passed in, such as one made by
+:func:`process_executor`.
+
+:func:`agenerate_characters` submits chunks of a bulk job and keeps at most
+``max_pending`` of them in flight. A new chunk is only submitted when the
+consumer takes one, so a slow consumer holds back generation rather than
+letting finished characters pile up. Characters come out in index order and
+match :func:`~rpgcharacters.bulk.iter_characters` for the same job.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections import deque
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from diceroller.core import DiceRoller
+
+from rpgcharacters.ability_methods import DEFAULT_ABILITY_METHOD
+from rpgcharacters.bulk import (
+    DEFAULT_CHUNK_SIZE,
+    BulkJob,
+    chunk_ranges,
+    generate_chunk,
+    init_worker,
+    new_seed,
+    validate_job,
+)
+from rpgcharacters.character_generator import AbilityScores, Character, generate_character
+from rpgcharacters.metrics import METRICS
+from rpgcharacters.rules import active_rules, pinned_rules
+
+# --- Constants ---
+
+DEFAULT_MAX_PENDING = 4
+
+
+def process_executor(workers: int) -> ProcessPoolExecutor:
+    """Create a process pool whose workers use this process's rules.
+
+    Args:
+        workers (int): Number of worker processes.
+
+    Returns:
+        ProcessPoolExecutor: Executor for :func:`agenerate_characters`. The
+            caller owns it and should shut it down when done.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(active_rules(), METRICS.enabled, None),
+    )
+
+
+async def agenerate_character(
+    race: str,
+    class_name: str,
+    rng: DiceRoller,
+    name: str | None = None,
+    abilities: AbilityScores | None = None,
+    ability_method: str = DEFAULT_ABILITY_METHOD,
+    executor: Executor | None = None,
+) -> Character:
+    """Generate a character without blocking the event loop.
+
+    Takes the same arguments as
+    :func:`~rpgcharacters.character_generator.generate_character`.
+
+    Args:
+        race (str): Selected race name.
+        class_name (str): Selected class name.
+        rng (DiceRoller): Dice roller used for all random generation. It must
+            not be used elsewhere until the coroutine finishes.
+        name (str | None): Optional character name.
+        abilities (AbilityScores | None): Optional pre-rolled ability scores.
+        ability_method (str): Ability method used when ``abilities`` is
+            ``None``.
+        executor (Executor | None): Executor to run on, or ``None`` for the
+            loop's default thread pool.
+
+    Returns:
+        Character: Fully built level-1 character record.
+
+    Raises:
+        ValueError: If race or class validation returns any messages.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(
+        generate_character, race, class_name, rng, name, abilities, ability_method
+    )
+    return await loop.run_in_executor(executor, call)
+
+
+async def agenerate_characters(
+    count: int,
+    job: BulkJob | None = None,
+    executor: Executor | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> AsyncIterator[Character]:
+    """Stream the characters of a bulk job without blocking the event loop.
+
+    Cancelling the consuming task, or leaving an ``async for`` early, cancels
+    the chunks that have not started; chunks already running are left to
+    finish on the executor and their results are dropped.
+
+    Args:
+        count (int): Number of characters to generate.
+        job (BulkJob | None): Bulk job parameters; defaults to auto-selected
+            races and classes with a random seed.
+        executor (Executor | None): Executor to run chunks on, or ``None``
+            for the loop's default thread pool. Process pools must be
+            prepared like :func:`process_executor` does.
+        chunk_size (int): Characters per executor task.
+        max_pending (int): Maximum chunks submitted but not yet consumed.
+
+    Yields:
+        Character: Characters ``0`` through ``count - 1`` in index order.
+
+    Raises:
+        ValueError: If the job is invalid or ``chunk_size`` or
+            ``max_pending`` is less than 1.
+    """
+    job = job if job is not None else BulkJob(seed=new_seed())
+    errors = validate_job(job)
+    if chunk_size < 1:
+        errors.append("Chunk size must be at least 1.")
+    if max_pending < 1:
+        errors.append("Pending chunk limit must be at least 1.")
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    loop = asyncio.get_running_loop()
+    ranges = chunk_ranges(0, count, chunk_size)
+    pending: deque[asyncio.Future[list[Character]]] = deque()
+
+    def refill() -> None:
+        while len(pending) < max_pending:
+            chunk = next(ranges, None)
+            if chunk is None:
+                return
+            pending.append(loop.run_in_executor(executor, generate_chunk, job, *chunk))
+
+    # Thread executors read the shared rules tables while this generator runs.
+    with pinned_rules():
+        try:
+            refill()
+            while pending:
+                characters = await pending.popleft()
+                refill()
+                for character in characters:
+                    yield character
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,559 @@
+"""
+Bitmap index over sharded character archives.
+
+An index keeps, for each shard of a shard directory (see
+:mod:`rpgcharacters.shards`), one bitmap per race, class, ability score value
+and saving throw value of its characters. Bit ``i`` of a shard's bitmap is
+set when record ``i`` of that shard has the value. Bitmaps are Python
+integers, so a query such as "halfling thieves with DEX >= 16 and a CON
+modifier of at least 0" is a handful of integer ANDs and ORs per shard, and
+only shards that contain a candidate are read.
+
+Bitmaps stay zlib-compressed in memory and in ``index.json`` next to the
+manifest, and a query decodes only the ones its conditions name. Because
+each shard has its own bitmaps, :func:`update_index` indexes shards appended
+since the index was last written without touching the others.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import operator
+import re
+import zlib
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+
+from rpgcharacters.character_generator import ability_modifier
+from rpgcharacters.rules import (
+    ABILITY_NAMES,
+    ABILITY_SCORE_MAX,
+    ABILITY_SCORE_MIN,
+    SAVING_THROW_NAMES,
+    atomic_write_bytes,
+)
+from rpgcharacters.shards import Manifest, ShardInfo, load_manifest, read_shard
+
+# --- Constants ---
+
+INDEX_NAME: Final = "index.json"
+INDEX_VERSION: Final = 2
+NAME_FIELDS: Final = ("race", "class")
+MODIFIER_SUFFIX: Final = "_mod"
+_OPERATORS: Final[dict[str, Callable[[Any, Any], bool]]] = {
+    "=": operator.eq,
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+_CONDITION: Final = re.compile(r"^\s*([A-Za-z_]+)\s*(>=|<=|=|>|<)\s*(\S.*?)\s*$")
+
+
+def record_keys(record: Mapping[str, Any]) -> Iterator[str]:
+    """List the bitmap keys a character record belongs to.
+
+    Args:
+        record (Mapping[str, Any]): Character dictionary from
+            :meth:`~rpgcharacters.character_generator.Character.to_dict`.
+
+    Yields:
+        str: Keys such as ``"race=dwarf"``, ``"STR=16"`` or ``"spells=13"``.
+    """
+    yield f"race={record['race']}"
+    yield f"class={record['class']}"
+    for ability in ABILITY_NAMES:
+        yield f"{ability}={record['abilities'][ability]}"
+    for save, value in record["saving_throws"].items():
+        yield f"{save}={value}"
+
+
+def record_ids(bitmap: int) -> Iterator[int]:
+    """Yield the positions of the set bits of a bitmap in ascending order.
+
+    Args:
+        bitmap (int): Non-negative bitmap.
+
+    Yields:
+        int: Record indices.
+    """
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for byte_index, byte in enumerate(data):
+        if byte:
+            base = byte_index * 8
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield base + bit
+
+
+@dataclass(frozen=True, slots=True)
+class Condition:
+    """One query condition, such as ``DEX >= 16`` or ``race = elf|halfling``.
+
+    Attributes:
+        field: ``race``, ``class``, an ability name, an ability name with a
+            ``_mod`` suffix, or a saving throw name.
+        op: One of ``=``, ``>=``, ``<=``, ``>`` and ``<``.
+        values: Values to compare with; several values are OR-ed.
+    """
+
+    field: str
+    op: str
+    values: tuple[int | str, ...]
+
+
+def parse_condition(text: str) -> Condition:
+    """Parse a ``FIELD OP VALUE`` condition.
+
+    ``=`` accepts several values separated by ``|``. Race and class only
+    support ``=``.
+
+    Args:
+        text (str): Condition such as ``"DEX>=16"`` or ``"class=thief|fighter"``.
+
+    Returns:
+        Condition: The parsed condition.
+
+    Raises:
+        ValueError: If the condition is malformed or names an unknown field.
+    """
+    match = _CONDITION.match(text)
+    if match is None:
+        raise ValueError(f"expected FIELD=VALUE or FIELD>=VALUE, got '{text}'")
+    field, op, raw = match.groups()
+    raw_values = [value.strip() for value in raw.split("|")] if op == "=" else [raw]
+    if field.lower() in NAME_FIELDS:
+        if op != "=":
+            raise ValueError(f"'{field}' only supports '='.")
+        return Condition(field.lower(), op, tuple(value.lower() for value in raw_values))
+
+    ability = field.upper().removesuffix(MODIFIER_SUFFIX.upper())
+    if ability in ABILITY_NAMES:
+        field = ability + (MODIFIER_SUFFIX if field.lower().endswith(MODIFIER_SUFFIX) else "")
+    elif field.lower() in SAVING_THROW_NAMES:
+        field = field.lower()
+    else:
+        raise ValueError(f"Unknown query field: '{field}'")
+    try:
+        values = tuple(int(value) for value in raw_values)
+    except ValueError as exc:
+        raise ValueError(f"'{field}' needs an integer value, got '{raw}'") from exc
+    return Condition(field, op, values)
+
+
+# --- Index ---
+
+def _encode_bitmap(bitmap: int) -> bytes:
+    return zlib.compress(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little"))
+
+
+def _decode_bitmap(blob: bytes) -> int:
+    return int.from_bytes(zlib.decompress(blob), "little")
+
+
+def _merge(parts: Sequence[tuple[int, int]], base: int = 0) -> int:
+    # OR (offset, bitmap) parts into one bitmap. Halves are joined with one
+    # shift each, so the cost grows with n log n rather than n squared.
+    if not parts:
+        return 0
+    if len(parts) == 1:
+        offset, bitmap = parts[0]
+        return bitmap << (offset - base)
+    middle = len(parts) // 2
+    split = parts[middle][0]
+    return _merge(parts[:middle], base) | _merge(parts[middle:], split) << (split - base)
+
+
+def chunk_bitmaps(records: Sequence[Mapping[str, Any]]) -> dict[str, int]:
+    """Build the bitmaps of one shard's records.
+
+    Args:
+        records (Sequence[Mapping[str, Any]]): Character dictionaries in
+            shard order.
+
+    Returns:
+        dict[str, int]: Bitmap per key; bit ``i`` stands for record ``i`` of
+            the shard.
+    """
+    positions: defaultdict[str, list[int]] = defaultdict(list)
+    for position, record in enumerate(records):
+        for key in record_keys(record):
+            positions[key].append(position)
+    size = (len(records) + 7) // 8
+    bitmaps: dict[str, int] = {}
+    for key, hits in positions.items():
+        bits = bytearray(size)
+        for position in hits:
+            bits[position >> 3] |= 1 << (position & 7)
+        bitmaps[key] = int.from_bytes(bits, "little")
+    return bitmaps
+
+
+class BitmapIndex:
+    """Per-value bitmaps over the records of a shard directory.
+
+    Bitmaps are kept per shard and zlib-compressed, as in ``index.json``.
+    Adding a shard only touches that shard's bitmaps, and a query decodes
+    only the bitmaps its conditions name, one shard at a time.
+    """
+
+    def __init__(
+        self,
+        shards: Iterable[ShardInfo] = (),
+        chunks: Iterable[Mapping[str, bytes]] = (),
+    ) -> None:
+        """Create an index.
+
+        Args:
+            shards (Iterable[ShardInfo]): Indexed shards in record order.
+            chunks (Iterable[Mapping[str, bytes]]): Compressed bitmap per
+                ``field=value`` key for each shard, with bit ``i`` standing
+                for record ``i`` of the shard.
+
+        Raises:
+            ValueError: If there is not one chunk per shard.
+        """
+        self.shards = list(shards)
+        self.chunks: list[dict[str, bytes]] = [dict(chunk) for chunk in chunks]
+        if len(self.chunks) != len(self.shards):
+            raise ValueError("An index needs one bitmap chunk per shard.")
+
+    @property
+    def records(self) -> int:
+        """Number of indexed records."""
+        return self.shards[-1].stop if self.shards else 0
+
+    @property
+    def all(self) -> int:
+        """Bitmap with every indexed record set."""
+        return (1 << self.records) - 1
+
+    def add_chunk(self, shard: ShardInfo, bitmaps: Mapping[str, int]) -> None:
+        """Add the bitmaps of a shard that follows the indexed ones.
+
+        Args:
+            shard (ShardInfo): Shard the bitmaps describe.
+            bitmaps (Mapping[str, int]): Bitmaps from :func:`chunk_bitmaps`.
+
+        Raises:
+            ValueError: If the shard does not follow the indexed records.
+        """
+        if shard.start != self.records:
+            raise ValueError(
+                f"Shard {shard.path} starts at record {shard.start}, "
+                f"but {self.records} records are indexed."
+            )
+        self.shards.append(shard)
+        self.chunks.append({})
+        self.set_chunk(len(self.shards) - 1, bitmaps)
+
+    def add_shard(self, directory: str | Path, shard: ShardInfo, manifest: Manifest) -> None:
+        """Read and index one shard.
+
+        Args:
+            directory (str | Path): Shard directory.
+            shard (ShardInfo): Shard to index; must start at ``records``.
+            manifest (Manifest): Manifest the shard belongs to.
+
+        Raises:
+            ValueError: If the shard does not follow the indexed records or
+                fails its checksum.
+        """
+        if shard.start != self.records:
+            raise ValueError(
+                f"Shard {shard.path} starts at record {shard.start}, "
+                f"but {self.records} records are indexed."
+            )
+        data = read_shard(directory, shard, manifest.compression)
+        self.add_chunk(shard, chunk_bitmaps([json.loads(line) for line in data.splitlines()]))
+
+    def chunk(self, number: int) -> dict[str, int]:
+        """Decode every bitmap of one shard.
+
+        Args:
+            number (int): Shard position in ``shards``.
+
+        Returns:
+            dict[str, int]: Bitmap per key, local to the shard.
+        """
+        return {key: _decode_bitmap(blob) for key, blob in self.chunks[number].items()}
+
+    def set_chunk(self, number: int, bitmaps: Mapping[str, int]) -> None:
+        """Replace the bitmaps of one shard.
+
+        Args:
+            number (int): Shard position in ``shards``.
+            bitmaps (Mapping[str, int]): Bitmap per key, local to the shard;
+                empty bitmaps are dropped.
+        """
+        self.chunks[number] = {
+            key: _encode_bitmap(bitmap) for key, bitmap in sorted(bitmaps.items()) if bitmap
+        }
+
+    def _lookup(self, number: int, key: str) -> int:
+        blob = self.chunks[number].get(key)
+        return _decode_bitmap(blob) if blob is not None else 0
+
+    def shard_bitmap(self, number: int, field: str, value: int | str) -> int:
+        """Return one shard's bitmap of records with ``field`` equal to ``value``.
+
+        Args:
+            number (int): Shard position in ``shards``.
+            field (str): Field name, e.g. ``"race"`` or ``"DEX"``.
+            value (int | str): Field value.
+
+        Returns:
+            int: Bitmap local to the shard, ``0`` when no record has the value.
+        """
+        return self._lookup(number, f"{field}={value}")
+
+    def bitmap(self, field: str, value: int | str) -> int:
+        """Return the bitmap of records with ``field`` equal to ``value``.
+
+        Args:
+            field (str): Field name, e.g. ``"race"`` or ``"DEX"``.
+            value (int | str): Field value.
+
+        Returns:
+            int: Bitmap over the whole archive, ``0`` when no record has the
+                value.
+        """
+        key = f"{field}={value}"
+        return _merge([
+            (shard.start, self._lookup(number, key)) for number, shard in enumerate(self.shards)
+        ])
+
+    def values(self, field: str) -> list[str]:
+        """List the indexed values of a field.
+
+        Args:
+            field (str): Field name.
+
+        Returns:
+            list[str]: Values with at least one record, as strings.
+        """
+        prefix = f"{field}="
+        keys = {key for chunk in self.chunks for key in chunk if key.startswith(prefix)}
+        return sorted(key.removeprefix(prefix) for key in keys)
+
+    def _match(self, number: int, condition: Condition) -> int:
+        chunk = self.chunks[number]
+        compare = _OPERATORS[condition.op]
+        result = 0
+        if condition.field.endswith(MODIFIER_SUFFIX):
+            # Modifiers are not indexed; OR the scores that give a matching modifier.
+            ability = condition.field.removesuffix(MODIFIER_SUFFIX)
+            for score in range(ABILITY_SCORE_MIN, ABILITY_SCORE_MAX + 1):
+                modifier = ability_modifier(score)
+                if any(compare(modifier, value) for value in condition.values):
+                    result |= self._lookup(number, f"{ability}={score}")
+            return result
+        if condition.field in NAME_FIELDS:
+            for value in condition.values:
+                result |= self._lookup(number, f"{condition.field}={value}")
+            return result
+        prefix = f"{condition.field}="
+        for key in chunk:
+            if key.startswith(prefix):
+                value = int(key.removeprefix(prefix))
+                if any(compare(value, wanted) for wanted in condition.values):
+                    result |= self._lookup(number, key)
+        return result
+
+    def match(self, condition: Condition) -> int:
+        """Return the bitmap of records that satisfy one condition.
+
+        Args:
+            condition (Condition): Condition to evaluate.
+
+        Returns:
+            int: Bitmap of matching records over the whole archive.
+        """
+        return _merge([
+            (shard.start, self._match(number, condition))
+            for number, shard in enumerate(self.shards)
+        ])
+
+    def query_shards(self, conditions: Iterable[Condition]) -> Iterator[tuple[ShardInfo, int]]:
+        """Find the records that satisfy every condition, shard by shard.
+
+        Args:
+            conditions (Iterable[Condition]): Conditions to AND together.
+
+        Yields:
+            tuple[ShardInfo, int]: Each shard with at least one match and the
+                bitmap of its matching records, local to the shard.
+        """
+        conditions = tuple(conditions)
+        for number, shard in enumerate(self.shards):
+            result = (1 << shard.count) - 1
+            for condition in conditions:
+                result &= self._match(number, condition)
+                if not result:
+                    break
+            if result:
+                yield shard, result
+
+    def query(self, conditions: Iterable[Condition]) -> int:
+        """Return the bitmap of records that satisfy every condition.
+
+        Args:
+            conditions (Iterable[Condition]): Conditions to AND together.
+
+        Returns:
+            int: Bitmap of matching records over the whole archive; every
+                record when there are no conditions.
+        """
+        return _merge([(shard.start, hits) for shard, hits in self.query_shards(conditions)])
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the index to a JSON-compatible dictionary.
+
+        Returns:
+            dict[str, Any]: Index document with zlib-compressed bitmaps.
+        """
+        return {
+            "version": INDEX_VERSION,
+            "records": self.records,
+            "shards": [
+                {
+                    "path": shard.path,
+                    "sha256": shard.sha256,
+                    "bitmaps": {
+                        key: base64.b64encode(blob).decode("ascii")
+                        for key, blob in chunk.items()
+                    },
+                }
+                for shard, chunk in zip(self.shards, self.chunks, strict=True)
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], manifest: Manifest) -> BitmapIndex:
+        """Rebuild an index from :meth:`to_dict` output.
+
+        Args:
+            data (Mapping[str, Any]): Index document.
+            manifest (Manifest): Manifest of the indexed directory.
+
+        Returns:
+            BitmapIndex: The index.
+
+        Raises:
+            ValueError: If the document is invalid or its shards are not the
+                leading shards of ``manifest``.
+        """
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported index version: {data.get('version')!r}")
+        try:
+            indexed = [(shard["path"], shard["sha256"]) for shard in data["shards"]]
+            chunks = [
+                {key: base64.b64decode(blob) for key, blob in shard["bitmaps"].items()}
+                for shard in data["shards"]
+            ]
+            records = int(data["records"])
+        except (KeyError, TypeError, ValueError, AttributeError) as exc:
+            raise ValueError(f"Malformed index: {exc}") from exc
+        shards = manifest.shards[:len(indexed)]
+        if [(shard.path, shard.sha256) for shard in shards] != indexed:
+            raise ValueError("Index does not match the shards in the manifest.")
+        if records != (shards[-1].stop if shards else 0):
+            raise ValueError("Index record count does not match its shards.")
+        return cls(shards, chunks)
+
+
+# --- Index Files ---
+
+def save_index(directory: str | Path, index: BitmapIndex) -> None:
+    """Atomically write an index next to the manifest.
+
+    Args:
+        directory (str | Path): Shard directory.
+        index (BitmapIndex): Index to write.
+    """
+    atomic_write_bytes(Path(directory) / INDEX_NAME, json.dumps(index.to_dict()).encode("utf-8"))
+
+
+def load_index(directory: str | Path, manifest: Manifest | None = None) -> BitmapIndex:
+    """Read the index of a shard directory.
+
+    Args:
+        directory (str | Path): Shard directory.
+        manifest (Manifest | None): Manifest of the directory; read from
+            disk when omitted.
+
+    Returns:
+        BitmapIndex: The index.
+
+    Raises:
+        OSError: If the index cannot be read.
+        ValueError: If the index is invalid or out of step with the manifest.
+    """
+    manifest = manifest or load_manifest(directory)
+    try:
+        data = json.loads((Path(directory) / INDEX_NAME).read_bytes())
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Could not parse index: {exc}") from exc
+    if not isinstance(data, dict):
+        raise ValueError("Index must be a JSON object.")
+    return BitmapIndex.from_dict(data, manifest)
+
+
+def update_index(directory: str | Path) -> BitmapIndex:
+    """Bring the index of a shard directory up to date and save it.
+
+    Shards appended since the index was written are indexed and added. If
+    there is no usable index, for example because earlier shards were
+    rewritten, the index is rebuilt from every shard.
+
+    Args:
+        directory (str | Path): Shard directory.
+
+    Returns:
+        BitmapIndex: Index covering every shard in the manifest.
+
+    Raises:
+        OSError: If the manifest or a shard cannot be read.
+        ValueError: If a shard fails its checksum.
+    """
+    manifest = load_manifest(directory)
+    try:
+        index = load_index(directory, manifest)
+    except (OSError, ValueError):
+        index = BitmapIndex()
+    if len(index.shards) == len(manifest.shards):
+        return index
+    for shard in manifest.shards[len(index.shards):]:
+        index.add_shard(directory, shard, manifest)
+    save_index(directory, index)
+    return index
+
+
+def iter_matching_records(
+    directory: str | Path,
+    matches: Iterable[tuple[ShardInfo, int]],
+    manifest: Manifest | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Read the records selected by a query, one shard at a time.
+
+    Args:
+        directory (str | Path): Shard directory.
+        matches (Iterable[tuple[ShardInfo, int]]): Shards and their local
+            match bitmaps, as from :meth:`BitmapIndex.query_shards`.
+        manifest (Manifest | None): Manifest of the directory; read from
+            disk when omitted.
+
+    Yields:
+        dict[str, Any]: Selected records in index order.
+    """
+    manifest = manifest or load_manifest(directory)
+    for shard, hits in matches:
+        if not hits:
+            continue
+        lines = read_shard(directory, shard, manifest.compression).splitlines()
+        for position in record_ids(hits):
+            yield json.loads(lines[position])
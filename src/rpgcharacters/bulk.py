@@ -0,0 +1,532 @@
+"""
+Bulk generation of many characters from a single seed.
+
+Every character in a bulk run gets its own dice roller seeded from the job
+seed and the character's index, so a run produces the same characters in the
+same order regardless of how the indices are split across worker processes,
+threads or subinterpreters. No roller is shared between workers, which lets
+the thread backend scale across cores on free-threaded Python builds.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import multiprocessing
+import os
+import secrets
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Iterator, Mapping
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final, Literal
+
+from diceroller.core import CustomRandom, DiceRoller
+
+from rpgcharacters.ability_methods import ABILITY_METHODS, DEFAULT_ABILITY_METHOD
+from rpgcharacters.character_generator import Character, generate_random_character
+from rpgcharacters.fastpath import FastRoller, fast_random_character
+from rpgcharacters.metrics import METRICS, StageSnapshot
+from rpgcharacters.names import name_character
+from rpgcharacters.packing import pack_characters, unpack_characters
+from rpgcharacters.rules import CompiledRules, activate_rules, active_rules, pinned_rules
+
+# --- Constants ---
+
+Backend = Literal["process", "thread", "interpreter"]
+BACKENDS: Final[tuple[Backend, ...]] = ("process", "thread", "interpreter")
+DEFAULT_CHUNK_SIZE = 256
+MAX_REROLLS = 10_000
+_MASK64: Final = (1 << 64) - 1
+_GOLDEN_GAMMA: Final = 0x9E3779B97F4A7C15
+
+
+@dataclass(frozen=True, slots=True)
+class BulkJob:
+    """Parameters shared by every character of a bulk run.
+
+    Attributes:
+        seed: Job seed that every per-character seed is derived from.
+        race: Race for every character, or ``None`` to auto-select.
+        class_name: Class for every character, or ``None`` to auto-select.
+        name: Name given to every character.
+        race_weights: Relative weights for auto-selected races.
+        class_weights: Relative weights for auto-selected classes.
+        ability_method: Name of the ability method every character rolls
+            with.
+        random_names: Whether characters without ``name`` get a name drawn
+            for their race.
+        fast: Whether to generate with :mod:`rpgcharacters.fastpath`,
+            which gives the same characters with fewer Python-level steps.
+    """
+
+    seed: int
+    race: str | None = None
+    class_name: str | None = None
+    name: str | None = None
+    race_weights: Mapping[str, float] | None = None
+    class_weights: Mapping[str, float] | None = None
+    ability_method: str = DEFAULT_ABILITY_METHOD
+    random_names: bool = False
+    fast: bool = False
+
+
+# --- Seeding ---
+
+def _mix64(value: int) -> int:
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & _MASK64
+    return value ^ (value >> 31)
+
+
+def derive_seed(seed: int, index: int) -> int:
+    """Derive an independent per-character seed from a job seed.
+
+    Uses the SplitMix64 output function, so neighbouring indices get
+    unrelated seeds.
+
+    Args:
+        seed (int): Job seed.
+        index (int): Zero-based character index within the job.
+
+    Returns:
+        int: 64-bit seed for the character's dice roller.
+    """
+    return _mix64((_mix64(seed & _MASK64) + (index + 1) * _GOLDEN_GAMMA) & _MASK64)
+
+
+def new_seed() -> int:
+    """Return a fresh random job seed.
+
+    Returns:
+        int: Non-negative 63-bit seed.
+    """
+    return secrets.randbits(63)
+
+
+def create_indexed_roller(seed: int, index: int) -> DiceRoller:
+    """Create the dice roller used for one character of a job.
+
+    Args:
+        seed (int): Job seed.
+        index (int): Zero-based character index within the job.
+
+    Returns:
+        DiceRoller: Roller seeded with ``derive_seed(seed, index)``.
+    """
+    return DiceRoller(CustomRandom(derive_seed(seed, index)))
+
+
+def validate_job(job: BulkJob) -> list[str]:
+    """Check that a bulk job's ability method, race and class can be generated.
+
+    Args:
+        job (BulkJob): Bulk job parameters.
+
+    Returns:
+        list[str]: Validation messages. Empty when the job is valid.
+    """
+    rules = active_rules()
+    errors: list[str] = []
+    race = job.race.lower() if job.race else None
+    class_name = job.class_name.lower() if job.class_name else None
+    if race is not None and race not in rules.race_names:
+        errors.append(f"Unknown race: '{race}'")
+    if class_name is not None and class_name not in rules.class_names:
+        errors.append(f"Unknown class: '{class_name}'")
+    if job.ability_method not in ABILITY_METHODS:
+        errors.append(f"Unknown ability method: '{job.ability_method}'")
+    for label, weights, known in (
+        ("race", job.race_weights, rules.race_names),
+        ("class", job.class_weights, rules.class_names),
+    ):
+        for weighted in sorted(set(weights or ()) - set(known)):
+            errors.append(f"Unknown {label} in weights: '{weighted}'")
+    if errors or race is None or class_name is None:
+        return errors
+    if not rules.is_allowed(rules.race_index(race), rules.class_index(class_name)):
+        errors.append(f"{race.title()} characters cannot be {class_name.title()}s.")
+    return errors
+
+
+# --- Generation ---
+
+def generate_indexed_character(job: BulkJob, index: int) -> Character:
+    """Generate the character at ``index`` of a bulk job.
+
+    Abilities are rerolled from the same roller until they allow the job's
+    race and class, so fixed race/class jobs always produce a character.
+
+    Args:
+        job (BulkJob): Bulk job parameters.
+        index (int): Zero-based character index.
+
+    Returns:
+        Character: The generated character.
+
+    Raises:
+        ValueError: If no valid character is rolled within ``MAX_REROLLS``
+            attempts, e.g. for an impossible race/class combination.
+    """
+    # FastRoller stands in for DiceRoller here; fastpath keeps the draws equal.
+    rng: Any
+    generate: Callable[..., Character]
+    if job.fast:
+        rng = FastRoller(derive_seed(job.seed, index))
+        generate = fast_random_character
+    else:
+        rng = create_indexed_roller(job.seed, index)
+        generate = generate_random_character
+    error: ValueError | None = None
+    for _ in range(MAX_REROLLS):
+        try:
+            character = generate(
+                rng,
+                job.race,
+                job.class_name,
+                job.name,
+                race_weights=job.race_weights,
+                class_weights=job.class_weights,
+                ability_method=job.ability_method,
+            )
+        except ValueError as exc:
+            error = exc
+            continue
+        return name_character(character, rng) if job.random_names else character
+    raise ValueError(f"Could not generate character {index}: {error}")
+
+
+def generate_chunk(job: BulkJob, start: int, stop: int) -> list[Character]:
+    """Generate characters ``start`` through ``stop - 1`` of a bulk job.
+
+    Args:
+        job (BulkJob): Bulk job parameters.
+        start (int): First index (inclusive).
+        stop (int): Last index (exclusive).
+
+    Returns:
+        list[Character]: Characters in index order.
+    """
+    return [generate_indexed_character(job, index) for index in range(start, stop)]
+
+
+def generate_packed_chunk(job: BulkJob, start: int, stop: int) -> bytes:
+    """Generate a chunk of characters and pack them with the active rules.
+
+    Args:
+        job (BulkJob): Bulk job parameters.
+        start (int): First index (inclusive).
+        stop (int): Last index (exclusive).
+
+    Returns:
+        bytes: Characters encoded by :func:`~rpgcharacters.packing.pack_characters`.
+    """
+    return pack_characters(generate_chunk(job, start, stop), active_rules())
+
+
+def chunk_ranges(start: int, stop: int, chunk_size: int) -> Iterator[tuple[int, int]]:
+    """Split ``[start, stop)`` into consecutive ranges of ``chunk_size``.
+
+    Args:
+        start (int): First index (inclusive).
+        stop (int): Last index (exclusive).
+        chunk_size (int): Maximum indices per range.
+
+    Yields:
+        tuple[int, int]: ``(start, stop)`` pairs covering the range in order.
+    """
+    for chunk_start in range(start, stop, chunk_size):
+        yield chunk_start, min(chunk_start + chunk_size, stop)
+
+
+def ordered_map[T, R](
+    executor: Executor,
+    fn: Callable[[T], R],
+    tasks: Iterable[T],
+    window: int,
+) -> Iterator[R]:
+    """Map ``fn`` over ``tasks`` on an executor, yielding results in order.
+
+    At most ``window`` tasks are in flight at once, so long task streams do
+    not queue every result in memory.
+
+    Args:
+        executor (Executor): Executor that runs the tasks.
+        fn (Callable[[T], R]): Picklable task function.
+        tasks (Iterable[T]): Task arguments.
+        window (int): Maximum number of submitted, unconsumed tasks.
+
+    Yields:
+        R: Task results in submission order.
+    """
+    pending: deque[Future[R]] = deque()
+    try:
+        for task in tasks:
+            pending.append(executor.submit(fn, task))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+# --- Worker Processes ---
+
+_worker_profiler: cProfile.Profile | None = None
+_worker_profile_path: Path | None = None
+
+
+def init_worker(
+    rules: CompiledRules,
+    metrics_enabled: bool,
+    profile_dir: str | None = None,
+) -> None:
+    """Prepare a worker process to generate characters like its parent.
+
+    Args:
+        rules (CompiledRules): Rules active in the parent process.
+        metrics_enabled (bool): Whether the parent records stage metrics.
+        profile_dir (str | None): Directory for per-worker cProfile output,
+            or ``None`` to disable profiling.
+    """
+    global _worker_profiler, _worker_profile_path
+    activate_rules(rules)
+    if metrics_enabled:
+        METRICS.enable()
+    if profile_dir is not None:
+        _worker_profiler = cProfile.Profile()
+        _worker_profile_path = Path(profile_dir) / f"worker-{os.getpid()}.prof"
+
+
+def worker_call[R](
+    task: tuple[Callable[..., R], tuple[Any, ...]],
+) -> tuple[R, dict[str, StageSnapshot] | None]:
+    """Run one task in a worker process with profiling and metrics capture.
+
+    Args:
+        task (tuple[Callable[..., R], tuple[Any, ...]]): Picklable function
+            and its positional arguments.
+
+    Returns:
+        tuple[R, dict[str, StageSnapshot] | None]: The function result and
+            the stage metrics recorded while running it, if enabled.
+    """
+    fn, args = task
+    profiler = _worker_profiler
+    if profiler is not None:
+        profiler.enable()
+    try:
+        result = fn(*args)
+    finally:
+        if profiler is not None and _worker_profile_path is not None:
+            profiler.disable()
+            profiler.dump_stats(_worker_profile_path)
+    snapshot = None
+    if METRICS.enabled:
+        snapshot = METRICS.snapshot()
+        METRICS.reset()
+    return result, snapshot
+
+
+def pool_map[R](
+    fn: Callable[..., R],
+    task_args: Iterable[tuple[Any, ...]],
+    workers: int,
+    profile_dir: str | Path | None = None,
+) -> Generator[R]:
+    """Run tasks in a process pool prepared like the current process.
+
+    Workers get the active rules and metrics setting, and optionally profile
+    themselves into ``profile_dir``. Worker stage metrics are merged into
+    this process's registry.
+
+    Args:
+        fn (Callable[..., R]): Picklable module-level task function.
+        task_args (Iterable[tuple[Any, ...]]): Positional arguments per task.
+        workers (int): Number of worker processes.
+        profile_dir (str | Path | None): Directory for per-worker cProfile
+            output, or ``None``.
+
+    Yields:
+        R: Task results in submission order.
+    """
+    tasks = ((fn, args) for args in task_args)
+    mp_context = None
+    if profile_dir is not None:
+        # A forked worker inherits the parent's active profiler, which blocks
+        # starting its own; start workers from a clean interpreter instead.
+        methods = multiprocessing.get_all_start_methods()
+        mp_context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in methods else "spawn"
+        )
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=init_worker,
+        initargs=(
+            active_rules(),
+            METRICS.enabled,
+            None if profile_dir is None else str(profile_dir),
+        ),
+    ) as executor:
+        for result, snapshot in ordered_map(executor, worker_call, tasks, workers * 2):
+            if snapshot:
+                METRICS.merge(snapshot)
+            yield result
+
+
+def interpreter_map[R](
+    fn: Callable[..., R],
+    task_args: Iterable[tuple[Any, ...]],
+    workers: int,
+) -> Iterator[R]:
+    """Run tasks in a pool of subinterpreters prepared like this interpreter.
+
+    Each subinterpreter gets the active rules and metrics setting, like a
+    worker process, without the cost of starting a process. Task functions,
+    arguments and results cross interpreters by pickling, so tasks should
+    return compact values such as packed bytes.
+
+    Args:
+        fn (Callable[..., R]): Picklable module-level task function.
+        task_args (Iterable[tuple[Any, ...]]): Positional arguments per task.
+        workers (int): Number of subinterpreters.
+
+    Yields:
+        R: Task results in submission order.
+
+    Raises:
+        RuntimeError: If this Python build has no ``InterpreterPoolExecutor``.
+    """
+    try:
+        from concurrent.futures import InterpreterPoolExecutor
+    except ImportError as exc:
+        raise RuntimeError("The interpreter backend needs Python 3.14 or newer.") from exc
+
+    tasks = ((fn, args) for args in task_args)
+    with InterpreterPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(active_rules(), METRICS.enabled, None),
+    ) as executor:
+        for result, snapshot in ordered_map(executor, worker_call, tasks, workers * 2):
+            if snapshot:
+                METRICS.merge(snapshot)
+            yield result
+
+
+# --- Worker Threads ---
+
+def _thread_call[R](task: tuple[Callable[..., R], tuple[Any, ...]]) -> R:
+    fn, args = task
+    return fn(*args)
+
+
+def thread_map[R](
+    fn: Callable[..., R],
+    task_args: Iterable[tuple[Any, ...]],
+    workers: int,
+) -> Iterator[R]:
+    """Run tasks in a thread pool that shares this process's rules.
+
+    The active rules are pinned while the pool runs, so the shared rules
+    tables are only ever read by the worker threads. Each task must build
+    its own dice rollers; stage metrics are recorded directly into the
+    process-wide registry.
+
+    Args:
+        fn (Callable[..., R]): Task function.
+        task_args (Iterable[tuple[Any, ...]]): Positional arguments per task.
+        workers (int): Number of worker threads.
+
+    Yields:
+        R: Task results in submission order.
+    """
+    tasks = ((fn, args) for args in task_args)
+    with pinned_rules(), ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from ordered_map(executor, _thread_call, tasks, workers * 2)
+
+
+def parallel_map[R](
+    fn: Callable[..., R],
+    task_args: Iterable[tuple[Any, ...]],
+    workers: int,
+    backend: Backend = "process",
+    profile_dir: str | Path | None = None,
+) -> Iterator[R]:
+    """Run tasks on the requested backend, yielding results in order.
+
+    Args:
+        fn (Callable[..., R]): Picklable module-level task function.
+        task_args (Iterable[tuple[Any, ...]]): Positional arguments per task.
+        workers (int): Number of worker processes or threads.
+        backend (Backend): ``"process"``, ``"thread"`` or ``"interpreter"``.
+        profile_dir (str | Path | None): Directory for per-worker cProfile
+            output. Only used by the process backend.
+
+    Yields:
+        R: Task results in submission order.
+
+    Raises:
+        ValueError: If ``backend`` is not a known backend.
+    """
+    if backend == "process":
+        yield from pool_map(fn, task_args, workers, profile_dir)
+    elif backend == "thread":
+        yield from thread_map(fn, task_args, workers)
+    elif backend == "interpreter":
+        yield from interpreter_map(fn, task_args, workers)
+    else:
+        raise ValueError(f"Unknown backend: '{backend}'")
+
+
+def iter_characters(
+    job: BulkJob,
+    count: int,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    profile_dir: str | Path | None = None,
+    backend: Backend = "process",
+    start: int = 0,
+) -> Iterator[Character]:
+    """Generate ``count`` characters for a bulk job, in index order.
+
+    With more than one worker, chunks of indices are generated in a process,
+    thread or subinterpreter pool. Subinterpreters return each chunk as packed
+    bytes rather than pickled characters. Stage metrics recorded by workers
+    are merged into the parent's registry.
+
+    Args:
+        job (BulkJob): Bulk job parameters.
+        count (int): Number of characters to generate.
+        workers (int): Number of workers; ``1`` generates inline.
+        chunk_size (int): Indices per worker task.
+        profile_dir (str | Path | None): Directory where each worker process
+            writes its cProfile stats, or ``None`` to disable worker profiling.
+        backend (Backend): ``"process"`` for a process pool, ``"thread"``
+            for a thread pool, which scales on free-threaded builds, or
+            ``"interpreter"`` for a subinterpreter pool.
+        start (int): First index to generate, for resuming an interrupted
+            run; earlier characters are skipped without being generated.
+
+    Yields:
+        Character: Characters ``start`` through ``count - 1``.
+    """
+    if workers <= 1:
+        for index in range(start, count):
+            yield generate_indexed_character(job, index)
+        return
+
+    task_args = (
+        (job, chunk_start, chunk_stop)
+        for chunk_start, chunk_stop in chunk_ranges(start, count, chunk_size)
+    )
+    if backend == "interpreter":
+        rules = active_rules()
+        for packed in interpreter_map(generate_packed_chunk, task_args, workers):
+            yield from unpack_characters(packed, rules)
+        return
+    for characters in parallel_map(generate_chunk, task_args, workers, backend, profile_dir):
+        yield from characters
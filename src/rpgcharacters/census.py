@@ -0,0 +1,393 @@
+"""
+Quota-driven generation of whole populations.
+
+A census gives an exact count for each race/class cell, for example 3,000
+human fighters and clerics, 900 dwarves and so on. Every character is built
+for its cell directly, with abilities drawn from the ability method's
+distribution (3d6 by default) conditioned on the race's limits and the
+class's prime requisite (see :mod:`rpgcharacters.sampling`). The output therefore matches the quotas
+exactly, and no rolls are discarded.
+
+Characters are numbered across the census in cell order (races, then
+classes, in rules-table order) and seeded from the census seed and that
+number, so the population is identical for any worker count or chunking.
+"""
+
+from __future__ import annotations
+
+import json
+import tomllib
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+from rpgcharacters.ability_methods import ABILITY_METHODS, DEFAULT_ABILITY_METHOD
+from rpgcharacters.bulk import (
+    DEFAULT_CHUNK_SIZE,
+    Backend,
+    create_indexed_roller,
+    interpreter_map,
+    parallel_map,
+)
+from rpgcharacters.character_generator import Character, generate_character
+from rpgcharacters.names import name_character
+from rpgcharacters.packing import pack_characters, unpack_characters
+from rpgcharacters.rules import CompiledRules, active_rules
+from rpgcharacters.sampling import is_feasible, roll_conditioned_abilities
+
+Quotas = Mapping[str, Mapping[str, int]]
+"""Character counts keyed by race, then class."""
+
+
+@dataclass(frozen=True, slots=True)
+class CensusCell:
+    """One race/class cell of a census, positioned in the global numbering.
+
+    Attributes:
+        race: Race name.
+        class_name: Class name.
+        start: Index of the cell's first character within the census.
+        count: Number of characters in the cell.
+    """
+
+    race: str
+    class_name: str
+    start: int
+    count: int
+
+
+# --- Quotas ---
+
+def validate_quotas(
+    quotas: Quotas,
+    rules: CompiledRules | None = None,
+    ability_method: str = DEFAULT_ABILITY_METHOD,
+) -> list[str]:
+    """Check that every quota names a real, achievable race/class cell.
+
+    Args:
+        quotas (Quotas): Counts keyed by race, then class.
+        rules (CompiledRules | None): Rules to check against; defaults to the
+            active rules.
+        ability_method (str): Name of the ability method the census rolls
+            with.
+
+    Returns:
+        list[str]: Validation messages. Empty when the quotas are valid.
+    """
+    rules = rules or active_rules()
+    errors: list[str] = []
+    if ability_method not in ABILITY_METHODS:
+        return [f"Unknown ability method: '{ability_method}'"]
+    for race, classes in quotas.items():
+        race_key = race.lower()
+        if race_key not in rules.race_names:
+            errors.append(f"Unknown race: '{race_key}'")
+            continue
+        for class_name, count in classes.items():
+            class_key = class_name.lower()
+            if class_key not in rules.class_names:
+                errors.append(f"Unknown class: '{class_key}'")
+                continue
+            if not isinstance(count, int) or isinstance(count, bool) or count < 0:
+                errors.append(
+                    f"Quota for {race_key}/{class_key} must be a non-negative integer."
+                )
+                continue
+            race_index = rules.race_index(race_key)
+            class_index = rules.class_index(class_key)
+            if count and not is_feasible(rules, race_index, class_index, ability_method):
+                errors.append(f"{race_key.title()} characters cannot be {class_key.title()}s.")
+    return errors
+
+
+def census_cells(
+    quotas: Quotas,
+    rules: CompiledRules | None = None,
+    ability_method: str = DEFAULT_ABILITY_METHOD,
+) -> list[CensusCell]:
+    """Lay out the non-empty cells of a census in generation order.
+
+    Args:
+        quotas (Quotas): Counts keyed by race, then class.
+        rules (CompiledRules | None): Rules to use; defaults to the active
+            rules.
+        ability_method (str): Name of the ability method the census rolls
+            with.
+
+    Returns:
+        list[CensusCell]: Cells ordered by race, then class, in rules-table
+            order.
+
+    Raises:
+        ValueError: If the quotas are invalid.
+    """
+    rules = rules or active_rules()
+    errors = validate_quotas(quotas, rules, ability_method)
+    if errors:
+        raise ValueError("; ".join(errors))
+    counts: dict[tuple[str, str], int] = {}
+    for race, classes in quotas.items():
+        for class_name, count in classes.items():
+            key = (race.lower(), class_name.lower())
+            counts[key] = counts.get(key, 0) + count
+
+    cells = []
+    start = 0
+    for race in rules.race_names:
+        for class_name in rules.class_names:
+            count = counts.get((race, class_name), 0)
+            if count:
+                cells.append(CensusCell(race, class_name, start, count))
+                start += count
+    return cells
+
+
+def parse_quota_cells(text: str) -> dict[str, dict[str, int]]:
+    """Parse ``race:class=count`` quotas separated by commas.
+
+    Args:
+        text (str): Quotas such as ``"human:fighter=1200,dwarf:fighter=600"``.
+
+    Returns:
+        dict[str, dict[str, int]]: Counts keyed by race, then class.
+
+    Raises:
+        ValueError: If an entry is malformed.
+    """
+    quotas: dict[str, dict[str, int]] = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        cell, sep, value = item.partition("=")
+        race, colon, class_name = cell.partition(":")
+        if not sep or not colon or not value.strip().isdigit():
+            raise ValueError(f"expected RACE:CLASS=COUNT, got '{item}'")
+        race_quotas = quotas.setdefault(race.strip().lower(), {})
+        key = class_name.strip().lower()
+        race_quotas[key] = race_quotas.get(key, 0) + int(value)
+    return quotas
+
+
+def load_quotas(path: str | Path) -> dict[str, dict[str, int]]:
+    """Load a quota matrix from a TOML or JSON file.
+
+    The document maps race names to tables of class counts, e.g.
+    ``[human]`` / ``fighter = 1200`` in TOML.
+
+    Args:
+        path (str | Path): File to read; ``.json`` selects JSON, anything
+            else TOML.
+
+    Returns:
+        dict[str, dict[str, int]]: Counts keyed by race, then class.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the document cannot be parsed, is not a matrix, or
+            has a count that is not a non-negative integer.
+    """
+    path = Path(path)
+    raw = path.read_bytes()
+    try:
+        if path.suffix.lower() == ".json":
+            data = json.loads(raw)
+        else:
+            data = tomllib.loads(raw.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Could not parse quotas: {exc}") from exc
+    if not isinstance(data, dict) or not all(isinstance(row, dict) for row in data.values()):
+        raise ValueError("Quotas must map each race to a table of class counts.")
+    errors = [
+        f"Quota for {race}/{class_name} must be a non-negative integer."
+        for race, classes in data.items()
+        for class_name, count in classes.items()
+        if not isinstance(count, int) or isinstance(count, bool) or count < 0
+    ]
+    if errors:
+        raise ValueError("; ".join(errors))
+    return data
+
+
+# --- Generation ---
+
+def generate_census_character(
+    seed: int,
+    index: int,
+    race: str,
+    class_name: str,
+    name: str | None = None,
+    ability_method: str = DEFAULT_ABILITY_METHOD,
+    random_names: bool = False,
+) -> Character:
+    """Generate character ``index`` of a census for its cell.
+
+    Args:
+        seed (int): Census seed.
+        index (int): Character index within the census.
+        race (str): Race of the character's cell.
+        class_name (str): Class of the character's cell.
+        name (str | None): Optional character name.
+        ability_method (str): Name of the ability method whose distribution
+            the scores follow.
+        random_names (bool): Whether an unnamed character gets a name drawn
+            for its race.
+
+    Returns:
+        Character: Character that qualifies for ``race`` and ``class_name``.
+    """
+    rng = create_indexed_roller(seed, index)
+    abilities = roll_conditioned_abilities(race, class_name, rng, method=ability_method)
+    character = generate_character(race, class_name, rng, name=name, abilities=abilities)
+    return name_character(character, rng) if random_names else character
+
+
+def generate_census_chunk(
+    seed: int,
+    race: str,
+    class_name: str,
+    start: int,
+    stop: int,
+    name: str | None = None,
+    ability_method: str = DEFAULT_ABILITY_METHOD,
+    random_names: bool = False,
+) -> list[Character]:
+    """Generate census characters ``start`` through ``stop - 1`` of one cell.
+
+    Args:
+        seed (int): Census seed.
+        race (str): Cell race.
+        class_name (str): Cell class.
+        start (int): First census index (inclusive).
+        stop (int): Last census index (exclusive).
+        name (str | None): Optional name for every character.
+        ability_method (str): Name of the ability method to roll with.
+        random_names (bool): Whether unnamed characters get generated names.
+
+    Returns:
+        list[Character]: Characters in index order.
+    """
+    return [
+        generate_census_character(
+            seed, index, race, class_name, name, ability_method, random_names
+        )
+        for index in range(start, stop)
+    ]
+
+
+def generate_packed_census_chunk(
+    seed: int,
+    race: str,
+    class_name: str,
+    start: int,
+    stop: int,
+    name: str | None = None,
+    ability_method: str = DEFAULT_ABILITY_METHOD,
+    random_names: bool = False,
+) -> bytes:
+    """Generate a chunk of one cell and pack it with the active rules.
+
+    Args:
+        seed (int): Census seed.
+        race (str): Cell race.
+        class_name (str): Cell class.
+        start (int): First census index (inclusive).
+        stop (int): Last census index (exclusive).
+        name (str | None): Optional name for every character.
+        ability_method (str): Name of the ability method to roll with.
+        random_names (bool): Whether unnamed characters get generated names.
+
+    Returns:
+        bytes: Characters encoded by :func:`~rpgcharacters.packing.pack_characters`.
+    """
+    characters = generate_census_chunk(
+        seed, race, class_name, start, stop, name, ability_method, random_names
+    )
+    return pack_characters(characters, active_rules())
+
+
+def census_tasks(
+    cells: list[CensusCell],
+    seed: int,
+    chunk_size: int,
+    name: str | None = None,
+    ability_method: str = DEFAULT_ABILITY_METHOD,
+    random_names: bool = False,
+) -> Iterator[tuple[int, str, str, int, int, str | None, str, bool]]:
+    """Split census cells into chunk tasks, never mixing two cells in one task.
+
+    Args:
+        cells (list[CensusCell]): Cells from :func:`census_cells`.
+        seed (int): Census seed.
+        chunk_size (int): Maximum characters per task.
+        name (str | None): Optional name for every character.
+        ability_method (str): Name of the ability method to roll with.
+        random_names (bool): Whether unnamed characters get generated names.
+
+    Yields:
+        tuple[int, str, str, int, int, str | None, str, bool]: Arguments for
+            :func:`generate_census_chunk`.
+    """
+    for cell in cells:
+        stop = cell.start + cell.count
+        for start in range(cell.start, stop, chunk_size):
+            chunk_stop = min(start + chunk_size, stop)
+            yield (
+                seed,
+                cell.race,
+                cell.class_name,
+                start,
+                chunk_stop,
+                name,
+                ability_method,
+                random_names,
+            )
+
+
+def iter_census(
+    quotas: Quotas,
+    seed: int,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    name: str | None = None,
+    profile_dir: str | Path | None = None,
+    backend: Backend = "process",
+    ability_method: str = DEFAULT_ABILITY_METHOD,
+    random_names: bool = False,
+) -> Iterator[Character]:
+    """Stream a population that matches the quotas exactly.
+
+    Cells are split into chunks and generated in parallel; results stream
+    back in census order, grouped by cell.
+
+    Args:
+        quotas (Quotas): Counts keyed by race, then class.
+        seed (int): Census seed.
+        workers (int): Number of workers; ``1`` generates inline.
+        chunk_size (int): Characters per worker task.
+        name (str | None): Optional name for every character.
+        profile_dir (str | Path | None): Directory for per-worker cProfile
+            output, or ``None``.
+        backend (Backend): ``"process"``, ``"thread"`` or ``"interpreter"``.
+        ability_method (str): Name of the ability method whose distribution
+            the scores follow.
+        random_names (bool): Whether unnamed characters get names drawn for
+            their race.
+
+    Yields:
+        Character: Every character of the census.
+
+    Raises:
+        ValueError: If the quotas are invalid.
+    """
+    cells = census_cells(quotas, ability_method=ability_method)
+    tasks = census_tasks(cells, seed, chunk_size, name, ability_method, random_names)
+    if workers <= 1:
+        for task in tasks:
+            yield from generate_census_chunk(*task)
+        return
+    if backend == "interpreter":
+        rules = active_rules()
+        for packed in interpreter_map(generate_packed_census_chunk, tasks, workers):
+            yield from unpack_characters(packed, rules)
+        return
+    for characters in parallel_map(generate_census_chunk, tasks, workers, backend, profile_dir):
+        yield from characters
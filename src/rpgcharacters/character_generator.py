@@ -6,14 +6,18 @@ ability rolls, race and class validation, hit points, armor class, saving
 throws, and starting money.
 """
 
+from collections.abc import Mapping
 from dataclasses import dataclass, fields
 from typing import Any, cast
 
 from diceroller.core import DiceRoller
 
+from rpgcharacters.ability_methods import DEFAULT_ABILITY_METHOD, get_ability_method
 from rpgcharacters.classes import CLASSES, ClassName
 from rpgcharacters.equipment import ARMOR, ArmorName
+from rpgcharacters.metrics import stage
 from rpgcharacters.races import RACES, RaceName
+from rpgcharacters.weighting import selector_for
 
 # --- Constants ---
 
@@ -131,19 +135,25 @@ def ability_modifier(score: int) -> int:
             return mod
     raise ValueError("Ability score must be between 3 and 18.")
 
-def roll_abilities(rng: DiceRoller) -> AbilityScores:
-    """Roll ability scores using Basic Fantasy's 3d6 method.
+def roll_abilities(rng: DiceRoller, method: str = DEFAULT_ABILITY_METHOD) -> AbilityScores:
+    """Roll ability scores using a registered ability method.
 
-    Rolls one ``3d6`` result for each ability in ``ABILITY_ROLL_ORDER``.
+    The default method rolls one ``3d6`` result for each ability in
+    ``ABILITY_ROLL_ORDER``, as Basic Fantasy does.
 
     Args:
         rng (DiceRoller): Dice roller used to generate each score.
+        method (str): Name of an ability method from
+            :mod:`rpgcharacters.ability_methods`.
 
     Returns:
         AbilityScores: Rolled scores for all six abilities.
+
+    Raises:
+        ValueError: If the method is unknown.
     """
-    rolled = {name: rng.roll(ABILITY_ROLL) for name in ABILITY_ROLL_ORDER}
-    return AbilityScores(**rolled)
+    rolled = get_ability_method(method).roll(rng)
+    return AbilityScores(**dict(zip(ABILITY_ROLL_ORDER, rolled, strict=True)))
 
 def calculate_ability_modifiers(abilities: AbilityScores) -> dict[str, int]:
     """Calculate modifiers for each ability score.
@@ -412,7 +422,8 @@ def generate_character(
     class_name: str,
     rng: DiceRoller,
     name: str | None = None,
-    abilities: AbilityScores | None = None
+    abilities: AbilityScores | None = None,
+    ability_method: str = DEFAULT_ABILITY_METHOD,
 ) -> Character:
     """Generate a complete level-1 character from race, class, and dice rolls.
 
@@ -426,7 +437,9 @@ def generate_character(
         rng (DiceRoller): Dice roller used for all random generation.
         name (str | None): Optional character name.
         abilities (AbilityScores | None): Optional pre-rolled ability scores.
-            If ``None``, abilities are rolled with ``3d6`` per ability.
+            If ``None``, abilities are rolled with ``ability_method``.
+        ability_method (str): Ability method used when ``abilities`` is
+            ``None``; ``3d6`` per ability by default.
 
     Returns:
         Character: Fully built level-1 character record.
@@ -435,41 +448,50 @@ def generate_character(
         ValueError: If race or class validation returns any messages.
     """
     # 1. Roll abilities
-    # abilities = roll_abilities(rng)
-    abilities = abilities if abilities is not None else roll_abilities(rng)
+    if abilities is None:
+        with stage("generate.roll_abilities"):
+            abilities = roll_abilities(rng, ability_method)
 
     # 2. Validate race
-    race_errors = validate_race(abilities, race)
+    with stage("generate.validate_race"):
+        race_errors = validate_race(abilities, race)
     if race_errors:
         raise ValueError("; ".join(race_errors))
 
     # 3. Validate class
-    class_errors = validate_class(abilities, race, class_name)
+    with stage("generate.validate_class"):
+        class_errors = validate_class(abilities, race, class_name)
     if class_errors:
         raise ValueError("; ".join(class_errors))
 
     # 4. Ability modifiers
-    ability_mods = calculate_ability_modifiers(abilities)
+    with stage("generate.ability_mods"):
+        ability_mods = calculate_ability_modifiers(abilities)
 
     # 5. Hit points
-    hp = roll_hit_points(
-        class_name,
-        race,
-        ability_mods["CON"],
-        rng
-    )
+    with stage("generate.hit_points"):
+        hp = roll_hit_points(
+            class_name,
+            race,
+            ability_mods["CON"],
+            rng
+        )
 
     # 6. Armor class (no armor at creation)
-    ac = calculate_armor_class(ability_mods["DEX"])
+    with stage("generate.armor_class"):
+        ac = calculate_armor_class(ability_mods["DEX"])
 
     # 7. Attack bonus
-    attack_bonus = level_one_attack_bonus()
+    with stage("generate.attack_bonus"):
+        attack_bonus = level_one_attack_bonus()
 
     # 8. Saving throws
-    saving_throws = calculate_saving_throws(class_name, race)
+    with stage("generate.saving_throws"):
+        saving_throws = calculate_saving_throws(class_name, race)
 
     # 9. Starting money
-    money = starting_money(rng)
+    with stage("generate.starting_money"):
+        money = starting_money(rng)
 
     # 10. Return Character
     return Character(
@@ -486,3 +508,135 @@ def generate_character(
         race=race.lower(),
         saving_throws=saving_throws,
     )
+
+
+def pick_weighted(
+    valid: list[str],
+    names: list[str],
+    rng: DiceRoller,
+    weights: Mapping[str, float] | None = None,
+) -> str:
+    """Pick one of ``valid`` uniformly, or in proportion to ``weights``.
+
+    Without weights, candidates are sorted by name and indexed with a single
+    ``randint`` draw, matching the CLI's non-interactive auto-selection. With
+    weights, the pick comes from a cached alias table for this set of
+    candidates.
+
+    Args:
+        valid (list[str]): Eligible names.
+        names (list[str]): Every name in the table ``valid`` comes from.
+        rng (DiceRoller): Dice roller whose generator makes the pick.
+        weights (Mapping[str, float] | None): Relative weight per name;
+            unlisted names get weight ``1``.
+
+    Returns:
+        str: Selected name.
+
+    Raises:
+        ValueError: If ``weights`` is invalid or gives every candidate
+            weight ``0``.
+    """
+    if weights is None:
+        ordered = sorted(valid)
+        pick: int = rng.rng.randint(0, len(ordered) - 1)
+        return ordered[pick]
+    return selector_for(names, weights).select(valid, rng)
+
+
+def auto_select_race(
+    abilities: AbilityScores,
+    rng: DiceRoller,
+    weights: Mapping[str, float] | None = None,
+) -> str:
+    """Pick a race from the races the ability scores allow.
+
+    Args:
+        abilities (AbilityScores): Rolled ability scores.
+        rng (DiceRoller): Dice roller whose generator makes the pick.
+        weights (Mapping[str, float] | None): Relative weight per race, or
+            ``None`` for a uniform pick.
+
+    Returns:
+        str: Selected race name.
+
+    Raises:
+        ValueError: If no race accepts the ability scores.
+    """
+    valid = valid_races_for_abilities(abilities)
+    if not valid:
+        raise ValueError("No valid races available for these ability scores.")
+    return pick_weighted(valid, list(RACES), rng, weights)
+
+
+def auto_select_class(
+    abilities: AbilityScores,
+    race: str,
+    rng: DiceRoller,
+    weights: Mapping[str, float] | None = None,
+) -> str:
+    """Pick a class from the classes valid for a race and scores.
+
+    Args:
+        abilities (AbilityScores): Rolled ability scores.
+        race (str): Race the class must be compatible with.
+        rng (DiceRoller): Dice roller whose generator makes the pick.
+        weights (Mapping[str, float] | None): Relative weight per class, or
+            ``None`` for a uniform pick.
+
+    Returns:
+        str: Selected class name.
+
+    Raises:
+        ValueError: If no class is valid for the race and scores.
+    """
+    valid = valid_classes_for_race(abilities, race)
+    if not valid:
+        raise ValueError("No valid classes available for this race.")
+    return pick_weighted(valid, list(CLASSES), rng, weights)
+
+
+def generate_random_character(
+    rng: DiceRoller,
+    race: str | None = None,
+    class_name: str | None = None,
+    name: str | None = None,
+    race_weights: Mapping[str, float] | None = None,
+    class_weights: Mapping[str, float] | None = None,
+    ability_method: str = DEFAULT_ABILITY_METHOD,
+) -> Character:
+    """Roll abilities, auto-select any unspecified race or class, and build.
+
+    The draw order (six ability rolls, race pick, class pick, hit die, money)
+    matches the CLI's non-interactive mode, so the same seeded generator
+    produces the same character.
+
+    Args:
+        rng (DiceRoller): Dice roller used for all random generation.
+        race (str | None): Race to use, or ``None`` to pick one at random.
+        class_name (str | None): Class to use, or ``None`` to pick one at
+            random.
+        name (str | None): Optional character name.
+        race_weights (Mapping[str, float] | None): Relative weights for the
+            race pick, or ``None`` for a uniform pick.
+        class_weights (Mapping[str, float] | None): Relative weights for the
+            class pick, or ``None`` for a uniform pick.
+        ability_method (str): Name of the ability method to roll with.
+
+    Returns:
+        Character: Fully built level-1 character record.
+
+    Raises:
+        ValueError: If the rolled abilities allow no (or not the requested)
+            race or class, or the ability method is unknown.
+    """
+    abilities = roll_abilities(rng, ability_method)
+    if race is None:
+        race = auto_select_race(abilities, rng, race_weights)
+    else:
+        race_errors = validate_race(abilities, race)
+        if race_errors:
+            raise ValueError("; ".join(race_errors))
+    if class_name is None:
+        class_name = auto_select_class(abilities, race, rng, class_weights)
+    return generate_character(race, class_name, rng, name=name, abilities=abilities)
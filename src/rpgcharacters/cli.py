@@ -1,22 +1,94 @@
 import argparse
+import cProfile
 import json
+import multiprocessing
+import os
 import sys
+import tempfile
+from collections.abc import Iterator
 from importlib.metadata import PackageNotFoundError, version
+from multiprocessing import AuthenticationError
+from pathlib import Path
+from typing import TextIO
 
 from diceroller.core import CustomRandom, DiceRoller
 
+from rpgcharacters.ability_methods import ABILITY_METHODS, DEFAULT_ABILITY_METHOD
+from rpgcharacters.archive_index import (
+    INDEX_NAME,
+    Condition,
+    iter_matching_records,
+    parse_condition,
+    record_ids,
+    update_index,
+)
+from rpgcharacters.bulk import (
+    BACKENDS,
+    BulkJob,
+    derive_seed,
+    iter_characters,
+    new_seed,
+    validate_job,
+)
+from rpgcharacters.census import iter_census, load_quotas, parse_quota_cells
 from rpgcharacters.character_generator import (
     ABILITY_ROLL_ORDER,
     AbilityScores,
     Character,
     calculate_ability_modifiers,
     generate_character,
+    pick_weighted,
     roll_abilities,
-    valid_classes_for_race,
-    valid_races_for_abilities,
-    validate_class,
-    validate_race,
 )
+from rpgcharacters.cluster import (
+    AUTHKEY_ENV,
+    DEFAULT_CLUSTER_CHUNK_SIZE,
+    DEFAULT_LEASE_TIMEOUT,
+    DEFAULT_PORT,
+    Coordinator,
+    parse_address,
+    run_worker,
+)
+from rpgcharacters.fastpath import verify_fast_path
+from rpgcharacters.fingerprint import (
+    DEFAULT_BLOOM_CAPACITY,
+    DEFAULT_ERROR_RATE,
+    DEFAULT_MAX_EXACT,
+    Deduplicator,
+    fingerprint_record,
+)
+from rpgcharacters.jobs import DEFAULT_CHECKPOINT_EVERY, resume_job, run_job
+from rpgcharacters.memo import (
+    cached_valid_classes,
+    cached_valid_races,
+    cached_validate_class,
+    cached_validate_race,
+)
+from rpgcharacters.metrics import enable_metrics, stage, write_metrics
+from rpgcharacters.names import DEFAULT_NAME_ORDER, generate_names, name_character
+from rpgcharacters.party import PartySpec, iter_parties
+from rpgcharacters.profiling import write_profile
+from rpgcharacters.rederive import diff_rules, rederive_archive
+from rpgcharacters.result_cache import DEFAULT_MAX_BYTES, ResultCache, result_key
+from rpgcharacters.rules import BUILTIN_RULES, activate_rules, active_rules, load_rules_pack
+from rpgcharacters.serve import serve
+from rpgcharacters.shards import (
+    COMPRESSIONS,
+    DEFAULT_SHARD_RECORDS,
+    ShardSpec,
+    ShardWriter,
+    remove_shards,
+)
+from rpgcharacters.sheets import TextBuffer, render_sheet
+from rpgcharacters.teams import (
+    DEFAULT_MAX_ITERATIONS,
+    DEFAULT_STRENGTH_WEIGHTS,
+    STAT_NAMES,
+    StatTable,
+    partition_scores,
+    strength_scores,
+)
+from rpgcharacters.weighting import parse_weights
 
 
 class RestartFlow(Exception):
@@ -32,6 +104,7 @@ def create_dice_roller(seed: int | None) -> DiceRoller:
 
 
 INVALID_SELECTION_MESSAGE = "Invalid selection. Please try again."
+NAMES_PER_WRITE = 65_536
 
 
 def print_header() -> None:
@@ -45,10 +118,11 @@ def format_modifier(value: int) -> str:
     return f"{value:+d}"
 
 
-def run_ability_phase(rng: DiceRoller) -> AbilityScores:
+def run_ability_phase(rng: DiceRoller, method: str = DEFAULT_ABILITY_METHOD) -> AbilityScores:
     while True:
         print("Rolling abilities...")
-        abilities = roll_abilities(rng)
+        with stage("cli.reroll"):
+            abilities = roll_abilities(rng, method)
         modifiers = calculate_ability_modifiers(abilities)
 
         for ability in ABILITY_ROLL_ORDER:
@@ -74,7 +148,7 @@ def select_from_list(items: list[str], prompt: str) -> str:
 
 
 def select_race(abilities: AbilityScores) -> str:
-    races = valid_races_for_abilities(abilities)
+    races = cached_valid_races(abilities)
     if not races:
         print("No valid races available for these ability scores.")
         print("Re-rolling abilities...")
@@ -90,7 +164,7 @@ def select_race(abilities: AbilityScores) -> str:
 
 
 def select_class(abilities: AbilityScores, race: str) -> str:
-    classes = valid_classes_for_race(abilities, race)
+    classes = cached_valid_classes(abilities, race)
     if not classes:
         print("No valid classes available for this race.")
         print("Returning to ability roll.")
@@ -110,52 +184,8 @@ def prompt_name() -> str | None:
     return name or None
 
 
-def print_core_stats(character: Character) -> None:
-    print(f"HP: {character.hp}")
-    print(f"AC: {character.ac}")
-    print(f"Attack Bonus: {character.attack_bonus:+d}")
-    print(f"Money: {character.money_gp} gp")
-    print()
-
-
-def print_abilities(character: Character) -> None:
-    print("Abilities:")
-    for ability in ABILITY_ROLL_ORDER:
-        score = getattr(character.abilities, ability)
-        mod = character.ability_mods[ability]
-        print(f"{ability}: {score:2d} ({format_modifier(mod)})")
-    print()
-
-
-def format_saving_throw_name(name: str) -> str:
-    words = name.replace("_", " ").split()
-    return " ".join(word.title() if word.lower() != "or" else "or" for word in words)
-
-
-def print_saving_throws(character: Character) -> None:
-    print("Saving Throws:")
-    for saving_throw in sorted(character.saving_throws):
-        display = format_saving_throw_name(saving_throw)
-        value = character.saving_throws[saving_throw]
-        print(f"  {display}: {value:2d}")
-    print()
-
-
 def print_character_summary(character: Character) -> None:
-    race_title = character.race.title()
-    class_title = character.class_name.title()
-    header_name = (
-        f" {character.name} the {race_title} {class_title} (Level {character.level})"
-        if character.name
-        else f" {race_title} {class_title} (Level {character.level})"
-    )
-    print("========================================")
-    print(header_name)
-    print("========================================")
-    print()
-    print_core_stats(character)
-    print_abilities(character)
-    print_saving_throws(character)
+    print(render_sheet(character), end="")
 
 
 def prompt_yes_no(prompt: str) -> bool:
@@ -211,6 +241,12 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Print character JSON to stdout.",
     )
+    parser.add_argument(
+        "--format",
+        choices=("json", "text"),
+        default="json",
+        help="Write characters as JSON or as text sheets (default json).",
+    )
     parser.add_argument(
         "--output",
         help="Write character JSON to FILE (non-interactive mode only).",
@@ -220,19 +256,580 @@ def parse_args() -> argparse.Namespace:
         type=int,
         help="Use deterministic seed for random generation.",
     )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=1,
+        help="Generate COUNT characters as JSON lines (non-interactive mode only).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Workers used when generating more than one character.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="process",
+        help="Run workers as processes, threads (which scale on free-threaded "
+        "Python builds) or subinterpreters.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Profile the run (including worker processes) into a pstats file at PATH "
+        "and collapsed stacks at PATH.collapsed (non-interactive mode and the process "
+        "backend only).",
+    )
+    parser.add_argument(
+        "--race-weights",
+        type=weight_profile,
+        metavar="NAME=WEIGHT,...",
+        help="Weight auto-selected races, e.g. human=60,dwarf=15,elf=15,halfling=10 "
+        "(unlisted races weigh 1).",
+    )
+    parser.add_argument(
+        "--class-weights",
+        type=weight_profile,
+        metavar="NAME=WEIGHT,...",
+        help="Weight auto-selected classes (unlisted classes weigh 1).",
+    )
+    parser.add_argument(
+        "--ability-method",
+        choices=tuple(ABILITY_METHODS),
+        default=DEFAULT_ABILITY_METHOD,
+        help="How ability scores are generated: "
+        + "; ".join(f"{method.name}: {method.description}" for method in ABILITY_METHODS.values())
+        + f" (default {DEFAULT_ABILITY_METHOD}).",
+    )
+    parser.add_argument(
+        "--random-names",
+        action="store_true",
+        help="Give characters without --name a name drawn for their race.",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Generate --count output with the seed-compatible fast path "
+        "(same characters; see verify-fast).",
+    )
+    parser.add_argument(
+        "--shard-dir",
+        metavar="DIR",
+        help="Write --count output as rotated shard files plus a manifest in DIR.",
+    )
+    parser.add_argument(
+        "--shard-records",
+        type=int,
+        default=DEFAULT_SHARD_RECORDS,
+        metavar="N",
+        help="Start a new shard after N characters.",
+    )
+    parser.add_argument(
+        "--shard-mb",
+        type=int,
+        metavar="MB",
+        help="Start a new shard after MB megabytes of uncompressed output.",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=COMPRESSIONS,
+        default="none",
+        help="Compress shards on background threads.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="PATH",
+        help="Run --count generation into --output or --shard-dir as a resumable "
+        "job, recording progress in PATH.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the interrupted job recorded in --checkpoint.",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=DEFAULT_CHECKPOINT_EVERY,
+        metavar="N",
+        help="Characters written between checkpoints.",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse output of earlier runs with the same --seed and options "
+        "(non-interactive mode only).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="PATH",
+        help="Directory for cached output (default: $XDG_CACHE_HOME/rpgcharacters/results).",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        metavar="MB",
+        help="Evict least recently used cached output beyond this size.",
+    )
+    parser.add_argument(
+        "--rules",
+        metavar="PATH",
+        help="Load race/class/armor rules from a TOML or JSON rules pack.",
+    )
+    parser.add_argument(
+        "--metrics-out",
+        metavar="PATH",
+        help="Record per-stage timings and write them to PATH (.json for JSON, "
+        "otherwise Prometheus text format).",
+    )
     parser.add_argument(
         "--non-interactive",
         action="store_true",
         help="Run in non-interactive mode.",
     )
+    parser.add_argument(
+        "--serve-stdio",
+        action="store_true",
+        help="Answer NDJSON generation requests from stdin on stdout until stdin closes.",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
         help="Print detailed execution steps (non-interactive mode only).",
     )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    party_parser = subparsers.add_parser(
+        "party",
+        help="Generate parties that satisfy class/race constraints.",
+        description="Generate parties that satisfy class/race constraints.",
+    )
+    party_parser.add_argument("--size", type=int, required=True, help="Members per party.")
+    party_parser.add_argument(
+        "--min-classes",
+        type=parse_name_counts,
+        default={},
+        metavar="CLASS=N,...",
+        help="Minimum members per class, e.g. cleric=1,fighter=1.",
+    )
+    party_parser.add_argument(
+        "--max-classes",
+        type=parse_name_counts,
+        default={},
+        metavar="CLASS=N,...",
+        help="Maximum members per class, e.g. magic-user=1.",
+    )
+    party_parser.add_argument(
+        "--min-races",
+        type=parse_name_counts,
+        default={},
+        metavar="RACE=N,...",
+        help="Minimum members per race.",
+    )
+    party_parser.add_argument(
+        "--max-races",
+        type=parse_name_counts,
+        default={},
+        metavar="RACE=N,...",
+        help="Maximum members per race.",
+    )
+    party_parser.add_argument(
+        "--unique-races",
+        action="store_true",
+        help="Give every member a different race.",
+    )
+    party_parser.add_argument(
+        "--unique-classes",
+        action="store_true",
+        help="Give every member a different class.",
+    )
+    party_parser.add_argument(
+        "--count",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Number of parties to generate.",
+    )
+    party_parser.add_argument(
+        "--seed",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Use deterministic seed for random generation.",
+    )
+    party_parser.add_argument(
+        "--workers",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Workers used for generation.",
+    )
+    party_parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=argparse.SUPPRESS,
+        help="Run workers as processes, threads or subinterpreters.",
+    )
+    party_parser.add_argument(
+        "--output",
+        default=argparse.SUPPRESS,
+        help="Write parties as JSON lines to FILE instead of stdout.",
+    )
+
+    census_parser = subparsers.add_parser(
+        "census",
+        help="Generate a population with exact race/class counts.",
+        description="Generate a population with exact race/class counts.",
+    )
+    census_parser.add_argument(
+        "--cells",
+        type=quota_cells,
+        default={},
+        metavar="RACE:CLASS=N,...",
+        help="Characters per race/class cell, e.g. human:fighter=1200,dwarf:cleric=300.",
+    )
+    census_parser.add_argument(
+        "--quota-file",
+        metavar="PATH",
+        help="TOML or JSON file mapping each race to a table of class counts.",
+    )
+    census_parser.add_argument(
+        "--seed",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Use deterministic seed for random generation.",
+    )
+    census_parser.add_argument(
+        "--workers",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Workers used for generation.",
+    )
+    census_parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=argparse.SUPPRESS,
+        help="Run workers as processes, threads or subinterpreters.",
+    )
+    census_parser.add_argument(
+        "--output",
+        default=argparse.SUPPRESS,
+        help="Write characters as JSON lines to FILE instead of stdout.",
+    )
+
+    query_parser = subparsers.add_parser(
+        "query",
+        help="Find characters in a --shard-dir archive using its bitmap index.",
+        description="Find characters in a --shard-dir archive using its bitmap index. "
+        "The index is created or extended as needed.",
+    )
+    query_parser.add_argument("directory", help="Shard directory to search.")
+    query_parser.add_argument(
+        "--where",
+        type=query_condition,
+        action="append",
+        default=[],
+        metavar="COND",
+        help="Condition such as race=halfling, class=thief|fighter, DEX>=16, "
+        "CON_mod>=0 or spells<=14; repeat to require several.",
+    )
+    query_parser.add_argument(
+        "--count-only", action="store_true", help="Print the number of matches only."
+    )
+    query_parser.add_argument(
+        "--ids", action="store_true", help="Print matching record numbers instead of records."
+    )
+    query_parser.add_argument(
+        "--output",
+        default=argparse.SUPPRESS,
+        help="Write matches as JSON lines to FILE instead of stdout.",
+    )
+
+    dedup_parser = subparsers.add_parser(
+        "dedup",
+        help="Drop duplicate characters from JSON lines files.",
+        description="Drop duplicate characters from JSON lines files, keeping the "
+        "first occurrence. Characters are compared by fingerprint.",
+    )
+    dedup_parser.add_argument(
+        "inputs", nargs="+", metavar="FILE", help="JSON lines files; '-' reads stdin."
+    )
+    dedup_parser.add_argument(
+        "--include-name",
+        action="store_true",
+        help="Treat differently named characters as distinct.",
+    )
+    dedup_parser.add_argument(
+        "--include-inventory",
+        action="store_true",
+        help="Treat characters with different inventories as distinct.",
+    )
+    dedup_parser.add_argument(
+        "--max-exact",
+        type=int,
+        default=DEFAULT_MAX_EXACT,
+        metavar="N",
+        help="Distinct characters remembered exactly before switching to a Bloom filter.",
+    )
+    dedup_parser.add_argument(
+        "--expected",
+        type=int,
+        default=DEFAULT_BLOOM_CAPACITY,
+        metavar="N",
+        help="Expected number of distinct characters, used to size the Bloom filter.",
+    )
+    dedup_parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=DEFAULT_ERROR_RATE,
+        metavar="P",
+        help="Bloom filter false positive rate.",
+    )
+    dedup_parser.add_argument(
+        "--output",
+        default=argparse.SUPPRESS,
+        help="Write unique characters to FILE instead of stdout.",
+    )
+
+    teams_parser = subparsers.add_parser(
+        "teams",
+        help="Split characters from JSON lines files into balanced teams.",
+        description="Split characters from JSON lines files into teams of near-equal "
+        "total strength and write each record with a 'team' field added.",
+    )
+    teams_parser.add_argument(
+        "inputs", nargs="+", metavar="FILE", help="JSON lines files; '-' reads stdin."
+    )
+    teams_parser.add_argument(
+        "--teams", type=int, required=True, metavar="N", help="Number of teams."
+    )
+    teams_parser.add_argument(
+        "--strength",
+        type=weight_profile,
+        default=dict(DEFAULT_STRENGTH_WEIGHTS),
+        metavar="STAT=WEIGHT,...",
+        help="Strength as a weighted sum of stats, e.g. hp=1,ac=2,attack_bonus=3,str_mod=1 "
+        f"(stats: {', '.join(STAT_NAMES)}; default weight 1 each).",
+    )
+    teams_parser.add_argument(
+        "--max-iterations",
+        type=int,
+        default=DEFAULT_MAX_ITERATIONS,
+        metavar="N",
+        help="Maximum moves and swaps when rebalancing.",
+    )
+    teams_parser.add_argument(
+        "--output",
+        default=argparse.SUPPRESS,
+        help="Write records to FILE instead of stdout.",
+    )
+
+    coordinate_parser = subparsers.add_parser(
+        "coordinate",
+        help="Serve a seeded bulk job to 'work' processes on other hosts.",
+        description="Serve a seeded bulk job to 'work' processes, possibly on other "
+        "hosts, and write the characters in order as they come back. Uses the "
+        "top-level --race, --class, --name and weight options.",
+    )
+    coordinate_parser.add_argument(
+        "--count",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Number of characters to generate.",
+    )
+    coordinate_parser.add_argument(
+        "--seed",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Use deterministic seed for random generation.",
+    )
+    coordinate_parser.add_argument(
+        "--listen",
+        type=cluster_address,
+        default=("127.0.0.1", DEFAULT_PORT),
+        metavar="HOST:PORT",
+        help=f"Address to accept workers on (default 127.0.0.1:{DEFAULT_PORT}).",
+    )
+    coordinate_parser.add_argument(
+        "--authkey",
+        default=os.environ.get(AUTHKEY_ENV),
+        help=f"Shared secret workers must present (default ${AUTHKEY_ENV}).",
+    )
+    coordinate_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CLUSTER_CHUNK_SIZE,
+        metavar="N",
+        help="Characters per chunk handed to a worker.",
+    )
+    coordinate_parser.add_argument(
+        "--lease-timeout",
+        type=float,
+        default=DEFAULT_LEASE_TIMEOUT,
+        metavar="SECONDS",
+        help="Hand a chunk to another worker if it is not returned in time.",
+    )
+    coordinate_parser.add_argument(
+        "--output",
+        default=argparse.SUPPRESS,
+        help="Write characters as JSON lines to FILE instead of stdout.",
+    )
+
+    work_parser = subparsers.add_parser(
+        "work",
+        help="Generate characters for a 'coordinate' process.",
+        description="Generate characters for a 'coordinate' process until its job "
+        "is finished.",
+    )
+    work_parser.add_argument(
+        "--connect",
+        type=cluster_address,
+        default=("127.0.0.1", DEFAULT_PORT),
+        metavar="HOST:PORT",
+        help=f"Coordinator address (default 127.0.0.1:{DEFAULT_PORT}).",
+    )
+    work_parser.add_argument(
+        "--authkey",
+        default=os.environ.get(AUTHKEY_ENV),
+        help=f"Shared secret of the coordinator (default ${AUTHKEY_ENV}).",
+    )
+    work_parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes to run on this host.",
+    )
+
+    names_parser = subparsers.add_parser(
+        "names",
+        help="Generate names for a race.",
+        description="Generate names for a race from its bundled word list, one per line.",
+    )
+    names_parser.add_argument(
+        "names_race", metavar="RACE", help="Race whose names to imitate."
+    )
+    names_parser.add_argument(
+        "--count",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Number of names to generate.",
+    )
+    names_parser.add_argument(
+        "--seed",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Use deterministic seed for random generation.",
+    )
+    names_parser.add_argument(
+        "--unique", action="store_true", help="Never repeat a name."
+    )
+    names_parser.add_argument(
+        "--order",
+        type=int,
+        default=DEFAULT_NAME_ORDER,
+        metavar="N",
+        help="Letters of context per choice; lower values give more distinct names.",
+    )
+    names_parser.add_argument(
+        "--output",
+        default=argparse.SUPPRESS,
+        help="Write names to FILE instead of stdout.",
+    )
+
+    rederive_parser = subparsers.add_parser(
+        "rederive",
+        help="Update stored characters after a rules change.",
+        description="Rewrite the saving throws and armor class of stored characters "
+        "whose race or class rules changed between --old and the active rules "
+        "(--rules, or the built-in rules). Other records and fields are left as they are.",
+    )
+    rederive_parser.add_argument(
+        "archive", metavar="PATH", help="Shard directory or JSON lines file to update."
+    )
+    rederive_parser.add_argument(
+        "--old",
+        metavar="PACK",
+        help="Rules pack the characters were generated with (default: built-in rules).",
+    )
+    rederive_parser.add_argument(
+        "--dry-run", action="store_true", help="List the rules changes without updating."
+    )
+    rederive_parser.add_argument(
+        "--allow-stale",
+        action="store_true",
+        help="Update what can be re-derived even when other changes, such as hit dice, "
+        "leave rolled fields out of date.",
+    )
+    rederive_parser.add_argument(
+        "--resume",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="Finish an interrupted update of a shard directory; shards are not "
+        "checked against their checksums.",
+    )
+
+    verify_fast_parser = subparsers.add_parser(
+        "verify-fast",
+        help="Check the fast path against the dice roller.",
+        description="Generate characters both with the dice roller and with the fast "
+        "path and report any index where they differ. Uses the top-level --race, "
+        "--class, --race-weights, --class-weights and --ability-method options.",
+    )
+    verify_fast_parser.add_argument(
+        "--count",
+        dest="check_count",
+        type=int,
+        default=10_000,
+        help="Number of indices to check.",
+    )
+    verify_fast_parser.add_argument(
+        "--seed",
+        type=int,
+        default=argparse.SUPPRESS,
+        help="Job seed whose indices are checked.",
+    )
     return parser.parse_args()
 
 
+def parse_name_counts(text: str) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, sep, value = item.partition("=")
+        if not sep or not value.strip().isdigit():
+            raise argparse.ArgumentTypeError(f"expected NAME=COUNT, got '{item}'")
+        counts[name.strip().lower()] = int(value)
+    return counts
+
+
+def quota_cells(text: str) -> dict[str, dict[str, int]]:
+    try:
+        return parse_quota_cells(text)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def query_condition(text: str) -> Condition:
+    try:
+        return parse_condition(text)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def cluster_address(text: str) -> tuple[str, int]:
+    try:
+        return parse_address(text)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def weight_profile(text: str) -> dict[str, float]:
+    try:
+        return parse_weights(text)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
 def should_use_noninteractive(args: argparse.Namespace) -> bool:
     return any(
         [
@@ -240,8 +837,18 @@ def should_use_noninteractive(args: argparse.Namespace) -> bool:
             args.race is not None,
             args.class_name is not None,
             args.json,
+            args.format != "json",
             args.output is not None,
             args.verbose,
+            args.count != 1,
+            args.profile is not None,
+            args.race_weights is not None,
+            args.class_weights is not None,
+            args.cache,
+            args.checkpoint is not None,
+            args.resume,
+            args.shard_dir is not None,
+            args.fast,
         ]
     )
 
@@ -250,7 +857,7 @@ def run_interactive(args: argparse.Namespace, rng: DiceRoller) -> None:
     while True:
         try:
             print_header()
-            abilities = run_ability_phase(rng)
+            abilities = run_ability_phase(rng, args.ability_method)
             race = select_race(abilities)
             class_name = select_class(abilities, race)
             name = prompt_name()
@@ -291,15 +898,22 @@ def exit_with_error(message: str, args: argparse.Namespace) -> None:
 def resolve_race(args: argparse.Namespace, abilities: AbilityScores, rng: DiceRoller) -> str:
     # TODO: implement a helper function to parse the class from args
     candidate: str | None = args.race.lower() if args.race else None
-    valid = sorted(valid_races_for_abilities(abilities))
+    with stage("cli.eligible_races"):
+        valid = sorted(cached_valid_races(abilities))
     if candidate:
-        errors = validate_race(abilities, candidate)
+        errors = cached_validate_race(abilities, candidate)
         if errors:
             exit_with_error("; ".join(errors), args)
         return candidate
     if not valid:
         exit_with_error("No valid races available for these ability scores.", args)
-    selection = valid[rng.rng.randint(0, len(valid)-1)]
+    with stage("cli.auto_select_race"):
+        try:
+            selection = pick_weighted(
+                valid, list(active_rules().race_names), rng, args.race_weights
+            )
+        except ValueError as exc:
+            exit_with_error(str(exc), args)
     verbose_print(f"Auto-selected race: {selection}", args)
     return selection
 
@@ -311,15 +925,22 @@ def resolve_class(
     rng: DiceRoller) -> str:
     # TODO: implement a helper function to parse the class from args
     candidate: str | None = args.class_name.lower() if args.class_name else None
-    valid = sorted(valid_classes_for_race(abilities, race))
+    with stage("cli.eligible_classes"):
+        valid = sorted(cached_valid_classes(abilities, race))
     if candidate:
-        errors = validate_class(abilities, race, candidate)
+        errors = cached_validate_class(abilities, race, candidate)
         if errors:
             exit_with_error("; ".join(errors), args)
         return candidate
     if not valid:
         exit_with_error("No valid classes available for this race.", args)
-    selection = valid[rng.rng.randint(0, len(valid)-1)]
+    with stage("cli.auto_select_class"):
+        try:
+            selection = pick_weighted(
+                valid, list(active_rules().class_names), rng, args.class_weights
+            )
+        except ValueError as exc:
+            exit_with_error(str(exc), args)
     verbose_print(f"Auto-selected class: {selection}", args)
     return selection
 
@@ -330,11 +951,162 @@ def format_verbose_abilities(abilities: AbilityScores) -> str:
     )
 
 
-def run_noninteractive(args: argparse.Namespace, rng: DiceRoller) -> None:
-    if args.verbose and args.seed is not None:
-        verbose_print(f"Using seed: {args.seed}", args)
+def open_result_cache(args: argparse.Namespace) -> tuple[ResultCache, str] | None:
+    # A hit replays only the output, so --verbose runs are never served from the cache.
+    if not args.cache or args.seed is None or args.profile or args.verbose:
+        return None
+    try:
+        cache = ResultCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+    except ValueError as exc:
+        exit_with_error(str(exc), args)
+    key = result_key(
+        {
+            "seed": args.seed,
+            "count": args.count,
+            "race": args.race.lower() if args.race else None,
+            "class": args.class_name.lower() if args.class_name else None,
+            "name": args.name,
+            "race_weights": args.race_weights,
+            "class_weights": args.class_weights,
+            "ability_method": args.ability_method,
+            "random_names": args.random_names,
+            "format": args.format,
+        }
+    )
+    return cache, key
+
+
+def cached_output(cached: tuple[ResultCache, str] | None) -> str | None:
+    if cached is None:
+        return None
+    cache, key = cached
+    data = cache.get(key)
+    return None if data is None else data.decode("utf-8")
+
+
+def run_bulk(args: argparse.Namespace, profile_dir: str | None = None) -> None:
+    seed = args.seed if args.seed is not None else new_seed()
+    job = BulkJob(
+        seed=seed,
+        race=args.race.lower() if args.race else None,
+        class_name=args.class_name.lower() if args.class_name else None,
+        name=args.name,
+        race_weights=args.race_weights,
+        class_weights=args.class_weights,
+        ability_method=args.ability_method,
+        random_names=args.random_names,
+        fast=args.fast,
+    )
+    errors = validate_job(job)
+    if errors:
+        exit_with_error("; ".join(errors), args)
+    if args.shard_dir:
+        write_shards(args, job, profile_dir)
+        return
+    cached = open_result_cache(args)
+    hit = cached_output(cached)
+    if hit is None:
+        verbose_print(
+            f"Generating {args.count} characters with seed {seed} on {args.workers} "
+            f"{args.backend} worker(s)",
+            args,
+        )
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if hit is not None:
+            output.write(hit)
+        else:
+            write_bulk(args, job, output, cached, profile_dir)
+    except (ValueError, RuntimeError) as exc:
+        exit_with_error(str(exc), args)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    if args.output:
+        verbose_print(f"Wrote {args.count} characters to ./{args.output}", args)
+
+
+def shard_spec(args: argparse.Namespace) -> ShardSpec:
+    return ShardSpec(
+        max_records=args.shard_records,
+        max_bytes=args.shard_mb * 1024 * 1024 if args.shard_mb is not None else None,
+        compression=args.compress,
+    )
+
+
+def write_shards(args: argparse.Namespace, job: BulkJob, profile_dir: str | None = None) -> None:
+    verbose_print(f"Generating {args.count} characters with seed {job.seed}", args)
+    try:
+        remove_shards(args.shard_dir)
+        (Path(args.shard_dir) / INDEX_NAME).unlink(missing_ok=True)
+        with ShardWriter(args.shard_dir, shard_spec(args)) as writer:
+            characters = iter_characters(
+                job,
+                args.count,
+                workers=args.workers,
+                profile_dir=profile_dir,
+                backend=args.backend,
+            )
+            for character in characters:
+                with stage("cli.serialize"):
+                    record = (json.dumps(character.to_dict()) + "\n").encode("utf-8")
+                writer.write(record)
+    except OSError as exc:
+        exit_with_error(f"Could not write shards: {exc}", args)
+    except (ValueError, RuntimeError) as exc:
+        exit_with_error(str(exc), args)
+    manifest = writer.manifest()
+    verbose_print(
+        f"Wrote {manifest.records} characters in {len(manifest.shards)} shard(s) "
+        f"to ./{args.shard_dir}",
+        args,
+    )
+
+
+def write_bulk(
+    args: argparse.Namespace,
+    job: BulkJob,
+    output: TextIO,
+    cached: tuple[ResultCache, str] | None,
+    profile_dir: str | None = None,
+) -> None:
+    characters = iter_characters(
+        job,
+        args.count,
+        workers=args.workers,
+        profile_dir=profile_dir,
+        backend=args.backend,
+    )
+    # Keep a copy of the output for the cache until it outgrows the cache.
+    lines: list[str] | None = [] if cached else None
+    limit = cached[0].max_bytes if cached else 0
+    size = 0
+    with TextBuffer(output) as buffer:
+        for character in characters:
+            with stage("cli.serialize"):
+                line = format_character(character, args)
+            buffer.write(line)
+            if lines is not None:
+                lines.append(line)
+                size += len(line)
+                if size > limit:
+                    lines = None
+    if cached and lines is not None:
+        cache, key = cached
+        cache.put(key, "".join(lines).encode("utf-8"))
+
+
+def format_character(character: Character, args: argparse.Namespace) -> str:
+    if args.format == "text":
+        return render_sheet(character)
+    return json.dumps(character.to_dict()) + "\n"
+
+
+def generate_payload(args: argparse.Namespace, rng: DiceRoller) -> str:
     verbose_print("Rolling abilities...", args)
-    abilities = roll_abilities(rng)
+    with stage("cli.roll_abilities"):
+        abilities = roll_abilities(rng, args.ability_method)
     if args.verbose:
         print(f"[verbose] Abilities: {format_verbose_abilities(abilities)}")
 
@@ -348,23 +1120,502 @@ def run_noninteractive(args: argparse.Namespace, rng: DiceRoller) -> None:
         name=args.name,
         abilities=abilities,
     )
+    if args.random_names:
+        name_character(character, rng)
+
+    with stage("cli.serialize"):
+        if args.format == "text":
+            return render_sheet(character)
+        return json.dumps(character.to_dict(), indent=2)
 
-    payload = json.dumps(character.to_dict(), indent=2)
+
+def run_checkpointed(args: argparse.Namespace, profile_dir: str | None = None) -> None:
+    options = dict(
+        workers=args.workers,
+        backend=args.backend,
+        checkpoint_every=args.checkpoint_every,
+        profile_dir=profile_dir,
+    )
+    try:
+        if args.resume:
+            checkpoint = resume_job(args.checkpoint, **options)
+        else:
+            if not args.output and not args.shard_dir:
+                exit_with_error("--checkpoint requires --output or --shard-dir.", args)
+            seed = args.seed if args.seed is not None else new_seed()
+            job = BulkJob(
+                seed=seed,
+                race=args.race.lower() if args.race else None,
+                class_name=args.class_name.lower() if args.class_name else None,
+                name=args.name,
+                race_weights=args.race_weights,
+                class_weights=args.class_weights,
+                ability_method=args.ability_method,
+                random_names=args.random_names,
+                fast=args.fast,
+            )
+            verbose_print(f"Starting job of {args.count} characters with seed {seed}", args)
+            if args.shard_dir:
+                checkpoint = run_job(
+                    job,
+                    args.count,
+                    args.shard_dir,
+                    args.checkpoint,
+                    sharding=shard_spec(args),
+                    **options,
+                )
+            else:
+                checkpoint = run_job(job, args.count, args.output, args.checkpoint, **options)
+    except OSError as exc:
+        exit_with_error(f"Could not run job: {exc}", args)
+    except (ValueError, RuntimeError) as exc:
+        exit_with_error(str(exc), args)
+    output = checkpoint.output or checkpoint.shards[-1].path
+    verbose_print(f"Wrote {checkpoint.count} characters to ./{output}", args)
+
+
+def run_noninteractive(
+    args: argparse.Namespace,
+    rng: DiceRoller,
+    profile_dir: str | None = None,
+) -> None:
+    if args.resume and args.checkpoint is None:
+        exit_with_error("--resume requires --checkpoint.", args)
+    if args.format == "text" and (args.checkpoint is not None or args.shard_dir):
+        exit_with_error("--format text cannot be used with --checkpoint or --shard-dir.", args)
+    if args.checkpoint is not None:
+        run_checkpointed(args, profile_dir)
+        return
+    if args.count < 1:
+        exit_with_error("--count must be at least 1.", args)
+    if args.count > 1 or args.shard_dir:
+        run_bulk(args, profile_dir)
+        return
+    if args.fast:
+        exit_with_error("--fast needs --count above 1, --shard-dir or --checkpoint.", args)
+    if args.verbose and args.seed is not None:
+        verbose_print(f"Using seed: {args.seed}", args)
+    cached = open_result_cache(args)
+    payload = cached_output(cached)
+    if payload is None:
+        payload = generate_payload(args, rng)
+        if cached:
+            cache, key = cached
+            cache.put(key, payload.encode("utf-8"))
     if args.output:
         verbose_print(f"Writing JSON to ./{args.output}", args)
         with open(args.output, "w", encoding="utf-8") as file:
             file.write(payload)
     else:
-        print(payload)
+        print(payload, end="" if args.format == "text" else "\n")
 
 
-def main() -> None:
-    args = parse_args()
+def apply_rules_pack(args: argparse.Namespace) -> None:
+    if args.rules is None:
+        return
+    try:
+        rules = load_rules_pack(args.rules)
+    except (OSError, ValueError) as exc:
+        exit_with_error(f"Could not load rules pack {args.rules}: {exc}", args)
+    verbose_print(f"Using rules pack {args.rules} ({rules.digest[:12]})", args)
+    activate_rules(rules)
+
+
+def run_party(args: argparse.Namespace, profile_dir: str | None = None) -> None:
+    spec = PartySpec(
+        size=args.size,
+        min_classes=args.min_classes,
+        max_classes=args.max_classes,
+        min_races=args.min_races,
+        max_races=args.max_races,
+        unique_races=args.unique_races,
+        unique_classes=args.unique_classes,
+        ability_method=args.ability_method,
+        random_names=args.random_names,
+    )
+    seed = args.seed if args.seed is not None else new_seed()
+    verbose_print(f"Generating {args.count} parties with seed {seed}", args)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        parties = iter_parties(
+            spec,
+            args.count,
+            seed,
+            workers=args.workers,
+            profile_dir=profile_dir,
+            backend=args.backend,
+        )
+        for party in parties:
+            with stage("cli.serialize"):
+                line = json.dumps(party.to_dict())
+            output.write(line + "\n")
+    except (ValueError, RuntimeError) as exc:
+        exit_with_error(str(exc), args)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def run_census(args: argparse.Namespace, profile_dir: str | None = None) -> None:
+    quotas: dict[str, dict[str, int]] = {}
+    if args.quota_file:
+        try:
+            quotas = load_quotas(args.quota_file)
+        except (OSError, ValueError) as exc:
+            exit_with_error(f"Could not load quotas '{args.quota_file}': {exc}", args)
+    for race, classes in args.cells.items():
+        row = quotas.setdefault(race, {})
+        for class_name, count in classes.items():
+            row[class_name] = row.get(class_name, 0) + count
+    if not quotas:
+        exit_with_error("Give census quotas with --cells or --quota-file.", args)
+    seed = args.seed if args.seed is not None else new_seed()
+    verbose_print(f"Generating census with seed {seed}", args)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        characters = iter_census(
+            quotas,
+            seed,
+            workers=args.workers,
+            name=args.name,
+            profile_dir=profile_dir,
+            backend=args.backend,
+            ability_method=args.ability_method,
+            random_names=args.random_names,
+        )
+        with TextBuffer(output) as buffer:
+            for character in characters:
+                with stage("cli.serialize"):
+                    buffer.write(format_character(character, args))
+    except (ValueError, RuntimeError) as exc:
+        exit_with_error(str(exc), args)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def run_query(args: argparse.Namespace) -> None:
+    try:
+        index = update_index(args.directory)
+    except OSError as exc:
+        exit_with_error(f"Could not index {args.directory}: {exc}", args)
+    except ValueError as exc:
+        exit_with_error(str(exc), args)
+    matches = list(index.query_shards(args.where))
+    count = sum(hits.bit_count() for _, hits in matches)
+    verbose_print(f"{count} of {index.records} characters match", args)
+    if args.count_only:
+        print(count)
+        return
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.ids:
+            for shard, hits in matches:
+                for position in record_ids(hits):
+                    output.write(f"{shard.start + position}\n")
+        else:
+            for record in iter_matching_records(args.directory, matches):
+                output.write(json.dumps(record) + "\n")
+    except (OSError, ValueError) as exc:
+        exit_with_error(f"Could not read {args.directory}: {exc}", args)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def iter_input_lines(paths: list[str]) -> Iterator[str]:
+    for path in paths:
+        if path == "-":
+            yield from sys.stdin
+            continue
+        with open(path, encoding="utf-8") as file:
+            yield from file
+
+
+def run_dedup(args: argparse.Namespace) -> None:
+    try:
+        deduplicator = Deduplicator(args.max_exact, args.expected, args.error_rate)
+    except ValueError as exc:
+        exit_with_error(str(exc), args)
+    kept = dropped = 0
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for line in iter_input_lines(args.inputs):
+            if not line.strip():
+                continue
+            value = fingerprint_record(
+                json.loads(line), 128, args.include_name, args.include_inventory
+            )
+            if deduplicator.seen(value):
+                dropped += 1
+                continue
+            kept += 1
+            output.write(line if line.endswith("\n") else line + "\n")
+    except OSError as exc:
+        exit_with_error(f"Could not read input: {exc}", args)
+    except (ValueError, KeyError, TypeError) as exc:
+        exit_with_error(f"Invalid character record: {exc}", args)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    mode = "exact" if deduplicator.exact else "Bloom filter"
+    verbose_print(f"Kept {kept} characters, dropped {dropped} duplicates ({mode})", args)
+
+
+def run_teams(args: argparse.Namespace) -> None:
+    try:
+        records = [json.loads(line) for line in iter_input_lines(args.inputs) if line.strip()]
+    except OSError as exc:
+        exit_with_error(f"Could not read input: {exc}", args)
+    except ValueError as exc:
+        exit_with_error(f"Invalid character record: {exc}", args)
+    try:
+        scores = strength_scores(StatTable.from_records(records), args.strength)
+        partition = partition_scores(scores, args.teams, args.max_iterations)
+    except (KeyError, TypeError) as exc:
+        exit_with_error(f"Invalid character record: {exc}", args)
+    except ValueError as exc:
+        exit_with_error(str(exc), args)
+    verbose_print(
+        f"Split {len(records)} characters into {args.teams} teams; imbalance "
+        f"{partition.imbalance:g} ({partition.relative_imbalance:.2%} of a team's strength) "
+        f"after {partition.exchanges} exchanges, from {partition.initial_imbalance:g}",
+        args,
+    )
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record, team in zip(records, partition.assignments()):
+            output.write(json.dumps({**record, "team": team}) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def run_names(args: argparse.Namespace) -> None:
+    race = args.names_race.lower()
+    if race not in active_rules().race_names:
+        exit_with_error(f"Unknown race: '{race}'", args)
     rng = create_dice_roller(args.seed)
-    if should_use_noninteractive(args):
-        run_noninteractive(args, rng)
+    try:
+        names = generate_names(race, args.count, rng, args.unique, args.order)
+    except ValueError as exc:
+        exit_with_error(str(exc), args)
+    verbose_print(f"Generated {len(names)} {race} names", args)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for start in range(0, len(names), NAMES_PER_WRITE):
+            output.write("\n".join(names[start:start + NAMES_PER_WRITE]) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def run_rederive(args: argparse.Namespace) -> None:
+    old = BUILTIN_RULES
+    if args.old is not None:
+        try:
+            old = load_rules_pack(args.old)
+        except (OSError, ValueError) as exc:
+            exit_with_error(f"Could not load rules pack {args.old}: {exc}", args)
+    diff = diff_rules(old, active_rules())
+    for change in diff.changes:
+        affected = ", ".join(change.fields) or "nothing stored"
+        stale = "" if change.rederivable else " (cannot be re-derived)"
+        print(f"{change}: {affected}{stale}")
+    if args.dry_run:
         return
-    run_interactive(args, rng)
+    try:
+        report = rederive_archive(args.archive, diff, args.allow_stale, not args.resume)
+    except OSError as exc:
+        exit_with_error(f"Could not update {args.archive}: {exc}", args)
+    except ValueError as exc:
+        exit_with_error(str(exc), args)
+    print(
+        f"Updated {report.updated} of {report.checked} characters checked "
+        f"({report.patched} files patched in place, {report.rewritten} rewritten)."
+    )
+
+
+def run_verify_fast(args: argparse.Namespace) -> None:
+    seed = args.seed if args.seed is not None else new_seed()
+    job = BulkJob(
+        seed=seed,
+        race=args.race.lower() if args.race else None,
+        class_name=args.class_name.lower() if args.class_name else None,
+        race_weights=args.race_weights,
+        class_weights=args.class_weights,
+        ability_method=args.ability_method,
+    )
+    errors = validate_job(job)
+    if args.check_count < 1:
+        errors.append("--count must be at least 1.")
+    if errors:
+        exit_with_error("; ".join(errors), args)
+    mismatches = verify_fast_path(
+        (derive_seed(seed, index) for index in range(args.check_count)),
+        race=job.race,
+        class_name=job.class_name,
+        race_weights=job.race_weights,
+        class_weights=job.class_weights,
+        ability_method=job.ability_method,
+    )
+    if mismatches:
+        exit_with_error(
+            f"Fast path differs for {len(mismatches)} of {args.check_count} seeds, "
+            f"first {mismatches[0]}.",
+            args,
+        )
+    print(f"Fast path matches the dice roller for {args.check_count} characters with seed {seed}.")
+
+
+def run_coordinate(args: argparse.Namespace) -> None:
+    if not args.authkey:
+        exit_with_error(f"Give a shared secret with --authkey or ${AUTHKEY_ENV}.", args)
+    seed = args.seed if args.seed is not None else new_seed()
+    job = BulkJob(
+        seed=seed,
+        race=args.race.lower() if args.race else None,
+        class_name=args.class_name.lower() if args.class_name else None,
+        name=args.name,
+        race_weights=args.race_weights,
+        class_weights=args.class_weights,
+        ability_method=args.ability_method,
+        random_names=args.random_names,
+        fast=args.fast,
+    )
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        coordinator = Coordinator(
+            job,
+            args.count,
+            args.authkey.encode(),
+            address=args.listen,
+            chunk_size=args.chunk_size,
+            lease_timeout=args.lease_timeout,
+        )
+        with coordinator:
+            host, port = coordinator.address
+            verbose_print(
+                f"Serving {args.count} characters with seed {seed} on {host}:{port}", args
+            )
+            for character in coordinator:
+                with stage("cli.serialize"):
+                    output.write(format_character(character, args))
+    except OSError as exc:
+        exit_with_error(f"Could not serve on {args.listen[0]}:{args.listen[1]}: {exc}", args)
+    except ValueError as exc:
+        exit_with_error(str(exc), args)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def work_process(args: argparse.Namespace) -> None:
+    try:
+        chunks = run_worker(args.connect, args.authkey.encode())
+    except (OSError, AuthenticationError) as exc:
+        exit_with_error(f"Could not connect to coordinator: {exc}", args)
+    verbose_print(f"Generated {chunks} chunks", args)
+
+
+def run_work(args: argparse.Namespace) -> None:
+    if not args.authkey:
+        exit_with_error(f"Give a shared secret with --authkey or ${AUTHKEY_ENV}.", args)
+    if args.processes <= 1:
+        work_process(args)
+        return
+    processes = [
+        multiprocessing.Process(target=work_process, args=(args,))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    if any(process.exitcode for process in processes):
+        exit_with_error("A worker process failed.", args)
+
+
+def run_command(
+    args: argparse.Namespace,
+    rng: DiceRoller,
+    profile_dir: str | None = None,
+) -> None:
+    if args.command == "party":
+        run_party(args, profile_dir)
+        return
+    if args.command == "census":
+        run_census(args, profile_dir)
+        return
+    if args.command == "query":
+        run_query(args)
+        return
+    if args.command == "dedup":
+        run_dedup(args)
+        return
+    if args.command == "teams":
+        run_teams(args)
+        return
+    if args.command == "names":
+        run_names(args)
+        return
+    if args.command == "rederive":
+        run_rederive(args)
+        return
+    if args.command == "verify-fast":
+        run_verify_fast(args)
+        return
+    if args.command == "coordinate":
+        run_coordinate(args)
+        return
+    if args.command == "work":
+        run_work(args)
+        return
+    run_noninteractive(args, rng, profile_dir)
+
+
+def run_profiled(args: argparse.Namespace, rng: DiceRoller) -> None:
+    if args.backend != "process" and args.workers > 1:
+        exit_with_error(
+            f"--profile cannot profile {args.backend} workers; use --backend process.", args
+        )
+    with tempfile.TemporaryDirectory(prefix="rpgcharacters-profile-") as profile_dir:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            run_command(args, rng, profile_dir)
+        finally:
+            profiler.disable()
+            worker_files = sorted(Path(profile_dir).glob("*.prof"))
+            collapsed = write_profile(args.profile, profiler, worker_files)
+            verbose_print(f"Wrote profile to ./{args.profile} and ./{collapsed}", args)
+
+
+def main() -> None:
+    args = parse_args()
+    if args.metrics_out:
+        enable_metrics()
+    try:
+        apply_rules_pack(args)
+        if args.serve_stdio:
+            serve(sys.stdin, sys.stdout)
+            return
+        rng = create_dice_roller(args.seed)
+        if args.profile:
+            run_profiled(args, rng)
+            return
+        if args.command is not None or should_use_noninteractive(args):
+            run_command(args, rng)
+            return
+        run_interactive(args, rng)
+    finally:
+        if args.metrics_out:
+            write_metrics(args.metrics_out)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,383 @@
+"""
+Bulk generation spread over several machines.
+
+A :class:`Coordinator` serves one seeded bulk job over TCP using
+:mod:`multiprocessing.managers`. Workers started with :func:`run_worker`,
+on any host that can reach it, repeatedly claim a chunk of indices, generate
+it and send the characters back packed (see :mod:`rpgcharacters.packing`).
+
+Each worker owns a span of indices and claims chunks from the front of it.
+A worker whose span is used up steals the back half of the largest remaining
+span, so fast workers take over work from slow ones without any upfront
+planning. A claimed chunk that is not returned within the lease timeout,
+for example because its worker died, is handed out again. Chunks are only
+leased up to ``max_ahead`` chunks past the oldest one the coordinator is
+still waiting for, which bounds the finished chunks it holds out of order.
+
+The coordinator yields characters in index order as chunks arrive, so the
+output is identical to :func:`~rpgcharacters.bulk.iter_characters` for the
+same job, however many workers take part.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import secrets
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from multiprocessing.managers import BaseManager
+from types import TracebackType
+from typing import Any, Final, Self
+
+from rpgcharacters.bulk import BulkJob, generate_packed_chunk, validate_job
+from rpgcharacters.character_generator import Character
+from rpgcharacters.metrics import stage
+from rpgcharacters.packing import unpack_characters
+from rpgcharacters.rules import CompiledRules, activate_rules, active_rules
+
+# --- Constants ---
+
+DEFAULT_PORT = 7300
+DEFAULT_CLUSTER_CHUNK_SIZE = 4096
+DEFAULT_LEASE_TIMEOUT = 300.0
+DEFAULT_MAX_AHEAD = 64
+DEFAULT_POLL_INTERVAL = 0.5
+AUTHKEY_ENV: Final = "RPGCHARACTERS_CLUSTER_KEY"
+UNASSIGNED: Final = ""
+"""Owner of the indices no worker has claimed yet."""
+
+
+@dataclass(frozen=True, slots=True)
+class JobSpec:
+    """What workers need to know about the job.
+
+    Attributes:
+        job: Bulk job parameters.
+        count: Number of characters in the job.
+        rules: Rules every worker must generate with.
+    """
+
+    job: BulkJob
+    count: int
+    rules: CompiledRules
+
+
+class WorkQueue:
+    """Index spans, leases and finished chunks of one job.
+
+    All methods are thread-safe; the coordinator's manager server calls them
+    from one thread per connected worker.
+    """
+
+    def __init__(
+        self,
+        spec: JobSpec,
+        chunk_size: int = DEFAULT_CLUSTER_CHUNK_SIZE,
+        lease_timeout: float = DEFAULT_LEASE_TIMEOUT,
+        max_ahead: int = DEFAULT_MAX_AHEAD,
+    ) -> None:
+        """Create a queue covering every index of the job.
+
+        Args:
+            spec (JobSpec): Job to hand out.
+            chunk_size (int): Indices per claimed chunk.
+            lease_timeout (float): Seconds before an unreturned chunk is
+                handed out again.
+            max_ahead (int): Chunks that may be leased or held past the
+                oldest chunk not yet taken.
+
+        Raises:
+            ValueError: If ``chunk_size`` or ``max_ahead`` is less than 1.
+        """
+        errors: list[str] = []
+        if chunk_size < 1:
+            errors.append("Chunk size must be at least 1.")
+        if max_ahead < 1:
+            errors.append("Chunks ahead must be at least 1.")
+        if errors:
+            raise ValueError("; ".join(errors))
+        self.spec = spec
+        self.chunk_size = chunk_size
+        self.lease_timeout = lease_timeout
+        self.max_ahead = max_ahead
+        self._spans: dict[str, list[int]] = {UNASSIGNED: [0, spec.count]}
+        self._leases: dict[int, tuple[int, float]] = {}
+        self._results: dict[int, tuple[int, bytes]] = {}
+        self._taken = 0
+        self._changed = threading.Condition()
+
+    def job(self) -> JobSpec:
+        """Return the job workers should generate."""
+        return self.spec
+
+    def _steal(self, worker: str, limit: int) -> list[int] | None:
+        # Only indices before ``limit`` can be leased, so spans are sized by those.
+        victim = max(self._spans.values(), key=lambda span: min(span[1], limit) - span[0])
+        remaining = min(victim[1], limit) - victim[0]
+        if remaining <= 0:
+            return None
+        # Take the back half, split on a chunk boundary so chunks never overlap.
+        chunks = -(-remaining // self.chunk_size)
+        split = victim[0] + chunks // 2 * self.chunk_size
+        span = [split, victim[1]]
+        victim[1] = split
+        self._spans[worker] = span
+        return span
+
+    def claim(self, worker: str) -> tuple[int, int] | None:
+        """Lease the next chunk for a worker, stealing work if its span is empty.
+
+        Args:
+            worker (str): Worker identifier.
+
+        Returns:
+            tuple[int, int] | None: ``(start, stop)`` of the chunk, or
+                ``None`` when every chunk is leased or finished, or lies more
+                than ``max_ahead`` chunks past the oldest chunk not yet taken.
+        """
+        with self._changed:
+            limit = self._taken + self.max_ahead * self.chunk_size
+            span = self._spans.get(worker)
+            if span is None or span[0] >= span[1]:
+                span = self._steal(worker, limit)
+            elif span[0] >= limit:
+                span = None  # Keep the span; it becomes claimable as chunks are taken.
+            now = time.monotonic()
+            if span is not None:
+                start = span[0]
+                stop = min(start + self.chunk_size, span[1])
+                span[0] = stop
+            else:
+                expired = [
+                    start for start, (_, deadline) in self._leases.items() if deadline <= now
+                ]
+                if not expired:
+                    return None
+                start = min(expired)
+                stop = self._leases[start][0]
+            self._leases[start] = (stop, now + self.lease_timeout)
+            return start, stop
+
+    def submit(self, start: int, stop: int, packed: bytes) -> None:
+        """Accept a finished chunk; repeated submissions are ignored.
+
+        Args:
+            start (int): First index of the chunk.
+            stop (int): One past the last index of the chunk.
+            packed (bytes): Characters packed with the job's rules.
+        """
+        with self._changed:
+            if self._leases.pop(start, None) is None:
+                return
+            self._results[start] = (stop, packed)
+            self._changed.notify_all()
+
+    def finished(self) -> bool:
+        """Whether every chunk has been returned."""
+        with self._changed:
+            return not self._leases and all(
+                span[0] >= span[1] for span in self._spans.values()
+            )
+
+    def take(self, start: int, timeout: float | None = None) -> tuple[int, bytes] | None:
+        """Wait for the chunk that starts at ``start`` and remove it.
+
+        Args:
+            start (int): First index of the wanted chunk.
+            timeout (float | None): Seconds to wait, or ``None`` to wait
+                indefinitely.
+
+        Returns:
+            tuple[int, bytes] | None: ``(stop, packed)``, or ``None`` on
+                timeout.
+        """
+        with self._changed:
+            if not self._changed.wait_for(lambda: start in self._results, timeout):
+                return None
+            stop, packed = self._results.pop(start)
+            self._taken = stop
+            return stop, packed
+
+
+class _WorkerManager(BaseManager):
+    pass
+
+
+_WorkerManager.register("work")
+
+
+def parse_address(text: str) -> tuple[str, int]:
+    """Parse a ``HOST:PORT`` address.
+
+    Args:
+        text (str): Address such as ``"0.0.0.0:7300"`` or ``":7300"``.
+
+    Returns:
+        tuple[str, int]: Host and port; an empty host means all interfaces.
+
+    Raises:
+        ValueError: If the address is malformed.
+    """
+    host, sep, port = text.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"expected HOST:PORT, got '{text}'")
+    return host, int(port)
+
+
+# --- Coordinator ---
+
+class Coordinator:
+    """Serves a bulk job to remote workers and collects the results in order."""
+
+    def __init__(
+        self,
+        job: BulkJob,
+        count: int,
+        authkey: bytes,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        chunk_size: int = DEFAULT_CLUSTER_CHUNK_SIZE,
+        lease_timeout: float = DEFAULT_LEASE_TIMEOUT,
+        max_ahead: int = DEFAULT_MAX_AHEAD,
+    ) -> None:
+        """Prepare a job; call :meth:`start` to begin serving it.
+
+        Args:
+            job (BulkJob): Bulk job parameters.
+            count (int): Number of characters to generate.
+            authkey (bytes): Shared secret that workers must present.
+            address (tuple[str, int]): Host and port to listen on; port ``0``
+                picks a free port.
+            chunk_size (int): Indices per claimed chunk.
+            lease_timeout (float): Seconds before an unreturned chunk is
+                handed out again.
+            max_ahead (int): Chunks that may be leased or held past the
+                oldest chunk not yet yielded.
+
+        Raises:
+            ValueError: If the job, ``chunk_size`` or ``max_ahead`` is
+                invalid.
+        """
+        errors = validate_job(job)
+        if errors:
+            raise ValueError("; ".join(errors))
+        self.spec = JobSpec(job, count, active_rules())
+        self.queue = WorkQueue(self.spec, chunk_size, lease_timeout, max_ahead)
+        # register() is a classmethod, so each coordinator needs its own class.
+        manager_type: type[BaseManager] = type("_CoordinatorManager", (BaseManager,), {})
+        manager_type.register(
+            "work", callable=lambda: self.queue, exposed=("job", "claim", "submit", "finished")
+        )
+        self._manager = manager_type(address=address, authkey=authkey)
+        self._server: Any = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Address the coordinator listens on."""
+        if self._server is None:
+            raise RuntimeError("Coordinator is not running.")
+        host, port = self._server.address
+        return str(host), int(port)
+
+    def start(self) -> tuple[str, int]:
+        """Start accepting workers in a background thread.
+
+        Returns:
+            tuple[str, int]: Address the coordinator listens on.
+        """
+        self._server = self._manager.get_server()
+        self._thread = threading.Thread(
+            target=self._serve, args=(self._server,), name="rpgcharacters-coordinator", daemon=True
+        )
+        self._thread.start()
+        return self.address
+
+    @staticmethod
+    def _serve(server: Any) -> None:
+        # serve_forever() ends with sys.exit(), meant for a dedicated process.
+        with contextlib.suppress(SystemExit):
+            server.serve_forever()
+
+    def close(self) -> None:
+        """Stop accepting workers."""
+        if self._server is not None:
+            self._server.stop_event.set()
+            self._server.listener.close()
+            self._server = None
+
+    def __iter__(self) -> Iterator[Character]:
+        """Yield the job's characters in index order as workers return them."""
+        rules = self.spec.rules
+        start = 0
+        while start < self.spec.count:
+            result = self.queue.take(start)
+            if result is None:
+                continue
+            stop, packed = result
+            with stage("cluster.unpack"):
+                characters = unpack_characters(packed, rules)
+            yield from characters
+            start = stop
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+# --- Worker ---
+
+def run_worker(
+    address: tuple[str, int],
+    authkey: bytes,
+    worker_id: str | None = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> int:
+    """Generate chunks for a coordinator until its job is finished.
+
+    Args:
+        address (tuple[str, int]): Coordinator address.
+        authkey (bytes): Shared secret of the coordinator.
+        worker_id (str | None): Name reported to the coordinator; defaults
+            to the host name, process id and a random suffix.
+        poll_interval (float): Seconds to wait when no chunk is available
+            but the job is not finished.
+
+    Returns:
+        int: Number of chunks this worker generated.
+
+    Raises:
+        ConnectionError: If the coordinator cannot be reached.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{secrets.token_hex(2)}"
+    manager = _WorkerManager(address=address, authkey=authkey)
+    manager.connect()
+    work: Any = getattr(manager, "work")()
+    spec: JobSpec = work.job()
+    activate_rules(spec.rules)
+    done = 0
+    try:
+        while True:
+            task = work.claim(worker_id)
+            if task is None:
+                if work.finished():
+                    return done
+                time.sleep(poll_interval)
+                continue
+            start, stop = task
+            work.submit(start, stop, generate_packed_chunk(spec.job, start, stop))
+            done += 1
+    except (EOFError, ConnectionError):
+        # The coordinator stops serving once it has every chunk.
+        return done
@@ -0,0 +1,452 @@
+"""
+Seed-compatible fast character generation.
+
+Published seeds must keep producing the same characters, so this module does
+not change what is drawn, only how. :class:`ReplayRandom` reproduces
+``random.Random.randint`` exactly: it fetches Mersenne Twister output in
+blocks of 32-bit words with one ``getrandbits`` call and applies CPython's
+rejection sampling to the words itself. :func:`fast_random_character` then
+makes the same draws as
+:func:`~rpgcharacters.character_generator.generate_random_character` (six
+``3d6`` ability rolls, the race pick, the class pick, the hit die and the
+money roll) but rolls dice straight from the word buffer and checks races and
+classes against the compiled rules tables instead of parsing dice strings
+and validating dictionaries.
+
+This relies on ``CustomRandom(seed)`` drawing from a Mersenne Twister seeded
+like ``random.Random(seed)`` and on ``DiceRoller.roll("NdS")`` summing ``N``
+``randint(1, S)`` draws. :func:`verify_fast_path` checks that assumption
+against the installed dice roller by generating the same indices both ways.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import sys
+from array import array
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, Final
+
+from diceroller.core import CustomRandom, DiceRoller
+
+from rpgcharacters.ability_methods import DEFAULT_ABILITY_METHOD
+from rpgcharacters.character_generator import (
+    ABILITY_ROLL_ORDER,
+    AbilityScores,
+    Character,
+    ability_modifier,
+    calculate_saving_throws,
+    generate_random_character,
+    pick_weighted,
+)
+from rpgcharacters.classes import CLASSES
+from rpgcharacters.races import RACES
+from rpgcharacters.rules import ABILITY_SCORE_MAX, ABILITY_SCORE_MIN, CompiledRules, active_rules
+
+# --- Constants ---
+
+WORDS_PER_FETCH = 64
+_WORD_TYPECODE: Final = "I" if array("I").itemsize == 4 else "L"
+_DICE_PATTERN: Final = re.compile(r"(\d*)d(\d+)")
+_MODIFIERS: Final = {
+    score: ability_modifier(score) for score in range(ABILITY_SCORE_MIN, ABILITY_SCORE_MAX + 1)
+}
+
+
+class ReplayRandom:
+    """Generator whose ``randint`` draws match ``random.Random`` for the same seed."""
+
+    __slots__ = ("_source", "_words", "_position")
+
+    def __init__(self, seed: int | None = None) -> None:
+        """Create a generator.
+
+        Args:
+            seed (int | None): Seed, as for ``random.Random``.
+        """
+        self._source = random.Random(seed)
+        self._words = array(_WORD_TYPECODE)
+        self._position = WORDS_PER_FETCH
+
+    def seed(self, seed: int | None) -> None:
+        """Restart the stream from a new seed.
+
+        Args:
+            seed (int | None): Seed, as for ``random.Random``.
+        """
+        self._source.seed(seed)
+        self._words = array(_WORD_TYPECODE)
+        self._position = WORDS_PER_FETCH
+
+    def _refill(self) -> None:
+        # getrandbits(32 * n) packs n consecutive outputs, first one lowest.
+        data = self._source.getrandbits(32 * WORDS_PER_FETCH).to_bytes(
+            4 * WORDS_PER_FETCH, "little"
+        )
+        words = array(_WORD_TYPECODE)
+        words.frombytes(data)
+        if sys.byteorder == "big":
+            words.byteswap()
+        self._words = words
+        self._position = 0
+
+    def next_word(self) -> int:
+        """Return the next 32-bit Mersenne Twister output."""
+        if self._position == WORDS_PER_FETCH:
+            self._refill()
+        word = self._words[self._position]
+        self._position += 1
+        return word
+
+    def getrandbits(self, k: int) -> int:
+        """Return ``k`` random bits, consuming words like ``random.Random``.
+
+        Args:
+            k (int): Number of bits, at least 1.
+
+        Returns:
+            int: Integer below ``2 ** k``.
+        """
+        if k <= 32:
+            return self.next_word() >> (32 - k)
+        value = 0
+        for shift in range(0, k, 32):
+            word = self.next_word()
+            if k - shift < 32:
+                word >>= 32 - (k - shift)
+            value |= word << shift
+        return value
+
+    def randint(self, a: int, b: int) -> int:
+        """Return an integer in ``[a, b]``, as ``random.Random.randint`` would.
+
+        Args:
+            a (int): Smallest value.
+            b (int): Largest value.
+
+        Returns:
+            int: Drawn value.
+        """
+        n = b - a + 1
+        k = n.bit_length()
+        if k > 32:
+            r = self.getrandbits(k)
+            while r >= n:
+                r = self.getrandbits(k)
+            return a + r
+        shift = 32 - k
+        while True:
+            if self._position == WORDS_PER_FETCH:
+                self._refill()
+            r = self._words[self._position] >> shift
+            self._position += 1
+            if r < n:
+                return a + r
+
+    def dice(self, count: int, sides: int) -> int:
+        """Sum ``count`` draws of ``randint(1, sides)``.
+
+        Args:
+            count (int): Number of dice.
+            sides (int): Faces per die.
+
+        Returns:
+            int: Total of the dice.
+        """
+        shift = 32 - sides.bit_length()
+        total = count
+        for _ in range(count):
+            while True:
+                if self._position == WORDS_PER_FETCH:
+                    self._refill()
+                r = self._words[self._position] >> shift
+                self._position += 1
+                if r < sides:
+                    total += r
+                    break
+        return total
+
+
+class FastRoller:
+    """Dice roller driven by a :class:`ReplayRandom`.
+
+    It can stand in for :class:`~diceroller.core.DiceRoller` wherever only
+    ``rng.randint`` and ``roll("NdS")`` are used.
+
+    Attributes:
+        rng: The underlying generator.
+    """
+
+    __slots__ = ("rng",)
+
+    def __init__(self, seed: int | None = None) -> None:
+        """Create a roller.
+
+        Args:
+            seed (int | None): Seed, as for ``CustomRandom``.
+        """
+        self.rng = ReplayRandom(seed)
+
+    def roll(self, expression: str) -> int:
+        """Roll a plain ``NdS`` expression.
+
+        Args:
+            expression (str): Dice expression such as ``"3d6"``.
+
+        Returns:
+            int: Total of the dice.
+
+        Raises:
+            ValueError: If the expression is not of the form ``NdS``.
+        """
+        count, sides = _parse_dice(expression)
+        return self.rng.dice(count, sides)
+
+
+@cache
+def _parse_dice(expression: str) -> tuple[int, int]:
+    match = _DICE_PATTERN.fullmatch(expression.strip().lower())
+    if match is None:
+        raise ValueError(f"Unsupported dice expression: '{expression}'")
+    return int(match.group(1) or 1), int(match.group(2))
+
+
+# --- Rules Tables ---
+
+@dataclass(frozen=True, slots=True)
+class _Tables:
+    # Races and classes in RACES/CLASSES order, which is the order the
+    # reference path builds its candidate lists in.
+    race_names: tuple[str, ...]
+    class_names: tuple[str, ...]
+    race_bounds: tuple[tuple[tuple[int, int], ...], ...]
+    race_classes: tuple[tuple[int, ...], ...]
+    class_prime: tuple[tuple[int, int], ...]
+    hit_die: tuple[tuple[int, ...], ...]
+    saving_throws: tuple[tuple[dict[str, int], ...], ...]
+    base_ac: int
+
+
+_TABLES: dict[str, _Tables] = {}
+
+
+def _tables(rules: CompiledRules) -> _Tables:
+    # Keyed by digest: the compiled rules hold the source pack, which is not
+    # hashable.
+    tables = _TABLES.get(rules.digest)
+    if tables is None:
+        tables = _TABLES[rules.digest] = _build_tables(rules)
+    return tables
+
+
+def _build_tables(rules: CompiledRules) -> _Tables:
+    race_names = tuple(RACES)
+    class_names = tuple(CLASSES)
+    races = [rules.race_index(race) for race in race_names]
+    classes = [rules.class_index(class_name) for class_name in class_names]
+    return _Tables(
+        race_names=race_names,
+        class_names=class_names,
+        race_bounds=tuple(
+            tuple(zip(rules.ability_min[race], rules.ability_max[race], strict=True))
+            for race in races
+        ),
+        race_classes=tuple(
+            tuple(
+                position
+                for position, class_index in enumerate(classes)
+                if rules.allowed_classes[race] >> class_index & 1
+            )
+            for race in races
+        ),
+        class_prime=tuple(
+            (rules.prime_index[class_index], rules.min_prime[class_index])
+            for class_index in classes
+        ),
+        hit_die=tuple(
+            tuple(rules.hit_die[race][class_index] for class_index in classes) for race in races
+        ),
+        saving_throws=tuple(
+            tuple(calculate_saving_throws(class_name, race_name) for class_name in class_names)
+            for race_name in race_names
+        ),
+        base_ac=rules.base_ac,
+    )
+
+
+def _fits(scores: tuple[int, ...], bounds: tuple[tuple[int, int], ...]) -> bool:
+    for score, (low, high) in zip(scores, bounds):
+        if score < low or score > high:
+            return False
+    return True
+
+
+# --- Generation ---
+
+def fast_random_character(
+    rng: FastRoller,
+    race: str | None = None,
+    class_name: str | None = None,
+    name: str | None = None,
+    race_weights: Mapping[str, float] | None = None,
+    class_weights: Mapping[str, float] | None = None,
+    ability_method: str = DEFAULT_ABILITY_METHOD,
+) -> Character:
+    """Generate the character ``generate_random_character`` would for the same seed.
+
+    Only the default ``3d6`` ability method has a dedicated fast path; other
+    methods run the reference code on the fast roller.
+
+    Args:
+        rng (FastRoller): Roller seeded like the reference ``DiceRoller``.
+        race (str | None): Race to use, or ``None`` to pick one at random.
+        class_name (str | None): Class to use, or ``None`` to pick one at
+            random.
+        name (str | None): Optional character name.
+        race_weights (Mapping[str, float] | None): Relative weights for the
+            race pick, or ``None`` for a uniform pick.
+        class_weights (Mapping[str, float] | None): Relative weights for the
+            class pick, or ``None`` for a uniform pick.
+        ability_method (str): Name of the ability method to roll with.
+
+    Returns:
+        Character: The generated character.
+
+    Raises:
+        ValueError: In the same cases as ``generate_random_character``.
+    """
+    if ability_method != DEFAULT_ABILITY_METHOD:
+        return generate_random_character(
+            rng,  # type: ignore[arg-type]
+            race,
+            class_name,
+            name,
+            race_weights=race_weights,
+            class_weights=class_weights,
+            ability_method=ability_method,
+        )
+
+    tables = _tables(active_rules())
+    dice = rng.rng.dice
+    scores = (dice(3, 6), dice(3, 6), dice(3, 6), dice(3, 6), dice(3, 6), dice(3, 6))
+
+    if race is None:
+        valid = [
+            candidate
+            for candidate, bounds in zip(tables.race_names, tables.race_bounds)
+            if _fits(scores, bounds)
+        ]
+        if not valid:
+            raise ValueError("No valid races available for these ability scores.")
+        if race_weights is None:
+            valid.sort()
+            race = valid[rng.rng.randint(0, len(valid) - 1)]
+        else:
+            race = pick_weighted(
+                valid, list(tables.race_names), rng, race_weights  # type: ignore[arg-type]
+            )
+    if race.lower() not in tables.race_names:
+        raise ValueError(f"Unknown race: '{race.lower()}'")
+    race_position = tables.race_names.index(race.lower())
+    if not _fits(scores, tables.race_bounds[race_position]):
+        raise ValueError(f"Ability scores do not allow race '{race}'.")
+
+    eligible = [
+        tables.class_names[position]
+        for position in tables.race_classes[race_position]
+        if scores[tables.class_prime[position][0]] >= tables.class_prime[position][1]
+    ]
+    if class_name is None:
+        if not eligible:
+            raise ValueError("No valid classes available for this race.")
+        if class_weights is None:
+            eligible.sort()
+            class_name = eligible[rng.rng.randint(0, len(eligible) - 1)]
+        else:
+            class_name = pick_weighted(
+                eligible, list(tables.class_names), rng, class_weights  # type: ignore[arg-type]
+            )
+    elif class_name.lower() not in tables.class_names:
+        raise ValueError(f"Unknown class: '{class_name.lower()}'")
+    elif class_name.lower() not in eligible:
+        raise ValueError(f"Ability scores do not allow class '{class_name}' for race '{race}'.")
+    class_position = tables.class_names.index(class_name.lower())
+
+    mods = [_MODIFIERS[score] for score in scores]
+    ability_mods = dict(zip(ABILITY_ROLL_ORDER, mods))
+    hp = max(1, dice(1, tables.hit_die[race_position][class_position]) + ability_mods["CON"])
+    money = dice(3, 6) * 10
+    return Character(
+        abilities=AbilityScores(*scores),
+        ability_mods=ability_mods,
+        ac=tables.base_ac + ability_mods["DEX"],
+        attack_bonus=1,
+        class_name=class_name.lower(),
+        hp=hp,
+        inventory=[],
+        level=1,
+        money_gp=money,
+        name=name,
+        race=race.lower(),
+        saving_throws=dict(tables.saving_throws[race_position][class_position]),
+    )
+
+
+# --- Verification ---
+
+def _outcome(generate: Callable[[], Character]) -> dict[str, Any] | None:
+    try:
+        return generate().to_dict()
+    # validate_class raises KeyError for an unknown class or race.
+    except (KeyError, ValueError):
+        return None
+
+
+def verify_fast_path(
+    seeds: Iterable[int],
+    race: str | None = None,
+    class_name: str | None = None,
+    race_weights: Mapping[str, float] | None = None,
+    class_weights: Mapping[str, float] | None = None,
+    ability_method: str = DEFAULT_ABILITY_METHOD,
+) -> list[int]:
+    """Find seeds for which the fast path disagrees with the dice roller.
+
+    For each seed, a character is generated with ``DiceRoller(CustomRandom(
+    seed))`` and with ``FastRoller(seed)``. They agree when both give the same
+    character (or both fail) and the next draw from each generator is the
+    same, so the two streams are also left in the same position.
+
+    Args:
+        seeds (Iterable[int]): Seeds to check.
+        race (str | None): Race to use, or ``None`` to pick one at random.
+        class_name (str | None): Class to use, or ``None`` to pick one at
+            random.
+        race_weights (Mapping[str, float] | None): Relative race weights.
+        class_weights (Mapping[str, float] | None): Relative class weights.
+        ability_method (str): Name of the ability method to roll with.
+
+    Returns:
+        list[int]: Seeds that disagree, in the order checked.
+    """
+    options: dict[str, Any] = dict(
+        race=race,
+        class_name=class_name,
+        race_weights=race_weights,
+        class_weights=class_weights,
+        ability_method=ability_method,
+    )
+    mismatches = []
+    for seed in seeds:
+        reference = DiceRoller(CustomRandom(seed))
+        fast = FastRoller(seed)
+        expected = _outcome(lambda: generate_random_character(reference, **options))
+        actual = _outcome(lambda: fast_random_character(fast, **options))
+        if expected != actual or reference.rng.randint(0, 1 << 30) != fast.rng.randint(
+            0, 1 << 30
+        ):
+            mismatches.append(seed)
+    return mismatches
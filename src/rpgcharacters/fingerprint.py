@@ -0,0 +1,263 @@
+"""
+Stable character fingerprints and streaming deduplication.
+
+A fingerprint is a BLAKE2b hash of a canonical encoding of the fields that
+make a character distinct: abilities, race, class, level, hit points and
+money, plus optionally the name and inventory. The armor class, attack
+bonus, saving throws and modifiers follow from those fields and are left
+out. Fingerprints are the same for a :class:`Character` and for its
+``to_dict()`` record, across processes, platforms and package versions.
+
+:class:`Deduplicator` remembers fingerprints in a set until it holds
+``max_exact`` of them, then moves to a Bloom filter of fixed size. After the
+switch, memory stays bounded, at the cost of occasionally treating a new
+character as a duplicate (at most the configured error rate).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, Final, Literal
+
+from rpgcharacters.character_generator import Character
+from rpgcharacters.rules import ABILITY_NAMES
+
+# --- Constants ---
+
+FINGERPRINT_PERSON: Final = b"rpgc-fp-v1"
+DEFAULT_MAX_EXACT = 5_000_000
+DEFAULT_BLOOM_CAPACITY = 50_000_000
+DEFAULT_ERROR_RATE = 0.001
+_MASK64: Final = (1 << 64) - 1
+
+FingerprintBits = Literal[64, 128]
+
+
+def _canonical(
+    record: Mapping[str, Any],
+    include_name: bool,
+    include_inventory: bool,
+) -> bytes:
+    fields: list[Any] = [
+        [record["abilities"][ability] for ability in ABILITY_NAMES],
+        record["race"],
+        record["class"],
+        record["level"],
+        record["hp"],
+        record["money_gp"],
+    ]
+    if include_name:
+        fields.append(record["name"])
+    if include_inventory:
+        fields.append(sorted(record["inventory"]))
+    return json.dumps(fields, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def fingerprint_record(
+    record: Mapping[str, Any],
+    bits: FingerprintBits = 64,
+    include_name: bool = False,
+    include_inventory: bool = False,
+) -> int:
+    """Fingerprint a character record as produced by ``Character.to_dict()``.
+
+    Args:
+        record (Mapping[str, Any]): Character dictionary.
+        bits (FingerprintBits): Fingerprint width, ``64`` or ``128``.
+        include_name (bool): Whether characters that differ only by name are
+            distinct.
+        include_inventory (bool): Whether characters that differ only by
+            inventory are distinct. Item order is ignored.
+
+    Returns:
+        int: Unsigned fingerprint of ``bits`` bits.
+
+    Raises:
+        KeyError: If the record lacks a fingerprinted field.
+    """
+    digest = hashlib.blake2b(
+        _canonical(record, include_name, include_inventory),
+        digest_size=bits // 8,
+        person=FINGERPRINT_PERSON,
+    ).digest()
+    return int.from_bytes(digest, "big")
+
+
+def fingerprint(
+    character: Character,
+    bits: FingerprintBits = 64,
+    include_name: bool = False,
+    include_inventory: bool = False,
+) -> int:
+    """Fingerprint a character.
+
+    Args:
+        character (Character): Character to fingerprint.
+        bits (FingerprintBits): Fingerprint width, ``64`` or ``128``.
+        include_name (bool): Whether the name is part of the fingerprint.
+        include_inventory (bool): Whether the inventory is part of the
+            fingerprint.
+
+    Returns:
+        int: Same value as :func:`fingerprint_record` on ``character.to_dict()``.
+    """
+    record = {
+        "abilities": vars(character.abilities),
+        "race": character.race,
+        "class": character.class_name,
+        "level": character.level,
+        "hp": character.hp,
+        "money_gp": character.money_gp,
+        "name": character.name,
+        "inventory": character.inventory,
+    }
+    return fingerprint_record(record, bits, include_name, include_inventory)
+
+
+# --- Deduplication ---
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 128-bit fingerprints."""
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_ERROR_RATE) -> None:
+        """Size a filter for ``capacity`` items at ``error_rate``.
+
+        Args:
+            capacity (int): Number of items the filter is sized for.
+            error_rate (float): False positive rate at ``capacity`` items.
+
+        Raises:
+            ValueError: If ``capacity`` or ``error_rate`` is out of range.
+        """
+        if capacity < 1:
+            raise ValueError("Bloom filter capacity must be at least 1.")
+        if not 0 < error_rate < 1:
+            raise ValueError("Bloom filter error rate must be between 0 and 1.")
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: int) -> Iterator[int]:
+        # Double hashing: the two 64-bit halves give every probe position.
+        first, second = value >> 64 & _MASK64, value & _MASK64 | 1
+        for probe in range(self.hashes):
+            yield (first + probe * second) % self.size
+
+    def add(self, value: int) -> bool:
+        """Add a fingerprint.
+
+        Args:
+            value (int): 128-bit fingerprint.
+
+        Returns:
+            bool: Whether the fingerprint was possibly present already.
+        """
+        present = True
+        bits = self._bits
+        for position in self._positions(value):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        return present
+
+    def __contains__(self, value: int) -> bool:
+        return all(
+            self._bits[position >> 3] & 1 << (position & 7)
+            for position in self._positions(value)
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self._bits)
+
+
+class Deduplicator:
+    """Remembers 128-bit fingerprints, exactly at first and then in a Bloom filter."""
+
+    def __init__(
+        self,
+        max_exact: int = DEFAULT_MAX_EXACT,
+        bloom_capacity: int = DEFAULT_BLOOM_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+    ) -> None:
+        """Create a deduplicator.
+
+        Args:
+            max_exact (int): Fingerprints kept in an exact set before moving
+                to the Bloom filter.
+            bloom_capacity (int): Expected total number of distinct
+                fingerprints, used to size the Bloom filter.
+            error_rate (float): Bloom filter false positive rate.
+
+        Raises:
+            ValueError: If ``max_exact`` is negative or ``error_rate`` is
+                not between 0 and 1.
+        """
+        if max_exact < 0:
+            raise ValueError("Exact fingerprint limit must not be negative.")
+        if not 0 < error_rate < 1:
+            raise ValueError("Bloom filter error rate must be between 0 and 1.")
+        self.max_exact = max_exact
+        self.bloom_capacity = max(bloom_capacity, max_exact + 1)
+        self.error_rate = error_rate
+        self._exact: set[int] = set()
+        self._bloom: BloomFilter | None = None
+
+    @property
+    def exact(self) -> bool:
+        """Whether answers are still exact."""
+        return self._bloom is None
+
+    def seen(self, value: int) -> bool:
+        """Record a fingerprint and report whether it was seen before.
+
+        Args:
+            value (int): 128-bit fingerprint.
+
+        Returns:
+            bool: ``True`` for a duplicate. Once the Bloom filter is in use,
+                a new fingerprint may be reported as a duplicate.
+        """
+        if self._bloom is not None:
+            return self._bloom.add(value)
+        if value in self._exact:
+            return True
+        self._exact.add(value)
+        if len(self._exact) > self.max_exact:
+            bloom = BloomFilter(self.bloom_capacity, self.error_rate)
+            for known in self._exact:
+                bloom.add(known)
+            self._bloom, self._exact = bloom, set()
+        return False
+
+
+def iter_unique(
+    records: Iterable[Mapping[str, Any]],
+    include_name: bool = False,
+    include_inventory: bool = False,
+    deduplicator: Deduplicator | None = None,
+) -> Iterator[Mapping[str, Any]]:
+    """Yield the first occurrence of every distinct character record.
+
+    Args:
+        records (Iterable[Mapping[str, Any]]): Character dictionaries.
+        include_name (bool): Whether the name is part of the fingerprint.
+        include_inventory (bool): Whether the inventory is part of the
+            fingerprint.
+        deduplicator (Deduplicator | None): Fingerprint memory to use, for
+            example with a smaller exact set; a default one is created
+            when omitted.
+
+    Yields:
+        Mapping[str, Any]: Records not seen earlier in the stream.
+    """
+    deduplicator = deduplicator or Deduplicator()
+    for record in records:
+        value = fingerprint_record(record, 128, include_name, include_inventory)
+        if not deduplicator.seen(value):
+            yield record
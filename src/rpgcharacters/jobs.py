@@ -0,0 +1,466 @@
+"""
+Checkpointed, resumable bulk generation jobs.
+
+A job writes ``count`` characters of a :class:`~rpgcharacters.bulk.BulkJob`
+as JSON lines and periodically records its progress in a small checkpoint
+file: the job parameters, the rules digest, and for each output shard the
+last index and byte offset that were flushed to disk. If the job is
+interrupted, :func:`resume_job` truncates the output back to the last
+checkpoint and continues from the next index.
+
+Jobs can also write a directory of rotated, compressed shards (see
+:mod:`rpgcharacters.shards`). A sharded job checkpoints after every completed
+shard and resumes after the last one.
+
+Every character is generated from its own index-derived seed, so a resumed
+job writes exactly the bytes an uninterrupted run would have written.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, BinaryIO, Final
+
+from rpgcharacters.ability_methods import DEFAULT_ABILITY_METHOD
+from rpgcharacters.archive_index import INDEX_NAME
+from rpgcharacters.bulk import (
+    DEFAULT_CHUNK_SIZE,
+    Backend,
+    BulkJob,
+    iter_characters,
+    validate_job,
+)
+from rpgcharacters.metrics import stage
+from rpgcharacters.rules import active_rules, atomic_write_bytes
+from rpgcharacters.shards import ShardInfo, ShardSpec, ShardWriter, remove_shards
+
+# --- Constants ---
+
+CHECKPOINT_VERSION: Final = 1
+DEFAULT_CHECKPOINT_EVERY = 100_000
+
+
+@dataclass(frozen=True, slots=True)
+class ShardProgress:
+    """Flushed progress of one output file.
+
+    Attributes:
+        path: Output file path, or the shard file name for sharded jobs.
+        start: Index of the first character in the file.
+        stop: One past the index of the last flushed character.
+        offset: File size in bytes after the last flushed character.
+        sha256: Hex SHA-256 of a completed shard, or ``None``.
+    """
+
+    path: str
+    start: int
+    stop: int
+    offset: int
+    sha256: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Checkpoint:
+    """Everything needed to resume a bulk job.
+
+    Attributes:
+        job: Bulk job parameters, including the seed.
+        count: Total number of characters in the job.
+        rules: Digest of the rules the job was started with.
+        shards: Flushed progress of each output file, in index order.
+        output: Shard directory of a sharded job, or ``None``.
+        sharding: Shard rotation and compression of a sharded job, or
+            ``None`` for a single output file.
+    """
+
+    job: BulkJob
+    count: int
+    rules: str
+    shards: tuple[ShardProgress, ...]
+    output: str | None = None
+    sharding: ShardSpec | None = None
+
+    @property
+    def flushed(self) -> int:
+        """Number of characters safely written to disk."""
+        return self.shards[-1].stop if self.shards else 0
+
+    @property
+    def complete(self) -> bool:
+        """Whether every character of the job has been written."""
+        return self.flushed >= self.count
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the checkpoint to a JSON-compatible dictionary.
+
+        Returns:
+            dict[str, Any]: Checkpoint document.
+        """
+        return {
+            "version": CHECKPOINT_VERSION,
+            "seed": self.job.seed,
+            "count": self.count,
+            "rules": self.rules,
+            "race": self.job.race,
+            "class": self.job.class_name,
+            "name": self.job.name,
+            "race_weights": self.job.race_weights,
+            "class_weights": self.job.class_weights,
+            "ability_method": self.job.ability_method,
+            "random_names": self.job.random_names,
+            "fast": self.job.fast,
+            "shards": [
+                {
+                    "path": shard.path,
+                    "start": shard.start,
+                    "stop": shard.stop,
+                    "offset": shard.offset,
+                    "sha256": shard.sha256,
+                }
+                for shard in self.shards
+            ],
+            "output": self.output,
+            "sharding": None if self.sharding is None else {
+                "max_records": self.sharding.max_records,
+                "max_bytes": self.sharding.max_bytes,
+                "compression": self.sharding.compression,
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Checkpoint:
+        """Rebuild a checkpoint from :meth:`to_dict` output.
+
+        Args:
+            data (Mapping[str, Any]): Checkpoint document.
+
+        Returns:
+            Checkpoint: The checkpoint.
+
+        Raises:
+            ValueError: If the document is not a checkpoint of this version.
+        """
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {data.get('version')!r}")
+        try:
+            job = BulkJob(
+                seed=int(data["seed"]),
+                race=data["race"],
+                class_name=data["class"],
+                name=data["name"],
+                race_weights=data["race_weights"],
+                class_weights=data["class_weights"],
+                ability_method=data.get("ability_method", DEFAULT_ABILITY_METHOD),
+                random_names=bool(data.get("random_names", False)),
+                fast=bool(data.get("fast", False)),
+            )
+            shards = tuple(
+                ShardProgress(
+                    str(shard["path"]),
+                    int(shard["start"]),
+                    int(shard["stop"]),
+                    int(shard["offset"]),
+                    shard.get("sha256"),
+                )
+                for shard in data["shards"]
+            )
+            sharding = data.get("sharding")
+            return cls(
+                job,
+                int(data["count"]),
+                str(data["rules"]),
+                shards,
+                data.get("output"),
+                None if sharding is None else ShardSpec(**sharding),
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Malformed checkpoint: {exc}") from exc
+
+
+# --- Checkpoint Files ---
+
+def write_checkpoint(path: str | Path, checkpoint: Checkpoint) -> None:
+    """Atomically replace the checkpoint file at ``path``.
+
+    Args:
+        path (str | Path): Checkpoint file.
+        checkpoint (Checkpoint): Progress to record.
+    """
+    data = json.dumps(checkpoint.to_dict(), indent=2).encode("utf-8")
+    atomic_write_bytes(Path(path), data)
+
+
+def load_checkpoint(path: str | Path) -> Checkpoint:
+    """Read a checkpoint file.
+
+    Args:
+        path (str | Path): Checkpoint file.
+
+    Returns:
+        Checkpoint: The recorded progress.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid checkpoint.
+    """
+    try:
+        data = json.loads(Path(path).read_bytes())
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Could not parse checkpoint: {exc}") from exc
+    if not isinstance(data, dict):
+        raise ValueError("Checkpoint must be a JSON object.")
+    return Checkpoint.from_dict(data)
+
+
+# --- Jobs ---
+
+def _flush(
+    file: BinaryIO,
+    checkpoint: Checkpoint,
+    checkpoint_path: str | Path,
+    stop: int,
+    offset: int,
+) -> Checkpoint:
+    # The data must be on disk before the checkpoint that points past it.
+    with stage("job.checkpoint"):
+        file.flush()
+        os.fsync(file.fileno())
+        last = checkpoint.shards[-1]
+        checkpoint = replace(
+            checkpoint,
+            shards=(*checkpoint.shards[:-1], replace(last, stop=stop, offset=offset)),
+        )
+        write_checkpoint(checkpoint_path, checkpoint)
+    return checkpoint
+
+
+def _run(
+    checkpoint: Checkpoint,
+    checkpoint_path: str | Path,
+    workers: int,
+    backend: Backend,
+    chunk_size: int,
+    checkpoint_every: int,
+    profile_dir: str | Path | None,
+) -> Checkpoint:
+    if checkpoint_every < 1:
+        raise ValueError("Checkpoint interval must be at least 1.")
+    shard = checkpoint.shards[-1]
+    with open(shard.path, "r+b") as file:
+        file.truncate(shard.offset)
+        file.seek(shard.offset)
+        index, offset = shard.stop, shard.offset
+        characters = iter_characters(
+            checkpoint.job,
+            checkpoint.count,
+            workers=workers,
+            chunk_size=chunk_size,
+            profile_dir=profile_dir,
+            backend=backend,
+            start=index,
+        )
+        for character in characters:
+            with stage("job.serialize"):
+                data = (json.dumps(character.to_dict()) + "\n").encode("utf-8")
+            file.write(data)
+            index += 1
+            offset += len(data)
+            if index % checkpoint_every == 0:
+                checkpoint = _flush(file, checkpoint, checkpoint_path, index, offset)
+        return _flush(file, checkpoint, checkpoint_path, index, offset)
+
+
+def _run_sharded(
+    checkpoint: Checkpoint,
+    checkpoint_path: str | Path,
+    output: str,
+    sharding: ShardSpec,
+    workers: int,
+    backend: Backend,
+    chunk_size: int,
+    profile_dir: str | Path | None,
+) -> Checkpoint:
+    def record(shard: ShardInfo) -> None:
+        nonlocal checkpoint
+        progress = ShardProgress(shard.path, shard.start, shard.stop, shard.size, shard.sha256)
+        checkpoint = replace(checkpoint, shards=(*checkpoint.shards, progress))
+        write_checkpoint(checkpoint_path, checkpoint)
+
+    writer = ShardWriter(
+        output,
+        sharding,
+        shards=[
+            ShardInfo(shard.path, shard.start, shard.stop, shard.offset, shard.sha256 or "")
+            for shard in checkpoint.shards
+        ],
+        on_shard=record,
+    )
+    with writer:
+        characters = iter_characters(
+            checkpoint.job,
+            checkpoint.count,
+            workers=workers,
+            chunk_size=chunk_size,
+            profile_dir=profile_dir,
+            backend=backend,
+            start=checkpoint.flushed,
+        )
+        for character in characters:
+            with stage("job.serialize"):
+                writer.write((json.dumps(character.to_dict()) + "\n").encode("utf-8"))
+    return checkpoint
+
+
+def run_job(
+    job: BulkJob,
+    count: int,
+    output: str | Path,
+    checkpoint_path: str | Path,
+    workers: int = 1,
+    backend: Backend = "process",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    profile_dir: str | Path | None = None,
+    sharding: ShardSpec | None = None,
+) -> Checkpoint:
+    """Start a bulk job that writes JSON lines to ``output``.
+
+    The checkpoint records ``output`` as an absolute path, so the job can be
+    resumed from another working directory. Any existing output file is
+    overwritten. With ``sharding``, shards, the
+    manifest and the query index left in the output directory by an earlier
+    run are deleted first.
+
+    Args:
+        job (BulkJob): Bulk job parameters.
+        count (int): Number of characters to generate.
+        output (str | Path): JSON lines output file, or the shard directory
+            when ``sharding`` is given.
+        checkpoint_path (str | Path): Checkpoint file to keep up to date.
+        workers (int): Number of workers; ``1`` generates inline.
+        backend (Backend): ``"process"``, ``"thread"`` or ``"interpreter"``.
+        chunk_size (int): Indices per worker task.
+        checkpoint_every (int): Characters between checkpoints of a single
+            output file. Sharded jobs checkpoint after every shard.
+        profile_dir (str | Path | None): Directory for per-worker cProfile
+            output, or ``None``.
+        sharding (ShardSpec | None): Write rotated shards into the
+            ``output`` directory instead of a single file.
+
+    Returns:
+        Checkpoint: Final checkpoint of the completed job.
+
+    Raises:
+        ValueError: If the job or shard spec is invalid.
+    """
+    errors = validate_job(job)
+    if count < 1:
+        errors.append("Job count must be at least 1.")
+    if sharding is not None:
+        errors.extend(sharding.validate())
+    if errors:
+        raise ValueError("; ".join(errors))
+    output = Path(output).resolve()
+    if sharding is not None:
+        remove_shards(output)
+        (output / INDEX_NAME).unlink(missing_ok=True)
+        checkpoint = Checkpoint(
+            job, count, active_rules().digest, (), str(output), sharding
+        )
+        write_checkpoint(checkpoint_path, checkpoint)
+        return _run_sharded(
+            checkpoint,
+            checkpoint_path,
+            str(output),
+            sharding,
+            workers,
+            backend,
+            chunk_size,
+            profile_dir,
+        )
+    output.write_bytes(b"")
+    checkpoint = Checkpoint(
+        job,
+        count,
+        active_rules().digest,
+        (ShardProgress(str(output), 0, 0, 0),),
+    )
+    write_checkpoint(checkpoint_path, checkpoint)
+    return _run(
+        checkpoint, checkpoint_path, workers, backend, chunk_size, checkpoint_every, profile_dir
+    )
+
+
+def resume_job(
+    checkpoint_path: str | Path,
+    workers: int = 1,
+    backend: Backend = "process",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    profile_dir: str | Path | None = None,
+) -> Checkpoint:
+    """Continue an interrupted job from its last checkpoint.
+
+    Output written after the checkpoint is discarded and regenerated, so the
+    finished output is identical to an uninterrupted run. Resuming a
+    completed job does nothing.
+
+    Args:
+        checkpoint_path (str | Path): Checkpoint file of the job.
+        workers (int): Number of workers; ``1`` generates inline.
+        backend (Backend): ``"process"``, ``"thread"`` or ``"interpreter"``.
+        chunk_size (int): Indices per worker task.
+        checkpoint_every (int): Characters between checkpoints.
+        profile_dir (str | Path | None): Directory for per-worker cProfile
+            output, or ``None``.
+
+    Returns:
+        Checkpoint: Final checkpoint of the completed job.
+
+    Raises:
+        OSError: If the checkpoint cannot be read.
+        ValueError: If the checkpoint is invalid, the active rules differ
+            from the job's, or the output is shorter than checkpointed.
+    """
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint.rules != active_rules().digest:
+        raise ValueError(
+            f"Checkpoint was written with different rules ({checkpoint.rules[:12]}); "
+            "load the same rules pack to resume."
+        )
+    if checkpoint.complete:
+        return checkpoint
+    if checkpoint.sharding is not None and checkpoint.output is not None:
+        for shard in checkpoint.shards:
+            path = Path(checkpoint.output) / shard.path
+            if not path.is_file() or path.stat().st_size != shard.offset:
+                raise ValueError(f"Cannot resume: shard {path} is missing or changed.")
+        return _run_sharded(
+            checkpoint,
+            checkpoint_path,
+            checkpoint.output,
+            checkpoint.sharding,
+            workers,
+            backend,
+            chunk_size,
+            profile_dir,
+        )
+    if not checkpoint.shards:
+        raise ValueError("Checkpoint has no output files.")
+    shard = checkpoint.shards[-1]
+    try:
+        size = os.path.getsize(shard.path)
+    except OSError as exc:
+        raise ValueError(f"Cannot resume: output {shard.path} is unreadable: {exc}") from exc
+    if size < shard.offset:
+        raise ValueError(
+            f"Cannot resume: output {shard.path} is shorter than its checkpoint "
+            f"({size} < {shard.offset} bytes)."
+        )
+    return _run(
+        checkpoint, checkpoint_path, workers, backend, chunk_size, checkpoint_every, profile_dir
+    )
@@ -0,0 +1,221 @@
+"""
+Memoized race and class validation queries.
+
+Validation results depend only on the ability scores, the normalized race and
+class names, and the active rules tables. The CLI asks the same questions
+several times per character (list the eligible races, then validate the
+chosen one), so results are kept in a bounded LRU keyed on an ability tuple
+and the normalized names. Every cache is cleared when the active rules change.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import astuple
+from threading import Lock
+from typing import TypedDict
+
+from rpgcharacters.character_generator import (
+    AbilityScores,
+    valid_classes_for_race,
+    valid_races_for_abilities,
+    validate_class,
+    validate_race,
+)
+from rpgcharacters.rules import on_rules_change
+
+# --- Constants ---
+
+DEFAULT_MAXSIZE = 4096
+
+AbilityKey = tuple[int, ...]
+"""Ability scores as a hashable tuple in ``AbilityScores`` field order."""
+
+
+class MemoStats(TypedDict):
+    """Hit/miss statistics for one memo cache."""
+
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+
+class LruMemo:
+    """Bounded least-recently-used cache of query results.
+
+    Results are stored as tuples and returned as fresh lists, so callers can
+    mutate what they get back without corrupting the cache.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of entries kept.
+
+        Raises:
+            ValueError: If ``maxsize`` is less than 1.
+        """
+        if maxsize < 1:
+            raise ValueError("Memo size must be at least 1.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[str, ...]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, compute: Callable[[], list[str]]) -> list[str]:
+        """Return the cached result for ``key``, computing it on a miss.
+
+        Args:
+            key (Hashable): Cache key.
+            compute (Callable[[], list[str]]): Produces the result on a miss.
+
+        Returns:
+            list[str]: A copy of the cached result.
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(cached)
+            self.misses += 1
+        result = tuple(compute())
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return list(result)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> MemoStats:
+        """Return the cache's hit/miss statistics.
+
+        Returns:
+            MemoStats: Hits, misses, current size and maximum size.
+        """
+        with self._lock:
+            return MemoStats(
+                hits=self.hits,
+                misses=self.misses,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+
+_race_memo = LruMemo()
+_class_memo = LruMemo()
+_valid_races_memo = LruMemo()
+_valid_classes_memo = LruMemo()
+
+MEMOS: dict[str, LruMemo] = {
+    "validate_race": _race_memo,
+    "validate_class": _class_memo,
+    "valid_races_for_abilities": _valid_races_memo,
+    "valid_classes_for_race": _valid_classes_memo,
+}
+"""Memo caches keyed by the name of the function they memoize."""
+
+
+def ability_key(abilities: AbilityScores) -> AbilityKey:
+    """Convert ability scores to a hashable cache key.
+
+    Args:
+        abilities (AbilityScores): Ability scores.
+
+    Returns:
+        AbilityKey: Scores in ``AbilityScores`` field order.
+    """
+    return astuple(abilities)
+
+
+# --- Cached Queries ---
+
+def cached_validate_race(abilities: AbilityScores, race: str) -> list[str]:
+    """Memoized :func:`~rpgcharacters.character_generator.validate_race`.
+
+    Args:
+        abilities (AbilityScores): Ability scores to validate.
+        race (str): Race name to validate.
+
+    Returns:
+        list[str]: Validation messages. Empty when the race is valid.
+    """
+    key = (ability_key(abilities), race.lower())
+    return _race_memo.get(key, lambda: validate_race(abilities, race))
+
+
+def cached_validate_class(abilities: AbilityScores, race: str, class_name: str) -> list[str]:
+    """Memoized :func:`~rpgcharacters.character_generator.validate_class`.
+
+    Args:
+        abilities (AbilityScores): Ability scores to validate.
+        race (str): Character race to check for allowed classes.
+        class_name (str): Class name to validate.
+
+    Returns:
+        list[str]: Validation messages. Empty when the class is valid.
+
+    Raises:
+        KeyError: If ``race`` or ``class_name`` is unknown after normalization.
+    """
+    key = (ability_key(abilities), race.lower(), class_name.lower())
+    return _class_memo.get(key, lambda: validate_class(abilities, race, class_name))
+
+
+def cached_valid_races(abilities: AbilityScores) -> list[str]:
+    """Memoized :func:`~rpgcharacters.character_generator.valid_races_for_abilities`.
+
+    Args:
+        abilities (AbilityScores): Ability scores to evaluate.
+
+    Returns:
+        list[str]: Race names with no race-validation messages.
+    """
+    return _valid_races_memo.get(
+        ability_key(abilities), lambda: valid_races_for_abilities(abilities)
+    )
+
+
+def cached_valid_classes(abilities: AbilityScores, race: str) -> list[str]:
+    """Memoized :func:`~rpgcharacters.character_generator.valid_classes_for_race`.
+
+    Args:
+        abilities (AbilityScores): Ability scores to evaluate.
+        race (str): Race used for class compatibility checks.
+
+    Returns:
+        list[str]: Class names with no class-validation messages.
+    """
+    key = (ability_key(abilities), race.lower())
+    return _valid_classes_memo.get(key, lambda: valid_classes_for_race(abilities, race))
+
+
+# --- Maintenance ---
+
+def clear_memos() -> None:
+    """Clear every memo cache and reset its statistics."""
+    for memo in MEMOS.values():
+        memo.clear()
+
+
+def memo_stats() -> dict[str, MemoStats]:
+    """Return hit/miss statistics for every memo cache.
+
+    Returns:
+        dict[str, MemoStats]: Statistics keyed by memoized function name.
+    """
+    return {name: memo.stats() for name, memo in MEMOS.items()}
+
+
+on_rules_change(lambda _rules: clear_memos())
@@ -0,0 +1,276 @@
+"""
+Opt-in timing and counter instrumentation for character generation.
+
+Stages inside ``generate_character`` and the CLI are wrapped in ``stage``
+blocks. While metrics are disabled (the default) a stage is a shared no-op
+context manager, so instrumented code pays only a function call. Once enabled,
+each stage records its call count, cumulative time and a latency histogram,
+which can be exported in the Prometheus text format or as JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterable
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+from time import perf_counter
+from types import TracebackType
+from typing import Final, Literal, TypedDict
+
+# --- Constants ---
+
+DEFAULT_BUCKETS: Final[tuple[float, ...]] = (
+    0.000_001, 0.000_005,
+    0.000_01, 0.000_05,
+    0.000_1, 0.000_5,
+    0.001, 0.005,
+    0.01, 0.05,
+    0.1, 0.5,
+    1.0,
+)
+"""Histogram bucket upper bounds in seconds."""
+
+METRIC_NAME = "rpgcharacters_stage_seconds"
+
+MetricsFormat = Literal["prometheus", "json"]
+"""Supported metrics export formats."""
+
+_DISABLED_STAGE: Final = nullcontext()
+
+
+class StageSnapshot(TypedDict):
+    """Exported measurements for a single stage.
+
+    Attributes:
+        count: Number of completed calls.
+        total_seconds: Cumulative time spent in the stage.
+        buckets: Per-bucket (non-cumulative) call counts, one per bucket bound
+            plus a final overflow bucket.
+    """
+
+    count: int
+    total_seconds: float
+    buckets: list[int]
+
+
+class _StageTimer:
+    __slots__ = ("_registry", "_name", "_start")
+
+    def __init__(self, registry: MetricsRegistry, name: str) -> None:
+        self._registry = registry
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._registry.record(self._name, perf_counter() - self._start)
+
+
+class MetricsRegistry:
+    """Collect per-stage call counts, cumulative time and latency histograms.
+
+    Args:
+        buckets (Iterable[float]): Ascending histogram bucket upper bounds in
+            seconds.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self.enabled = False
+        self._stages: dict[str, StageSnapshot] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """Start recording stage measurements."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording stage measurements. Existing data is kept."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Discard all recorded measurements."""
+        with self._lock:
+            self._stages.clear()
+
+    def _empty_stage(self) -> StageSnapshot:
+        return {"count": 0, "total_seconds": 0.0, "buckets": [0] * (len(self.buckets) + 1)}
+
+    def stage(self, name: str) -> AbstractContextManager[None]:
+        """Return a context manager that times one call of a stage.
+
+        Args:
+            name (str): Stage name, e.g. ``"generate.hit_points"``.
+
+        Returns:
+            AbstractContextManager[None]: A timer when enabled, otherwise a
+                shared no-op context manager.
+        """
+        if not self.enabled:
+            return _DISABLED_STAGE
+        return _StageTimer(self, name)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record one completed call of a stage.
+
+        Args:
+            name (str): Stage name.
+            seconds (float): Elapsed time of the call.
+        """
+        bucket = len(self.buckets)
+        for index, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                bucket = index
+                break
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = self._empty_stage()
+            stats["count"] += 1
+            stats["total_seconds"] += seconds
+            stats["buckets"][bucket] += 1
+
+    def snapshot(self) -> dict[str, StageSnapshot]:
+        """Return a copy of the recorded measurements.
+
+        Returns:
+            dict[str, StageSnapshot]: Measurements keyed by stage name.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "count": stats["count"],
+                    "total_seconds": stats["total_seconds"],
+                    "buckets": list(stats["buckets"]),
+                }
+                for name, stats in sorted(self._stages.items())
+            }
+
+    def merge(self, snapshot: dict[str, StageSnapshot]) -> None:
+        """Add measurements from another registry, e.g. a worker process.
+
+        Args:
+            snapshot (dict[str, StageSnapshot]): Output of ``snapshot()`` from
+                a registry using the same buckets.
+
+        Raises:
+            ValueError: If the snapshot uses a different bucket layout.
+        """
+        with self._lock:
+            for name, other in snapshot.items():
+                if len(other["buckets"]) != len(self.buckets) + 1:
+                    raise ValueError(f"Bucket layout mismatch for stage '{name}'.")
+                stats = self._stages.get(name)
+                if stats is None:
+                    stats = self._stages[name] = self._empty_stage()
+                stats["count"] += other["count"]
+                stats["total_seconds"] += other["total_seconds"]
+                for index, value in enumerate(other["buckets"]):
+                    stats["buckets"][index] += value
+
+    def to_json(self) -> str:
+        """Export measurements as a JSON document.
+
+        Returns:
+            str: JSON with the bucket bounds and per-stage measurements.
+        """
+        return json.dumps(
+            {"buckets": list(self.buckets), "stages": self.snapshot()},
+            indent=2,
+        )
+
+    def to_prometheus(self) -> str:
+        """Export measurements in the Prometheus text exposition format.
+
+        Returns:
+            str: One histogram family with a ``stage`` label per stage.
+        """
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in character generation stages.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for name, stats in self.snapshot().items():
+            cumulative = 0
+            for bound, value in zip(self.buckets, stats["buckets"], strict=False):
+                cumulative += value
+                lines.append(
+                    f'{METRIC_NAME}_bucket{{stage="{name}",le="{bound:g}"}} {cumulative}'
+                )
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{name}",le="+Inf"}} {stats["count"]}')
+            lines.append(f'{METRIC_NAME}_sum{{stage="{name}"}} {stats["total_seconds"]!r}')
+            lines.append(f'{METRIC_NAME}_count{{stage="{name}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, format_: MetricsFormat = "prometheus") -> str:
+        """Export measurements in the requested format.
+
+        Args:
+            format_ (MetricsFormat): ``"prometheus"`` or ``"json"``.
+
+        Returns:
+            str: Serialized measurements.
+        """
+        return self.to_json() if format_ == "json" else self.to_prometheus()
+
+
+# --- Default Registry ---
+
+METRICS: Final[MetricsRegistry] = MetricsRegistry()
+"""Process-wide registry used by the instrumented generation stages."""
+
+
+def stage(name: str) -> AbstractContextManager[None]:
+    """Time one call of a stage in the default registry.
+
+    Args:
+        name (str): Stage name.
+
+    Returns:
+        AbstractContextManager[None]: Stage timer, or a no-op when disabled.
+    """
+    return METRICS.stage(name)
+
+
+def enable_metrics() -> None:
+    """Enable recording in the default registry."""
+    METRICS.enable()
+
+
+def disable_metrics() -> None:
+    """Disable recording in the default registry."""
+    METRICS.disable()
+
+
+def export_metrics(format_: MetricsFormat = "prometheus") -> str:
+    """Export the default registry.
+
+    Args:
+        format_ (MetricsFormat): ``"prometheus"`` or ``"json"``.
+
+    Returns:
+        str: Serialized measurements.
+    """
+    return METRICS.export(format_)
+
+
+def write_metrics(path: str | Path) -> None:
+    """Write the default registry to a file.
+
+    Files ending in ``.json`` are written as JSON; anything else uses the
+    Prometheus text format.
+
+    Args:
+        path (str | Path): Destination file.
+    """
+    path = Path(path)
+    format_: MetricsFormat = "json" if path.suffix.lower() == ".json" else "prometheus"
+    path.write_text(export_metrics(format_), encoding="utf-8")
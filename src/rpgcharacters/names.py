@@ -0,0 +1,245 @@
+"""
+Generated names for unnamed characters.
+
+Each race has a bundled word list of given names
+(``rpgcharacters/data/names/<race>.txt``). On first use the list is compiled
+into a character-level n-gram model: every context of the last ``order``
+letters becomes a numbered state holding each letter that followed it in the
+list, once per occurrence, and the state each entry leads to. Sampling a
+name is then one uniform draw and two lookups per letter, with no string
+slicing, dictionary lookups or searching.
+
+Names are drawn from the character's own :class:`DiceRoller`, after the
+character itself is generated, so a seeded run gives the same names every
+time and turning names on does not change any other field. Races without a
+bundled list, such as those added by rules packs, use the human list.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cache
+from importlib import resources
+from typing import Final
+
+from diceroller.core import DiceRoller
+
+from rpgcharacters.character_generator import Character
+
+# --- Constants ---
+
+DEFAULT_NAME_ORDER = 2
+DEFAULT_NAME_RACE: Final = "human"
+MIN_NAME_LENGTH = 3
+MAX_NAME_LENGTH = 12
+MAX_NAME_ATTEMPTS = 100
+_END: Final = "$"
+
+
+@dataclass(frozen=True, slots=True)
+class NameModel:
+    """Compiled n-gram model of a word list.
+
+    Attributes:
+        order: Number of preceding letters each choice depends on.
+        states: States by number; state ``0`` starts a name. Each state is
+            the letters seen after its context, repeated as often as they
+            were seen so a uniform pick follows their frequency (``"$"``
+            ends the name); the state reached after each of those entries;
+            and the index of the last entry.
+    """
+
+    order: int
+    states: tuple[tuple[str, array[int], int], ...]
+
+    def generate(self, rng: DiceRoller) -> str:
+        """Draw one name.
+
+        Names shorter than :data:`MIN_NAME_LENGTH` or longer than
+        :data:`MAX_NAME_LENGTH` letters are redrawn.
+
+        Args:
+            rng (DiceRoller): Dice roller whose generator makes the draws.
+
+        Returns:
+            str: Capitalized name.
+
+        Raises:
+            ValueError: If no name of an allowed length is drawn within
+                :data:`MAX_NAME_ATTEMPTS` attempts.
+        """
+        randint, states = rng.rng.randint, self.states
+        for _ in range(MAX_NAME_ATTEMPTS):
+            name = ""
+            letters, targets, last = states[0]
+            while len(name) <= MAX_NAME_LENGTH:
+                choice = randint(0, last)
+                letter = letters[choice]
+                if letter == _END:
+                    break
+                name += letter
+                letters, targets, last = states[targets[choice]]
+            if MIN_NAME_LENGTH <= len(name) <= MAX_NAME_LENGTH:
+                return name.capitalize()
+        raise ValueError(f"No name of {MIN_NAME_LENGTH} to {MAX_NAME_LENGTH} letters was drawn.")
+
+
+def compile_names(words: Iterable[str], order: int = DEFAULT_NAME_ORDER) -> NameModel:
+    """Compile a word list into an n-gram model.
+
+    Args:
+        words (Iterable[str]): Training names; case is ignored.
+        order (int): Number of preceding letters each choice depends on.
+
+    Returns:
+        NameModel: Compiled model.
+
+    Raises:
+        ValueError: If ``order`` is less than 1, no word is given, or a word
+            contains ``"$"``.
+    """
+    cleaned = [word.strip().lower() for word in words if word.strip()]
+    errors: list[str] = []
+    if order < 1:
+        errors.append("Name order must be at least 1.")
+    if not cleaned:
+        errors.append("No names to learn from.")
+    if any(_END in word for word in cleaned):
+        errors.append(f"Names cannot contain '{_END}'.")
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    # Contexts are the last `order` letters, padded with NUL at the start.
+    counts: dict[str, dict[str, int]] = {}
+    for word in cleaned:
+        context = "\0" * order
+        for letter in word + _END:
+            following = counts.setdefault(context, {})
+            following[letter] = following.get(letter, 0) + 1
+            context = context[1:] + letter
+
+    numbers = {"\0" * order: 0}
+    for context in counts:
+        numbers.setdefault(context, len(numbers))
+    states: list[tuple[str, array[int], int]] = [("", array("I"), -1)] * len(numbers)
+    for context, following in counts.items():
+        letters = "".join(letter * following[letter] for letter in sorted(following))
+        # The end marker leads nowhere; any state number will do.
+        targets = array("I", (numbers.get(context[1:] + letter, 0) for letter in letters))
+        states[numbers[context]] = (letters, targets, len(letters) - 1)
+    return NameModel(order=order, states=tuple(states))
+
+
+def word_list(race: str) -> tuple[str, ...]:
+    """Read the bundled names for a race.
+
+    Args:
+        race (str): Race name; races without a list use the human list.
+
+    Returns:
+        tuple[str, ...]: Names, lowercase, without comments or blank lines.
+    """
+    directory = resources.files("rpgcharacters").joinpath("data", "names")
+    path = directory.joinpath(f"{race.lower()}.txt")
+    if not path.is_file():
+        path = directory.joinpath(f"{DEFAULT_NAME_RACE}.txt")
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return tuple(
+        line.strip().lower() for line in lines if line.strip() and not line.startswith("#")
+    )
+
+
+@cache
+def name_model(race: str, order: int = DEFAULT_NAME_ORDER) -> NameModel:
+    """Return the compiled model for a race, compiling it on first use.
+
+    Args:
+        race (str): Race name.
+        order (int): Number of preceding letters each choice depends on.
+
+    Returns:
+        NameModel: Compiled model of the race's word list.
+    """
+    return compile_names(word_list(race), order)
+
+
+# --- Generation ---
+
+def generate_name(rng: DiceRoller, race: str) -> str:
+    """Draw one name for a race.
+
+    Args:
+        rng (DiceRoller): Dice roller whose generator makes the draws.
+        race (str): Race name.
+
+    Returns:
+        str: Capitalized name.
+    """
+    return name_model(race.lower()).generate(rng)
+
+
+def name_character(character: Character, rng: DiceRoller) -> Character:
+    """Give an unnamed character a name drawn for its race.
+
+    Args:
+        character (Character): Character to name; it is updated in place.
+        rng (DiceRoller): Dice roller the character was generated with.
+
+    Returns:
+        Character: The same character.
+    """
+    if character.name is None:
+        character.name = generate_name(rng, character.race)
+    return character
+
+
+def generate_names(
+    race: str,
+    count: int,
+    rng: DiceRoller,
+    unique: bool = False,
+    order: int = DEFAULT_NAME_ORDER,
+) -> list[str]:
+    """Draw many names for a race.
+
+    Args:
+        race (str): Race name.
+        count (int): Number of names.
+        rng (DiceRoller): Dice roller whose generator makes the draws.
+        unique (bool): Whether every name must differ from the others.
+        order (int): Number of preceding letters each choice depends on;
+            lower orders give less familiar names but many more distinct
+            ones.
+
+    Returns:
+        list[str]: Names in the order drawn.
+
+    Raises:
+        ValueError: If ``count`` is negative, or ``unique`` is set and
+            :data:`MAX_NAME_ATTEMPTS` draws in a row repeat earlier names.
+    """
+    if count < 0:
+        raise ValueError("Name count cannot be negative.")
+    generate = name_model(race.lower(), order).generate
+    if not unique:
+        return [generate(rng) for _ in range(count)]
+
+    names: list[str] = []
+    seen: set[str] = set()
+    misses = 0
+    while len(names) < count:
+        name = generate(rng)
+        if name in seen:
+            misses += 1
+            if misses >= MAX_NAME_ATTEMPTS:
+                raise ValueError(
+                    f"Only found {len(names)} unique {race.lower()} names; "
+                    "the word list cannot produce that many."
+                )
+            continue
+        misses = 0
+        seen.add(name)
+        names.append(name)
+    return names
@@ -0,0 +1,429 @@
+"""
+Compact binary encoding of generated characters.
+
+Workers that run in other interpreters return their characters as packed
+bytes instead of pickled dataclasses. A record stores the six scores, rules
+table indices for race and class, the derived combat values and the two
+variable-length fields. Ability modifiers are not stored; they are
+recomputed from the scores when a record is unpacked.
+
+Nameless level-1 characters with an empty inventory can go further: every
+field that is not derivable from the rules tables fits in one 64-bit code,
+which :class:`CharacterPool` stores in an ``array('Q')``.
+
+Records and codes refer to races and classes by their index in a
+``CompiledRules`` table, so they must be decoded with the same rules they
+were encoded with.
+"""
+
+from __future__ import annotations
+
+import struct
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Final, Self
+
+from rpgcharacters.character_generator import (
+    AbilityScores,
+    Character,
+    calculate_ability_modifiers,
+    level_one_attack_bonus,
+)
+from rpgcharacters.rules import (
+    ABILITY_NAMES,
+    ABILITY_SCORE_MIN,
+    SAVING_THROW_NAMES,
+    CompiledRules,
+    active_rules,
+)
+
+# --- Constants ---
+
+_COUNT: Final = struct.Struct("<I")
+_LENGTH: Final = struct.Struct("<H")
+_RECORD: Final = struct.Struct(f"<{len(ABILITY_NAMES)}BBBBhhhI{len(SAVING_THROW_NAMES)}bBB")
+"""Scores, race, class, level, hp, ac, attack bonus, money, saves, flags, items."""
+
+_HAS_NAME: Final = 0x01
+
+# 64-bit code layout, low to high: six 4-bit scores (score - 3, CHA highest),
+# 8-bit hp, 8-bit money / 10, 4-bit class index, 4-bit race index. Sorting
+# codes therefore groups characters by race, then class.
+_SCORE_BITS = 4
+_HP_SHIFT = _SCORE_BITS * len(ABILITY_NAMES)
+_MONEY_SHIFT = _HP_SHIFT + 8
+_CLASS_SHIFT = _MONEY_SHIFT + 8
+_RACE_SHIFT = _CLASS_SHIFT + 4
+_BYTE = 0xFF
+_NIBBLE = 0x0F
+
+
+def _pack_text(parts: list[bytes], text: str) -> None:
+    data = text.encode("utf-8")
+    parts.append(_LENGTH.pack(len(data)))
+    parts.append(data)
+
+
+def _unpack_text(view: memoryview, offset: int) -> tuple[str, int]:
+    (length,) = _LENGTH.unpack_from(view, offset)
+    offset += _LENGTH.size
+    return str(view[offset:offset + length], "utf-8"), offset + length
+
+
+def pack_characters(characters: Iterable[Character], rules: CompiledRules) -> bytes:
+    """Encode characters as a single packed byte string.
+
+    Args:
+        characters (Iterable[Character]): Characters to encode.
+        rules (CompiledRules): Rules whose tables index races and classes.
+
+    Returns:
+        bytes: Record count followed by one record per character.
+
+    Raises:
+        ValueError: If a character uses an unknown race or class, or a value
+            does not fit its field.
+    """
+    parts: list[bytes] = [b""]
+    count = 0
+    for character in characters:
+        try:
+            parts.append(
+                _RECORD.pack(
+                    *(getattr(character.abilities, name) for name in ABILITY_NAMES),
+                    rules.race_index(character.race),
+                    rules.class_index(character.class_name),
+                    character.level,
+                    character.hp,
+                    character.ac,
+                    character.attack_bonus,
+                    character.money_gp,
+                    *(character.saving_throws[name] for name in SAVING_THROW_NAMES),
+                    _HAS_NAME if character.name is not None else 0,
+                    len(character.inventory),
+                )
+            )
+        except struct.error as exc:
+            raise ValueError(f"Character cannot be packed: {exc}") from exc
+        if character.name is not None:
+            _pack_text(parts, character.name)
+        for item in character.inventory:
+            _pack_text(parts, item)
+        count += 1
+    parts[0] = _COUNT.pack(count)
+    return b"".join(parts)
+
+
+def unpack_characters(data: bytes, rules: CompiledRules) -> list[Character]:
+    """Decode characters produced by :func:`pack_characters`.
+
+    Args:
+        data (bytes): Packed characters.
+        rules (CompiledRules): Rules the characters were packed with.
+
+    Returns:
+        list[Character]: Characters in packed order.
+    """
+    view = memoryview(data)
+    (count,) = _COUNT.unpack_from(view, 0)
+    offset = _COUNT.size
+    ability_count = len(ABILITY_NAMES)
+    save_count = len(SAVING_THROW_NAMES)
+    characters = []
+    for _ in range(count):
+        fields = _RECORD.unpack_from(view, offset)
+        offset += _RECORD.size
+        scores = fields[:ability_count]
+        race_index, class_index, level, hp, ac, attack_bonus, money_gp = fields[
+            ability_count:ability_count + 7
+        ]
+        saves = dict(zip(SAVING_THROW_NAMES, fields[ability_count + 7:-2], strict=True))
+        flags, item_count = fields[ability_count + 7 + save_count:]
+
+        name = None
+        if flags & _HAS_NAME:
+            name, offset = _unpack_text(view, offset)
+        inventory = []
+        for _ in range(item_count):
+            item, offset = _unpack_text(view, offset)
+            inventory.append(item)
+
+        class_name = rules.class_names[class_index]
+        abilities = AbilityScores(**dict(zip(ABILITY_NAMES, scores, strict=True)))
+        save_order = rules.pack["classes"][class_name]["saving_throws"]
+        characters.append(
+            Character(
+                abilities=abilities,
+                ability_mods=calculate_ability_modifiers(abilities),
+                ac=ac,
+                attack_bonus=attack_bonus,
+                class_name=class_name,
+                hp=hp,
+                inventory=inventory,
+                level=level,
+                money_gp=money_gp,
+                name=name,
+                race=rules.race_names[race_index],
+                saving_throws={save: saves[save] for save in save_order},
+            )
+        )
+    return characters
+
+
+# --- 64-bit Codes ---
+
+def _derived_saves(rules: CompiledRules, race_index: int, class_index: int) -> dict[str, int]:
+    # Keyed in the class's table order, like calculate_saving_throws.
+    saves = dict(zip(SAVING_THROW_NAMES, rules.saving_throws[race_index][class_index], strict=True))
+    class_name = rules.class_names[class_index]
+    return {save: saves[save] for save in rules.pack["classes"][class_name]["saving_throws"]}
+
+
+def encode_character(character: Character, rules: CompiledRules | None = None) -> int:
+    """Encode a nameless level-1 character as a single 64-bit code.
+
+    Modifiers, saving throws, armor class and attack bonus are not stored;
+    they are recomputed from ``rules`` when the code is decoded, so they
+    must equal the values derived from ``rules``.
+
+    Args:
+        character (Character): Character to encode.
+        rules (CompiledRules | None): Rules whose tables give race and class
+            indices; defaults to the active rules.
+
+    Returns:
+        int: Unsigned 64-bit code.
+
+    Raises:
+        ValueError: If the character has a name, inventory, level above 1,
+            values outside the code's fields, or modifiers, saving throws,
+            armor class or attack bonus that differ from the derived values.
+    """
+    rules = rules or active_rules()
+    if character.name is not None or character.inventory or character.level != 1:
+        raise ValueError("Only nameless level-1 characters without inventory can be encoded.")
+    race_index = rules.race_index(character.race)
+    class_index = rules.class_index(character.class_name)
+    money, remainder = divmod(character.money_gp, 10)
+    if (
+        race_index > _NIBBLE
+        or class_index > _NIBBLE
+        or not 0 <= character.hp <= _BYTE
+        or remainder
+        or not 0 <= money <= _BYTE
+    ):
+        raise ValueError("Character values do not fit a 64-bit code.")
+    ability_mods = calculate_ability_modifiers(character.abilities)
+    if (
+        character.ability_mods != ability_mods
+        or character.saving_throws != _derived_saves(rules, race_index, class_index)
+        or character.ac != rules.base_ac + ability_mods["DEX"]
+        or character.attack_bonus != level_one_attack_bonus()
+    ):
+        raise ValueError("Character combat values differ from the derived values.")
+
+    code = race_index << _RACE_SHIFT | class_index << _CLASS_SHIFT
+    code |= money << _MONEY_SHIFT | character.hp << _HP_SHIFT
+    shift = _HP_SHIFT
+    for name in ABILITY_NAMES:
+        shift -= _SCORE_BITS
+        offset = getattr(character.abilities, name) - ABILITY_SCORE_MIN
+        if not 0 <= offset <= _NIBBLE:
+            raise ValueError(f"{name} score does not fit a 64-bit code.")
+        code |= offset << shift
+    return code
+
+
+def decode_character(code: int, rules: CompiledRules | None = None) -> Character:
+    """Decode a 64-bit code produced by :func:`encode_character`.
+
+    Derived fields are recomputed from ``rules``.
+
+    Args:
+        code (int): Character code.
+        rules (CompiledRules | None): Rules the code was encoded with;
+            defaults to the active rules.
+
+    Returns:
+        Character: The decoded character.
+    """
+    rules = rules or active_rules()
+    shift = _HP_SHIFT
+    scores = {}
+    for name in ABILITY_NAMES:
+        shift -= _SCORE_BITS
+        scores[name] = (code >> shift & _NIBBLE) + ABILITY_SCORE_MIN
+    abilities = AbilityScores(**scores)
+    ability_mods = calculate_ability_modifiers(abilities)
+    race_index = code >> _RACE_SHIFT & _NIBBLE
+    class_index = code >> _CLASS_SHIFT & _NIBBLE
+    return Character(
+        abilities=abilities,
+        ability_mods=ability_mods,
+        ac=rules.base_ac + ability_mods["DEX"],
+        attack_bonus=level_one_attack_bonus(),
+        class_name=rules.class_names[class_index],
+        hp=code >> _HP_SHIFT & _BYTE,
+        inventory=[],
+        level=1,
+        money_gp=(code >> _MONEY_SHIFT & _BYTE) * 10,
+        name=None,
+        race=rules.race_names[race_index],
+        saving_throws=_derived_saves(rules, race_index, class_index),
+    )
+
+
+class CharacterPool:
+    """In-memory pool of nameless level-1 characters, eight bytes each.
+
+    Characters are kept as 64-bit codes in an ``array('Q')`` and decoded on
+    access. Sorting, deduplication, membership and set operations work on
+    the codes directly. Membership tests use a set of the codes that is
+    built on first use and rebuilt after the pool changes through its
+    methods or by assigning :attr:`codes`.
+    """
+
+    def __init__(self, codes: Iterable[int] = (), rules: CompiledRules | None = None) -> None:
+        """Create a pool from existing codes.
+
+        Args:
+            codes (Iterable[int]): Character codes.
+            rules (CompiledRules | None): Rules the codes were encoded with;
+                defaults to the active rules.
+        """
+        self.rules = rules or active_rules()
+        self.codes = array("Q", codes)
+
+    @property
+    def codes(self) -> array[int]:
+        """The character codes."""
+        return self._codes
+
+    @codes.setter
+    def codes(self, codes: array[int]) -> None:
+        self._codes = codes
+        self._members: frozenset[int] | None = None
+
+    @classmethod
+    def from_characters(
+        cls,
+        characters: Iterable[Character],
+        rules: CompiledRules | None = None,
+    ) -> Self:
+        """Create a pool by encoding characters.
+
+        Args:
+            characters (Iterable[Character]): Characters to encode.
+            rules (CompiledRules | None): Rules to encode with; defaults to
+                the active rules.
+
+        Returns:
+            CharacterPool: Pool holding the encoded characters.
+        """
+        pool = cls(rules=rules)
+        pool.extend(characters)
+        return pool
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the codes, in bytes."""
+        return len(self.codes) * self.codes.itemsize
+
+    def append(self, character: Character) -> None:
+        """Encode and add one character.
+
+        Args:
+            character (Character): Character to add.
+        """
+        self.codes.append(encode_character(character, self.rules))
+        self._members = None
+
+    def extend(self, characters: Iterable[Character]) -> None:
+        """Encode and add several characters.
+
+        Args:
+            characters (Iterable[Character]): Characters to add.
+        """
+        self.codes.extend(encode_character(character, self.rules) for character in characters)
+        self._members = None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Character:
+        return decode_character(self.codes[index], self.rules)
+
+    def __iter__(self) -> Iterator[Character]:
+        for code in self.codes:
+            yield decode_character(code, self.rules)
+
+    def __contains__(self, character: object) -> bool:
+        if not isinstance(character, Character):
+            return False
+        try:
+            code = encode_character(character, self.rules)
+        except ValueError:
+            return False
+        if self._members is None:
+            self._members = frozenset(self._codes)
+        return code in self._members
+
+    def sort(self) -> None:
+        """Sort the codes in place (by race, class, money, hp, then scores)."""
+        self.codes = array("Q", sorted(self.codes))
+
+    def dedup(self) -> None:
+        """Remove duplicate characters in place, leaving the codes sorted."""
+        self.codes = array("Q", sorted(set(self.codes)))
+
+    def _combine(self, codes: set[int]) -> CharacterPool:
+        return CharacterPool(sorted(codes), self.rules)
+
+    def _check_rules(self, other: CharacterPool) -> None:
+        if other.rules.digest != self.rules.digest:
+            raise ValueError("Pools were encoded with different rules.")
+
+    def union(self, other: CharacterPool) -> CharacterPool:
+        """Return the sorted, deduplicated characters in either pool.
+
+        Args:
+            other (CharacterPool): Pool encoded with the same rules.
+
+        Returns:
+            CharacterPool: New pool.
+
+        Raises:
+            ValueError: If the pools use different rules.
+        """
+        self._check_rules(other)
+        return self._combine(set(self.codes) | set(other.codes))
+
+    def intersection(self, other: CharacterPool) -> CharacterPool:
+        """Return the sorted, deduplicated characters in both pools.
+
+        Args:
+            other (CharacterPool): Pool encoded with the same rules.
+
+        Returns:
+            CharacterPool: New pool.
+
+        Raises:
+            ValueError: If the pools use different rules.
+        """
+        self._check_rules(other)
+        return self._combine(set(self.codes) & set(other.codes))
+
+    def difference(self, other: CharacterPool) -> CharacterPool:
+        """Return the sorted, deduplicated characters not in ``other``.
+
+        Args:
+            other (CharacterPool): Pool encoded with the same rules.
+
+        Returns:
+            CharacterPool: New pool.
+
+        Raises:
+            ValueError: If the pools use different rules.
+        """
+        self._check_rules(other)
+        return self._combine(set(self.codes) - set(other.codes))
@@ -0,0 +1,347 @@
+"""
+Party generation under class and race coverage constraints.
+
+A party is planned before anything is rolled: race/class roles are assigned
+with a search over the legal pairs from the rules tables, then each member's
+abilities are sampled conditioned on their role. Every generated party meets
+its constraints on the first attempt, with no discarded characters.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from diceroller.core import DiceRoller
+
+from rpgcharacters.ability_methods import ABILITY_METHODS, DEFAULT_ABILITY_METHOD
+from rpgcharacters.bulk import (
+    DEFAULT_CHUNK_SIZE,
+    Backend,
+    chunk_ranges,
+    create_indexed_roller,
+    interpreter_map,
+    parallel_map,
+)
+from rpgcharacters.character_generator import Character, generate_character
+from rpgcharacters.names import name_character
+from rpgcharacters.packing import pack_characters, unpack_characters
+from rpgcharacters.rules import CompiledRules, active_rules
+from rpgcharacters.sampling import is_feasible, roll_conditioned_abilities
+
+# --- Domain Models ---
+
+@dataclass(frozen=True)
+class PartySpec:
+    """Constraints a generated party must satisfy.
+
+    Attributes:
+        size: Number of party members.
+        min_classes: Minimum members per class name.
+        max_classes: Maximum members per class name.
+        min_races: Minimum members per race name.
+        max_races: Maximum members per race name.
+        unique_races: Whether every member must have a different race.
+        unique_classes: Whether every member must have a different class.
+        ability_method: Name of the ability method members' scores follow.
+        random_names: Whether members get names drawn for their race.
+    """
+
+    size: int
+    min_classes: Mapping[str, int] = field(default_factory=dict)
+    max_classes: Mapping[str, int] = field(default_factory=dict)
+    min_races: Mapping[str, int] = field(default_factory=dict)
+    max_races: Mapping[str, int] = field(default_factory=dict)
+    unique_races: bool = False
+    unique_classes: bool = False
+    ability_method: str = DEFAULT_ABILITY_METHOD
+    random_names: bool = False
+
+
+@dataclass
+class Party:
+    """A generated party.
+
+    Attributes:
+        members: Party members in planned order.
+    """
+
+    members: list[Character]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the party to a JSON-friendly dictionary.
+
+        Returns:
+            dict[str, Any]: Party data with a ``members`` list.
+        """
+        return {"members": [member.to_dict() for member in self.members]}
+
+
+# --- Planning ---
+
+def validate_party_spec(spec: PartySpec, rules: CompiledRules | None = None) -> list[str]:
+    """Check a party spec for unknown names and obviously impossible limits.
+
+    Args:
+        spec (PartySpec): Party constraints.
+        rules (CompiledRules | None): Rules to check against; defaults to the
+            active rules.
+
+    Returns:
+        list[str]: Validation messages. Empty when the spec looks satisfiable.
+    """
+    rules = rules or active_rules()
+    errors: list[str] = []
+    if spec.size < 1:
+        errors.append("Party size must be at least 1.")
+    if spec.ability_method not in ABILITY_METHODS:
+        errors.append(f"Unknown ability method: '{spec.ability_method}'")
+    for label, limits, known in (
+        ("class", spec.min_classes, rules.class_names),
+        ("class", spec.max_classes, rules.class_names),
+        ("race", spec.min_races, rules.race_names),
+        ("race", spec.max_races, rules.race_names),
+    ):
+        for name, value in limits.items():
+            if name.lower() not in known:
+                errors.append(f"Unknown {label}: '{name.lower()}'")
+            if value < 0:
+                errors.append(f"Party {label} limit for '{name.lower()}' must not be negative.")
+    if sum(spec.min_classes.values()) > spec.size:
+        errors.append("Class minimums need more members than the party size.")
+    if sum(spec.min_races.values()) > spec.size:
+        errors.append("Race minimums need more members than the party size.")
+    if spec.unique_races and spec.size > len(rules.race_names):
+        errors.append(f"A party of {spec.size} cannot have unique races.")
+    if spec.unique_classes and spec.size > len(rules.class_names):
+        errors.append(f"A party of {spec.size} cannot have unique classes.")
+    return errors
+
+
+def _limit_table(limits: Mapping[str, int], names: tuple[str, ...], default: int) -> list[int]:
+    lowered = {name.lower(): value for name, value in limits.items()}
+    return [lowered.get(name, default) for name in names]
+
+
+def plan_party(
+    spec: PartySpec,
+    rng: DiceRoller,
+    rules: CompiledRules | None = None,
+) -> list[tuple[str, str]]:
+    """Assign a race and class to every party slot.
+
+    Slots are filled depth-first, trying the legal race/class pairs in a
+    random order drawn from ``rng``. Branches are pruned when the remaining
+    slots cannot cover the unmet minimums, and dead-end count states are
+    remembered so infeasible specs fail quickly.
+
+    Args:
+        spec (PartySpec): Party constraints.
+        rng (DiceRoller): Dice roller whose generator orders the search.
+        rules (CompiledRules | None): Rules to plan with; defaults to the
+            active rules.
+
+    Returns:
+        list[tuple[str, str]]: ``(race, class)`` per member.
+
+    Raises:
+        ValueError: If the spec is invalid or no assignment satisfies it.
+    """
+    rules = rules or active_rules()
+    errors = validate_party_spec(spec, rules)
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    race_count = len(rules.race_names)
+    class_count = len(rules.class_names)
+    class_min = _limit_table(spec.min_classes, rules.class_names, 0)
+    race_min = _limit_table(spec.min_races, rules.race_names, 0)
+    class_max = _limit_table(spec.max_classes, rules.class_names, spec.size)
+    race_max = _limit_table(spec.max_races, rules.race_names, spec.size)
+    if spec.unique_classes:
+        class_max = [min(value, 1) for value in class_max]
+    if spec.unique_races:
+        race_max = [min(value, 1) for value in race_max]
+
+    pairs = [
+        (race_index, class_index)
+        for race_index in range(race_count)
+        for class_index in range(class_count)
+        if is_feasible(rules, race_index, class_index, spec.ability_method)
+    ]
+    race_used = [0] * race_count
+    class_used = [0] * class_count
+    plan: list[tuple[int, int]] = []
+    dead_ends: set[tuple[tuple[int, ...], tuple[int, ...]]] = set()
+
+    def fill(remaining: int) -> bool:
+        class_deficit = sum(max(0, low - used) for low, used in zip(class_min, class_used))
+        race_deficit = sum(max(0, low - used) for low, used in zip(race_min, race_used))
+        if max(class_deficit, race_deficit) > remaining:
+            return False
+        if remaining == 0:
+            return True
+        state = (tuple(race_used), tuple(class_used))
+        if state in dead_ends:
+            return False
+        order = list(pairs)
+        for index in range(len(order) - 1, 0, -1):
+            swap = rng.rng.randint(0, index)
+            order[index], order[swap] = order[swap], order[index]
+        for race_index, class_index in order:
+            if race_used[race_index] >= race_max[race_index]:
+                continue
+            if class_used[class_index] >= class_max[class_index]:
+                continue
+            race_used[race_index] += 1
+            class_used[class_index] += 1
+            plan.append((race_index, class_index))
+            if fill(remaining - 1):
+                return True
+            plan.pop()
+            race_used[race_index] -= 1
+            class_used[class_index] -= 1
+        dead_ends.add(state)
+        return False
+
+    if not fill(spec.size):
+        raise ValueError("No party satisfies the requested constraints.")
+    return [
+        (rules.race_names[race_index], rules.class_names[class_index])
+        for race_index, class_index in plan
+    ]
+
+
+# --- Generation ---
+
+def generate_party(
+    spec: PartySpec,
+    rng: DiceRoller,
+    rules: CompiledRules | None = None,
+) -> Party:
+    """Plan a party and generate every member for their assigned role.
+
+    Args:
+        spec (PartySpec): Party constraints.
+        rng (DiceRoller): Dice roller used for planning and all members.
+        rules (CompiledRules | None): Rules to use; defaults to the active
+            rules.
+
+    Returns:
+        Party: A party that satisfies ``spec``.
+
+    Raises:
+        ValueError: If no party satisfies ``spec``.
+    """
+    rules = rules or active_rules()
+    members = []
+    for race, class_name in plan_party(spec, rng, rules):
+        abilities = roll_conditioned_abilities(
+            race, class_name, rng, rules, spec.ability_method
+        )
+        member = generate_character(race, class_name, rng, abilities=abilities)
+        members.append(name_character(member, rng) if spec.random_names else member)
+    return Party(members=members)
+
+
+def generate_indexed_party(spec: PartySpec, seed: int, index: int) -> Party:
+    """Generate the party at ``index`` of a seeded party job.
+
+    Args:
+        spec (PartySpec): Party constraints.
+        seed (int): Job seed.
+        index (int): Zero-based party index.
+
+    Returns:
+        Party: The generated party.
+    """
+    return generate_party(spec, create_indexed_roller(seed, index))
+
+
+def generate_party_chunk(spec: PartySpec, seed: int, start: int, stop: int) -> list[Party]:
+    """Generate parties ``start`` through ``stop - 1`` of a seeded party job.
+
+    Args:
+        spec (PartySpec): Party constraints.
+        seed (int): Job seed.
+        start (int): First index (inclusive).
+        stop (int): Last index (exclusive).
+
+    Returns:
+        list[Party]: Parties in index order.
+    """
+    return [generate_indexed_party(spec, seed, index) for index in range(start, stop)]
+
+
+def generate_packed_party_chunk(spec: PartySpec, seed: int, start: int, stop: int) -> bytes:
+    """Generate a chunk of parties and pack their members with the active rules.
+
+    Every party has ``spec.size`` members, so members are packed one party
+    after another and split again by size when unpacked.
+
+    Args:
+        spec (PartySpec): Party constraints.
+        seed (int): Job seed.
+        start (int): First index (inclusive).
+        stop (int): Last index (exclusive).
+
+    Returns:
+        bytes: Members encoded by :func:`~rpgcharacters.packing.pack_characters`.
+    """
+    parties = generate_party_chunk(spec, seed, start, stop)
+    members = [member for party in parties for member in party.members]
+    return pack_characters(members, active_rules())
+
+
+def iter_parties(
+    spec: PartySpec,
+    count: int,
+    seed: int,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    profile_dir: str | Path | None = None,
+    backend: Backend = "process",
+) -> Iterator[Party]:
+    """Generate ``count`` parties for a seeded job, in index order.
+
+    Party ``i`` depends only on ``seed`` and ``i``, so results are identical
+    for any number of workers.
+
+    Args:
+        spec (PartySpec): Party constraints.
+        count (int): Number of parties to generate.
+        seed (int): Job seed.
+        workers (int): Number of workers; ``1`` generates inline.
+        chunk_size (int): Parties per worker task.
+        profile_dir (str | Path | None): Directory for per-worker cProfile
+            output, or ``None``.
+        backend (Backend): ``"process"``, ``"thread"`` or ``"interpreter"``.
+
+    Yields:
+        Party: Parties ``0`` through ``count - 1``.
+
+    Raises:
+        ValueError: If no party satisfies ``spec``.
+    """
+    errors = validate_party_spec(spec)
+    if errors:
+        raise ValueError("; ".join(errors))
+    if workers <= 1:
+        for index in range(count):
+            yield generate_indexed_party(spec, seed, index)
+        return
+
+    task_args = ((spec, seed, start, stop) for start, stop in chunk_ranges(0, count, chunk_size))
+    if backend == "interpreter":
+        rules = active_rules()
+        for packed in interpreter_map(generate_packed_party_chunk, task_args, workers):
+            members = unpack_characters(packed, rules)
+            for offset in range(0, len(members), spec.size):
+                yield Party(members[offset : offset + spec.size])
+        return
+    for parties in parallel_map(
+        generate_party_chunk, task_args, workers, backend, profile_dir
+    ):
+        yield from parties
@@ -0,0 +1,123 @@
+"""
+Profile output helpers for bulk CLI runs.
+
+The CLI profiles its own process with ``cProfile`` while each bulk worker
+writes its stats to a scratch directory. This module merges those stats into
+a single pstats file and renders them as flamegraph-compatible collapsed
+stacks (one ``frame;frame;frame microseconds`` line per stack).
+"""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+from collections import defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+# --- Constants ---
+
+COLLAPSED_SUFFIX = ".collapsed"
+MAX_STACK_DEPTH = 128
+MIN_PATH_SECONDS = 1e-6
+
+FunctionKey = tuple[str, int, str]
+"""pstats function key: ``(filename, line number, function name)``."""
+
+
+def frame_label(func: FunctionKey) -> str:
+    """Render a pstats function key as a collapsed-stack frame label.
+
+    Args:
+        func (FunctionKey): ``(filename, line number, function name)``.
+
+    Returns:
+        str: ``name (file.py:line)`` for Python code, or the bare name for
+            built-ins. Semicolons are replaced so frames stay separable.
+    """
+    filename, line, name = func
+    if filename == "~":
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(";", ",")
+
+
+def collapse_stats(stats: pstats.Stats) -> list[str]:
+    """Reconstruct collapsed call stacks from caller/callee statistics.
+
+    cProfile records call edges rather than full stacks, so time is spread
+    over paths in proportion to the cumulative time each caller contributed.
+    Recursive cycles are cut at the first repeated frame.
+
+    Args:
+        stats (pstats.Stats): Profile statistics.
+
+    Returns:
+        list[str]: Sorted ``stack value`` lines with values in microseconds.
+    """
+    raw: dict[FunctionKey, Any] = stats.stats  # type: ignore[attr-defined]
+    children: dict[FunctionKey, list[tuple[FunctionKey, float]]] = defaultdict(list)
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            if caller != func:
+                children[caller].append((func, edge[3]))
+
+    roots = [
+        func for func, (_, _, _, _, callers) in raw.items()
+        if not set(callers) - {func}
+    ]
+    totals: dict[str, float] = defaultdict(float)
+
+    def walk(func: FunctionKey, path: tuple[FunctionKey, ...], share: float) -> None:
+        _, _, self_time, cumulative, _ = raw[func]
+        path = (*path, func)
+        if self_time * share > 0:
+            totals[";".join(frame_label(frame) for frame in path)] += self_time * share
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        for child, edge_time in children.get(func, ()):
+            child_cumulative = raw[child][3]
+            if child in path or child_cumulative <= 0:
+                continue
+            child_share = share * edge_time / child_cumulative
+            if child_share * child_cumulative >= MIN_PATH_SECONDS:
+                walk(child, path, child_share)
+
+    for root in roots:
+        walk(root, (), 1.0)
+
+    return [
+        f"{stack} {round(seconds * 1_000_000)}"
+        for stack, seconds in sorted(totals.items())
+        if round(seconds * 1_000_000) > 0
+    ]
+
+
+def write_profile(
+    path: str | Path,
+    main_profile: cProfile.Profile,
+    worker_files: Iterable[str | Path] = (),
+) -> Path:
+    """Merge main-process and worker profiles into pstats and collapsed files.
+
+    Args:
+        path (str | Path): Destination pstats file.
+        main_profile (cProfile.Profile): Profile of the main process.
+        worker_files (Iterable[str | Path]): pstats files written by workers.
+
+    Returns:
+        Path: Path of the collapsed-stack file written next to ``path``.
+    """
+    path = Path(path)
+    stats = pstats.Stats(main_profile)
+    for worker_file in worker_files:
+        stats.add(str(worker_file))
+    stats.dump_stats(path)
+
+    collapsed_path = path.with_name(path.name + COLLAPSED_SUFFIX)
+    lines = collapse_stats(stats)
+    collapsed_path.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+    return collapsed_path
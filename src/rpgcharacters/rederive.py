@@ -0,0 +1,586 @@
+"""
+Incremental re-derivation of stored characters after a rules change.
+
+Most of a stored character was rolled, but two fields are pure functions of
+the rules: saving throws (the class's base values plus the race's modifiers)
+and armor class (the unarmored base AC plus the DEX modifier).
+:data:`FIELD_DEPENDENCIES` maps each rules entry to the record fields that
+depend on it, and :func:`diff_rules` compares two rules snapshots entry by
+entry. :func:`rederive_jsonl` and :func:`rederive_shards` then rewrite only
+the re-derivable fields, and only in records of the races and classes whose
+entries changed.
+
+Uncompressed files are patched in place when every rewritten record keeps its
+length, which is the common case for saving throw tweaks, and are otherwise
+rewritten atomically. Compressed shards are recompressed, but only shards
+that hold an affected record. A shard directory's manifest and bitmap index
+are updated to match, and the index also tells the updater which shards and
+records to read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import defaultdict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Final, cast
+
+from rpgcharacters.archive_index import (
+    BitmapIndex,
+    chunk_bitmaps,
+    load_index,
+    record_ids,
+    save_index,
+)
+from rpgcharacters.rules import SAVING_THROW_NAMES, CompiledRules
+from rpgcharacters.shards import (
+    MANIFEST_NAME,
+    Manifest,
+    load_manifest,
+    read_shard,
+    write_manifest,
+    write_shard_file,
+)
+
+# --- Constants ---
+
+FIELD_DEPENDENCIES: Final[dict[tuple[str, str], tuple[str, ...]]] = {
+    ("races", "ability_min"): ("abilities",),
+    ("races", "ability_max"): ("abilities",),
+    ("races", "allowed_classes"): ("class",),
+    ("races", "saving_throw_modifiers"): ("saving_throws",),
+    ("races", "hit_die_max"): ("hp",),
+    ("classes", "prime_requisite"): ("abilities",),
+    ("classes", "min_prime"): ("abilities",),
+    ("classes", "hit_die"): ("hp",),
+    ("classes", "saving_throws"): ("saving_throws",),
+}
+"""Record fields that depend on each ``(section, key)`` of a race or class entry."""
+
+REDERIVABLE_FIELDS: Final = frozenset({"saving_throws", "ac"})
+UNARMORED: Final = "none"
+_SECTIONS: Final = ("races", "classes", "armor")
+_REMOVED_FIELDS: Final[dict[str, tuple[str, ...]]] = {
+    "races": ("race",),
+    "classes": ("class",),
+    "armor": (),
+}
+
+# Called with a record's position and its saving throws before and after.
+ChangeHook = Callable[[int, Mapping[str, int], Mapping[str, int]], None]
+
+
+@dataclass(frozen=True, slots=True)
+class RuleChange:
+    """One changed entry between two rules snapshots.
+
+    Attributes:
+        section: ``"races"``, ``"classes"`` or ``"armor"``.
+        entry: Race, class or armor name.
+        key: Changed key of the entry, or ``None`` when the whole entry was
+            added or removed.
+        fields: Record fields that depend on the changed value.
+    """
+
+    section: str
+    entry: str
+    key: str | None
+    fields: tuple[str, ...]
+
+    @property
+    def rederivable(self) -> bool:
+        """Whether every affected field can be recomputed from the rules."""
+        return set(self.fields) <= REDERIVABLE_FIELDS
+
+    def __str__(self) -> str:
+        path = f"{self.section}.{self.entry}"
+        return path if self.key is None else f"{path}.{self.key}"
+
+
+@dataclass(frozen=True, slots=True)
+class RulesDiff:
+    """Differences between two rules snapshots.
+
+    Attributes:
+        old: Rules the stored characters were generated with.
+        new: Rules to bring them in line with.
+        changes: Changed entries, by section and name.
+        race_fields: Re-derivable fields to rewrite per affected race.
+        class_fields: Re-derivable fields to rewrite per affected class.
+        global_fields: Re-derivable fields to rewrite in every record.
+        markers: JSON-encoded names of the affected races and classes. Unless
+            ``global_fields`` is set, a record line containing none of them
+            needs no update and is not parsed.
+    """
+
+    old: CompiledRules
+    new: CompiledRules
+    changes: tuple[RuleChange, ...]
+    race_fields: Mapping[str, frozenset[str]] = field(default_factory=dict)
+    class_fields: Mapping[str, frozenset[str]] = field(default_factory=dict)
+    global_fields: frozenset[str] = frozenset()
+    markers: tuple[bytes, ...] = ()
+
+    @property
+    def stale(self) -> tuple[RuleChange, ...]:
+        """Changes to fields that were rolled, which re-derivation cannot fix."""
+        return tuple(change for change in self.changes if not change.rederivable)
+
+    def fields_to_rederive(self, race: str, class_name: str) -> frozenset[str]:
+        """Return the fields to rewrite in a record of a race and class.
+
+        Args:
+            race (str): Record's race.
+            class_name (str): Record's class.
+
+        Returns:
+            frozenset[str]: Record field names; empty when nothing changes.
+        """
+        empty: frozenset[str] = frozenset()
+        return (
+            self.global_fields
+            | self.race_fields.get(race, empty)
+            | self.class_fields.get(class_name, empty)
+        )
+
+
+@dataclass(slots=True)
+class RederiveReport:
+    """Counts from one update.
+
+    Attributes:
+        checked: Records read and compared with the new rules.
+        updated: Records with at least one field rewritten.
+        patched: Files patched in place.
+        rewritten: Files rewritten in full.
+    """
+
+    checked: int = 0
+    updated: int = 0
+    patched: int = 0
+    rewritten: int = 0
+
+
+# --- Diffing ---
+
+def _dependent_fields(section: str, entry: str, key: str) -> tuple[str, ...]:
+    if section == "armor":
+        return ("ac",) if entry == UNARMORED and key == "base_ac" else ()
+    return FIELD_DEPENDENCIES.get((section, key), ())
+
+
+def diff_rules(old: CompiledRules, new: CompiledRules) -> RulesDiff:
+    """Compare two rules snapshots entry by entry.
+
+    Args:
+        old (CompiledRules): Rules the stored characters were generated with.
+        new (CompiledRules): Rules to bring them in line with.
+
+    Returns:
+        RulesDiff: Changed entries and the fields each one affects.
+    """
+    changes: list[RuleChange] = []
+    before_pack = cast(Mapping[str, Mapping[str, Mapping[str, Any]]], old.pack)
+    after_pack = cast(Mapping[str, Mapping[str, Mapping[str, Any]]], new.pack)
+    for section in _SECTIONS:
+        before, after = before_pack[section], after_pack[section]
+        for entry in sorted(before.keys() | after.keys()):
+            if entry not in after:
+                changes.append(RuleChange(section, entry, None, _REMOVED_FIELDS[section]))
+            elif entry not in before:
+                changes.append(RuleChange(section, entry, None, ()))
+            else:
+                for key in sorted(before[entry].keys() | after[entry].keys()):
+                    if before[entry].get(key) != after[entry].get(key):
+                        fields = _dependent_fields(section, entry, key)
+                        changes.append(RuleChange(section, entry, key, fields))
+
+    race_fields: defaultdict[str, frozenset[str]] = defaultdict(frozenset)
+    class_fields: defaultdict[str, frozenset[str]] = defaultdict(frozenset)
+    global_fields: frozenset[str] = frozenset()
+    for change in changes:
+        rederived = REDERIVABLE_FIELDS.intersection(change.fields)
+        if not rederived:
+            continue
+        if change.section == "races":
+            race_fields[change.entry] |= rederived
+        elif change.section == "classes":
+            class_fields[change.entry] |= rederived
+        else:
+            global_fields |= rederived
+    markers = tuple(json.dumps(name).encode("utf-8") for name in (*race_fields, *class_fields))
+    return RulesDiff(
+        old,
+        new,
+        tuple(changes),
+        dict(race_fields),
+        dict(class_fields),
+        global_fields,
+        markers,
+    )
+
+
+def check_stale(diff: RulesDiff) -> list[str]:
+    """Describe the changes that re-derivation cannot apply.
+
+    Args:
+        diff (RulesDiff): Rules differences.
+
+    Returns:
+        list[str]: One message per stale change. Empty when every change
+            can be re-derived.
+    """
+    return [
+        f"Rules change to {change} affects {', '.join(change.fields)}, "
+        "which cannot be re-derived."
+        for change in diff.stale
+    ]
+
+
+# --- Records ---
+
+def rederive_record(record: dict[str, Any], diff: RulesDiff) -> bool:
+    """Recompute the re-derivable fields of one character record.
+
+    Saving throws keep the record's key order. Records whose race or class
+    is not part of the new rules are left unchanged.
+
+    Args:
+        record (dict[str, Any]): Character dictionary; updated in place.
+        diff (RulesDiff): Rules differences.
+
+    Returns:
+        bool: Whether any field changed.
+    """
+    fields = diff.fields_to_rederive(record["race"], record["class"])
+    if not fields:
+        return False
+    rules = diff.new
+    try:
+        race_index = rules.race_index(record["race"])
+        class_index = rules.class_index(record["class"])
+    except ValueError:
+        return False
+
+    changed = False
+    if "saving_throws" in fields:
+        values = dict(zip(SAVING_THROW_NAMES, rules.saving_throws[race_index][class_index]))
+        saves = {name: values[name] for name in record["saving_throws"] if name in values}
+        saves |= values
+        if saves != record["saving_throws"]:
+            record["saving_throws"] = saves
+            changed = True
+    if "ac" in fields:
+        ac = rules.base_ac + record["ability_mods"]["DEX"]
+        if ac != record["ac"]:
+            record["ac"] = ac
+            changed = True
+    return changed
+
+
+def _rederive_line(
+    line: bytes, position: int, diff: RulesDiff, on_change: ChangeHook | None
+) -> bytes | None:
+    # Returns the re-encoded record without its newline, or None if unchanged.
+    if not diff.global_fields and not any(marker in line for marker in diff.markers):
+        return None
+    record = json.loads(line)
+    saves = record["saving_throws"]
+    if not rederive_record(record, diff):
+        return None
+    if on_change is not None:
+        on_change(position, saves, record["saving_throws"])
+    return json.dumps(record).encode("utf-8")
+
+
+# --- Files ---
+
+def _patch_file(
+    path: Path,
+    diff: RulesDiff,
+    report: RederiveReport,
+    candidates: set[int] | None = None,
+    on_change: ChangeHook | None = None,
+) -> tuple[bool, bool]:
+    # Overwrite changed records that keep their length. Returns whether any
+    # record changed and whether any changed length, which needs a rewrite.
+    changed = resized = False
+    with open(path, "r+b") as file:
+        start = 0
+        for position, line in enumerate(iter(file.readline, b"")):
+            end = start + len(line)
+            if candidates is None or position in candidates:
+                report.checked += 1
+                body = line.rstrip(b"\n")
+                new = _rederive_line(body, position, diff, on_change)
+                if new is not None:
+                    report.updated += 1
+                    changed = True
+                    if len(new) == len(body):
+                        file.seek(start)
+                        file.write(new)
+                        file.seek(end)
+                    else:
+                        resized = True
+            start = end
+    return changed, resized
+
+
+def _rewrite_file(path: Path, diff: RulesDiff, candidates: set[int] | None = None) -> None:
+    # Stream the file into a rewritten copy and swap it in atomically.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as output, open(path, "rb") as source:
+            for position, line in enumerate(source):
+                if candidates is None or position in candidates:
+                    new = _rederive_line(line.rstrip(b"\n"), position, diff, None)
+                    if new is not None:
+                        line = new + b"\n"
+                output.write(line)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _update_file(
+    path: Path,
+    diff: RulesDiff,
+    report: RederiveReport,
+    candidates: set[int] | None = None,
+    on_change: ChangeHook | None = None,
+) -> bool:
+    changed, resized = _patch_file(path, diff, report, candidates, on_change)
+    if resized:
+        # Records patched in place re-derive to themselves and are copied.
+        _rewrite_file(path, diff, candidates)
+        report.rewritten += 1
+    elif changed:
+        report.patched += 1
+    return changed
+
+
+def rederive_jsonl(
+    path: str | Path, diff: RulesDiff, allow_stale: bool = False
+) -> RederiveReport:
+    """Bring a JSON lines file of characters in line with new rules.
+
+    Args:
+        path (str | Path): File with one character record per line.
+        diff (RulesDiff): Differences between the rules the file was
+            generated with and the new rules.
+        allow_stale (bool): Whether to re-derive what can be re-derived even
+            though other changes leave rolled fields out of date.
+
+    Returns:
+        RederiveReport: What was changed.
+
+    Raises:
+        OSError: If the file cannot be read or written.
+        ValueError: If ``diff`` has stale changes and ``allow_stale`` is not
+            set, or a line is not a character record.
+    """
+    errors = [] if allow_stale else check_stale(diff)
+    if errors:
+        raise ValueError("; ".join(errors))
+    report = RederiveReport()
+    if diff.race_fields or diff.class_fields or diff.global_fields:
+        _update_file(Path(path), diff, report)
+    return report
+
+
+# --- Shard Directories ---
+
+def _shard_targets(index: BitmapIndex, number: int, diff: RulesDiff) -> int:
+    if diff.global_fields:
+        return (1 << index.shards[number].count) - 1
+    bitmap = 0
+    for race in diff.race_fields:
+        bitmap |= index.shard_bitmap(number, "race", race)
+    for class_name in diff.class_fields:
+        bitmap |= index.shard_bitmap(number, "class", class_name)
+    return bitmap
+
+
+def _file_digest(path: Path) -> str:
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def _positions_bitmap(positions: list[int]) -> int:
+    bits = bytearray(max(positions) // 8 + 1)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _apply_index_changes(
+    index: BitmapIndex,
+    number: int,
+    cleared: Mapping[str, list[int]],
+    added: Mapping[str, list[int]],
+) -> None:
+    # Bitmaps are rebuilt once per key rather than once per record.
+    bitmaps = index.chunk(number)
+    for key, positions in cleared.items():
+        bitmaps[key] = bitmaps.get(key, 0) & ~_positions_bitmap(positions)
+    for key, positions in added.items():
+        bitmaps[key] = bitmaps.get(key, 0) | _positions_bitmap(positions)
+    index.set_chunk(number, bitmaps)
+
+
+def rederive_shards(
+    directory: str | Path,
+    diff: RulesDiff,
+    allow_stale: bool = False,
+    verify: bool = True,
+) -> RederiveReport:
+    """Bring a shard directory in line with new rules.
+
+    Only shards holding an affected record are touched. When the directory
+    has a bitmap index that is in step with the manifest, it selects the
+    shards and records to read and its saving throw bitmaps are updated;
+    otherwise every record is read and the index is left for
+    :func:`~rpgcharacters.archive_index.update_index` to rebuild.
+
+    Shards are changed before the manifest, and uncompressed shards are
+    patched in place, so an interrupted update leaves shards out of step
+    with their checksums. Running the update again with ``verify=False``
+    finishes it: affected shards that no longer match their checksums are
+    re-hashed and their index entries rebuilt from their records.
+
+    Args:
+        directory (str | Path): Shard directory.
+        diff (RulesDiff): Differences between the rules the shards were
+            generated with and the new rules.
+        allow_stale (bool): Whether to re-derive what can be re-derived even
+            though other changes leave rolled fields out of date.
+        verify (bool): Whether to check each shard against its checksum
+            before changing it.
+
+    Returns:
+        RederiveReport: What was changed.
+
+    Raises:
+        OSError: If the manifest or a shard cannot be read or written.
+        ValueError: If ``diff`` has stale changes and ``allow_stale`` is not
+            set, or a shard fails its checksum.
+    """
+    errors = [] if allow_stale else check_stale(diff)
+    if errors:
+        raise ValueError("; ".join(errors))
+    report = RederiveReport()
+    if not (diff.race_fields or diff.class_fields or diff.global_fields):
+        return report
+
+    directory = Path(directory)
+    manifest = load_manifest(directory)
+    index: BitmapIndex | None
+    try:
+        index = load_index(directory, manifest)
+    except (OSError, ValueError):
+        index = None
+
+    shards = list(manifest.shards)
+    for number, shard in enumerate(manifest.shards):
+        candidates: set[int] | None = None
+        on_change: ChangeHook | None = None
+        cleared: defaultdict[str, list[int]] = defaultdict(list)
+        added: defaultdict[str, list[int]] = defaultdict(list)
+        indexed = index is not None and number < len(index.shards)
+        if index is not None and indexed:
+            hits = _shard_targets(index, number, diff)
+            if not hits:
+                continue
+            candidates = set(record_ids(hits))
+
+            def on_change(
+                position: int,
+                old: Mapping[str, int],
+                new: Mapping[str, int],
+                cleared: defaultdict[str, list[int]] = cleared,
+                added: defaultdict[str, list[int]] = added,
+            ) -> None:
+                for save, value in new.items():
+                    if old.get(save) != value:
+                        cleared[f"{save}={old.get(save)}"].append(position)
+                        added[f"{save}={value}"].append(position)
+
+        path = directory / shard.path
+        # Without verification, a shard that no longer matches its checksum
+        # was already (partly) updated by an interrupted run.
+        interrupted = not verify and _file_digest(path) != shard.sha256
+        if manifest.compression == "none":
+            if verify:
+                read_shard(directory, shard, manifest.compression)
+            changed = _update_file(path, diff, report, candidates, on_change)
+            if not (changed or interrupted):
+                continue
+            sha256 = _file_digest(path)
+            size = path.stat().st_size
+            if interrupted:
+                lines = path.read_bytes().splitlines()
+        else:
+            lines = read_shard(directory, shard, manifest.compression, verify).splitlines()
+            changed = False
+            for position, line in enumerate(lines):
+                if candidates is None or position in candidates:
+                    report.checked += 1
+                    new = _rederive_line(line, position, diff, on_change)
+                    if new is not None:
+                        lines[position] = new
+                        report.updated += 1
+                        changed = True
+            if changed:
+                data = b"".join(line + b"\n" for line in lines)
+                size, sha256 = write_shard_file(path, data, manifest.compression)
+                report.rewritten += 1
+            elif interrupted:
+                sha256 = _file_digest(path)
+                size = path.stat().st_size
+            else:
+                continue
+        shards[number] = replace(shard, size=size, sha256=sha256)
+        if index is not None and indexed:
+            if interrupted:
+                # Records patched by the interrupted run were not recorded.
+                records = [json.loads(line) for line in lines]
+                index.set_chunk(number, chunk_bitmaps(records))
+            else:
+                _apply_index_changes(index, number, cleared, added)
+            index.shards[number] = shards[number]
+
+    updated = Manifest(manifest.compression, tuple(shards))
+    if updated != manifest:
+        write_manifest(directory, updated)
+        if index is not None:
+            save_index(directory, index)
+    return report
+
+
+def rederive_archive(
+    path: str | Path,
+    diff: RulesDiff,
+    allow_stale: bool = False,
+    verify: bool = True,
+) -> RederiveReport:
+    """Update a shard directory or a JSON lines file, whichever ``path`` is.
+
+    Args:
+        path (str | Path): Shard directory (holding a manifest) or JSON lines
+            file.
+        diff (RulesDiff): Rules differences.
+        allow_stale (bool): Whether to re-derive despite stale changes.
+        verify (bool): Whether to check shards against their checksums.
+
+    Returns:
+        RederiveReport: What was changed.
+    """
+    if (Path(path) / MANIFEST_NAME).is_file():
+        return rederive_shards(path, diff, allow_stale, verify)
+    return rederive_jsonl(path, diff, allow_stale)
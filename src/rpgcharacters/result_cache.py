@@ -0,0 +1,160 @@
+"""
+Content-addressed on-disk cache of seeded CLI output.
+
+With a fixed seed, CLI output depends only on the generation inputs, the
+active rules and the package version. The cache stores the exact serialized
+output under a SHA-256 of those inputs, so repeated invocations can replay it
+without generating or serializing anything.
+
+Entries are written atomically, so concurrent processes sharing a cache never
+read a partial entry. Reading an entry refreshes its modification time, and
+the least recently used entries are evicted once the cache grows past its
+size limit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Final
+
+from rpgcharacters.rules import active_rules, atomic_write_bytes, default_cache_dir
+
+# --- Constants ---
+
+RESULT_CACHE_VERSION: Final = 1
+"""Bump when the cached output format changes to invalidate old entries."""
+
+DEFAULT_MAX_BYTES: Final = 256 * 1024 * 1024
+ENTRY_SUFFIX: Final = ".out"
+
+
+def _package_version() -> str:
+    try:
+        return version("rpgcharacters")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def result_key(inputs: Mapping[str, Any]) -> str:
+    """Hash generation inputs together with the rules and package version.
+
+    Args:
+        inputs (Mapping[str, Any]): JSON-serializable inputs that fully
+            determine the output, such as seed, race, class, name and count.
+
+    Returns:
+        str: Hex SHA-256 cache key.
+    """
+    document = {
+        "cache_version": RESULT_CACHE_VERSION,
+        "package_version": _package_version(),
+        "rules": active_rules().digest,
+        "inputs": inputs,
+    }
+    canonical = json.dumps(document, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache of output blobs keyed by :func:`result_key`."""
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        """Open a cache directory; it is created on first write.
+
+        Args:
+            directory (str | Path | None): Cache directory; defaults to
+                ``results`` under :func:`~rpgcharacters.rules.default_cache_dir`.
+            max_bytes (int): Total entry size to keep after eviction.
+
+        Raises:
+            ValueError: If ``max_bytes`` is negative.
+        """
+        if max_bytes < 0:
+            raise ValueError("Cache size limit must not be negative.")
+        self.directory = Path(directory) if directory else default_cache_dir() / "results"
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> bytes | None:
+        """Return a cached entry and mark it as recently used.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            bytes | None: Entry contents, or ``None`` on a miss.
+        """
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # Evicted by another process; the data we read is still valid.
+        return data
+
+    def put(self, key: str, data: bytes) -> bool:
+        """Store an entry atomically and evict old entries if needed.
+
+        Entries larger than the whole cache are not stored.
+
+        Args:
+            key (str): Cache key.
+            data (bytes): Entry contents.
+
+        Returns:
+            bool: Whether the entry was stored.
+        """
+        if len(data) > self.max_bytes:
+            return False
+        try:
+            atomic_write_bytes(self._path(key), data)
+        except OSError:
+            return False
+        self.evict()
+        return True
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits its limit.
+
+        Returns:
+            int: Number of entries deleted.
+        """
+        entries = []
+        total = 0
+        try:
+            paths = list(self.directory.glob(f"*{ENTRY_SUFFIX}"))
+        except OSError:
+            return 0
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass  # Already removed by a concurrent eviction.
+            total -= size
+        return removed
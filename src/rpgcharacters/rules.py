@@ -0,0 +1,614 @@
+"""
+Loadable rules packs and their compiled lookup tables.
+
+This module lets house rules and other OSR variants replace the built-in
+``RACES``, ``CLASSES`` and ``ARMOR`` tables without forking the package. A
+rules pack is a TOML or JSON file with ``races``, ``classes`` and (optionally)
+``armor`` tables shaped like ``RaceData``, ``ClassData`` and ``ArmorData``.
+
+Each pack is validated and compiled into dense, index-based tables that bulk
+generation paths can use without string lookups. Compiled packs are cached on
+disk keyed by a hash of the file contents, so switching packs or starting a
+worker costs a single cache load.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import tomllib
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Final, TypedDict, cast, get_args
+
+from rpgcharacters.classes import CLASSES, AbilityName, ClassData, SavingThrowName
+from rpgcharacters.equipment import ARMOR, ArmorData, ArmorName, ArmorType
+from rpgcharacters.races import RACES, RaceData
+
+# --- Constants ---
+
+RULES_CACHE_VERSION = 2
+ABILITY_NAMES: Final[tuple[AbilityName, ...]] = get_args(AbilityName)
+SAVING_THROW_NAMES: Final[tuple[SavingThrowName, ...]] = get_args(SavingThrowName)
+ARMOR_TYPES: Final[tuple[ArmorType, ...]] = get_args(ArmorType)
+ABILITY_SCORE_MIN = 3
+ABILITY_SCORE_MAX = 18
+DEFAULT_ARMOR: Final[dict[ArmorName, ArmorData]] = copy.deepcopy(ARMOR)
+"""Built-in armor table used by packs without an ``armor`` section.
+
+Taken at import, because :func:`activate_rules` rewrites ``ARMOR`` in place.
+"""
+
+
+class RulesPack(TypedDict):
+    """Raw rules data as loaded from a rules pack file.
+
+    Attributes:
+        races: Race rule data keyed by lowercase race name.
+        classes: Class rule data keyed by lowercase class name.
+        armor: Armor data keyed by armor name.
+    """
+
+    races: dict[str, RaceData]
+    classes: dict[str, ClassData]
+    armor: dict[str, ArmorData]
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRules:
+    """Dense, immutable lookup tables compiled from a rules pack.
+
+    Races and classes are addressed by their position in ``race_names`` and
+    ``class_names``. Ability tables follow ``ABILITY_NAMES`` order and saving
+    throw tables follow ``SAVING_THROW_NAMES`` order.
+
+    Attributes:
+        digest: Content hash identifying the rules pack.
+        pack: Validated source data the tables were compiled from.
+        race_names: Race names in table order.
+        class_names: Class names in table order.
+        ability_min: Per-race minimum score for each ability.
+        ability_max: Per-race maximum score for each ability.
+        allowed_classes: Per-race bitmask of allowed class indices.
+        prime_index: Per-class index of the prime requisite ability.
+        min_prime: Per-class minimum prime requisite score.
+        hit_die: Per-race, per-class hit die after racial caps.
+        saving_throws: Per-race, per-class adjusted saving throws.
+        base_ac: Base armor class with no armor worn.
+    """
+
+    digest: str
+    pack: RulesPack
+    race_names: tuple[str, ...]
+    class_names: tuple[str, ...]
+    ability_min: tuple[tuple[int, ...], ...]
+    ability_max: tuple[tuple[int, ...], ...]
+    allowed_classes: tuple[int, ...]
+    prime_index: tuple[int, ...]
+    min_prime: tuple[int, ...]
+    hit_die: tuple[tuple[int, ...], ...]
+    saving_throws: tuple[tuple[tuple[int, ...], ...], ...]
+    base_ac: int
+
+    def race_index(self, race: str) -> int:
+        """Return the table index for a race name.
+
+        Args:
+            race (str): Race name, in any case.
+
+        Returns:
+            int: Position of the race in ``race_names``.
+
+        Raises:
+            ValueError: If the race is not part of these rules.
+        """
+        try:
+            return self.race_names.index(race.lower())
+        except ValueError:
+            raise ValueError(f"Unknown race: {race.lower()}") from None
+
+    def class_index(self, class_name: str) -> int:
+        """Return the table index for a class name.
+
+        Args:
+            class_name (str): Class name, in any case.
+
+        Returns:
+            int: Position of the class in ``class_names``.
+
+        Raises:
+            ValueError: If the class is not part of these rules.
+        """
+        try:
+            return self.class_names.index(class_name.lower())
+        except ValueError:
+            raise ValueError(f"Unknown class: {class_name.lower()}") from None
+
+    def is_allowed(self, race_index: int, class_index: int) -> bool:
+        """Return whether a race may take a class, ignoring ability scores.
+
+        Args:
+            race_index (int): Race table index.
+            class_index (int): Class table index.
+
+        Returns:
+            bool: ``True`` when the class is in the race's allowed list.
+        """
+        return bool(self.allowed_classes[race_index] >> class_index & 1)
+
+
+# --- Validation ---
+
+def _check_int(errors: list[str], where: str, value: Any, low: int, high: int) -> None:
+    if isinstance(value, bool) or not isinstance(value, int):
+        errors.append(f"{where} must be an integer; found {value!r}.")
+    elif not low <= value <= high:
+        errors.append(f"{where} must be between {low} and {high}; found {value}.")
+
+
+def _check_keys(
+    errors: list[str],
+    where: str,
+    entry: Any,
+    required: frozenset[str],
+    optional: frozenset[str] = frozenset(),
+) -> bool:
+    if not isinstance(entry, dict):
+        errors.append(f"{where} must be a table.")
+        return False
+    missing = sorted(required - set(entry))
+    unknown = sorted(set(entry) - required - optional)
+    if missing:
+        errors.append(f"{where} is missing {', '.join(missing)}.")
+    if unknown:
+        errors.append(f"{where} has unknown keys {', '.join(unknown)}.")
+    return not missing
+
+
+def _check_names(errors: list[str], section: str, table: dict[Any, Any]) -> None:
+    # Names are lowercased when the pack is normalized.
+    seen: dict[str, Any] = {}
+    for name in table:
+        other = seen.setdefault(str(name).lower(), name)
+        if other != name:
+            errors.append(f"{section}.{other} and {section}.{name} differ only in case.")
+
+
+def _validate_classes(classes: Any, errors: list[str]) -> None:
+    if not isinstance(classes, dict) or not classes:
+        errors.append("Rules pack must define at least one class.")
+        return
+    _check_names(errors, "classes", classes)
+    for name, entry in classes.items():
+        where = f"classes.{name}"
+        if not _check_keys(errors, where, entry, ClassData.__required_keys__):
+            continue
+        if entry["prime_requisite"] not in ABILITY_NAMES:
+            errors.append(
+                f"{where}.prime_requisite is not an ability: {entry['prime_requisite']!r}."
+            )
+        _check_int(
+            errors, f"{where}.min_prime", entry["min_prime"], ABILITY_SCORE_MIN, ABILITY_SCORE_MAX
+        )
+        _check_int(errors, f"{where}.hit_die", entry["hit_die"], 1, 100)
+        saves = entry["saving_throws"]
+        if not isinstance(saves, dict) or set(saves) != set(SAVING_THROW_NAMES):
+            errors.append(f"{where}.saving_throws must define {', '.join(SAVING_THROW_NAMES)}.")
+            continue
+        for save, value in saves.items():
+            _check_int(errors, f"{where}.saving_throws.{save}", value, 1, 30)
+
+
+def _validate_races(races: Any, classes: Any, errors: list[str]) -> None:
+    if not isinstance(races, dict) or not races:
+        errors.append("Rules pack must define at least one race.")
+        return
+    _check_names(errors, "races", races)
+    required = RaceData.__required_keys__ - {"hit_die_max"}
+    for name, entry in races.items():
+        where = f"races.{name}"
+        if not _check_keys(errors, where, entry, required, frozenset({"hit_die_max"})):
+            continue
+        for limit in ("ability_min", "ability_max"):
+            table = entry[limit]
+            if not isinstance(table, dict):
+                errors.append(f"{where}.{limit} must be a table.")
+                continue
+            for ability, value in table.items():
+                if ability not in ABILITY_NAMES:
+                    errors.append(f"{where}.{limit} has unknown ability {ability!r}.")
+                _check_int(
+                    errors, f"{where}.{limit}.{ability}", value, ABILITY_SCORE_MIN,
+                    ABILITY_SCORE_MAX,
+                )
+        allowed = entry["allowed_classes"]
+        if not isinstance(allowed, list):
+            errors.append(f"{where}.allowed_classes must be a list.")
+        elif isinstance(classes, dict):
+            known = {str(class_name).lower() for class_name in classes}
+            for class_name in allowed:
+                if str(class_name).lower() not in known:
+                    errors.append(f"{where}.allowed_classes has unknown class {class_name!r}.")
+        modifiers = entry["saving_throw_modifiers"]
+        if not isinstance(modifiers, dict):
+            errors.append(f"{where}.saving_throw_modifiers must be a table.")
+        else:
+            for save, value in modifiers.items():
+                if save not in SAVING_THROW_NAMES:
+                    errors.append(f"{where}.saving_throw_modifiers has unknown save {save!r}.")
+                _check_int(errors, f"{where}.saving_throw_modifiers.{save}", value, -20, 20)
+        if entry.get("hit_die_max") is not None:
+            _check_int(errors, f"{where}.hit_die_max", entry["hit_die_max"], 1, 100)
+
+
+def _validate_armor(armor: Any, errors: list[str]) -> None:
+    if not isinstance(armor, dict) or "none" not in armor:
+        errors.append("Rules pack armor must define a 'none' entry.")
+        return
+    for name, entry in armor.items():
+        where = f"armor.{name}"
+        if not _check_keys(errors, where, entry, ArmorData.__required_keys__):
+            continue
+        _check_int(errors, f"{where}.base_ac", entry["base_ac"], 0, 40)
+        _check_int(errors, f"{where}.weight", entry["weight"], 0, 1000)
+        _check_int(errors, f"{where}.cost_gp", entry["cost_gp"], 0, 1_000_000)
+        if entry["type_"] not in ARMOR_TYPES:
+            errors.append(f"{where}.type_ is not an armor type: {entry['type_']!r}.")
+
+
+def validate_rules_pack(data: Any) -> list[str]:
+    """Validate raw rules pack data against the built-in rule shapes.
+
+    Race entries follow ``RaceData`` (``hit_die_max`` may be omitted, since
+    TOML has no null), class entries follow ``ClassData`` and armor entries
+    follow ``ArmorData``. The ``armor`` table is optional.
+
+    Args:
+        data (Any): Parsed TOML or JSON document.
+
+    Returns:
+        list[str]: Validation messages. Empty when the pack is valid.
+    """
+    if not isinstance(data, dict):
+        return ["Rules pack must be a table."]
+    errors: list[str] = []
+    unknown = sorted(set(data) - {"races", "classes", "armor"})
+    if unknown:
+        errors.append(f"Rules pack has unknown sections {', '.join(unknown)}.")
+    _validate_classes(data.get("classes"), errors)
+    _validate_races(data.get("races"), data.get("classes"), errors)
+    _validate_armor(data.get("armor", DEFAULT_ARMOR), errors)
+    return errors
+
+
+# --- Compilation ---
+
+def _normalize_pack(data: dict[str, Any]) -> RulesPack:
+    races = {
+        str(name).lower(): {
+            **entry,
+            "allowed_classes": [str(class_name).lower() for class_name in entry["allowed_classes"]],
+            "hit_die_max": entry.get("hit_die_max"),
+        }
+        for name, entry in data["races"].items()
+    }
+    classes = {str(name).lower(): entry for name, entry in data["classes"].items()}
+    armor = data.get("armor", DEFAULT_ARMOR)
+    return cast(RulesPack, copy.deepcopy({"races": races, "classes": classes, "armor": armor}))
+
+
+def rules_digest(pack: RulesPack) -> str:
+    """Hash rules data into a stable content digest.
+
+    Args:
+        pack (RulesPack): Rules data to hash.
+
+    Returns:
+        str: Hex SHA-256 digest of the canonical JSON encoding.
+    """
+    canonical = json.dumps(pack, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def compile_rules(pack: RulesPack) -> CompiledRules:
+    """Compile validated rules data into dense lookup tables.
+
+    Args:
+        pack (RulesPack): Validated rules data.
+
+    Returns:
+        CompiledRules: Immutable index-based tables for the pack.
+    """
+    race_names = tuple(sorted(pack["races"]))
+    class_names = tuple(sorted(pack["classes"]))
+    races = [pack["races"][name] for name in race_names]
+    classes = [pack["classes"][name] for name in class_names]
+
+    hit_die: list[tuple[int, ...]] = []
+    saving_throws: list[tuple[tuple[int, ...], ...]] = []
+    for race in races:
+        cap = race["hit_die_max"]
+        hit_die.append(tuple(
+            class_data["hit_die"] if cap is None else min(class_data["hit_die"], cap)
+            for class_data in classes
+        ))
+        modifiers = race["saving_throw_modifiers"]
+        saving_throws.append(tuple(
+            tuple(
+                class_data["saving_throws"][save] + modifiers.get(save, 0)
+                for save in SAVING_THROW_NAMES
+            )
+            for class_data in classes
+        ))
+
+    return CompiledRules(
+        digest=rules_digest(pack),
+        pack=pack,
+        race_names=race_names,
+        class_names=class_names,
+        ability_min=tuple(
+            tuple(race["ability_min"].get(name, ABILITY_SCORE_MIN) for name in ABILITY_NAMES)
+            for race in races
+        ),
+        ability_max=tuple(
+            tuple(race["ability_max"].get(name, ABILITY_SCORE_MAX) for name in ABILITY_NAMES)
+            for race in races
+        ),
+        allowed_classes=tuple(
+            sum(
+                1 << index
+                for index, name in enumerate(class_names)
+                if name in race["allowed_classes"]
+            )
+            for race in races
+        ),
+        prime_index=tuple(
+            ABILITY_NAMES.index(class_data["prime_requisite"]) for class_data in classes
+        ),
+        min_prime=tuple(class_data["min_prime"] for class_data in classes),
+        hit_die=tuple(hit_die),
+        saving_throws=tuple(saving_throws),
+        base_ac=pack["armor"]["none"]["base_ac"],
+    )
+
+
+# --- Loading and Caching ---
+
+def default_cache_dir() -> Path:
+    """Return the per-user cache directory for rpgcharacters.
+
+    Uses ``$XDG_CACHE_HOME/rpgcharacters`` when set, otherwise
+    ``~/.cache/rpgcharacters``.
+
+    Returns:
+        Path: Cache directory (not created).
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "rpgcharacters"
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` so readers never observe a partial file.
+
+    Args:
+        path (Path): Destination file. Parent directories are created.
+        data (bytes): File contents.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def encode_compiled_rules(rules: CompiledRules) -> bytes:
+    """Encode compiled rules as JSON for the on-disk cache.
+
+    Args:
+        rules (CompiledRules): Rules to encode.
+
+    Returns:
+        bytes: UTF-8 JSON document.
+    """
+    return json.dumps(asdict(rules), separators=(",", ":")).encode("utf-8")
+
+
+def decode_compiled_rules(raw: bytes) -> CompiledRules:
+    """Decode compiled rules written by :func:`encode_compiled_rules`.
+
+    The cache holds plain data rather than pickles, so a tampered entry can at
+    worst fail to decode; entries whose pack no longer matches their digest
+    are rejected as well.
+
+    Args:
+        raw (bytes): UTF-8 JSON document.
+
+    Returns:
+        CompiledRules: The decoded rules.
+
+    Raises:
+        ValueError: If the document is malformed or fails its digest check.
+    """
+    try:
+        data = json.loads(raw)
+        rules = CompiledRules(**{
+            field.name: data[field.name] if field.name == "pack" else _freeze(data[field.name])
+            for field in fields(CompiledRules)
+        })
+        digest = rules_digest(rules.pack)
+    except (KeyError, TypeError, AttributeError) as exc:
+        raise ValueError(f"Malformed compiled rules: {exc}") from exc
+    if digest != rules.digest:
+        raise ValueError("Compiled rules do not match their digest.")
+    return rules
+
+
+def parse_rules_pack(raw: bytes, suffix: str) -> RulesPack:
+    """Parse and validate rules pack file contents.
+
+    Args:
+        raw (bytes): File contents.
+        suffix (str): File suffix; ``.json`` selects JSON, anything else TOML.
+
+    Returns:
+        RulesPack: Normalized rules data.
+
+    Raises:
+        ValueError: If the document cannot be parsed or fails validation.
+    """
+    try:
+        if suffix.lower() == ".json":
+            data = json.loads(raw)
+        else:
+            data = tomllib.loads(raw.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Could not parse rules pack: {exc}") from exc
+    errors = validate_rules_pack(data)
+    if errors:
+        raise ValueError("; ".join(errors))
+    return _normalize_pack(data)
+
+
+def load_rules_pack(path: str | Path, cache_dir: str | Path | None = None) -> CompiledRules:
+    """Load a rules pack file, using the compiled on-disk cache when possible.
+
+    The cache entry is keyed by the SHA-256 of the file contents, so edits to
+    a pack are picked up automatically and identical packs share one entry.
+    Entries are stored as JSON and an unreadable entry is simply recompiled.
+
+    Args:
+        path (str | Path): TOML or JSON rules pack file.
+        cache_dir (str | Path | None): Directory for compiled packs. Defaults
+            to ``default_cache_dir() / "rules"``.
+
+    Returns:
+        CompiledRules: Compiled rules for the pack.
+
+    Raises:
+        ValueError: If the pack cannot be parsed or fails validation.
+    """
+    path = Path(path)
+    raw = path.read_bytes()
+    key = hashlib.sha256(raw + f"v{RULES_CACHE_VERSION}".encode()).hexdigest()
+    cache_path = Path(cache_dir or default_cache_dir() / "rules") / f"{key}.json"
+
+    try:
+        return decode_compiled_rules(cache_path.read_bytes())
+    except (OSError, ValueError):
+        pass
+
+    compiled = compile_rules(parse_rules_pack(raw, path.suffix))
+    try:
+        atomic_write_bytes(cache_path, encode_compiled_rules(compiled))
+    except OSError:
+        pass  # A read-only cache only costs the next load a recompile.
+    return compiled
+
+
+# --- Active Rules ---
+
+BUILTIN_RULES: Final[CompiledRules] = compile_rules(
+    cast(RulesPack, copy.deepcopy({"races": RACES, "classes": CLASSES, "armor": ARMOR}))
+)
+"""Compiled form of the rules shipped with the package."""
+
+_active_rules: CompiledRules = BUILTIN_RULES
+_rules_lock = threading.Lock()
+_rules_listeners: list[Callable[[CompiledRules], None]] = []
+_rules_pins = 0
+
+
+def active_rules() -> CompiledRules:
+    """Return the compiled rules currently used for character generation.
+
+    Returns:
+        CompiledRules: The active rules, ``BUILTIN_RULES`` by default.
+    """
+    return _active_rules
+
+
+def activate_rules(rules: CompiledRules) -> None:
+    """Make a compiled rules pack the active rules for generation.
+
+    The ``RACES``, ``CLASSES`` and ``ARMOR`` tables are updated in place so
+    the per-character functions in ``character_generator`` follow the pack,
+    and registered listeners are notified.
+
+    Args:
+        rules (CompiledRules): Rules to activate.
+
+    Raises:
+        RuntimeError: If the active rules are pinned by :func:`pinned_rules`.
+    """
+    global _active_rules
+    with _rules_lock:
+        if rules.digest == _active_rules.digest:
+            return
+        if _rules_pins:
+            raise RuntimeError("Rules cannot change while generation threads are running.")
+        pack = copy.deepcopy(rules.pack)
+        tables: tuple[tuple[dict[Any, Any], dict[str, Any]], ...] = (
+            (RACES, cast(dict[str, Any], pack["races"])),
+            (CLASSES, cast(dict[str, Any], pack["classes"])),
+            (ARMOR, cast(dict[str, Any], pack["armor"])),
+        )
+        for table, values in tables:
+            table.clear()
+            table.update(values)
+        _active_rules = rules
+        listeners = list(_rules_listeners)
+    for listener in listeners:
+        listener(rules)
+
+
+def reset_rules() -> None:
+    """Restore the built-in rules as the active rules."""
+    activate_rules(BUILTIN_RULES)
+
+
+@contextmanager
+def pinned_rules() -> Iterator[CompiledRules]:
+    """Keep the active rules fixed for the duration of a ``with`` block.
+
+    The rules tables are shared by every thread, so thread-pool generation
+    pins them: :func:`activate_rules` raises instead of rewriting the tables
+    while other threads read them.
+
+    Yields:
+        CompiledRules: The pinned active rules.
+    """
+    global _rules_pins
+    with _rules_lock:
+        _rules_pins += 1
+        rules = _active_rules
+    try:
+        yield rules
+    finally:
+        with _rules_lock:
+            _rules_pins -= 1
+
+
+def on_rules_change(listener: Callable[[CompiledRules], None]) -> None:
+    """Register a callback invoked after the active rules change.
+
+    Args:
+        listener (Callable[[CompiledRules], None]): Called with the new rules.
+    """
+    with _rules_lock:
+        _rules_listeners.append(listener)
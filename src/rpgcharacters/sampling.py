@@ -0,0 +1,137 @@
+"""
+Ability score sampling conditioned on a race and class.
+
+Racial ability limits and class prime requisites are per-ability bounds. For
+methods that roll each ability independently, such as 3d6, drawing each
+score from its distribution truncated to its bounds gives exactly the
+distribution of rolled characters that qualify for the race and class. Other
+methods, such as a standard array, draw from their qualifying rolls
+directly. Either way no rolls are rejected.
+"""
+
+from __future__ import annotations
+
+from typing import Final
+
+from diceroller.core import DiceRoller
+
+from rpgcharacters.ability_methods import (
+    DEFAULT_ABILITY_METHOD,
+    dice_weights,
+    draw_score,
+    get_ability_method,
+)
+from rpgcharacters.character_generator import AbilityScores
+from rpgcharacters.rules import ABILITY_NAMES, CompiledRules, active_rules
+
+# --- Constants ---
+
+THREE_D6_WEIGHTS: Final[tuple[int, ...]] = dice_weights(3)
+"""Number of 3d6 outcomes (out of 216) for each score from 3 to 18."""
+
+AbilityBounds = tuple[tuple[int, int], ...]
+"""Inclusive ``(low, high)`` score bounds per ability, in ``ABILITY_NAMES`` order."""
+
+
+def ability_bounds(rules: CompiledRules, race_index: int, class_index: int) -> AbilityBounds:
+    """Return the score bounds a race/class pair imposes on each ability.
+
+    Args:
+        rules (CompiledRules): Compiled rules.
+        race_index (int): Race table index.
+        class_index (int): Class table index.
+
+    Returns:
+        AbilityBounds: Bounds per ability. ``low > high`` for an ability
+            means no scores qualify.
+    """
+    lows = list(rules.ability_min[race_index])
+    highs = rules.ability_max[race_index]
+    prime = rules.prime_index[class_index]
+    lows[prime] = max(lows[prime], rules.min_prime[class_index])
+    return tuple(zip(lows, highs, strict=True))
+
+
+def is_feasible(
+    rules: CompiledRules,
+    race_index: int,
+    class_index: int,
+    method: str = DEFAULT_ABILITY_METHOD,
+) -> bool:
+    """Return whether any ability scores qualify for a race/class pair.
+
+    Args:
+        rules (CompiledRules): Compiled rules.
+        race_index (int): Race table index.
+        class_index (int): Class table index.
+        method (str): Name of the ability method that rolls the scores.
+
+    Returns:
+        bool: ``True`` when the class is allowed and the method can roll
+            scores within every bound.
+    """
+    if not rules.is_allowed(race_index, class_index):
+        return False
+    bounds = ability_bounds(rules, race_index, class_index)
+    return get_ability_method(method).probability(bounds) > 0
+
+
+def sample_score(
+    rng: DiceRoller,
+    low: int,
+    high: int,
+    weights: tuple[int, ...] = THREE_D6_WEIGHTS,
+) -> int:
+    """Draw one ability score from a distribution truncated to ``[low, high]``.
+
+    Args:
+        rng (DiceRoller): Dice roller whose generator makes the draw.
+        low (int): Smallest allowed score.
+        high (int): Largest allowed score.
+        weights (tuple[int, ...]): Integer weights for scores 3 to 18.
+
+    Returns:
+        int: Score within the bounds.
+
+    Raises:
+        ValueError: If no score within the bounds has a positive weight.
+    """
+    return draw_score(rng, weights, low, high)
+
+
+def roll_conditioned_abilities(
+    race: str,
+    class_name: str,
+    rng: DiceRoller,
+    rules: CompiledRules | None = None,
+    method: str = DEFAULT_ABILITY_METHOD,
+) -> AbilityScores:
+    """Roll ability scores that are guaranteed to qualify for a race and class.
+
+    Args:
+        race (str): Race the scores must satisfy.
+        class_name (str): Class the scores must satisfy.
+        rng (DiceRoller): Dice roller whose generator makes the draws.
+        rules (CompiledRules | None): Rules to use; defaults to the active
+            rules.
+        method (str): Name of the ability method whose distribution the
+            scores follow.
+
+    Returns:
+        AbilityScores: Scores distributed like the method's rolls that
+            qualify.
+
+    Raises:
+        ValueError: If the race/class pair is unknown, not allowed, or has
+            no qualifying scores, or the method is unknown.
+    """
+    rules = rules or active_rules()
+    race_index = rules.race_index(race)
+    class_index = rules.class_index(class_name)
+    if not is_feasible(rules, race_index, class_index, method):
+        raise ValueError(
+            f"No ability scores qualify a {race.title()} {class_name.title()}."
+        )
+    bounds = ability_bounds(rules, race_index, class_index)
+    scores = get_ability_method(method).sample_bounded(rng, bounds)
+    return AbilityScores(**dict(zip(ABILITY_NAMES, scores, strict=True)))
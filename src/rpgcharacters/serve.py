@@ -0,0 +1,174 @@
+"""
+NDJSON request/response loop for long-lived generator processes.
+
+Scripting hosts start one ``rpgcharacters --serve-stdio`` process and write
+one JSON request per line to its stdin::
+
+    {"id": 1, "race": "dwarf", "class": "fighter", "seed": 42}
+    {"id": "b", "count": 3, "seed": 7, "name": "Guard"}
+
+Each request is answered with one JSON line on stdout, carrying the request's
+``id``::
+
+    {"id": 1, "ok": true, "seed": 42, "characters": [{...}]}
+    {"id": "x", "ok": false, "error": "Unknown race: 'gnome'"}
+
+Requests may be pipelined: hosts can write many requests without waiting,
+and responses come back in request order, one flushed line per request. A
+single-character request with a seed returns the same character as
+``rpgcharacters --non-interactive --json --seed SEED``; multi-character
+requests match ``--count``.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from typing import Any, Final, TextIO
+
+from diceroller.core import CustomRandom, DiceRoller
+
+from rpgcharacters.ability_methods import DEFAULT_ABILITY_METHOD
+from rpgcharacters.bulk import BulkJob, iter_characters, new_seed, validate_job
+from rpgcharacters.character_generator import generate_random_character
+from rpgcharacters.metrics import stage
+from rpgcharacters.names import name_character
+
+# --- Constants ---
+
+MAX_REQUEST_COUNT = 10_000
+REQUEST_FIELDS: Final = frozenset(
+    {
+        "id",
+        "race",
+        "class",
+        "name",
+        "seed",
+        "count",
+        "race_weights",
+        "class_weights",
+        "ability_method",
+        "random_names",
+    }
+)
+_KIND_NAMES: Final = {int: "an integer", str: "a string"}
+
+
+def _optional(request: Mapping[str, Any], key: str, kind: type, errors: list[str]) -> Any:
+    value = request.get(key)
+    if value is not None and (not isinstance(value, kind) or isinstance(value, bool)):
+        errors.append(f"'{key}' must be {_KIND_NAMES[kind]}.")
+        return None
+    return value
+
+
+def _weights(request: Mapping[str, Any], key: str, errors: list[str]) -> dict[str, float] | None:
+    value = request.get(key)
+    if value is None:
+        return None
+    if not isinstance(value, dict) or not all(
+        isinstance(weight, int | float) and not isinstance(weight, bool)
+        for weight in value.values()
+    ):
+        errors.append(f"'{key}' must map names to numbers.")
+        return None
+    return {str(name).lower(): float(weight) for name, weight in value.items()}
+
+
+def handle_request(request: Any) -> dict[str, Any]:
+    """Answer one generation request.
+
+    Args:
+        request (Any): Decoded JSON request.
+
+    Returns:
+        dict[str, Any]: Response with ``ok`` and either ``characters`` and
+            ``seed`` or an ``error`` message. The request ``id`` is echoed.
+    """
+    if not isinstance(request, dict):
+        return {"id": None, "ok": False, "error": "Request must be a JSON object."}
+    response: dict[str, Any] = {"id": request.get("id")}
+    errors: list[str] = []
+    unknown = sorted(set(request) - REQUEST_FIELDS)
+    if unknown:
+        errors.append(f"Unknown request fields: {', '.join(unknown)}")
+    race = _optional(request, "race", str, errors)
+    class_name = _optional(request, "class", str, errors)
+    name = _optional(request, "name", str, errors)
+    seed = _optional(request, "seed", int, errors)
+    count = _optional(request, "count", int, errors)
+    ability_method = _optional(request, "ability_method", str, errors)
+    random_names = request.get("random_names", False)
+    if not isinstance(random_names, bool):
+        errors.append("'random_names' must be true or false.")
+    count = 1 if count is None else count
+    if not 1 <= count <= MAX_REQUEST_COUNT:
+        errors.append(f"'count' must be between 1 and {MAX_REQUEST_COUNT}.")
+    job = BulkJob(
+        seed=new_seed() if seed is None else seed,
+        race=race.lower() if race else None,
+        class_name=class_name.lower() if class_name else None,
+        name=name,
+        race_weights=_weights(request, "race_weights", errors),
+        class_weights=_weights(request, "class_weights", errors),
+        ability_method=ability_method or DEFAULT_ABILITY_METHOD,
+        random_names=random_names is True,
+    )
+    if not errors:
+        errors = validate_job(job)
+    if errors:
+        return {**response, "ok": False, "error": "; ".join(errors)}
+
+    try:
+        if count == 1:
+            rng = DiceRoller(CustomRandom(job.seed))
+            character = generate_random_character(
+                rng,
+                job.race,
+                job.class_name,
+                job.name,
+                race_weights=job.race_weights,
+                class_weights=job.class_weights,
+                ability_method=job.ability_method,
+            )
+            if job.random_names:
+                name_character(character, rng)
+            characters = [character]
+        else:
+            characters = list(iter_characters(job, count))
+    except ValueError as exc:
+        return {**response, "ok": False, "error": str(exc)}
+    return {
+        **response,
+        "ok": True,
+        "seed": job.seed,
+        "characters": [character.to_dict() for character in characters],
+    }
+
+
+def serve(stdin: TextIO, stdout: TextIO) -> int:
+    """Answer NDJSON requests from ``stdin`` until it is closed.
+
+    Blank lines are ignored. Lines that are not valid JSON get an error
+    response with a ``null`` id, and serving continues.
+
+    Args:
+        stdin (TextIO): Request stream.
+        stdout (TextIO): Response stream; flushed after every response.
+
+    Returns:
+        int: Number of requests answered.
+    """
+    served = 0
+    for line in stdin:
+        if not line.strip():
+            continue
+        with stage("serve.request"):
+            try:
+                response = handle_request(json.loads(line))
+            except json.JSONDecodeError as exc:
+                response = {"id": None, "ok": False, "error": f"Invalid JSON: {exc}"}
+            stdout.write(json.dumps(response) + "\n")
+        stdout.flush()
+        served += 1
+    return served
@@ -0,0 +1,579 @@
+"""
+Sharded JSON lines output with background compression.
+
+A :class:`ShardWriter` splits a stream of records into numbered shard files
+in one directory, starting a new shard once the current one reaches a record
+count or an uncompressed size. Records are handed to a small thread pool in
+bounded blocks that are compressed and written as they arrive, so generation
+does not wait for compression or disk I/O and a shard is never held in memory
+whole. ``gzip`` and ``lzma`` release the GIL while compressing, so the pool
+compresses shards in parallel.
+
+The directory also holds a ``manifest.json`` that lists every shard with its
+record range, size and SHA-256 checksum. The manifest is rewritten after
+each completed shard, so it always describes the shards that are safely on
+disk.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import re
+import tempfile
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from queue import Queue
+from types import TracebackType
+from typing import IO, Any, Final, Literal, Self, cast
+
+from rpgcharacters.metrics import stage
+from rpgcharacters.rules import atomic_write_bytes
+
+# --- Constants ---
+
+Compression = Literal["none", "gzip", "lzma"]
+COMPRESSIONS: Final[tuple[Compression, ...]] = ("none", "gzip", "lzma")
+SHARD_SUFFIXES: Final[dict[Compression, str]] = {
+    "none": ".jsonl",
+    "gzip": ".jsonl.gz",
+    "lzma": ".jsonl.xz",
+}
+MANIFEST_NAME: Final = "manifest.json"
+MANIFEST_VERSION: Final = 1
+DEFAULT_SHARD_RECORDS = 1_000_000
+DEFAULT_WRITER_THREADS = 2
+SHARD_BLOCK_BYTES = 1 << 20
+SHARD_QUEUE_BLOCKS = 4
+
+
+@dataclass(frozen=True, slots=True)
+class ShardSpec:
+    """When to rotate shards and how to compress them.
+
+    Attributes:
+        max_records: Records per shard, or ``None`` for no record limit.
+        max_bytes: Uncompressed bytes per shard, or ``None`` for no size
+            limit. A shard is closed after the record that reaches it.
+        compression: ``"none"``, ``"gzip"`` or ``"lzma"``.
+    """
+
+    max_records: int | None = DEFAULT_SHARD_RECORDS
+    max_bytes: int | None = None
+    compression: Compression = "none"
+
+    def validate(self) -> list[str]:
+        """Check the rotation limits and compression.
+
+        Returns:
+            list[str]: Validation messages. Empty when the spec is valid.
+        """
+        errors: list[str] = []
+        if self.max_records is not None and self.max_records < 1:
+            errors.append("Shard record limit must be at least 1.")
+        if self.max_bytes is not None and self.max_bytes < 1:
+            errors.append("Shard size limit must be at least 1 byte.")
+        if self.max_records is None and self.max_bytes is None:
+            errors.append("Shards need a record limit or a size limit.")
+        if self.compression not in COMPRESSIONS:
+            errors.append(f"Unknown compression: '{self.compression}'")
+        return errors
+
+
+@dataclass(frozen=True, slots=True)
+class ShardInfo:
+    """One completed shard file.
+
+    Attributes:
+        path: File name, relative to the shard directory.
+        start: Index of the first record in the shard.
+        stop: One past the index of the last record in the shard.
+        size: File size in bytes, after compression.
+        sha256: Hex SHA-256 of the file contents.
+    """
+
+    path: str
+    start: int
+    stop: int
+    size: int
+    sha256: str
+
+    @property
+    def count(self) -> int:
+        """Number of records in the shard."""
+        return self.stop - self.start
+
+
+@dataclass(frozen=True, slots=True)
+class Manifest:
+    """Index of the shards in a shard directory.
+
+    Attributes:
+        compression: Compression used by every shard.
+        shards: Shards in record order.
+    """
+
+    compression: Compression
+    shards: tuple[ShardInfo, ...] = ()
+
+    @property
+    def records(self) -> int:
+        """Number of records across all shards."""
+        return self.shards[-1].stop if self.shards else 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the manifest to a JSON-compatible dictionary.
+
+        Returns:
+            dict[str, Any]: Manifest document.
+        """
+        return {
+            "version": MANIFEST_VERSION,
+            "compression": self.compression,
+            "records": self.records,
+            "shards": [
+                {
+                    "path": shard.path,
+                    "start": shard.start,
+                    "stop": shard.stop,
+                    "size": shard.size,
+                    "sha256": shard.sha256,
+                }
+                for shard in self.shards
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Manifest:
+        """Rebuild a manifest from :meth:`to_dict` output.
+
+        Args:
+            data (Mapping[str, Any]): Manifest document.
+
+        Returns:
+            Manifest: The manifest.
+
+        Raises:
+            ValueError: If the document is not a manifest of this version.
+        """
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version: {data.get('version')!r}")
+        if data.get("compression") not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {data.get('compression')!r}")
+        try:
+            shards = tuple(
+                ShardInfo(
+                    str(shard["path"]),
+                    int(shard["start"]),
+                    int(shard["stop"]),
+                    int(shard["size"]),
+                    str(shard["sha256"]),
+                )
+                for shard in data["shards"]
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Malformed manifest: {exc}") from exc
+        return cls(data["compression"], shards)
+
+
+# --- Files ---
+
+def compress(data: bytes, compression: Compression) -> bytes:
+    """Compress shard contents.
+
+    Args:
+        data (bytes): Uncompressed JSON lines.
+        compression (Compression): ``"none"``, ``"gzip"`` or ``"lzma"``.
+
+    Returns:
+        bytes: File contents.
+    """
+    match compression:
+        case "gzip":
+            return gzip.compress(data, mtime=0)
+        case "lzma":
+            return lzma.compress(data)
+        case _:
+            return data
+
+
+def decompress(data: bytes, compression: Compression) -> bytes:
+    """Reverse :func:`compress`.
+
+    Args:
+        data (bytes): File contents.
+        compression (Compression): Compression the file was written with.
+
+    Returns:
+        bytes: Uncompressed JSON lines.
+    """
+    match compression:
+        case "gzip":
+            return gzip.decompress(data)
+        case "lzma":
+            return lzma.decompress(data)
+        case _:
+            return data
+
+
+def write_shard_file(path: Path, data: bytes, compression: Compression) -> tuple[int, str]:
+    """Compress and atomically write one shard.
+
+    Args:
+        path (Path): Shard file path.
+        data (bytes): Uncompressed JSON lines.
+        compression (Compression): Compression to apply.
+
+    Returns:
+        tuple[int, str]: File size and hex SHA-256 of the file contents.
+    """
+    with stage("shards.compress"):
+        contents = compress(data, compression)
+    with stage("shards.write"):
+        atomic_write_bytes(path, contents)
+    return len(contents), hashlib.sha256(contents).hexdigest()
+
+
+class _HashingWriter:
+    """Binary sink that counts and hashes what it passes to a file."""
+
+    def __init__(self, file: IO[bytes]) -> None:
+        self.file = file
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.file.write(data)
+        self.size += len(data)
+        self.sha256.update(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+
+def _compressing_writer(sink: _HashingWriter, compression: Compression) -> Any:
+    match compression:
+        case "gzip":
+            return gzip.GzipFile(fileobj=sink, mode="wb", mtime=0)
+        case "lzma":
+            return lzma.LZMAFile(cast(IO[bytes], sink), "wb")
+        case _:
+            return nullcontext(sink)
+
+
+def write_shard_blocks(
+    path: Path, blocks: Iterable[bytes], compression: Compression
+) -> tuple[int, str]:
+    """Compress blocks of JSON lines as they arrive and atomically write one shard.
+
+    Args:
+        path (Path): Shard file path.
+        blocks (Iterable[bytes]): Uncompressed JSON lines, in order.
+        compression (Compression): Compression to apply.
+
+    Returns:
+        tuple[int, str]: File size and hex SHA-256 of the file contents.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file, stage("shards.write"):
+            sink = _HashingWriter(file)
+            with _compressing_writer(sink, compression) as out:
+                for block in blocks:
+                    out.write(block)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return sink.size, sink.sha256.hexdigest()
+
+
+def remove_shards(directory: str | Path, prefix: str = "characters") -> None:
+    """Delete the shards and manifest a previous run left in a directory.
+
+    Args:
+        directory (str | Path): Shard directory.
+        prefix (str): Shard file name prefix.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return
+    suffixes = "|".join(re.escape(suffix) for suffix in SHARD_SUFFIXES.values())
+    pattern = re.compile(rf"{re.escape(prefix)}-\d{{5,}}(?:{suffixes})")
+    for path in directory.iterdir():
+        if pattern.fullmatch(path.name):
+            path.unlink()
+    (directory / MANIFEST_NAME).unlink(missing_ok=True)
+
+
+def write_manifest(directory: str | Path, manifest: Manifest) -> None:
+    """Atomically replace the manifest of a shard directory.
+
+    Args:
+        directory (str | Path): Shard directory.
+        manifest (Manifest): Manifest to write.
+    """
+    data = json.dumps(manifest.to_dict(), indent=2).encode("utf-8")
+    atomic_write_bytes(Path(directory) / MANIFEST_NAME, data)
+
+
+def load_manifest(directory: str | Path) -> Manifest:
+    """Read the manifest of a shard directory.
+
+    Args:
+        directory (str | Path): Shard directory.
+
+    Returns:
+        Manifest: The manifest.
+
+    Raises:
+        OSError: If the manifest cannot be read.
+        ValueError: If the manifest is invalid.
+    """
+    try:
+        data = json.loads((Path(directory) / MANIFEST_NAME).read_bytes())
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Could not parse manifest: {exc}") from exc
+    if not isinstance(data, dict):
+        raise ValueError("Manifest must be a JSON object.")
+    return Manifest.from_dict(data)
+
+
+def read_shard(
+    directory: str | Path,
+    shard: ShardInfo,
+    compression: Compression,
+    verify: bool = True,
+) -> bytes:
+    """Read and decompress one shard.
+
+    Args:
+        directory (str | Path): Shard directory.
+        shard (ShardInfo): Shard to read.
+        compression (Compression): Compression from the manifest.
+        verify (bool): Whether to check the file against its checksum.
+
+    Returns:
+        bytes: Uncompressed JSON lines.
+
+    Raises:
+        OSError: If the shard cannot be read.
+        ValueError: If the shard does not match its checksum.
+    """
+    contents = (Path(directory) / shard.path).read_bytes()
+    if verify and hashlib.sha256(contents).hexdigest() != shard.sha256:
+        raise ValueError(f"Shard {shard.path} does not match its checksum.")
+    return decompress(contents, compression)
+
+
+def iter_shard_records(directory: str | Path, verify: bool = True) -> Iterator[dict[str, Any]]:
+    """Stream every record of a shard directory in index order.
+
+    Args:
+        directory (str | Path): Shard directory.
+        verify (bool): Whether to check each shard against its checksum.
+
+    Yields:
+        dict[str, Any]: Decoded records.
+    """
+    manifest = load_manifest(directory)
+    for shard in manifest.shards:
+        for line in read_shard(directory, shard, manifest.compression, verify).splitlines():
+            yield json.loads(line)
+
+
+# --- Writer ---
+
+class ShardWriter:
+    """Write records into size-rotated shards on a background thread pool.
+
+    Records are collected into blocks of ``SHARD_BLOCK_BYTES`` and queued to
+    the pool task writing the current shard, which compresses each block as
+    it arrives. At most ``SHARD_QUEUE_BLOCKS`` blocks wait per shard, so
+    memory stays bounded whatever the shard size. Once a shard is full a new
+    one is started while earlier ones finish; at most ``threads`` finished
+    shards are in flight, and beyond that :meth:`write` waits for the oldest.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        spec: ShardSpec | None = None,
+        prefix: str = "characters",
+        threads: int = DEFAULT_WRITER_THREADS,
+        shards: Iterable[ShardInfo] = (),
+        on_shard: Callable[[ShardInfo], None] | None = None,
+    ) -> None:
+        """Open a shard directory for writing.
+
+        Args:
+            directory (str | Path): Directory for shards and the manifest;
+                created if missing.
+            spec (ShardSpec | None): Rotation and compression settings.
+            prefix (str): Shard file name prefix.
+            threads (int): Shards that may finish compressing while the
+                next one fills.
+            shards (Iterable[ShardInfo]): Completed shards to keep, for
+                continuing an interrupted run. Writing resumes after them.
+            on_shard (Callable[[ShardInfo], None] | None): Called in the
+                writing thread, in order, after each shard and the manifest
+                are on disk.
+
+        Raises:
+            ValueError: If the spec or thread count is invalid.
+        """
+        self.spec = spec or ShardSpec()
+        errors = self.spec.validate()
+        if threads < 1:
+            errors.append("Shard writer needs at least one thread.")
+        if errors:
+            raise ValueError("; ".join(errors))
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.threads = threads
+        self.shards = list(shards)
+        self.on_shard = on_shard
+        self._start = self.shards[-1].stop if self.shards else 0
+        self._block = bytearray()
+        self._bytes = 0
+        self._records = 0
+        self._stream: tuple[Future[tuple[int, str]], Queue[bytes | None], str] | None = None
+        self._aborted = threading.Event()
+        self._pending: deque[tuple[Future[tuple[int, str]], str, int, int]] = deque()
+        # One more thread than finishing shards, for the shard being filled.
+        self._executor = ThreadPoolExecutor(
+            max_workers=threads + 1, thread_name_prefix="rpgcharacters-shards"
+        )
+
+    @property
+    def records(self) -> int:
+        """Number of records written so far, including buffered ones."""
+        return self._start + self._records
+
+    def write(self, record: bytes) -> None:
+        """Append one record, which must end with a newline.
+
+        Args:
+            record (bytes): One JSON line.
+        """
+        self._block += record
+        self._bytes += len(record)
+        self._records += 1
+        if len(self._block) >= SHARD_BLOCK_BYTES:
+            self._flush_block()
+        spec = self.spec
+        if (spec.max_records is not None and self._records >= spec.max_records) or (
+            spec.max_bytes is not None and self._bytes >= spec.max_bytes
+        ):
+            self._rotate()
+
+    def _write_stream(self, path: Path, blocks: Queue[bytes | None]) -> tuple[int, str]:
+        finished = False
+
+        def take() -> Iterator[bytes]:
+            nonlocal finished
+            while (block := blocks.get()) is not None:
+                yield block
+            finished = True
+            if self._aborted.is_set():
+                raise RuntimeError("Shard writer was aborted.")
+
+        try:
+            return write_shard_blocks(path, take(), self.spec.compression)
+        finally:
+            # Keep taking blocks after a failure so write() never waits on a full queue.
+            while not finished:
+                finished = blocks.get() is None
+
+    def _flush_block(self) -> tuple[Future[tuple[int, str]], Queue[bytes | None], str]:
+        if self._stream is None:
+            number = len(self.shards) + len(self._pending)
+            name = f"{self.prefix}-{number:05d}{SHARD_SUFFIXES[self.spec.compression]}"
+            blocks: Queue[bytes | None] = Queue(SHARD_QUEUE_BLOCKS)
+            future = self._executor.submit(self._write_stream, self.directory / name, blocks)
+            self._stream = (future, blocks, name)
+        if self._block:
+            self._stream[1].put(bytes(self._block))
+            self._block = bytearray()
+        return self._stream
+
+    def _rotate(self) -> None:
+        if not self._records:
+            return
+        future, blocks, name = self._flush_block()
+        blocks.put(None)
+        stop = self._start + self._records
+        self._pending.append((future, name, self._start, stop))
+        self._stream = None
+        self._start = stop
+        self._bytes = 0
+        self._records = 0
+        while len(self._pending) > self.threads:
+            self._complete_oldest()
+
+    def _complete_oldest(self) -> None:
+        future, name, start, stop = self._pending.popleft()
+        size, digest = future.result()
+        shard = ShardInfo(name, start, stop, size, digest)
+        self.shards.append(shard)
+        write_manifest(self.directory, self.manifest())
+        if self.on_shard is not None:
+            self.on_shard(shard)
+
+    def manifest(self) -> Manifest:
+        """Return the manifest of the shards completed so far.
+
+        Returns:
+            Manifest: Completed shards.
+        """
+        return Manifest(self.spec.compression, tuple(self.shards))
+
+    def close(self) -> Manifest:
+        """Write the last partial shard and wait for every shard to finish.
+
+        Returns:
+            Manifest: Manifest of the finished directory.
+        """
+        self._rotate()
+        while self._pending:
+            self._complete_oldest()
+        if not self.shards:
+            write_manifest(self.directory, self.manifest())
+        self._executor.shutdown()
+        return self.manifest()
+
+    def abort(self) -> None:
+        """Stop without completing the shard being filled or recording queued shards."""
+        self._aborted.set()
+        if self._stream is not None:
+            self._stream[1].put(None)
+            self._stream = None
+        for future, *_ in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
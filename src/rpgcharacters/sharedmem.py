@@ -0,0 +1,427 @@
+"""
+Shared-memory transport for bulk generation in worker processes.
+
+Instead of pickling every ``Character`` back to the parent, each worker task
+writes its chunk into a ``multiprocessing.shared_memory`` segment as columns:
+one typed array per field, with races and classes stored as rules-table
+codes. The parent attaches to the segment and reads the columns through
+zero-copy ``memoryview`` casts. Names and inventories are kept as encoded
+blobs and only decoded when asked for.
+
+Segment layout (native byte order; segments never leave the host)::
+
+    header   count, extras size
+    columns  one array per entry of COLUMNS, each 8-byte aligned
+    extras   JSON ``[name, inventory]`` per character, back to back
+"""
+
+from __future__ import annotations
+
+import json
+import secrets
+import struct
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Any, Final, Literal, Self, cast
+
+from rpgcharacters.bulk import (
+    DEFAULT_CHUNK_SIZE,
+    BulkJob,
+    chunk_ranges,
+    generate_chunk,
+    pool_map,
+    validate_job,
+)
+from rpgcharacters.character_generator import (
+    AbilityScores,
+    Character,
+    calculate_ability_modifiers,
+)
+from rpgcharacters.rules import ABILITY_NAMES, SAVING_THROW_NAMES, CompiledRules, active_rules
+
+# --- Layout ---
+
+@dataclass(frozen=True, slots=True)
+class Column:
+    """One typed array in a shared batch.
+
+    Attributes:
+        name: Column name.
+        typecode: ``array``/``memoryview`` type code of the elements.
+        width: Elements per character.
+    """
+
+    name: str
+    typecode: Literal["b", "B", "h", "I"]
+    width: int = 1
+
+
+COLUMNS: Final[tuple[Column, ...]] = (
+    Column("abilities", "B", len(ABILITY_NAMES)),
+    Column("race", "B"),
+    Column("class", "B"),
+    Column("level", "B"),
+    Column("hp", "h"),
+    Column("ac", "h"),
+    Column("attack_bonus", "h"),
+    Column("money_gp", "I"),
+    Column("saving_throws", "b", len(SAVING_THROW_NAMES)),
+    Column("extras_end", "I"),
+)
+"""Columns of a shared batch. ``abilities`` and ``saving_throws`` are
+row-major in ``ABILITY_NAMES`` and ``SAVING_THROW_NAMES`` order."""
+
+_HEADER: Final = struct.Struct("=II")
+_ALIGN = 8
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def column_offsets(count: int) -> tuple[dict[str, tuple[int, int]], int]:
+    """Compute where each column of a ``count``-character batch lives.
+
+    Args:
+        count (int): Number of characters in the batch.
+
+    Returns:
+        tuple[dict[str, tuple[int, int]], int]: ``(offset, byte length)`` per
+            column name, and the offset where the extras blob starts.
+    """
+    offsets = {}
+    offset = _align(_HEADER.size)
+    for column in COLUMNS:
+        length = count * column.width * array(column.typecode).itemsize
+        offsets[column.name] = (offset, length)
+        offset = _align(offset + length)
+    return offsets, offset
+
+
+# --- Writing ---
+
+def _column_values(column: str, character: Character, rules: CompiledRules) -> list[int]:
+    match column:
+        case "abilities":
+            return [getattr(character.abilities, name) for name in ABILITY_NAMES]
+        case "race":
+            return [rules.race_index(character.race)]
+        case "class":
+            return [rules.class_index(character.class_name)]
+        case "saving_throws":
+            return [character.saving_throws[name] for name in SAVING_THROW_NAMES]
+        case _:
+            return [getattr(character, column)]
+
+
+def write_batch(
+    characters: Sequence[Character],
+    rules: CompiledRules,
+    name: str | None = None,
+) -> str:
+    """Write characters into a new shared-memory segment.
+
+    The segment is left in place for a reader; whoever reads it is
+    responsible for unlinking it.
+
+    Args:
+        characters (Sequence[Character]): Characters to write.
+        rules (CompiledRules): Rules whose tables give race and class codes.
+        name (str | None): Segment name, or ``None`` for a generated name.
+
+    Returns:
+        str: Name of the created segment.
+
+    Raises:
+        ValueError: If a value does not fit its column.
+    """
+    extras = [
+        json.dumps([character.name, character.inventory]).encode("utf-8")
+        for character in characters
+    ]
+    offsets, extras_start = column_offsets(len(characters))
+    extras_size = sum(len(blob) for blob in extras)
+    ends = array("I")
+    end = 0
+    for blob in extras:
+        end += len(blob)
+        ends.append(end)
+
+    shm = SharedMemory(name=name, create=True, size=max(extras_start + extras_size, 1), track=False)
+    try:
+        buf = cast(memoryview, shm.buf)
+        _HEADER.pack_into(buf, 0, len(characters), extras_size)
+        for column in COLUMNS:
+            if column.name == "extras_end":
+                values = ends
+            else:
+                try:
+                    values = array(
+                        column.typecode,
+                        (
+                            value
+                            for character in characters
+                            for value in _column_values(column.name, character, rules)
+                        ),
+                    )
+                except OverflowError as exc:
+                    raise ValueError(f"Column '{column.name}' cannot hold a value: {exc}") from exc
+            offset, length = offsets[column.name]
+            buf[offset:offset + length] = values.tobytes()
+        buf[extras_start:extras_start + extras_size] = b"".join(extras)
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    return shm.name
+
+
+# --- Reading ---
+
+class SharedBatch:
+    """Read-only view of a batch written by :func:`write_batch`.
+
+    Column views returned by :meth:`column` alias the shared segment, so
+    they must not be used after the batch is closed.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Attach to an existing batch segment.
+
+        Args:
+            name (str): Segment name returned by :func:`write_batch`.
+        """
+        self._shm = SharedMemory(name=name)
+        self._buf = cast(memoryview, self._shm.buf)
+        count, extras_size = _HEADER.unpack_from(self._buf, 0)
+        self._count: int = count
+        self._extras_size: int = extras_size
+        self._offsets, self._extras_start = column_offsets(self._count)
+        self._views: dict[str, memoryview] = {}
+
+    @property
+    def name(self) -> str:
+        """Name of the underlying shared-memory segment."""
+        return self._shm.name
+
+    def __len__(self) -> int:
+        return self._count
+
+    def column(self, name: str) -> memoryview:
+        """Return a zero-copy typed view of one column.
+
+        Args:
+            name (str): Column name from ``COLUMNS``.
+
+        Returns:
+            memoryview: Flat view with ``len(batch) * width`` elements.
+
+        Raises:
+            KeyError: If ``name`` is not a column.
+        """
+        view = self._views.get(name)
+        if view is None:
+            offset, length = self._offsets[name]
+            typecode = next(column.typecode for column in COLUMNS if column.name == name)
+            view = self._buf[offset:offset + length].cast(typecode)
+            self._views[name] = view
+        return view
+
+    def _extras(self, index: int) -> list[Any]:
+        if not 0 <= index < self._count:
+            raise IndexError(f"Character index {index} is out of range.")
+        ends = self.column("extras_end")
+        start = self._extras_start + (ends[index - 1] if index else 0)
+        stop = self._extras_start + ends[index]
+        extras: list[Any] = json.loads(bytes(self._buf[start:stop]))
+        return extras
+
+    def character_name(self, index: int) -> str | None:
+        """Decode one character's name.
+
+        Args:
+            index (int): Character index within the batch.
+
+        Returns:
+            str | None: The character's name.
+        """
+        name: str | None = self._extras(index)[0]
+        return name
+
+    def inventory(self, index: int) -> list[str]:
+        """Decode one character's inventory.
+
+        Args:
+            index (int): Character index within the batch.
+
+        Returns:
+            list[str]: The character's inventory.
+        """
+        inventory: list[str] = self._extras(index)[1]
+        return inventory
+
+    def character(self, index: int, rules: CompiledRules | None = None) -> Character:
+        """Decode one character in full.
+
+        Args:
+            index (int): Character index within the batch.
+            rules (CompiledRules | None): Rules the batch was written with;
+                defaults to the active rules.
+
+        Returns:
+            Character: The decoded character.
+        """
+        rules = rules or active_rules()
+        name, inventory = self._extras(index)
+        width = len(ABILITY_NAMES)
+        scores = self.column("abilities")[index * width:(index + 1) * width]
+        abilities = AbilityScores(**dict(zip(ABILITY_NAMES, scores.tolist(), strict=True)))
+        save_width = len(SAVING_THROW_NAMES)
+        saves = dict(
+            zip(
+                SAVING_THROW_NAMES,
+                self.column("saving_throws")[index * save_width:(index + 1) * save_width].tolist(),
+                strict=True,
+            )
+        )
+        class_name = rules.class_names[self.column("class")[index]]
+        save_order = rules.pack["classes"][class_name]["saving_throws"]
+        return Character(
+            abilities=abilities,
+            ability_mods=calculate_ability_modifiers(abilities),
+            ac=self.column("ac")[index],
+            attack_bonus=self.column("attack_bonus")[index],
+            class_name=class_name,
+            hp=self.column("hp")[index],
+            inventory=inventory,
+            level=self.column("level")[index],
+            money_gp=self.column("money_gp")[index],
+            name=name,
+            race=rules.race_names[self.column("race")[index]],
+            saving_throws={save: saves[save] for save in save_order},
+        )
+
+    def close(self) -> None:
+        """Release the column views and detach from the segment."""
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Remove the segment once every process has closed it."""
+        self._shm.unlink()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+# --- Bulk Generation ---
+
+def generate_shared_chunk(job: BulkJob, start: int, stop: int, name: str) -> str:
+    """Generate a chunk of a bulk job into a named shared-memory segment.
+
+    Args:
+        job (BulkJob): Bulk job parameters.
+        start (int): First index (inclusive).
+        stop (int): Last index (exclusive).
+        name (str): Segment name to create.
+
+    Returns:
+        str: Name of the created segment.
+    """
+    return write_batch(generate_chunk(job, start, stop), active_rules(), name)
+
+
+def _discard_segment(name: str) -> None:
+    try:
+        SharedMemory(name=name).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def iter_shared_batches(
+    job: BulkJob,
+    count: int,
+    workers: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[SharedBatch]:
+    """Generate a bulk job in worker processes, yielding shared batches in order.
+
+    Each batch is closed and unlinked when the next one is requested, so
+    column views must not be kept past that point. Segments are cleaned up
+    even if iteration stops early.
+
+    Args:
+        job (BulkJob): Bulk job parameters.
+        count (int): Number of characters to generate.
+        workers (int): Number of worker processes.
+        chunk_size (int): Characters per batch.
+
+    Yields:
+        SharedBatch: Batches covering indices ``0`` through ``count - 1``.
+
+    Raises:
+        ValueError: If the job's race or class is invalid.
+    """
+    errors = validate_job(job)
+    if errors:
+        raise ValueError("; ".join(errors))
+    prefix = f"rpgc-{secrets.token_hex(4)}"
+    pending: list[str] = []
+
+    def task_args() -> Iterator[tuple[Any, ...]]:
+        for start, stop in chunk_ranges(0, count, chunk_size):
+            name = f"{prefix}-{start}"
+            pending.append(name)
+            yield job, start, stop, name
+
+    results = pool_map(generate_shared_chunk, task_args(), max(workers, 1))
+    try:
+        for name in results:
+            pending.remove(name)
+            batch = SharedBatch(name)
+            try:
+                yield batch
+            finally:
+                batch.close()
+                batch.unlink()
+    finally:
+        results.close()
+        for name in pending:
+            _discard_segment(name)
+
+
+def iter_shared_characters(
+    job: BulkJob,
+    count: int,
+    workers: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Character]:
+    """Generate a bulk job through shared memory, decoding every character.
+
+    Args:
+        job (BulkJob): Bulk job parameters.
+        count (int): Number of characters to generate.
+        workers (int): Number of worker processes.
+        chunk_size (int): Characters per batch.
+
+    Yields:
+        Character: Characters ``0`` through ``count - 1``.
+    """
+    rules = active_rules()
+    for batch in iter_shared_batches(job, count, workers, chunk_size):
+        for index in range(len(batch)):
+            yield batch.character(index, rules)
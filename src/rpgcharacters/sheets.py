@@ -0,0 +1,186 @@
+"""
+Human-readable character sheets.
+
+:func:`render_sheet` produces the summary the interactive CLI shows after a
+character is built, as a single string. The sheet layout is one format
+template, and the labels that need string manipulation (saving throw names,
+ability lines) are computed once per distinct value and cached, so rendering
+a sheet is a handful of joins and one ``str.format`` call.
+
+:class:`TextBuffer` collects rendered text in memory and writes it to the
+underlying stream in large chunks, which keeps per-sheet writes off the
+stream when rendering many thousands of sheets.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import cache
+from types import TracebackType
+from typing import Final, TextIO
+
+from rpgcharacters.character_generator import ABILITY_ROLL_ORDER, Character
+
+# --- Constants ---
+
+SHEET_RULE: Final = "=" * 40
+DEFAULT_BUFFER_CHARS = 1 << 20
+_SHEET_TEMPLATE: Final = (
+    f"{SHEET_RULE}\n"
+    " {title}\n"
+    f"{SHEET_RULE}\n"
+    "\n"
+    "HP: {hp}\n"
+    "AC: {ac}\n"
+    "Attack Bonus: {attack_bonus:+d}\n"
+    "Money: {money} gp\n"
+    "\n"
+    "Abilities:\n"
+    "{abilities}"
+    "\n"
+    "Saving Throws:\n"
+    "{saving_throws}"
+    "\n"
+)
+
+
+# --- Display Strings ---
+
+@cache
+def saving_throw_label(name: str) -> str:
+    """Turn a saving throw key into its display name.
+
+    Args:
+        name (str): Saving throw key, e.g. ``"death_ray_or_poison"``.
+
+    Returns:
+        str: Display name, e.g. ``"Death Ray or Poison"``.
+    """
+    words = name.replace("_", " ").split()
+    return " ".join(word.title() if word.lower() != "or" else "or" for word in words)
+
+
+@cache
+def ability_line(ability: str, score: int, modifier: int) -> str:
+    """Format one line of a sheet's ability block.
+
+    Args:
+        ability (str): Ability name.
+        score (int): Ability score.
+        modifier (int): Ability modifier.
+
+    Returns:
+        str: Line including its newline, e.g. ``"STR: 13 (+1)\\n"``.
+    """
+    return f"{ability}: {score:2d} ({modifier:+d})\n"
+
+
+@cache
+def _saving_throw_lines(names: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+    # Sorted saving throw keys with their "  Label: " line prefixes.
+    return tuple((name, f"  {saving_throw_label(name)}: ") for name in sorted(names))
+
+
+@cache
+def _title_suffix(race: str, class_name: str, level: int) -> str:
+    return f"{race.title()} {class_name.title()} (Level {level})"
+
+
+# --- Rendering ---
+
+def render_sheet(character: Character) -> str:
+    """Render a character as a text sheet.
+
+    Args:
+        character (Character): Character to render.
+
+    Returns:
+        str: Sheet text, ending with a blank line.
+    """
+    suffix = _title_suffix(character.race, character.class_name, character.level)
+    title = f"{character.name} the {suffix}" if character.name else suffix
+    abilities, mods = character.abilities, character.ability_mods
+    saving_throws = character.saving_throws
+    return _SHEET_TEMPLATE.format(
+        title=title,
+        hp=character.hp,
+        ac=character.ac,
+        attack_bonus=character.attack_bonus,
+        money=character.money_gp,
+        abilities="".join(
+            ability_line(ability, getattr(abilities, ability), mods[ability])
+            for ability in ABILITY_ROLL_ORDER
+        ),
+        saving_throws="".join(
+            f"{prefix}{saving_throws[name]:2d}\n"
+            for name, prefix in _saving_throw_lines(tuple(saving_throws))
+        ),
+    )
+
+
+class TextBuffer:
+    """Collect text in memory and write it to a stream in large chunks."""
+
+    def __init__(self, output: TextIO, limit: int = DEFAULT_BUFFER_CHARS) -> None:
+        """Wrap a stream.
+
+        Args:
+            output (TextIO): Stream the buffered text is written to.
+            limit (int): Buffered characters that trigger a write.
+        """
+        self.output = output
+        self.limit = limit
+        self._parts: list[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        """Buffer text, writing the buffer out once it reaches the limit.
+
+        Args:
+            text (str): Text to write.
+        """
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.limit:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered text to the stream."""
+        if self._parts:
+            self.output.write("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+
+    def __enter__(self) -> TextBuffer:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.flush()
+
+
+def write_sheets(
+    characters: Iterable[Character],
+    output: TextIO,
+    limit: int = DEFAULT_BUFFER_CHARS,
+) -> int:
+    """Render characters as sheets and write them through a :class:`TextBuffer`.
+
+    Args:
+        characters (Iterable[Character]): Characters to render.
+        output (TextIO): Stream to write to.
+        limit (int): Buffered characters that trigger a write.
+
+    Returns:
+        int: Number of sheets written.
+    """
+    count = 0
+    with TextBuffer(output, limit) as buffer:
+        for character in characters:
+            buffer.write(render_sheet(character))
+            count += 1
+    return count
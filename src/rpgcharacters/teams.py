@@ -0,0 +1,330 @@
+"""
+Splitting a character pool into teams of near-equal strength.
+
+Each character's strength is a weighted sum of its derived stats: hit points,
+armor class, attack bonus and the six ability modifiers. The stats are read
+once into one ``array('d')`` column per stat (:class:`StatTable`), and
+strengths are computed a column at a time, so a custom strength function
+works on whole columns rather than on :class:`Character` objects.
+
+:func:`partition_scores` first deals characters from strongest to weakest to
+the currently weakest team that still has room, then repeatedly moves or
+swaps characters between the strongest team and a weaker one while that
+narrows the gap. Team sizes never differ by more than one.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+from array import array
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Final
+
+from rpgcharacters.character_generator import Character
+from rpgcharacters.rules import ABILITY_NAMES
+
+# --- Constants ---
+
+STAT_NAMES: Final[tuple[str, ...]] = ("hp", "ac", "attack_bonus") + tuple(
+    f"{ability.lower()}_mod" for ability in ABILITY_NAMES
+)
+DEFAULT_STRENGTH_WEIGHTS: Final[Mapping[str, float]] = {name: 1.0 for name in STAT_NAMES}
+DEFAULT_MAX_ITERATIONS = 100_000
+
+
+class StatTable:
+    """Derived stats of a character pool, one numeric column per stat."""
+
+    def __init__(self, columns: Mapping[str, array[float]]) -> None:
+        """Wrap existing columns.
+
+        Args:
+            columns (Mapping[str, array[float]]): Column per name in
+                :data:`STAT_NAMES`, all of the same length.
+
+        Raises:
+            ValueError: If a column is missing or lengths differ.
+        """
+        missing = [name for name in STAT_NAMES if name not in columns]
+        if missing:
+            raise ValueError(f"Missing stat columns: {', '.join(missing)}")
+        lengths = {len(columns[name]) for name in STAT_NAMES}
+        if len(lengths) > 1:
+            raise ValueError("Stat columns have different lengths.")
+        self.columns = {name: columns[name] for name in STAT_NAMES}
+
+    def __len__(self) -> int:
+        return len(self.columns["hp"])
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]]) -> StatTable:
+        """Build a table from ``Character.to_dict()`` records.
+
+        Args:
+            records (Iterable[Mapping[str, Any]]): Character dictionaries.
+
+        Returns:
+            StatTable: One row per record, in order.
+
+        Raises:
+            KeyError: If a record lacks a stat.
+        """
+        columns = {name: array("d") for name in STAT_NAMES}
+        mod_columns = [(ability, columns[f"{ability.lower()}_mod"]) for ability in ABILITY_NAMES]
+        hp, ac, attack_bonus = columns["hp"], columns["ac"], columns["attack_bonus"]
+        for record in records:
+            hp.append(record["hp"])
+            ac.append(record["ac"])
+            attack_bonus.append(record["attack_bonus"])
+            mods = record["ability_mods"]
+            for ability, column in mod_columns:
+                column.append(mods[ability])
+        return cls(columns)
+
+    @classmethod
+    def from_characters(cls, characters: Iterable[Character]) -> StatTable:
+        """Build a table from characters.
+
+        Args:
+            characters (Iterable[Character]): Characters to read.
+
+        Returns:
+            StatTable: One row per character, in order.
+        """
+        return cls.from_records(
+            {
+                "hp": character.hp,
+                "ac": character.ac,
+                "attack_bonus": character.attack_bonus,
+                "ability_mods": character.ability_mods,
+            }
+            for character in characters
+        )
+
+    def weighted_sum(self, weights: Mapping[str, float]) -> array[float]:
+        """Compute the weighted sum of stat columns for every row.
+
+        Args:
+            weights (Mapping[str, float]): Weight per stat name; stats not
+                listed count zero.
+
+        Returns:
+            array[float]: Strength per row.
+
+        Raises:
+            ValueError: If a weight names an unknown stat.
+        """
+        unknown = sorted(set(weights) - set(STAT_NAMES))
+        if unknown:
+            raise ValueError(
+                f"Unknown stats: {', '.join(unknown)}. Expected some of: {', '.join(STAT_NAMES)}"
+            )
+        scores = [0.0] * len(self)
+        for name, weight in weights.items():
+            if weight:
+                column = self.columns[name]
+                scores = [score + weight * value for score, value in zip(scores, column)]
+        return array("d", scores)
+
+
+StrengthFunction = Callable[[StatTable], Sequence[float]]
+
+
+def strength_scores(
+    table: StatTable,
+    strength: Mapping[str, float] | StrengthFunction = DEFAULT_STRENGTH_WEIGHTS,
+) -> Sequence[float]:
+    """Score every row of a stat table.
+
+    Args:
+        table (StatTable): Stats of the pool.
+        strength (Mapping[str, float] | StrengthFunction): Stat weights, or a
+            function mapping the table to one score per row.
+
+    Returns:
+        Sequence[float]: Strength per row.
+
+    Raises:
+        ValueError: If weights name an unknown stat or the function returns
+            the wrong number of scores.
+    """
+    if isinstance(strength, Mapping):
+        return table.weighted_sum(strength)
+    scores = strength(table)
+    if len(scores) != len(table):
+        raise ValueError(f"Strength function returned {len(scores)} scores for {len(table)} rows.")
+    return scores
+
+
+# --- Partitioning ---
+
+@dataclass(frozen=True, slots=True)
+class Partition:
+    """Teams found by :func:`partition_scores`.
+
+    Attributes:
+        teams: Row indices of each team's members, in ascending order.
+        totals: Total strength of each team.
+        initial_imbalance: Imbalance after the greedy pass, before local
+            search.
+        exchanges: Moves and swaps made by local search.
+    """
+
+    teams: tuple[tuple[int, ...], ...]
+    totals: tuple[float, ...]
+    initial_imbalance: float
+    exchanges: int
+
+    @property
+    def imbalance(self) -> float:
+        """Difference between the strongest and weakest team totals."""
+        return max(self.totals) - min(self.totals)
+
+    @property
+    def relative_imbalance(self) -> float:
+        """Imbalance as a fraction of the mean team total."""
+        mean = sum(self.totals) / len(self.totals)
+        return self.imbalance / abs(mean) if mean else 0.0
+
+    def assignments(self) -> list[int]:
+        """Return the team number of every row."""
+        team_of = [0] * sum(len(members) for members in self.teams)
+        for team, members in enumerate(self.teams):
+            for row in members:
+                team_of[row] = team
+        return team_of
+
+
+def _greedy(scores: Sequence[float], count: int) -> list[list[tuple[float, int]]]:
+    # Deal strongest first to the weakest team with room; at most
+    # len(scores) % count teams get the extra member.
+    base, extra = divmod(len(scores), count)
+    members: list[list[tuple[float, int]]] = [[] for _ in range(count)]
+    heap = [(0.0, team) for team in range(count)]
+    for row in sorted(range(len(scores)), key=scores.__getitem__, reverse=True):
+        while True:
+            total, team = heapq.heappop(heap)
+            size = len(members[team])
+            if size < base or (size == base and extra):
+                break
+        if size == base:
+            extra -= 1
+        members[team].append((scores[row], row))
+        heapq.heappush(heap, (total + scores[row], team))
+    for team_members in members:
+        team_members.sort()
+    return members
+
+
+def _best_exchange(
+    high: list[tuple[float, int]],
+    low: list[tuple[float, int]],
+    gap: float,
+    can_move: bool,
+) -> tuple[float, int, int | None] | None:
+    # Find the member of `high` (and optionally of `low`) whose exchange
+    # leaves the smallest gap; moving `delta` strength leaves |gap - 2 delta|.
+    best: tuple[float, int, int | None] | None = None
+    if can_move:
+        position = bisect.bisect_left(high, (gap / 2, -1))
+        for candidate in (position - 1, position):
+            if 0 <= candidate < len(high):
+                delta = high[candidate][0]
+                remaining = abs(gap - 2 * delta)
+                if remaining < gap and (best is None or remaining < best[0]):
+                    best = (remaining, candidate, None)
+    low_values = [value for value, _ in low]
+    for index, (value, _) in enumerate(high):
+        position = bisect.bisect_left(low_values, value - gap / 2)
+        for candidate in (position - 1, position):
+            if 0 <= candidate < len(low):
+                remaining = abs(gap - 2 * (value - low_values[candidate]))
+                if remaining < gap and (best is None or remaining < best[0]):
+                    best = (remaining, index, candidate)
+    return best
+
+
+def partition_scores(
+    scores: Sequence[float],
+    teams: int,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+) -> Partition:
+    """Split rows into teams with near-equal total score.
+
+    Args:
+        scores (Sequence[float]): Strength per row.
+        teams (int): Number of teams.
+        max_iterations (int): Maximum local-search exchanges.
+
+    Returns:
+        Partition: Team members, totals and the imbalance reached.
+
+    Raises:
+        ValueError: If ``teams`` is less than 1 or more than the number of
+            rows.
+    """
+    if not 1 <= teams <= len(scores):
+        raise ValueError(f"Cannot split {len(scores)} characters into {teams} teams.")
+    members = _greedy(scores, teams)
+    totals = [sum(value for value, _ in team_members) for team_members in members]
+    initial = max(totals) - min(totals)
+
+    exchanges = 0
+    while exchanges < max_iterations:
+        high = max(range(teams), key=totals.__getitem__)
+        gap_order = sorted(range(teams), key=totals.__getitem__)
+        for low in gap_order:
+            gap = totals[high] - totals[low]
+            if gap <= 0:
+                continue
+            can_move = len(members[high]) > len(members[low])
+            best = _best_exchange(members[high], members[low], gap, can_move)
+            if best is not None:
+                break
+        else:
+            break
+        _, high_index, low_index = best
+        moved = members[high].pop(high_index)
+        back = members[low].pop(low_index) if low_index is not None else None
+        bisect.insort(members[low], moved)
+        totals[high] -= moved[0]
+        totals[low] += moved[0]
+        if back is not None:
+            bisect.insort(members[high], back)
+            totals[low] -= back[0]
+            totals[high] += back[0]
+        exchanges += 1
+
+    return Partition(
+        teams=tuple(tuple(sorted(row for _, row in team_members)) for team_members in members),
+        totals=tuple(totals),
+        initial_imbalance=initial,
+        exchanges=exchanges,
+    )
+
+
+def partition_teams(
+    characters: Sequence[Character],
+    teams: int,
+    strength: Mapping[str, float] | StrengthFunction = DEFAULT_STRENGTH_WEIGHTS,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+) -> Partition:
+    """Split characters into teams with near-equal total strength.
+
+    Args:
+        characters (Sequence[Character]): Character pool.
+        teams (int): Number of teams.
+        strength (Mapping[str, float] | StrengthFunction): Stat weights, or a
+            function scoring a :class:`StatTable`.
+        max_iterations (int): Maximum local-search exchanges.
+
+    Returns:
+        Partition: Team members as indices into ``characters``.
+
+    Raises:
+        ValueError: If the strength function or team count is invalid.
+    """
+    scores = strength_scores(StatTable.from_characters(characters), strength)
+    return partition_scores(scores, teams, max_iterations)
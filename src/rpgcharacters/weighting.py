@@ -0,0 +1,268 @@
+"""
+Weighted race and class selection with Walker alias tables.
+
+A weight profile gives each race (or class) a relative frequency, such as
+``{"human": 60, "dwarf": 15, "elf": 15, "halfling": 10}``. Which names are
+eligible changes from character to character, so a selector builds one alias
+table per eligibility mask and caches it. After the first pick for a mask,
+every weighted pick costs one ``randint`` draw and two list lookups.
+
+Tables use integer weights, so picks are exact: a name with weight ``w`` out
+of an eligible total ``W`` is chosen with probability exactly ``w / W``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from math import lcm
+from threading import Lock
+from typing import Final
+
+from diceroller.core import DiceRoller
+
+# --- Constants ---
+
+DEFAULT_WEIGHT = 1
+MAX_SELECTORS = 64
+_MAX_DENOMINATOR: Final = 1_000_000
+
+
+@dataclass(frozen=True, slots=True)
+class AliasTable:
+    """Walker alias table over a fixed list of items.
+
+    Column ``i`` keeps ``items[i]`` for draws below ``thresholds[i]`` (out of
+    ``scale``) and hands the rest to ``items[aliases[i]]``.
+
+    Attributes:
+        items: Items that can be picked.
+        thresholds: Per-column cut-off in ``[0, scale]``.
+        aliases: Per-column alias index into ``items``.
+        scale: Integer total weight of the items.
+    """
+
+    items: tuple[str, ...]
+    thresholds: tuple[int, ...]
+    aliases: tuple[int, ...]
+    scale: int
+
+    def pick(self, rng: DiceRoller) -> str:
+        """Draw one item in proportion to its weight.
+
+        Args:
+            rng (DiceRoller): Dice roller whose generator makes the draw.
+
+        Returns:
+            str: Selected item.
+        """
+        draw: int = rng.rng.randint(0, len(self.items) * self.scale - 1)
+        column, offset = divmod(draw, self.scale)
+        if offset < self.thresholds[column]:
+            return self.items[column]
+        return self.items[self.aliases[column]]
+
+
+def build_alias_table(weights: Mapping[str, int]) -> AliasTable:
+    """Build an alias table from positive integer weights (Vose's method).
+
+    Args:
+        weights (Mapping[str, int]): Weight per item. Items with weight ``0``
+            are left out.
+
+    Returns:
+        AliasTable: Table that picks each item with probability
+            ``weight / sum(weights)``.
+
+    Raises:
+        ValueError: If no item has a positive weight.
+    """
+    items = tuple(item for item, weight in weights.items() if weight > 0)
+    if not items:
+        raise ValueError("At least one weight must be positive.")
+    scale = sum(weights[item] for item in items)
+    # Each column holds ``scale`` units; item i brings ``weight_i * n`` units.
+    remaining = [weights[item] * len(items) for item in items]
+    thresholds = [scale] * len(items)
+    aliases = list(range(len(items)))
+    small = [index for index, units in enumerate(remaining) if units < scale]
+    large = [index for index, units in enumerate(remaining) if units >= scale]
+    while small and large:
+        low = small.pop()
+        high = large[-1]
+        thresholds[low] = remaining[low]
+        aliases[low] = high
+        remaining[high] -= scale - remaining[low]
+        if remaining[high] < scale:
+            small.append(large.pop())
+    return AliasTable(items, tuple(thresholds), tuple(aliases), scale)
+
+
+# --- Weight Profiles ---
+
+def integer_weights(weights: Mapping[str, float]) -> dict[str, int]:
+    """Scale non-negative weights to integers with the same ratios.
+
+    Args:
+        weights (Mapping[str, float]): Relative weights.
+
+    Returns:
+        dict[str, int]: Integer weights in the same proportions.
+
+    Raises:
+        ValueError: If a weight is negative.
+    """
+    fractions = {}
+    for name, weight in weights.items():
+        if weight < 0:
+            raise ValueError(f"Weight for '{name}' must not be negative.")
+        fractions[name] = Fraction(weight).limit_denominator(_MAX_DENOMINATOR)
+    denominator = lcm(*(value.denominator for value in fractions.values())) if fractions else 1
+    return {name: int(value * denominator) for name, value in fractions.items()}
+
+
+def parse_weights(text: str) -> dict[str, float]:
+    """Parse a ``name=weight,name=weight`` weight profile.
+
+    Args:
+        text (str): Comma-separated ``NAME=WEIGHT`` pairs.
+
+    Returns:
+        dict[str, float]: Weights keyed by lowercase name.
+
+    Raises:
+        ValueError: If an entry is malformed or a weight is negative.
+    """
+    weights: dict[str, float] = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, sep, value = item.partition("=")
+        try:
+            weight = float(value) if sep else -1.0
+        except ValueError:
+            weight = -1.0
+        if not name.strip() or not weight >= 0:
+            raise ValueError(f"expected NAME=WEIGHT with a non-negative weight, got '{item}'")
+        weights[name.strip().lower()] = weight
+    return weights
+
+
+class WeightedSelector:
+    """Weighted picker over a fixed set of names with per-mask alias tables.
+
+    Names missing from the weight profile get ``DEFAULT_WEIGHT``. Candidates
+    are described by a bitmask over ``names``; the alias table for each mask
+    is built on first use and reused afterwards.
+    """
+
+    def __init__(self, names: Iterable[str], weights: Mapping[str, float]) -> None:
+        """Create a selector.
+
+        Args:
+            names (Iterable[str]): Every name that can ever be eligible.
+            weights (Mapping[str, float]): Relative weight per name.
+
+        Raises:
+            ValueError: If ``weights`` names something outside ``names`` or
+                contains a negative weight.
+        """
+        self.names = tuple(sorted(name.lower() for name in names))
+        lowered = {name.lower(): weight for name, weight in weights.items()}
+        unknown = sorted(set(lowered) - set(self.names))
+        if unknown:
+            raise ValueError(f"Unknown names in weights: {', '.join(unknown)}")
+        scaled = integer_weights(
+            {name: lowered.get(name, DEFAULT_WEIGHT) for name in self.names}
+        )
+        self.weights = tuple(scaled[name] for name in self.names)
+        self._bits = {name: 1 << index for index, name in enumerate(self.names)}
+        self._tables: dict[int, AliasTable] = {}
+        self._lock = Lock()
+
+    def mask(self, eligible: Iterable[str]) -> int:
+        """Return the bitmask for a set of eligible names.
+
+        Args:
+            eligible (Iterable[str]): Eligible names.
+
+        Returns:
+            int: Bit ``i`` set when ``names[i]`` is eligible.
+
+        Raises:
+            KeyError: If a name is not known to the selector.
+        """
+        mask = 0
+        for name in eligible:
+            mask |= self._bits[name.lower()]
+        return mask
+
+    def table(self, mask: int) -> AliasTable:
+        """Return the cached alias table for an eligibility mask.
+
+        Args:
+            mask (int): Eligibility bitmask from :meth:`mask`.
+
+        Returns:
+            AliasTable: Table over the eligible names with positive weight.
+
+        Raises:
+            ValueError: If no eligible name has a positive weight.
+        """
+        table = self._tables.get(mask)
+        if table is None:
+            table = build_alias_table(
+                {
+                    name: weight
+                    for index, (name, weight) in enumerate(zip(self.names, self.weights))
+                    if mask >> index & 1
+                }
+            )
+            with self._lock:
+                self._tables.setdefault(mask, table)
+        return table
+
+    def select(self, eligible: Iterable[str], rng: DiceRoller) -> str:
+        """Pick one eligible name in proportion to its weight.
+
+        Args:
+            eligible (Iterable[str]): Eligible names.
+            rng (DiceRoller): Dice roller whose generator makes the draw.
+
+        Returns:
+            str: Selected name.
+
+        Raises:
+            ValueError: If nothing is eligible or every eligible name has
+                weight ``0``.
+        """
+        mask = self.mask(eligible)
+        if not mask:
+            raise ValueError("No eligible names to select from.")
+        return self.table(mask).pick(rng)
+
+
+@lru_cache(maxsize=MAX_SELECTORS)
+def _cached_selector(
+    names: tuple[str, ...], weights: tuple[tuple[str, float], ...]
+) -> WeightedSelector:
+    return WeightedSelector(names, dict(weights))
+
+
+def selector_for(names: Iterable[str], weights: Mapping[str, float]) -> WeightedSelector:
+    """Return a shared selector for a name set and weight profile.
+
+    Selectors, and the alias tables they have built, are reused across calls
+    with the same names and weights.
+
+    Args:
+        names (Iterable[str]): Every name that can ever be eligible.
+        weights (Mapping[str, float]): Relative weight per name.
+
+    Returns:
+        WeightedSelector: Cached selector.
+    """
+    return _cached_selector(
+        tuple(sorted(name.lower() for name in names)),
+        tuple(sorted((name.lower(), weight) for name, weight in weights.items())),
+    )
@@ -0,0 +1,162 @@
+from collections import Counter
+from dataclasses import astuple
+
+import pytest
+from diceroller.core import CustomRandom, DiceRoller
+
+from rpgcharacters.ability_methods import (
+    ABILITY_METHODS,
+    STANDARD_ARRAY,
+    ArrayMethod,
+    DiceMethod,
+    dice_weights,
+    get_ability_method,
+    register_ability_method,
+)
+from rpgcharacters.bulk import (
+    BulkJob,
+    create_indexed_roller,
+    generate_indexed_character,
+    iter_characters,
+    validate_job,
+)
+from rpgcharacters.census import iter_census
+from rpgcharacters.character_generator import (
+    ABILITY_ROLL_ORDER,
+    roll_abilities,
+    validate_class,
+    validate_race,
+)
+from rpgcharacters.party import PartySpec, generate_party
+from rpgcharacters.rules import BUILTIN_RULES
+from rpgcharacters.sampling import ability_bounds, is_feasible
+
+FULL_RANGE = ((3, 18),) * 6
+
+
+def roller(seed=1):
+    return DiceRoller(CustomRandom(seed))
+
+
+@pytest.mark.parametrize(
+    ("name", "total"),
+    [("3d6", 216), ("4d6-drop-lowest", 1296), ("3d6-reroll-ones", 125), ("standard-array", 6)],
+)
+def test_score_weights_count_every_outcome(name, total):
+    method = get_ability_method(name)
+    assert len(method.score_weights) == 16
+    assert sum(method.score_weights) == total
+    assert sum(method.score_probabilities()) == pytest.approx(1.0)
+
+
+def test_dice_weights_known_values():
+    assert dice_weights(4, keep=3)[-1] == 21      # 18 from four dice
+    assert dice_weights(3, lowest_face=2)[:3] == (0, 0, 0)  # nothing below 6
+    assert get_ability_method("3d6").mean_score() == pytest.approx(10.5)
+    assert get_ability_method("4d6-drop-lowest").mean_score() == pytest.approx(12.2446, abs=1e-4)
+
+
+def test_default_method_matches_previous_rolls():
+    rng = roller(9)
+    expected = tuple(rng.roll("3d6") for _ in range(6))
+    abilities = roll_abilities(roller(9))
+    assert tuple(getattr(abilities, name) for name in ABILITY_ROLL_ORDER) == expected
+
+
+@pytest.mark.parametrize("name", sorted(ABILITY_METHODS))
+def test_rolls_stay_within_the_method_support(name):
+    method = get_ability_method(name)
+    rng = roller(5)
+    support = {score for score, weight in zip(range(3, 19), method.score_weights) if weight}
+    for _ in range(200):
+        scores = method.roll(rng)
+        assert len(scores) == 6
+        assert set(scores) <= support
+
+
+@pytest.mark.parametrize("name", sorted(ABILITY_METHODS))
+def test_roll_batch_matches_per_character_rolls(name):
+    method = get_ability_method(name)
+    job = BulkJob(seed=11, race="human", ability_method=name)
+    batch = method.roll_batch(create_indexed_roller(job.seed, index) for index in range(40))
+    assert len(batch) == 40 * 6
+    for index in range(40):
+        row = tuple(batch[index * 6:(index + 1) * 6])
+        assert row == method.roll(create_indexed_roller(job.seed, index))
+        abilities = generate_indexed_character(job, index).abilities
+        assert row == tuple(getattr(abilities, ability) for ability in ABILITY_ROLL_ORDER)
+
+
+def test_standard_array_rows_are_permutations():
+    method = get_ability_method("standard-array")
+    rng = roller(3)
+    for _ in range(50):
+        assert sorted(method.roll(rng)) == sorted(STANDARD_ARRAY)
+
+
+def test_rolls_follow_the_exact_distribution():
+    method = get_ability_method("4d6-drop-lowest")
+    rng = roller(11)
+    scores = [score for _ in range(3_500) for score in method.roll(rng)]
+    counts = Counter(scores)
+    for score, p in zip(range(3, 19), method.score_probabilities()):
+        assert counts[score] / len(scores) == pytest.approx(p, abs=0.01)
+
+
+@pytest.mark.parametrize("name", sorted(ABILITY_METHODS))
+def test_sample_bounded_respects_bounds(name):
+    method = get_ability_method(name)
+    bounds = ((3, 18), (3, 18), (3, 18), (13, 18), (9, 18), (3, 18))
+    rng = roller(8)
+    for _ in range(100):
+        scores = method.sample_bounded(rng, bounds)
+        assert all(low <= score <= high for score, (low, high) in zip(scores, bounds))
+
+
+def test_probability_is_exact():
+    assert get_ability_method("3d6").probability(FULL_RANGE) == 1.0
+    assert get_ability_method("3d6").probability(((18, 18),) + FULL_RANGE[1:]) == 1 / 216
+    # Only the 15 fits the first slot and only the 14 the second: 4! orders.
+    array_method = get_ability_method("standard-array")
+    assert array_method.probability(((15, 18), (14, 14)) + FULL_RANGE[2:]) == 24 / 720
+    assert array_method.probability(((16, 18),) + FULL_RANGE[1:]) == 0.0
+    with pytest.raises(ValueError, match="No order"):
+        array_method.sample_bounded(roller(), ((16, 18),) + FULL_RANGE[1:])
+
+
+def test_feasibility_depends_on_the_method():
+    rules = BUILTIN_RULES
+    race, class_name = rules.race_index("human"), rules.class_index("fighter")
+    assert ability_bounds(rules, race, class_name)
+    assert is_feasible(rules, race, class_name, "standard-array")
+    strict = ArrayMethod("all-eights", "Eight everywhere.", (8,) * 6)
+    register_ability_method(strict)
+    try:
+        assert not is_feasible(rules, race, class_name, "all-eights")
+    finally:
+        del ABILITY_METHODS["all-eights"]
+
+
+def test_registry_rejects_duplicates_and_unknown_names():
+    with pytest.raises(ValueError, match="already registered"):
+        register_ability_method(DiceMethod("3d6", "Again.", lambda rng: 10, dice_weights(3)))
+    with pytest.raises(ValueError, match="Unknown ability method"):
+        get_ability_method("5d6")
+    with pytest.raises(ValueError, match="6 scores"):
+        ArrayMethod("short", "Too few.", (10, 10))
+    assert validate_job(BulkJob(seed=1, ability_method="5d6"))
+
+
+def test_bulk_census_and_party_use_the_method():
+    job = BulkJob(seed=21, ability_method="standard-array")
+    for character in iter_characters(job, 30):
+        assert sorted(astuple(character.abilities)) == sorted(STANDARD_ARRAY)
+
+    quotas = {"dwarf": {"fighter": 5}, "elf": {"magic-user": 5}}
+    for character in iter_census(quotas, seed=4, ability_method="standard-array"):
+        assert sorted(astuple(character.abilities)) == sorted(STANDARD_ARRAY)
+        assert not validate_class(character.abilities, character.race, character.class_name)
+
+    spec = PartySpec(size=4, ability_method="4d6-drop-lowest")
+    for member in generate_party(spec, roller(6)).members:
+        assert validate_race(member.abilities, member.race) == []
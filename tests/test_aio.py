@@ -0,0 +1,98 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from rpgcharacters.aio import agenerate_character, agenerate_characters, process_executor
+from rpgcharacters.bulk import BulkJob, create_indexed_roller, iter_characters
+from rpgcharacters.character_generator import generate_character
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+async def collect(stream, limit=None):
+    characters = []
+    async for character in stream:
+        characters.append(character)
+        if limit is not None and len(characters) >= limit:
+            break
+    return characters
+
+
+def test_agenerate_character_matches_generate_character():
+    expected = generate_character("dwarf", "fighter", create_indexed_roller(5, 0), "Brok")
+    character = asyncio.run(
+        agenerate_character("dwarf", "fighter", create_indexed_roller(5, 0), "Brok")
+    )
+    assert character.to_dict() == expected.to_dict()
+
+
+def test_agenerate_character_propagates_errors():
+    with pytest.raises(KeyError):
+        asyncio.run(agenerate_character("dwarf", "ogre", create_indexed_roller(5, 0)))
+
+
+def test_stream_matches_iter_characters():
+    job = BulkJob(seed=17, class_weights={"thief": 3.0})
+    characters = asyncio.run(collect(agenerate_characters(100, job, chunk_size=7)))
+    expected = list(iter_characters(job, 100))
+    assert [c.to_dict() for c in characters] == [c.to_dict() for c in expected]
+
+
+def test_stream_on_process_executor():
+    job = BulkJob(seed=4)
+    with process_executor(2) as executor:
+        stream = agenerate_characters(40, job, executor, chunk_size=8)
+        characters = asyncio.run(collect(stream))
+    assert [c.to_dict() for c in characters] == [c.to_dict() for c in iter_characters(job, 40)]
+
+
+def test_pending_chunks_are_bounded():
+    async def consume_slowly(executor):
+        seen = []
+        async for _ in agenerate_characters(1000, BulkJob(seed=1), executor, 10, 3):
+            seen.append(executor.submitted)
+            if len(seen) == 25:
+                break
+        return seen
+
+    with CountingExecutor() as executor:
+        seen = asyncio.run(consume_slowly(executor))
+    # After consuming k chunks, at most k + 3 chunks have been submitted.
+    assert all(submitted <= index // 10 + 4 for index, submitted in enumerate(seen))
+    assert executor.submitted <= 6
+
+
+def test_cancellation_stops_submitting():
+    async def cancel_consumer(executor):
+        started = asyncio.Event()
+
+        async def consume():
+            async for _ in agenerate_characters(10_000, BulkJob(seed=2), executor, 10, 2):
+                started.set()
+                await asyncio.sleep(3600)
+
+        task = asyncio.create_task(consume())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with CountingExecutor() as executor:
+        asyncio.run(cancel_consumer(executor))
+    assert executor.submitted <= 3
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="Pending chunk limit"):
+        asyncio.run(collect(agenerate_characters(5, BulkJob(seed=1), max_pending=0)))
+    with pytest.raises(ValueError):
+        asyncio.run(collect(agenerate_characters(5, BulkJob(seed=1, race="ogre"))))
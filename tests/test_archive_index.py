@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from rpgcharacters.archive_index import (
+    BitmapIndex,
+    Condition,
+    chunk_bitmaps,
+    iter_matching_records,
+    load_index,
+    parse_condition,
+    record_ids,
+    update_index,
+)
+from rpgcharacters.bulk import BulkJob, iter_characters
+from rpgcharacters.character_generator import ability_modifier
+from rpgcharacters.shards import ShardSpec, ShardWriter, load_manifest
+
+
+def characters(count, seed=4):
+    return [character.to_dict() for character in iter_characters(BulkJob(seed=seed), count)]
+
+
+def write_shards(directory, records, shards=()):
+    spec = ShardSpec(max_records=40, compression="gzip")
+    with ShardWriter(directory, spec, shards=shards) as writer:
+        for record in records:
+            writer.write((json.dumps(record) + "\n").encode("utf-8"))
+    return writer.manifest()
+
+
+def test_record_ids_lists_set_bits():
+    assert list(record_ids(0)) == []
+    assert list(record_ids(0b1010_0000_0001 | 1 << 70)) == [0, 9, 11, 70]
+
+
+def test_parse_condition():
+    assert parse_condition("DEX>=16") == Condition("DEX", ">=", (16,))
+    assert parse_condition("con_mod >= 0") == Condition("CON_mod", ">=", (0,))
+    assert parse_condition("Race=Elf|halfling") == Condition("race", "=", ("elf", "halfling"))
+    assert parse_condition("spells<14") == Condition("spells", "<", (14,))
+
+
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [("race>=elf", "only supports"), ("luck=3", "Unknown query field"), ("STR=high", "integer")],
+)
+def test_parse_condition_rejects_bad_conditions(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse_condition(text)
+
+
+def test_query_matches_full_scan(tmp_path):
+    records = characters(150)
+    write_shards(tmp_path, records)
+    index = update_index(tmp_path)
+    conditions = [
+        parse_condition("race=halfling|dwarf"),
+        parse_condition("DEX>=10"),
+        parse_condition("CON_mod>=0"),
+        parse_condition("spells<=15"),
+    ]
+    expected = [
+        record
+        for record in records
+        if record["race"] in ("halfling", "dwarf")
+        and record["abilities"]["DEX"] >= 10
+        and ability_modifier(record["abilities"]["CON"]) >= 0
+        and record["saving_throws"]["spells"] <= 15
+    ]
+    assert expected
+    assert list(iter_matching_records(tmp_path, index.query_shards(conditions))) == expected
+    matches = index.query(conditions)
+    assert [records[position] for position in record_ids(matches)] == expected
+    assert index.query([]) == index.all
+
+
+def test_update_index_adds_only_new_shards(tmp_path):
+    records = characters(100)
+    manifest = write_shards(tmp_path, records[:80])
+    first = update_index(tmp_path)
+    assert first.records == 80
+    # Already indexed shards are not read again.
+    (tmp_path / manifest.shards[0].path).write_bytes(b"")
+
+    write_shards(tmp_path, records[80:], shards=manifest.shards)
+    updated = update_index(tmp_path)
+    assert updated.records == 100
+    assert updated.shards == list(load_manifest(tmp_path).shards)
+    assert load_index(tmp_path).chunks == updated.chunks
+    assert updated.chunks[:len(first.chunks)] == first.chunks
+
+    for key, bitmap in chunk_bitmaps(records).items():
+        field, value = key.split("=")
+        assert updated.bitmap(field, value) == bitmap
+    assert updated.values("race") == sorted({record["race"] for record in records})
+
+
+def test_shard_chunks_are_local_to_their_shard(tmp_path):
+    records = characters(100)
+    write_shards(tmp_path, records)
+    index = update_index(tmp_path)
+    assert len(index.chunks) == len(index.shards) == 3
+    for number, shard in enumerate(index.shards):
+        assert index.chunk(number) == chunk_bitmaps(records[shard.start:shard.stop])
+    with pytest.raises(ValueError, match="one bitmap chunk per shard"):
+        BitmapIndex(index.shards, index.chunks[:1])
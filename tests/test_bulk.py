@@ -0,0 +1,90 @@
+import concurrent.futures
+
+import pytest
+
+from rpgcharacters.bulk import (
+    BulkJob,
+    chunk_ranges,
+    derive_seed,
+    generate_indexed_character,
+    iter_characters,
+    validate_job,
+)
+
+
+def test_derive_seed_is_deterministic_and_index_sensitive():
+    assert derive_seed(42, 0) == derive_seed(42, 0)
+    assert derive_seed(42, 0) != derive_seed(42, 1)
+    assert derive_seed(42, 0) != derive_seed(43, 0)
+    assert 0 <= derive_seed(-1, 10) < 2**64
+
+
+def test_chunk_ranges_cover_range_in_order():
+    assert list(chunk_ranges(0, 10, 4)) == [(0, 4), (4, 8), (8, 10)]
+    assert list(chunk_ranges(5, 5, 4)) == []
+
+
+@pytest.mark.parametrize(
+    "job,expected",
+    [
+        (BulkJob(seed=1, race="gnome"), ["Unknown race: 'gnome'"]),
+        (BulkJob(seed=1, class_name="paladin"), ["Unknown class: 'paladin'"]),
+        (
+            BulkJob(seed=1, race="halfling", class_name="magic-user"),
+            ["Halfling characters cannot be Magic-Users."],
+        ),
+        (BulkJob(seed=1, race="Elf", class_name="Magic-User"), []),
+        (
+            BulkJob(seed=1, race_weights={"orc": 2}, class_weights={"fighter": 1}),
+            ["Unknown race in weights: 'orc'"],
+        ),
+    ],
+)
+def test_validate_job(job, expected):
+    assert validate_job(job) == expected
+
+
+def test_generate_indexed_character_honours_fixed_race_and_class():
+    job = BulkJob(seed=99, race="elf", class_name="magic-user", name="Bulk")
+    character = generate_indexed_character(job, 3)
+    assert character.race == "elf"
+    assert character.class_name == "magic-user"
+    assert character.name == "Bulk"
+    assert character.abilities.INT >= 9
+
+
+def test_iter_characters_is_independent_of_worker_count():
+    job = BulkJob(seed=2024)
+    inline = [c.to_dict() for c in iter_characters(job, 12)]
+    pooled = [c.to_dict() for c in iter_characters(job, 12, workers=2, chunk_size=5)]
+    assert inline == pooled
+    assert len({str(c) for c in inline}) > 1
+
+
+def test_thread_backend_matches_inline_generation():
+    job = BulkJob(seed=99, race="elf")
+    inline = [c.to_dict() for c in iter_characters(job, 20)]
+    threaded = iter_characters(job, 20, workers=4, chunk_size=3, backend="thread")
+    assert [c.to_dict() for c in threaded] == inline
+
+
+@pytest.mark.skipif(
+    not hasattr(concurrent.futures, "InterpreterPoolExecutor"),
+    reason="subinterpreter pools need Python 3.14",
+)
+def test_interpreter_backend_matches_inline_generation():
+    job = BulkJob(seed=99, name="Pip")
+    inline = [c.to_dict() for c in iter_characters(job, 10)]
+    pooled = iter_characters(job, 10, workers=2, chunk_size=4, backend="interpreter")
+    assert [c.to_dict() for c in pooled] == inline
+
+
+def test_iter_characters_rejects_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown backend"):
+        list(iter_characters(BulkJob(seed=1), 2, workers=2, backend="fibers"))
+
+
+def test_iter_characters_writes_worker_profiles(tmp_path):
+    job = BulkJob(seed=7)
+    list(iter_characters(job, 4, workers=2, chunk_size=2, profile_dir=tmp_path))
+    assert list(tmp_path.glob("worker-*.prof"))
@@ -0,0 +1,117 @@
+import concurrent.futures
+import json
+from collections import Counter
+
+import pytest
+
+from rpgcharacters.census import (
+    census_cells,
+    census_tasks,
+    generate_census_chunk,
+    generate_packed_census_chunk,
+    iter_census,
+    load_quotas,
+    parse_quota_cells,
+    validate_quotas,
+)
+from rpgcharacters.character_generator import validate_class, validate_race
+from rpgcharacters.packing import unpack_characters
+from rpgcharacters.rules import BUILTIN_RULES
+
+QUOTAS = {
+    "human": {"fighter": 12, "cleric": 5},
+    "Dwarf": {"Thief": 4},
+    "halfling": {"fighter": 0},
+}
+
+
+def test_census_cells_follow_rules_order_and_number_characters():
+    cells = census_cells(QUOTAS)
+    assert [(c.race, c.class_name, c.start, c.count) for c in cells] == [
+        ("dwarf", "thief", 0, 4),
+        ("human", "cleric", 4, 5),
+        ("human", "fighter", 9, 12),
+    ]
+
+
+def test_census_tasks_split_cells_without_mixing_them():
+    tasks = list(census_tasks(census_cells(QUOTAS), seed=1, chunk_size=5))
+    assert [(t[1], t[2], t[3], t[4]) for t in tasks] == [
+        ("dwarf", "thief", 0, 4),
+        ("human", "cleric", 4, 9),
+        ("human", "fighter", 9, 14),
+        ("human", "fighter", 14, 19),
+        ("human", "fighter", 19, 21),
+    ]
+
+
+def test_iter_census_matches_quotas_exactly():
+    characters = list(iter_census(QUOTAS, seed=77))
+    counts = Counter((c.race, c.class_name) for c in characters)
+    assert counts == {("human", "fighter"): 12, ("human", "cleric"): 5, ("dwarf", "thief"): 4}
+    for character in characters:
+        assert not validate_race(character.abilities, character.race)
+        assert not validate_class(character.abilities, character.race, character.class_name)
+
+
+def test_packed_census_chunk_round_trips_characters():
+    characters = generate_census_chunk(3, "elf", "thief", 10, 20, random_names=True)
+    packed = generate_packed_census_chunk(3, "elf", "thief", 10, 20, random_names=True)
+    assert [c.to_dict() for c in unpack_characters(packed, BUILTIN_RULES)] == [
+        c.to_dict() for c in characters
+    ]
+
+
+@pytest.mark.skipif(
+    not hasattr(concurrent.futures, "InterpreterPoolExecutor"),
+    reason="subinterpreter pools need Python 3.14",
+)
+def test_interpreter_backend_matches_inline_census():
+    inline = [c.to_dict() for c in iter_census(QUOTAS, seed=5)]
+    pooled = iter_census(QUOTAS, seed=5, workers=2, chunk_size=4, backend="interpreter")
+    assert [c.to_dict() for c in pooled] == inline
+
+
+def test_iter_census_is_independent_of_workers_and_chunking():
+    inline = [c.to_dict() for c in iter_census(QUOTAS, seed=5)]
+    threaded = iter_census(QUOTAS, seed=5, workers=3, chunk_size=4, backend="thread")
+    assert [c.to_dict() for c in threaded] == inline
+
+
+@pytest.mark.parametrize(
+    "quotas,message",
+    [
+        ({"gnome": {"fighter": 1}}, "Unknown race: 'gnome'"),
+        ({"human": {"paladin": 1}}, "Unknown class: 'paladin'"),
+        ({"human": {"fighter": -2}}, "non-negative"),
+        ({"dwarf": {"magic-user": 1}}, "Dwarf characters cannot be Magic-Users."),
+    ],
+)
+def test_validate_quotas_reports_problems(quotas, message):
+    assert any(message in error for error in validate_quotas(quotas))
+
+
+def test_parse_quota_cells_and_load_quotas(tmp_path):
+    assert parse_quota_cells("human:fighter=3, Elf:Thief=2,human:fighter=1") == {
+        "human": {"fighter": 4},
+        "elf": {"thief": 2},
+    }
+    with pytest.raises(ValueError, match="RACE:CLASS=COUNT"):
+        parse_quota_cells("human=3")
+    path = tmp_path / "town.json"
+    path.write_text(json.dumps(QUOTAS), encoding="utf-8")
+    assert load_quotas(path) == QUOTAS
+    toml_path = tmp_path / "town.toml"
+    toml_path.write_text("[human]\nfighter = 3\n", encoding="utf-8")
+    assert load_quotas(toml_path) == {"human": {"fighter": 3}}
+
+
+def test_load_quotas_rejects_non_integer_counts(tmp_path):
+    path = tmp_path / "town.json"
+    path.write_text(json.dumps({"human": {"fighter": "10", "thief": -1}}), encoding="utf-8")
+    with pytest.raises(ValueError) as excinfo:
+        load_quotas(path)
+    assert str(excinfo.value) == (
+        "Quota for human/fighter must be a non-negative integer.; "
+        "Quota for human/thief must be a non-negative integer."
+    )
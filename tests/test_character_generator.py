@@ -12,6 +12,7 @@ from rpgcharacters.character_generator import (
     calculate_armor_class,
     calculate_saving_throws,
     generate_character,
+    generate_random_character,
     level_one_attack_bonus,
     roll_abilities,
     roll_hit_points,
@@ -559,3 +560,39 @@ def test_generate_character_raises_on_disallowed_race_class_combo():
     abilities = make_ability_scores(DEX=18, INT=18, STR=10)
     with pytest.raises(ValueError, match="Halfling characters cannot be Magic-Users."):
         generate_character("halfling", "magic-user", rng, abilities=abilities)
+
+
+def test_generate_random_character_auto_selects_race_and_class():
+    moc = CustomRandomMoc()
+    moc.randint_sequence([
+        5, 4, 1, # CHA
+        5, 4, 1, # CON
+        5, 4, 1, # DEX
+        5, 4, 1, # INT
+        5, 4, 1, # STR
+        5, 4, 1, # WIS
+        3,       # race index into [dwarf, elf, halfling, human]
+        1,       # class index into [cleric, fighter, magic-user, thief]
+        4,       # HP
+        9,       # gp
+    ])
+    character = generate_random_character(DiceRoller(moc), name="Auto")
+    assert character.race == "human"
+    assert character.class_name == "fighter"
+    assert character.hp == 4
+    assert character.money_gp == 90
+    assert character.name == "Auto"
+
+
+def test_generate_random_character_rejects_invalid_requested_race():
+    moc = CustomRandomMoc()
+    moc.randint_returns(1)  # every ability rolls 3
+    with pytest.raises(ValueError, match="Dwarf requires CON >= 9; found 3."):
+        generate_random_character(DiceRoller(moc), race="dwarf")
+
+
+def test_generate_random_character_raises_when_no_class_is_valid():
+    moc = CustomRandomMoc()
+    moc.randint_sequence([1] * 18)  # every ability rolls 3; only humans qualify
+    with pytest.raises(ValueError, match="No valid classes available for this race."):
+        generate_random_character(DiceRoller(moc))
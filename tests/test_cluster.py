@@ -0,0 +1,107 @@
+import multiprocessing
+import time
+
+import pytest
+
+from rpgcharacters.bulk import BulkJob, iter_characters
+from rpgcharacters.cluster import Coordinator, JobSpec, WorkQueue, parse_address, run_worker
+from rpgcharacters.rules import active_rules
+
+AUTHKEY = b"test-secret"
+
+
+def make_queue(count, chunk_size, lease_timeout=60.0, max_ahead=64):
+    spec = JobSpec(BulkJob(seed=3), count, active_rules())
+    return WorkQueue(spec, chunk_size, lease_timeout, max_ahead)
+
+
+def test_claims_cover_every_index_once():
+    queue = make_queue(100, 8)
+    claimed = []
+    workers = ["a", "b", "c"]
+    while (task := queue.claim(workers[len(claimed) % 3])) is not None:
+        claimed.append(task)
+    starts = sorted(claimed)
+    assert starts[0][0] == 0 and starts[-1][1] == 100
+    assert all(left[1] == right[0] for left, right in zip(starts, starts[1:]))
+    assert all(start % 8 == 0 for start, _ in claimed)
+
+
+def test_idle_worker_steals_back_half():
+    queue = make_queue(64, 8)
+    assert queue.claim("a") == (32, 40)
+    assert queue.claim("b") == (16, 24)
+    # "a" still owns 40..64, the largest span, so "c" takes its back half.
+    assert queue.claim("c") == (48, 56)
+    assert queue.claim("a") == (40, 48)
+
+
+def test_expired_lease_is_reissued():
+    queue = make_queue(8, 8, lease_timeout=0.0)
+    assert queue.claim("a") == (0, 8)
+    time.sleep(0.01)
+    assert queue.claim("b") == (0, 8)
+    queue.submit(0, 8, b"first")
+    queue.submit(0, 8, b"second")
+    assert queue.finished()
+    assert queue.take(0) == (8, b"first")
+
+
+def test_leases_stay_within_max_ahead_of_oldest_untaken_chunk():
+    queue = make_queue(100, 4, max_ahead=3)
+    claimed = []
+    while (task := queue.claim("a") or queue.claim("b")) is not None:
+        claimed.append(task)
+    assert sorted(claimed) == [(0, 4), (4, 8), (8, 12)]
+    for start, stop in claimed:
+        queue.submit(start, stop, b"")
+    assert queue.take(0) == (4, b"")
+    assert queue.claim("a") == (12, 16)
+    assert queue.claim("b") is None
+    queue.submit(12, 16, b"")
+    claimed.append((12, 16))
+
+    # Every index is still handed out exactly once as the window moves.
+    start = 4
+    while start < 100:
+        while (task := queue.claim("a") or queue.claim("b")) is not None:
+            claimed.append(task)
+            queue.submit(*task, b"")
+        start, _ = queue.take(start)
+    starts = sorted(claimed)
+    assert starts[0][0] == 0 and starts[-1][1] == 100
+    assert all(left[1] == right[0] for left, right in zip(starts, starts[1:]))
+
+
+def test_take_times_out():
+    assert make_queue(8, 8).take(0, timeout=0.01) is None
+
+
+def test_parse_address():
+    assert parse_address("10.0.0.2:7300") == ("10.0.0.2", 7300)
+    assert parse_address(":80") == ("", 80)
+    with pytest.raises(ValueError):
+        parse_address("localhost")
+
+
+def test_coordinator_rejects_invalid_job():
+    with pytest.raises(ValueError):
+        Coordinator(BulkJob(seed=1, race="ogre"), 10, AUTHKEY)
+
+
+def test_local_workers_match_single_process_output():
+    job = BulkJob(seed=11, race_weights={"elf": 2.0})
+    with Coordinator(job, 300, AUTHKEY, chunk_size=16) as coordinator:
+        context = multiprocessing.get_context("spawn")
+        workers = [
+            context.Process(target=run_worker, args=(coordinator.address, AUTHKEY))
+            for _ in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        characters = list(coordinator)
+        for worker in workers:
+            worker.join(timeout=30)
+    assert [worker.exitcode for worker in workers] == [0, 0, 0]
+    expected = list(iter_characters(job, 300))
+    assert [c.to_dict() for c in characters] == [c.to_dict() for c in expected]
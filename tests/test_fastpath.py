@@ -0,0 +1,102 @@
+import random
+from dataclasses import replace
+
+import pytest
+
+from rpgcharacters.ability_methods import ABILITY_METHODS
+from rpgcharacters.bulk import BulkJob, generate_indexed_character, iter_characters
+from rpgcharacters.fastpath import (
+    WORDS_PER_FETCH,
+    FastRoller,
+    ReplayRandom,
+    fast_random_character,
+    verify_fast_path,
+)
+
+
+@pytest.mark.parametrize("a,b", [(1, 6), (0, 0), (1, 20), (0, 2**31), (5, 2**40), (0, 3 * 2**64)])
+def test_randint_matches_random(a, b):
+    reference, replay = random.Random(11), ReplayRandom(11)
+    assert [replay.randint(a, b) for _ in range(500)] == [
+        reference.randint(a, b) for _ in range(500)
+    ]
+
+
+def test_draws_stay_aligned_across_fetches():
+    reference, replay = random.Random(3), ReplayRandom(3)
+    sizes = [1, 7, 32, 33, 64, 65, 100] * (WORDS_PER_FETCH // 2)
+    assert [replay.getrandbits(k) for k in sizes] == [reference.getrandbits(k) for k in sizes]
+    assert replay.randint(1, 100) == reference.randint(1, 100)
+
+
+def test_dice_sums_randint_draws():
+    reference, replay = random.Random(8), ReplayRandom(8)
+    for count, sides in [(3, 6), (1, 8), (4, 6), (10, 10), (1, 1)]:
+        assert replay.dice(count, sides) == sum(
+            reference.randint(1, sides) for _ in range(count)
+        )
+
+
+def test_seed_restarts_the_stream():
+    replay = ReplayRandom(5)
+    first = [replay.randint(1, 6) for _ in range(10)]
+    replay.seed(5)
+    assert [replay.randint(1, 6) for _ in range(10)] == first
+
+
+def test_roll_parses_plain_dice():
+    assert FastRoller(1).roll("3d6") == FastRoller(1).rng.dice(3, 6)
+    assert FastRoller(1).roll("d8") == FastRoller(1).rng.dice(1, 8)
+    with pytest.raises(ValueError, match="Unsupported dice expression"):
+        FastRoller(1).roll("3d6+1")
+
+
+def test_fast_path_matches_reference_over_seed_range():
+    assert verify_fast_path(range(3000)) == []
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        dict(race_weights={"human": 60, "elf": 15}, class_weights={"thief": 4}),
+        dict(race="elf"),
+        dict(class_name="magic-user"),
+        dict(race="dwarf", class_name="fighter"),
+        dict(race="halfling", class_name="magic-user"),
+        dict(race="ogre"),
+        dict(class_name="paladin"),
+        dict(race="dwarf", class_name="paladin"),
+    ],
+)
+def test_fast_path_matches_reference_with_options(options):
+    assert verify_fast_path(range(500), **options) == []
+
+
+@pytest.mark.parametrize("method", sorted(ABILITY_METHODS))
+def test_fast_path_matches_reference_for_every_ability_method(method):
+    assert verify_fast_path(range(200), ability_method=method) == []
+
+
+def test_class_the_race_does_not_allow_is_rejected():
+    for seed in range(50):
+        with pytest.raises(ValueError):
+            fast_random_character(FastRoller(seed), race="dwarf", class_name="magic-user")
+
+
+def test_unknown_race_and_class_are_reported_by_name():
+    with pytest.raises(ValueError, match="^Unknown race: 'ogre'$"):
+        fast_random_character(FastRoller(1), race="Ogre")
+    with pytest.raises(ValueError, match="^Unknown class: 'paladin'$"):
+        fast_random_character(FastRoller(1), race="human", class_name="Paladin")
+    with pytest.raises(ValueError, match="^Unknown class: 'paladin'$"):
+        fast_random_character(FastRoller(1), class_name="paladin")
+
+
+def test_fast_bulk_job_matches_reference():
+    job = BulkJob(seed=42, race_weights={"halfling": 5}, random_names=True)
+    fast = replace(job, fast=True)
+    for index in range(300):
+        assert generate_indexed_character(fast, index) == generate_indexed_character(job, index)
+    assert list(iter_characters(fast, 50, workers=2, backend="thread")) == list(
+        iter_characters(job, 50)
+    )
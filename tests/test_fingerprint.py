@@ -0,0 +1,79 @@
+import dataclasses
+
+import pytest
+
+from rpgcharacters.bulk import BulkJob, iter_characters
+from rpgcharacters.fingerprint import (
+    BloomFilter,
+    Deduplicator,
+    fingerprint,
+    fingerprint_record,
+    iter_unique,
+)
+
+
+@pytest.fixture
+def characters():
+    return list(iter_characters(BulkJob(seed=21), 50))
+
+
+def test_character_and_record_fingerprints_agree(characters):
+    for character in characters:
+        record = character.to_dict()
+        assert fingerprint(character) == fingerprint_record(record)
+        wide = fingerprint_record(record, 128, include_name=True, include_inventory=True)
+        assert fingerprint(character, 128, include_name=True, include_inventory=True) == wide
+
+
+def test_fingerprint_is_stable():
+    record = {
+        "abilities": {"CHA": 8, "CON": 11, "DEX": 12, "INT": 9, "STR": 15, "WIS": 10},
+        "race": "dwarf",
+        "class": "fighter",
+        "level": 1,
+        "hp": 7,
+        "money_gp": 110,
+        "name": "Brok",
+        "inventory": ["Chain Mail", "Shield"],
+    }
+    assert fingerprint_record(record) == 0xA9B7F4868C55019A
+    assert fingerprint_record(record).bit_length() <= 64
+    assert fingerprint_record(record, 128).bit_length() <= 128
+
+
+def test_name_and_inventory_are_optional(characters):
+    character = characters[0]
+    renamed = dataclasses.replace(character, name="Other", inventory=character.inventory[::-1])
+    assert fingerprint(renamed) == fingerprint(character)
+    assert fingerprint(renamed, include_name=True) != fingerprint(character, include_name=True)
+    assert fingerprint(renamed, include_inventory=True) == fingerprint(
+        character, include_inventory=True
+    )
+
+
+def test_iter_unique_keeps_first_occurrences(characters):
+    records = [character.to_dict() for character in characters]
+    stream = records + records[:10] + records[::-1]
+    assert list(iter_unique(stream)) == list(iter_unique(records))
+    assert len(list(iter_unique(stream))) == len({fingerprint_record(r) for r in records})
+
+
+def test_deduplicator_switches_to_bloom_filter():
+    deduplicator = Deduplicator(max_exact=10, bloom_capacity=100, error_rate=0.01)
+    values = [index * 0x9E3779B97F4A7C15_0123456789ABCDEF for index in range(1, 30)]
+    assert not any(deduplicator.seen(value) for value in values)
+    assert not deduplicator.exact
+    assert all(deduplicator.seen(value) for value in values)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1_000, 0.01)
+    values = [hash((index, "x")) & (1 << 128) - 1 for index in range(1_000)]
+    for value in values:
+        bloom.add(value)
+    assert all(value in bloom for value in values)
+
+
+def test_rejects_invalid_error_rate():
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        Deduplicator(error_rate=1.5)
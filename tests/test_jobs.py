@@ -0,0 +1,150 @@
+import json
+from dataclasses import replace
+
+import pytest
+
+from rpgcharacters.bulk import BulkJob, iter_characters
+from rpgcharacters.jobs import (
+    Checkpoint,
+    ShardProgress,
+    load_checkpoint,
+    resume_job,
+    run_job,
+    write_checkpoint,
+)
+from rpgcharacters.rules import BUILTIN_RULES
+from rpgcharacters.shards import ShardSpec, iter_shard_records
+
+
+def expected_output(job, count):
+    return "".join(
+        json.dumps(character.to_dict()) + "\n" for character in iter_characters(job, count)
+    ).encode("utf-8")
+
+
+def test_run_job_matches_bulk_output(tmp_path):
+    job = BulkJob(seed=11, race="dwarf")
+    output = tmp_path / "out.jsonl"
+    checkpoint = run_job(job, 25, output, tmp_path / "job.ckpt", checkpoint_every=10)
+    assert output.read_bytes() == expected_output(job, 25)
+    assert checkpoint.complete
+    assert load_checkpoint(tmp_path / "job.ckpt") == checkpoint
+
+
+def test_checkpoint_records_absolute_output_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    run_job(BulkJob(seed=2), 5, "out.jsonl", "job.ckpt")
+    checkpoint = load_checkpoint("job.ckpt")
+    assert checkpoint.shards[0].path == str(tmp_path.resolve() / "out.jsonl")
+
+    monkeypatch.chdir(tmp_path.parent)
+    rolled_back = replace(checkpoint, shards=(ShardProgress(checkpoint.shards[0].path, 0, 0, 0),))
+    write_checkpoint(tmp_path / "job.ckpt", rolled_back)
+    assert resume_job(tmp_path / "job.ckpt") == checkpoint
+    assert (tmp_path / "out.jsonl").read_bytes() == expected_output(BulkJob(seed=2), 5)
+
+
+def test_checkpoint_round_trips():
+    checkpoint = Checkpoint(
+        BulkJob(seed=3, class_name="thief", race_weights={"elf": 2.0}),
+        100,
+        BUILTIN_RULES.digest,
+        (ShardProgress("out.jsonl", 0, 40, 12_345),),
+    )
+    assert Checkpoint.from_dict(checkpoint.to_dict()) == checkpoint
+    assert checkpoint.flushed == 40
+    assert not checkpoint.complete
+
+
+def test_checkpoint_keeps_ability_method():
+    checkpoint = Checkpoint(BulkJob(seed=3, ability_method="4d6-drop-lowest"), 10, "x", ())
+    data = checkpoint.to_dict()
+    assert Checkpoint.from_dict(data).job.ability_method == "4d6-drop-lowest"
+    del data["ability_method"]
+    assert Checkpoint.from_dict(data).job.ability_method == "3d6"
+
+
+def test_checkpoint_keeps_fast_flag():
+    data = Checkpoint(BulkJob(seed=3, fast=True), 10, "x", ()).to_dict()
+    assert Checkpoint.from_dict(data).job.fast
+    del data["fast"]
+    assert not Checkpoint.from_dict(data).job.fast
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_resume_after_interruption_matches_uninterrupted_run(tmp_path, workers):
+    job = BulkJob(seed=5)
+    output = tmp_path / "out.jsonl"
+    checkpoint_path = tmp_path / "job.ckpt"
+    expected = expected_output(job, 30)
+    run_job(job, 30, output, checkpoint_path, checkpoint_every=7)
+
+    # Simulate a crash after the checkpoint at index 14, mid-way through a line.
+    lines = expected.splitlines(keepends=True)
+    offset = sum(len(line) for line in lines[:14])
+    write_checkpoint(
+        checkpoint_path,
+        Checkpoint(job, 30, BUILTIN_RULES.digest, (ShardProgress(str(output), 0, 14, offset),)),
+    )
+    output.write_bytes(expected[: offset + 50])
+
+    checkpoint = resume_job(checkpoint_path, workers=workers, backend="thread")
+    assert output.read_bytes() == expected
+    assert checkpoint.flushed == 30
+
+
+def test_resume_rejects_truncated_output(tmp_path):
+    output = tmp_path / "out.jsonl"
+    checkpoint_path = tmp_path / "job.ckpt"
+    run_job(BulkJob(seed=1), 5, output, checkpoint_path, checkpoint_every=2)
+    checkpoint = load_checkpoint(checkpoint_path)
+    write_checkpoint(
+        checkpoint_path,
+        Checkpoint(checkpoint.job, 10, checkpoint.rules, checkpoint.shards),
+    )
+    output.write_bytes(b"")
+    with pytest.raises(ValueError, match="shorter than its checkpoint"):
+        resume_job(checkpoint_path)
+
+
+def test_resume_rejects_different_rules(tmp_path):
+    checkpoint_path = tmp_path / "job.ckpt"
+    write_checkpoint(
+        checkpoint_path,
+        Checkpoint(BulkJob(seed=1), 10, "0" * 64, (ShardProgress("out.jsonl", 0, 0, 0),)),
+    )
+    with pytest.raises(ValueError, match="different rules"):
+        resume_job(checkpoint_path)
+
+
+def test_run_job_rejects_invalid_job(tmp_path):
+    with pytest.raises(ValueError, match="Unknown race"):
+        run_job(BulkJob(seed=1, race="gnome"), 5, tmp_path / "out", tmp_path / "ckpt")
+
+
+def test_sharded_job_removes_shards_left_by_earlier_run(tmp_path):
+    spec = ShardSpec(max_records=5)
+    run_job(BulkJob(seed=4), 20, tmp_path / "shards", tmp_path / "a.ckpt", sharding=spec)
+    (tmp_path / "shards" / "index.json").write_text("{}", encoding="utf-8")
+    run_job(BulkJob(seed=5), 7, tmp_path / "shards", tmp_path / "b.ckpt", sharding=spec)
+    names = sorted(path.name for path in (tmp_path / "shards").iterdir())
+    assert names == ["characters-00000.jsonl", "characters-00001.jsonl", "manifest.json"]
+    expected = [character.to_dict() for character in iter_characters(BulkJob(seed=5), 7)]
+    assert list(iter_shard_records(tmp_path / "shards")) == expected
+
+
+def test_sharded_job_resumes_after_last_completed_shard(tmp_path):
+    job = BulkJob(seed=8)
+    spec = ShardSpec(max_records=6, compression="gzip")
+    checkpoint_path = tmp_path / "job.ckpt"
+    run_job(job, 20, tmp_path / "shards", checkpoint_path, sharding=spec)
+
+    # Roll the checkpoint back to the first two shards and corrupt the rest.
+    checkpoint = load_checkpoint(checkpoint_path)
+    write_checkpoint(checkpoint_path, replace(checkpoint, shards=checkpoint.shards[:2]))
+    (tmp_path / "shards" / checkpoint.shards[2].path).write_bytes(b"partial")
+
+    resumed = resume_job(checkpoint_path, workers=2, backend="thread")
+    assert resumed == checkpoint
+    expected = [character.to_dict() for character in iter_characters(job, 20)]
+    assert list(iter_shard_records(tmp_path / "shards")) == expected
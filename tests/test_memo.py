@@ -0,0 +1,85 @@
+import copy
+
+import pytest
+
+from rpgcharacters.character_generator import (
+    AbilityScores,
+    valid_classes_for_race,
+    valid_races_for_abilities,
+    validate_class,
+    validate_race,
+)
+from rpgcharacters.memo import (
+    LruMemo,
+    cached_valid_classes,
+    cached_valid_races,
+    cached_validate_class,
+    cached_validate_race,
+    clear_memos,
+    memo_stats,
+)
+from rpgcharacters.rules import BUILTIN_RULES, activate_rules, compile_rules, reset_rules
+
+
+@pytest.fixture(autouse=True)
+def fresh_memos():
+    clear_memos()
+    yield
+    reset_rules()
+    clear_memos()
+
+
+def make_abilities(**overrides):
+    scores = dict(CHA=10, CON=10, DEX=10, INT=10, STR=10, WIS=10)
+    scores.update(overrides)
+    return AbilityScores(**scores)
+
+
+def test_cached_queries_match_uncached_results():
+    abilities = make_abilities(CON=17, INT=7)
+    assert cached_validate_race(abilities, "Elf") == validate_race(abilities, "Elf")
+    assert cached_validate_class(abilities, "dwarf", "magic-user") == validate_class(
+        abilities, "dwarf", "magic-user"
+    )
+    assert cached_valid_races(abilities) == valid_races_for_abilities(abilities)
+    assert cached_valid_classes(abilities, "human") == valid_classes_for_race(abilities, "human")
+
+
+def test_repeated_queries_hit_the_cache_across_name_case():
+    abilities = make_abilities()
+    cached_validate_race(abilities, "elf")
+    cached_validate_race(make_abilities(), "ELF")
+    stats = memo_stats()["validate_race"]
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+def test_cached_results_are_copies():
+    abilities = make_abilities()
+    cached_valid_races(abilities).clear()
+    assert cached_valid_races(abilities) == valid_races_for_abilities(abilities)
+
+
+def test_lru_memo_evicts_least_recently_used_entry():
+    memo = LruMemo(maxsize=2)
+    memo.get("a", lambda: ["a"])
+    memo.get("b", lambda: ["b"])
+    memo.get("a", lambda: ["stale"])
+    memo.get("c", lambda: ["c"])
+    assert memo.get("a", lambda: ["stale"]) == ["a"]
+    assert memo.get("b", lambda: ["fresh"]) == ["fresh"]
+    assert memo.stats()["size"] == 2
+
+
+def test_lru_memo_rejects_empty_size():
+    with pytest.raises(ValueError, match="at least 1"):
+        LruMemo(maxsize=0)
+
+
+def test_activating_rules_clears_memos():
+    abilities = make_abilities(CON=8)
+    assert "dwarf" not in cached_valid_races(abilities)
+    pack = copy.deepcopy(BUILTIN_RULES.pack)
+    pack["races"]["dwarf"]["ability_min"]["CON"] = 3
+    activate_rules(compile_rules(pack))
+    assert all(stats["size"] == 0 for stats in memo_stats().values())
+    assert "dwarf" in cached_valid_races(abilities)
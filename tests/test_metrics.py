@@ -0,0 +1,94 @@
+import json
+
+import pytest
+from diceroller.core import CustomRandom, DiceRoller
+
+from rpgcharacters.character_generator import AbilityScores, generate_character
+from rpgcharacters.metrics import (
+    METRICS,
+    MetricsRegistry,
+    export_metrics,
+    write_metrics,
+)
+
+
+@pytest.fixture
+def enabled_metrics():
+    METRICS.reset()
+    METRICS.enable()
+    yield METRICS
+    METRICS.disable()
+    METRICS.reset()
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry()
+    with registry.stage("generate.hit_points"):
+        pass
+    assert registry.snapshot() == {}
+
+
+def test_enabled_registry_counts_calls_and_buckets():
+    registry = MetricsRegistry(buckets=(0.5, 1.0))
+    registry.enable()
+    registry.record("generate.hit_points", 0.25)
+    registry.record("generate.hit_points", 0.75)
+    registry.record("generate.hit_points", 2.0)
+    stats = registry.snapshot()["generate.hit_points"]
+    assert stats["count"] == 3
+    assert stats["total_seconds"] == pytest.approx(3.0)
+    assert stats["buckets"] == [1, 1, 1]
+
+
+def test_merge_adds_worker_snapshots():
+    worker = MetricsRegistry(buckets=(1.0,))
+    worker.record("generate.saving_throws", 0.5)
+    parent = MetricsRegistry(buckets=(1.0,))
+    parent.record("generate.saving_throws", 0.25)
+    parent.merge(worker.snapshot())
+    assert parent.snapshot()["generate.saving_throws"]["count"] == 2
+
+
+def test_merge_rejects_mismatched_buckets():
+    worker = MetricsRegistry(buckets=(1.0, 2.0))
+    worker.record("generate.saving_throws", 0.5)
+    with pytest.raises(ValueError, match="Bucket layout mismatch"):
+        MetricsRegistry(buckets=(1.0,)).merge(worker.snapshot())
+
+
+def test_prometheus_export_uses_cumulative_buckets():
+    registry = MetricsRegistry(buckets=(0.5, 1.0))
+    registry.record("cli.serialize", 0.25)
+    registry.record("cli.serialize", 0.75)
+    text = registry.to_prometheus()
+    assert '# TYPE rpgcharacters_stage_seconds histogram' in text
+    assert 'rpgcharacters_stage_seconds_bucket{stage="cli.serialize",le="0.5"} 1' in text
+    assert 'rpgcharacters_stage_seconds_bucket{stage="cli.serialize",le="1"} 2' in text
+    assert 'rpgcharacters_stage_seconds_bucket{stage="cli.serialize",le="+Inf"} 2' in text
+    assert 'rpgcharacters_stage_seconds_count{stage="cli.serialize"} 2' in text
+
+
+def test_generate_character_records_each_step(enabled_metrics):
+    abilities = AbilityScores(CHA=10, CON=10, DEX=10, INT=10, STR=12, WIS=10)
+    generate_character("human", "fighter", DiceRoller(CustomRandom(7)), abilities=abilities)
+    stages = json.loads(export_metrics("json"))["stages"]
+    assert "generate.roll_abilities" not in stages
+    assert {
+        "generate.validate_race",
+        "generate.validate_class",
+        "generate.ability_mods",
+        "generate.hit_points",
+        "generate.armor_class",
+        "generate.attack_bonus",
+        "generate.saving_throws",
+        "generate.starting_money",
+    } <= set(stages)
+    assert all(stats["count"] == 1 for stats in stages.values())
+
+
+def test_write_metrics_picks_format_from_suffix(enabled_metrics, tmp_path):
+    enabled_metrics.record("cli.serialize", 0.001)
+    write_metrics(tmp_path / "metrics.json")
+    write_metrics(tmp_path / "metrics.prom")
+    assert "stages" in json.loads((tmp_path / "metrics.json").read_text())
+    assert (tmp_path / "metrics.prom").read_text().startswith("# HELP")
@@ -0,0 +1,94 @@
+from collections import Counter
+
+import pytest
+from diceroller.core import CustomRandom, DiceRoller
+
+from rpgcharacters.bulk import BulkJob, iter_characters
+from rpgcharacters.census import iter_census
+from rpgcharacters.names import (
+    MAX_NAME_LENGTH,
+    MIN_NAME_LENGTH,
+    compile_names,
+    generate_name,
+    generate_names,
+    name_model,
+    word_list,
+)
+from rpgcharacters.party import PartySpec, generate_party
+from rpgcharacters.serve import handle_request
+
+
+def roller(seed=1):
+    return DiceRoller(CustomRandom(seed))
+
+
+@pytest.mark.parametrize("race", ["human", "dwarf", "elf", "halfling"])
+def test_bundled_word_lists_load(race):
+    words = word_list(race)
+    assert len(words) >= 40
+    assert all(word == word.lower() and not word.startswith("#") for word in words)
+
+
+def test_races_without_a_list_use_the_human_list():
+    assert word_list("gnome") == word_list("human")
+
+
+def test_compiled_model_only_produces_seen_transitions():
+    model = compile_names(["anna", "hannah"], order=1)
+    allowed = {"an", "nn", "na", "ha", "ah"}
+    rng = roller(4)
+    for _ in range(50):
+        name = model.generate(rng).lower()
+        assert name[0] in "ah"
+        assert all(name[i:i + 2] in allowed for i in range(len(name) - 1))
+        assert MIN_NAME_LENGTH <= len(name) <= MAX_NAME_LENGTH
+
+
+def test_transition_frequencies_follow_the_word_list():
+    model = compile_names(["abx", "acx", "adx", "abz"], order=2)
+    letters, _, _ = model.states[0]
+    assert letters == "aaaa"
+    counts = Counter(model.generate(roller(seed)) for seed in range(400))
+    assert set(counts) == {"Abx", "Acx", "Adx", "Abz"}
+    assert min(counts.values()) > 60
+
+
+def test_compile_names_rejects_bad_input():
+    with pytest.raises(ValueError, match="order"):
+        compile_names(["anna"], order=0)
+    with pytest.raises(ValueError, match="No names"):
+        compile_names(["", "  "])
+
+
+def test_names_are_reproducible_and_cached():
+    assert generate_names("elf", 20, roller(7)) == generate_names("elf", 20, roller(7))
+    assert generate_name(roller(7), "ELF") == generate_names("elf", 1, roller(7))[0]
+    assert name_model("dwarf") is name_model("dwarf")
+
+
+def test_unique_names_do_not_repeat_and_report_exhaustion():
+    names = generate_names("elf", 2000, roller(3), unique=True)
+    assert len(set(names)) == 2000
+    with pytest.raises(ValueError, match="unique"):
+        generate_names("halfling", 100_000, roller(3), unique=True, order=3)
+
+
+def test_bulk_names_only_add_the_name_field():
+    job = BulkJob(seed=12)
+    plain = list(iter_characters(job, 20))
+    named = list(iter_characters(BulkJob(seed=12, random_names=True), 20))
+    for before, after in zip(plain, named):
+        assert before.name is None and after.name
+        assert {**after.to_dict(), "name": None} == before.to_dict()
+    kept = list(iter_characters(BulkJob(seed=12, name="Bob", random_names=True), 3))
+    assert {character.name for character in kept} == {"Bob"}
+
+
+def test_party_census_and_serve_names():
+    party = generate_party(PartySpec(size=3, random_names=True), roller(5))
+    assert all(member.name for member in party.members)
+    census = iter_census({"dwarf": {"fighter": 3}}, seed=2, random_names=True)
+    assert all(character.name for character in census)
+    response = handle_request({"seed": 1, "random_names": True})
+    assert response["characters"][0]["name"]
+    assert not handle_request({"random_names": "yes"})["ok"]
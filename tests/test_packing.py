@@ -0,0 +1,108 @@
+import copy
+from array import array
+from dataclasses import replace
+
+import pytest
+
+from rpgcharacters.bulk import BulkJob, generate_chunk
+from rpgcharacters.packing import (
+    CharacterPool,
+    decode_character,
+    encode_character,
+    pack_characters,
+    unpack_characters,
+)
+from rpgcharacters.rules import BUILTIN_RULES, activate_rules, compile_rules, reset_rules
+
+
+def test_pack_round_trips_characters():
+    characters = generate_chunk(BulkJob(seed=5), 0, 25)
+    characters[0] = replace(characters[0], name="Brynja Ø", inventory=["Rope", "Torch"])
+    packed = pack_characters(characters, BUILTIN_RULES)
+    unpacked = unpack_characters(packed, BUILTIN_RULES)
+    assert [c.to_dict() for c in unpacked] == [c.to_dict() for c in characters]
+    assert list(unpacked[0].to_dict()["saving_throws"]) == list(characters[0].saving_throws)
+
+
+def test_pack_is_smaller_than_json():
+    characters = generate_chunk(BulkJob(seed=5), 0, 10)
+    assert len(pack_characters(characters, BUILTIN_RULES)) < 40 * len(characters)
+
+
+def test_pack_rejects_values_that_do_not_fit():
+    character = generate_chunk(BulkJob(seed=5), 0, 1)[0]
+    with pytest.raises(ValueError, match="cannot be packed"):
+        pack_characters([replace(character, hp=-1 << 20)], BUILTIN_RULES)
+
+
+def test_unpack_empty_batch():
+    assert unpack_characters(pack_characters([], BUILTIN_RULES), BUILTIN_RULES) == []
+
+
+def test_character_code_round_trips_nameless_characters():
+    characters = generate_chunk(BulkJob(seed=12), 0, 200)
+    for character in characters:
+        code = encode_character(character)
+        assert 0 <= code < 1 << 64
+        assert decode_character(code).to_dict() == character.to_dict()
+
+
+def test_character_code_rejects_named_characters():
+    character = generate_chunk(BulkJob(seed=12, name="Odo"), 0, 1)[0]
+    with pytest.raises(ValueError, match="nameless"):
+        encode_character(character)
+
+
+def test_character_code_derives_fields_from_its_rules():
+    pack = copy.deepcopy(BUILTIN_RULES.pack)
+    pack["classes"]["thief"]["saving_throws"]["spells"] = 9
+    pack["races"]["halfling"]["saving_throw_modifiers"]["magic_wands"] = -6
+    pack["armor"]["none"]["base_ac"] = 10
+    house = compile_rules(pack)
+    activate_rules(house)
+    try:
+        characters = generate_chunk(BulkJob(seed=12), 0, 100)
+    finally:
+        reset_rules()
+    for character in characters:
+        decoded = decode_character(encode_character(character, house), house)
+        assert decoded.to_dict() == character.to_dict()
+        assert list(decoded.saving_throws) == list(character.saving_throws)
+
+
+def test_character_code_rejects_saves_it_cannot_rebuild():
+    character = generate_chunk(BulkJob(seed=12), 0, 1)[0]
+    saves = {**character.saving_throws, "spells": character.saving_throws["spells"] + 1}
+    with pytest.raises(ValueError, match="derived values"):
+        encode_character(replace(character, saving_throws=saves))
+
+
+def test_character_pool_membership_follows_changes():
+    characters = generate_chunk(BulkJob(seed=4), 0, 6)
+    pool = CharacterPool.from_characters(characters[:2])
+    assert characters[0] in pool and characters[2] not in pool
+    pool.append(characters[2])
+    pool.extend(characters[3:5])
+    assert all(character in pool for character in characters[:5])
+    pool.codes = array("Q", [encode_character(characters[5])])
+    assert characters[5] in pool and characters[0] not in pool
+
+
+def test_character_pool_set_operations_and_dedup():
+    characters = generate_chunk(BulkJob(seed=3), 0, 30)
+    first = CharacterPool.from_characters(characters[:20])
+    second = CharacterPool.from_characters(characters[10:])
+    assert first.nbytes == 20 * 8
+    assert characters[5] in first and characters[25] not in first
+    assert len(first.union(second)) == len({encode_character(c) for c in characters})
+    assert list(first.intersection(second).codes) == sorted(
+        {encode_character(c) for c in characters[10:20]}
+    )
+    assert characters[0] in first.difference(second)
+
+    doubled = CharacterPool(list(first.codes) * 2)
+    doubled.dedup()
+    assert list(doubled.codes) == sorted(set(first.codes))
+    assert [c.to_dict() for c in doubled] == [
+        decode_character(code).to_dict() for code in doubled.codes
+    ]
@@ -0,0 +1,101 @@
+import concurrent.futures
+from collections import Counter
+
+import pytest
+from diceroller.core import CustomRandom, DiceRoller
+
+from rpgcharacters.character_generator import validate_class, validate_race
+from rpgcharacters.packing import unpack_characters
+from rpgcharacters.party import (
+    PartySpec,
+    generate_packed_party_chunk,
+    generate_party,
+    generate_party_chunk,
+    iter_parties,
+    plan_party,
+    validate_party_spec,
+)
+from rpgcharacters.rules import BUILTIN_RULES
+
+
+def test_plan_party_meets_coverage_constraints():
+    spec = PartySpec(
+        size=4,
+        min_classes={"cleric": 1},
+        max_classes={"magic-user": 1},
+        unique_races=True,
+    )
+    for seed in range(25):
+        plan = plan_party(spec, DiceRoller(CustomRandom(seed)))
+        races = [race for race, _ in plan]
+        classes = Counter(class_name for _, class_name in plan)
+        assert len(plan) == 4
+        assert len(set(races)) == 4
+        assert classes["cleric"] >= 1
+        assert classes["magic-user"] <= 1
+
+
+def test_plan_party_respects_race_class_legality():
+    spec = PartySpec(size=3, min_classes={"magic-user": 3})
+    plan = plan_party(spec, DiceRoller(CustomRandom(3)))
+    assert {race for race, _ in plan} <= {"elf", "human"}
+
+
+def test_plan_party_raises_when_constraints_conflict():
+    # Only elves and humans can be magic-users, so three unique races cannot work.
+    spec = PartySpec(size=3, min_classes={"magic-user": 3}, unique_races=True)
+    with pytest.raises(ValueError, match="No party satisfies the requested constraints."):
+        plan_party(spec, DiceRoller(CustomRandom(1)))
+
+
+@pytest.mark.parametrize(
+    "spec,message",
+    [
+        (PartySpec(size=0), "Party size must be at least 1."),
+        (PartySpec(size=2, min_classes={"paladin": 1}), "Unknown class: 'paladin'"),
+        (PartySpec(size=5, unique_races=True), "A party of 5 cannot have unique races."),
+        (
+            PartySpec(size=1, min_classes={"cleric": 1, "thief": 1}),
+            "Class minimums need more members than the party size.",
+        ),
+    ],
+)
+def test_validate_party_spec(spec, message):
+    assert message in validate_party_spec(spec)
+
+
+def test_generate_party_members_are_valid_for_their_roles():
+    spec = PartySpec(size=4, min_classes={"cleric": 1, "thief": 1}, unique_races=True)
+    party = generate_party(spec, DiceRoller(CustomRandom(42)))
+    assert len(party.members) == 4
+    for member in party.members:
+        assert validate_race(member.abilities, member.race) == []
+        assert validate_class(member.abilities, member.race, member.class_name) == []
+    assert len(party.to_dict()["members"]) == 4
+
+
+def test_packed_party_chunk_round_trips_members():
+    spec = PartySpec(size=3, min_classes={"thief": 1})
+    parties = generate_party_chunk(spec, 4, 0, 5)
+    members = unpack_characters(generate_packed_party_chunk(spec, 4, 0, 5), BUILTIN_RULES)
+    assert [m.to_dict() for m in members] == [
+        m.to_dict() for party in parties for m in party.members
+    ]
+
+
+@pytest.mark.skipif(
+    not hasattr(concurrent.futures, "InterpreterPoolExecutor"),
+    reason="subinterpreter pools need Python 3.14",
+)
+def test_interpreter_backend_matches_inline_parties():
+    spec = PartySpec(size=3, min_classes={"fighter": 1})
+    inline = [p.to_dict() for p in iter_parties(spec, 6, seed=9)]
+    pooled = iter_parties(spec, 6, seed=9, workers=2, chunk_size=4, backend="interpreter")
+    assert [p.to_dict() for p in pooled] == inline
+
+
+def test_iter_parties_is_independent_of_worker_count():
+    spec = PartySpec(size=3, min_classes={"fighter": 1})
+    inline = [p.to_dict() for p in iter_parties(spec, 6, seed=9)]
+    pooled = [p.to_dict() for p in iter_parties(spec, 6, seed=9, workers=2, chunk_size=2)]
+    assert inline == pooled
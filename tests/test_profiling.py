@@ -0,0 +1,55 @@
+import cProfile
+import pstats
+
+from rpgcharacters.profiling import collapse_stats, frame_label, write_profile
+
+
+def _leaf(n):
+    return sum(i * i for i in range(n))
+
+
+def _middle(n):
+    return [_leaf(200) for _ in range(n)]
+
+
+def _root():
+    for _ in range(50):
+        _middle(10)
+
+
+def _profile_root():
+    profiler = cProfile.Profile()
+    profiler.enable()
+    _root()
+    profiler.disable()
+    return profiler
+
+
+def test_frame_label_formats_python_and_builtin_frames():
+    assert frame_label(("/src/pkg/mod.py", 12, "fn")) == "fn (mod.py:12)"
+    assert frame_label(("~", 0, "<built-in method builtins.len>")) == (
+        "<built-in method builtins.len>"
+    )
+
+
+def test_collapse_stats_reconstructs_call_paths():
+    lines = collapse_stats(pstats.Stats(_profile_root()))
+    assert lines
+    leaf_stacks = [line for line in lines if line.split(";")[-1].startswith("_leaf")]
+    assert leaf_stacks
+    assert all("_root" in line and "_middle" in line for line in leaf_stacks)
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines)
+
+
+def test_write_profile_merges_worker_stats(tmp_path):
+    worker_file = tmp_path / "worker-1.prof"
+    _profile_root().dump_stats(worker_file)
+    main = _profile_root()
+
+    collapsed = write_profile(tmp_path / "run.prof", main, [worker_file])
+
+    merged = pstats.Stats(str(tmp_path / "run.prof"))
+    calls = {func[2]: stat[1] for func, stat in merged.stats.items()}
+    assert calls["_root"] == 2
+    assert collapsed == tmp_path / "run.prof.collapsed"
+    assert collapsed.read_text().strip()
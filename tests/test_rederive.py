@@ -0,0 +1,199 @@
+import copy
+import json
+
+import pytest
+
+from rpgcharacters.archive_index import BitmapIndex, load_index, update_index
+from rpgcharacters.bulk import BulkJob, iter_characters
+from rpgcharacters.rederive import (
+    diff_rules,
+    rederive_archive,
+    rederive_jsonl,
+    rederive_record,
+    rederive_shards,
+)
+from rpgcharacters.rules import BUILTIN_RULES, activate_rules, compile_rules, reset_rules
+from rpgcharacters.shards import (
+    ShardSpec,
+    ShardWriter,
+    iter_shard_records,
+    load_manifest,
+    write_shard_file,
+)
+
+
+def house_rules(change):
+    pack = copy.deepcopy(BUILTIN_RULES.pack)
+    change(pack)
+    return compile_rules(pack)
+
+
+def elf_saves(pack):
+    pack["races"]["elf"]["saving_throw_modifiers"]["spells"] = -3
+
+
+def thief_saves(pack):
+    pack["classes"]["thief"]["saving_throws"]["dragon_breath"] = 12
+
+
+def dwarf_saves(pack):
+    pack["races"]["dwarf"]["saving_throw_modifiers"]["spells"] = -5
+
+
+def base_ac(pack):
+    pack["armor"]["none"]["base_ac"] = 9
+
+
+def records(count, rules=BUILTIN_RULES, seed=6):
+    activate_rules(rules)
+    try:
+        return [character.to_dict() for character in iter_characters(BulkJob(seed=seed), count)]
+    finally:
+        reset_rules()
+
+
+def dwarves_first(rows):
+    # Twenty dwarves, so with 50-record shards only the first shard has any.
+    dwarves = [row for row in rows if row["race"] == "dwarf"][:20]
+    return dwarves + [row for row in rows if row["race"] != "dwarf"]
+
+
+def write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+
+
+def write_shards(directory, rows, compression):
+    spec = ShardSpec(max_records=50, compression=compression)
+    with ShardWriter(directory, spec) as writer:
+        for row in rows:
+            writer.write((json.dumps(row) + "\n").encode("utf-8"))
+
+
+def test_diff_lists_changed_entries_and_their_fields():
+    new = house_rules(lambda pack: (elf_saves(pack), base_ac(pack)))
+    diff = diff_rules(BUILTIN_RULES, new)
+    assert [str(change) for change in diff.changes] == [
+        "races.elf.saving_throw_modifiers",
+        "armor.none.base_ac",
+    ]
+    assert diff.stale == ()
+    assert diff.fields_to_rederive("elf", "thief") == {"saving_throws", "ac"}
+    assert diff.fields_to_rederive("dwarf", "thief") == {"ac"}
+
+
+def test_diff_of_identical_rules_is_empty():
+    diff = diff_rules(BUILTIN_RULES, house_rules(lambda pack: None))
+    assert diff.changes == ()
+    assert diff.fields_to_rederive("elf", "thief") == frozenset()
+
+
+def test_rolled_fields_are_stale():
+    def changes(pack):
+        pack["classes"]["fighter"]["hit_die"] = 10
+        del pack["races"]["halfling"]
+        pack["races"]["human"]["allowed_classes"].remove("thief")
+
+    diff = diff_rules(BUILTIN_RULES, house_rules(changes))
+    assert {str(change): change.fields for change in diff.stale} == {
+        "classes.fighter.hit_die": ("hp",),
+        "races.halfling": ("race",),
+        "races.human.allowed_classes": ("class",),
+    }
+
+
+@pytest.mark.parametrize("change", [elf_saves, thief_saves, base_ac])
+def test_rederived_records_match_generation_under_new_rules(change):
+    new = house_rules(change)
+    diff = diff_rules(BUILTIN_RULES, new)
+    rows = records(300)
+    assert sum(rederive_record(row, diff) for row in rows) > 0
+    assert rows == records(300, new)
+
+
+def test_jsonl_update_patches_in_place_when_lengths_match(tmp_path):
+    new = house_rules(elf_saves)
+    path = tmp_path / "npcs.jsonl"
+    write_jsonl(path, records(200))
+    report = rederive_jsonl(path, diff_rules(BUILTIN_RULES, new))
+    assert (report.patched, report.rewritten) == (1, 0)
+    assert report.checked == 200
+    assert [json.loads(line) for line in path.read_text().splitlines()] == records(200, new)
+
+
+def test_jsonl_update_rewrites_when_lengths_change(tmp_path):
+    new = house_rules(lambda pack: pack["armor"]["none"].update(base_ac=2))
+    path = tmp_path / "npcs.jsonl"
+    write_jsonl(path, records(100))
+    report = rederive_archive(path, diff_rules(BUILTIN_RULES, new))
+    assert report.rewritten == 1
+    assert [json.loads(line) for line in path.read_text().splitlines()] == records(100, new)
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_stale_changes_need_allow_stale(tmp_path):
+    new = house_rules(lambda pack: (elf_saves(pack), pack["races"]["elf"].update(hit_die_max=4)))
+    path = tmp_path / "npcs.jsonl"
+    write_jsonl(path, records(50))
+    diff = diff_rules(BUILTIN_RULES, new)
+    with pytest.raises(ValueError, match="races.elf.hit_die_max affects hp"):
+        rederive_jsonl(path, diff)
+    assert rederive_jsonl(path, diff, allow_stale=True).updated > 0
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip"])
+def test_shard_update_touches_only_affected_shards(tmp_path, compression):
+    new = house_rules(dwarf_saves)
+    write_shards(tmp_path, dwarves_first(records(200)), compression)
+    before = load_manifest(tmp_path)
+    update_index(tmp_path)
+
+    report = rederive_shards(tmp_path, diff_rules(BUILTIN_RULES, new))
+    after = load_manifest(tmp_path)
+    assert report.updated == report.checked == 20
+    assert after.shards[0].sha256 != before.shards[0].sha256
+    assert after.shards[1:] == before.shards[1:]
+    assert list(iter_shard_records(tmp_path)) == dwarves_first(records(200, new))
+
+    index = load_index(tmp_path)
+    rebuilt = BitmapIndex()
+    for shard in after.shards:
+        rebuilt.add_shard(tmp_path, shard, after)
+    assert index.chunks == rebuilt.chunks
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip"])
+def test_interrupted_shard_update_is_finished_without_verify(tmp_path, compression):
+    new = house_rules(dwarf_saves)
+    diff = diff_rules(BUILTIN_RULES, new)
+    rows = dwarves_first(records(200))
+    write_shards(tmp_path, rows, compression)
+    update_index(tmp_path)
+
+    # Interrupted after patching half the dwarves, before the manifest.
+    shard = load_manifest(tmp_path).shards[0]
+    for row in rows[:10]:
+        rederive_record(row, diff)
+    data = b"".join((json.dumps(row) + "\n").encode("utf-8") for row in rows[:50])
+    write_shard_file(tmp_path / shard.path, data, compression)
+
+    with pytest.raises(ValueError, match="does not match its checksum"):
+        rederive_shards(tmp_path, diff)
+    report = rederive_shards(tmp_path, diff, verify=False)
+    assert report.updated == 10
+    assert list(iter_shard_records(tmp_path)) == dwarves_first(records(200, new))
+
+    # Nothing is left to do, and the index matches one built from scratch.
+    assert rederive_shards(tmp_path, diff).updated == 0
+    after = load_manifest(tmp_path)
+    rebuilt = BitmapIndex()
+    for shard in after.shards:
+        rebuilt.add_shard(tmp_path, shard, after)
+    assert load_index(tmp_path).chunks == rebuilt.chunks
+
+
+def test_shard_update_without_index_reads_every_record(tmp_path):
+    new = house_rules(thief_saves)
+    write_shards(tmp_path, records(120), "lzma")
+    report = rederive_shards(tmp_path, diff_rules(BUILTIN_RULES, new))
+    assert report.checked == 120
+    assert list(iter_shard_records(tmp_path)) == records(120, new)
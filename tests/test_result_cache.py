@@ -0,0 +1,59 @@
+import copy
+import os
+
+import pytest
+
+from rpgcharacters.result_cache import ResultCache, result_key
+from rpgcharacters.rules import BUILTIN_RULES, activate_rules, compile_rules, reset_rules
+
+
+@pytest.fixture(autouse=True)
+def builtin_rules():
+    yield
+    reset_rules()
+
+
+def test_result_key_depends_on_inputs():
+    key = result_key({"seed": 1, "race": "dwarf"})
+    assert key == result_key({"race": "dwarf", "seed": 1})
+    assert key != result_key({"seed": 2, "race": "dwarf"})
+    assert len(key) == 64
+
+
+def test_result_key_depends_on_active_rules():
+    key = result_key({"seed": 1})
+    pack = copy.deepcopy(BUILTIN_RULES.pack)
+    pack["races"]["dwarf"]["ability_min"]["CON"] = 3
+    activate_rules(compile_rules(pack))
+    assert result_key({"seed": 1}) != key
+
+
+def test_get_returns_stored_entry(tmp_path):
+    cache = ResultCache(tmp_path / "results")
+    assert cache.get("abc") is None
+    assert cache.put("abc", b"payload")
+    assert cache.get("abc") == b"payload"
+
+
+def test_entries_larger_than_cache_are_not_stored(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=4)
+    assert not cache.put("abc", b"too large")
+    assert cache.get("abc") is None
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=10)
+    cache.put("first", b"aaaa")
+    cache.put("second", b"bbbb")
+    os.utime(tmp_path / "first.out", ns=(1_000, 1_000))
+    os.utime(tmp_path / "second.out", ns=(2_000, 2_000))
+    assert cache.get("first") == b"aaaa"  # now the most recently used
+    cache.put("third", b"cccc")
+    assert cache.get("second") is None
+    assert cache.get("first") == b"aaaa"
+    assert cache.get("third") == b"cccc"
+
+
+def test_rejects_negative_size_limit(tmp_path):
+    with pytest.raises(ValueError, match="must not be negative"):
+        ResultCache(tmp_path, max_bytes=-1)
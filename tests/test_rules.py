@@ -0,0 +1,204 @@
+import copy
+import json
+
+import pytest
+
+from rpgcharacters.character_generator import (
+    AbilityScores,
+    calculate_saving_throws,
+    validate_race,
+)
+from rpgcharacters.classes import CLASSES
+from rpgcharacters.races import RACES
+from rpgcharacters.rules import (
+    BUILTIN_RULES,
+    activate_rules,
+    active_rules,
+    compile_rules,
+    load_rules_pack,
+    pinned_rules,
+    reset_rules,
+    validate_rules_pack,
+)
+
+HOUSE_RULES_TOML = """
+[races.human]
+ability_min = {}
+ability_max = {}
+allowed_classes = ["fighter"]
+saving_throw_modifiers = { spells = -1 }
+
+[races.gnome]
+ability_min = { INT = 11 }
+ability_max = { STR = 15 }
+allowed_classes = ["fighter"]
+saving_throw_modifiers = { magic_wands = -3 }
+hit_die_max = 6
+
+[classes.fighter]
+prime_requisite = "STR"
+min_prime = 9
+hit_die = 10
+
+[classes.fighter.saving_throws]
+death_ray_or_poison = 12
+magic_wands = 13
+paralysis_or_petrify = 14
+dragon_breath = 15
+spells = 17
+"""
+
+
+@pytest.fixture
+def house_rules_file(tmp_path):
+    path = tmp_path / "house.toml"
+    path.write_text(HOUSE_RULES_TOML, encoding="utf-8")
+    return path
+
+
+@pytest.fixture(autouse=True)
+def restore_builtin_rules():
+    yield
+    reset_rules()
+
+
+def test_builtin_rules_compile_to_dense_tables():
+    rules = BUILTIN_RULES
+    dwarf = rules.race_index("dwarf")
+    fighter = rules.class_index("fighter")
+    assert rules.race_names == ("dwarf", "elf", "halfling", "human")
+    assert rules.ability_min[dwarf] == (3, 9, 3, 3, 3, 3)
+    assert rules.ability_max[dwarf] == (17, 18, 18, 18, 18, 18)
+    assert rules.hit_die[rules.race_index("elf")][fighter] == 6
+    assert not rules.is_allowed(dwarf, rules.class_index("magic-user"))
+
+
+def test_compiled_saving_throws_match_generator():
+    rules = BUILTIN_RULES
+    for race in rules.race_names:
+        for class_name in rules.class_names:
+            expected = tuple(calculate_saving_throws(class_name, race).values())
+            saves = rules.saving_throws[rules.race_index(race)][rules.class_index(class_name)]
+            assert saves == expected
+
+
+def test_validate_rules_pack_accepts_builtin_tables():
+    assert validate_rules_pack(copy.deepcopy(BUILTIN_RULES.pack)) == []
+
+
+def test_validate_rules_pack_reports_bad_entries():
+    pack = copy.deepcopy(BUILTIN_RULES.pack)
+    pack["classes"]["fighter"]["prime_requisite"] = "LCK"
+    pack["races"]["elf"]["allowed_classes"].append("paladin")
+    errors = validate_rules_pack(pack)
+    assert "classes.fighter.prime_requisite is not an ability: 'LCK'." in errors
+    assert "races.elf.allowed_classes has unknown class 'paladin'." in errors
+
+
+def test_load_rules_pack_lowercases_names(tmp_path):
+    pack = copy.deepcopy(BUILTIN_RULES.pack)
+    pack["classes"]["Fighter"] = pack["classes"].pop("fighter")
+    pack["races"]["Dwarf"] = pack["races"].pop("dwarf")
+    pack["races"]["Dwarf"]["allowed_classes"] = ["Fighter", "THIEF"]
+    path = tmp_path / "mixed.json"
+    path.write_text(json.dumps(pack), encoding="utf-8")
+    rules = load_rules_pack(path, cache_dir=tmp_path / "cache")
+    assert rules.pack["races"]["dwarf"]["allowed_classes"] == ["fighter", "thief"]
+    dwarf = rules.race_index("dwarf")
+    assert rules.is_allowed(dwarf, rules.class_index("fighter"))
+    assert rules.is_allowed(dwarf, rules.class_index("thief"))
+
+
+def test_validate_rules_pack_rejects_names_differing_in_case():
+    pack = copy.deepcopy(BUILTIN_RULES.pack)
+    pack["classes"]["Fighter"] = copy.deepcopy(pack["classes"]["fighter"])
+    errors = validate_rules_pack(pack)
+    assert "classes.fighter and classes.Fighter differ only in case." in errors
+
+
+def test_load_rules_pack_rejects_invalid_pack(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text(json.dumps({"races": {}, "classes": {}}), encoding="utf-8")
+    with pytest.raises(ValueError, match="at least one class"):
+        load_rules_pack(path, cache_dir=tmp_path / "cache")
+
+
+def test_load_rules_pack_toml_defaults_armor_and_hit_die_cap(house_rules_file, tmp_path):
+    rules = load_rules_pack(house_rules_file, cache_dir=tmp_path / "cache")
+    assert rules.race_names == ("gnome", "human")
+    assert rules.pack["races"]["human"]["hit_die_max"] is None
+    assert rules.hit_die[rules.race_index("gnome")][0] == 6
+    assert rules.base_ac == 11
+
+
+def test_load_rules_pack_defaults_armor_to_builtin_while_other_pack_active(tmp_path):
+    pack = copy.deepcopy(BUILTIN_RULES.pack)
+    pack["armor"]["none"]["base_ac"] = 12
+    armored = tmp_path / "armored.json"
+    armored.write_text(json.dumps(pack), encoding="utf-8")
+    activate_rules(load_rules_pack(armored, cache_dir=tmp_path / "cache"))
+    assert active_rules().base_ac == 12
+
+    del pack["armor"]
+    unarmored = tmp_path / "unarmored.json"
+    unarmored.write_text(json.dumps(pack), encoding="utf-8")
+    rules = load_rules_pack(unarmored, cache_dir=tmp_path / "cache")
+    assert rules.base_ac == 11
+    assert rules.pack["armor"] == BUILTIN_RULES.pack["armor"]
+
+
+def test_load_rules_pack_uses_cache_keyed_by_content(house_rules_file, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    first = load_rules_pack(house_rules_file, cache_dir=cache_dir)
+    assert len(list(cache_dir.iterdir())) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache hit should not recompile")
+
+    monkeypatch.setattr("rpgcharacters.rules.compile_rules", fail)
+    assert load_rules_pack(house_rules_file, cache_dir=cache_dir) == first
+
+
+def test_load_rules_pack_recompiles_tampered_cache_entry(house_rules_file, tmp_path):
+    cache_dir = tmp_path / "cache"
+    first = load_rules_pack(house_rules_file, cache_dir=cache_dir)
+    (entry,) = cache_dir.iterdir()
+    data = json.loads(entry.read_bytes())
+    data["pack"]["armor"]["none"]["base_ac"] = 3
+    entry.write_text(json.dumps(data), encoding="utf-8")
+    assert load_rules_pack(house_rules_file, cache_dir=cache_dir) == first
+
+    entry.write_bytes(b"\x80\x05not json")
+    assert load_rules_pack(house_rules_file, cache_dir=cache_dir) == first
+
+
+def test_activate_rules_updates_generator_tables(house_rules_file, tmp_path):
+    activate_rules(load_rules_pack(house_rules_file, cache_dir=tmp_path / "cache"))
+    assert set(RACES) == {"gnome", "human"}
+    assert set(CLASSES) == {"fighter"}
+    abilities = AbilityScores(CHA=10, CON=10, DEX=10, INT=12, STR=16, WIS=10)
+    assert validate_race(abilities, "gnome") == [
+        "Gnome limits STR to <= 15; found 16."
+    ]
+    assert calculate_saving_throws("fighter", "gnome")["magic_wands"] == 10
+
+
+def test_pinned_rules_block_activation(house_rules_file, tmp_path):
+    house_rules = load_rules_pack(house_rules_file, cache_dir=tmp_path / "cache")
+    with pinned_rules() as rules:
+        assert rules is BUILTIN_RULES
+        with pytest.raises(RuntimeError, match="cannot change"):
+            activate_rules(house_rules)
+    activate_rules(house_rules)
+    assert active_rules() is house_rules
+
+
+def test_reset_rules_restores_builtin_tables(house_rules_file, tmp_path):
+    activate_rules(load_rules_pack(house_rules_file, cache_dir=tmp_path / "cache"))
+    reset_rules()
+    assert active_rules() is BUILTIN_RULES
+    assert set(RACES) == {"dwarf", "elf", "halfling", "human"}
+
+
+def test_compile_rules_digest_is_stable():
+    assert compile_rules(copy.deepcopy(BUILTIN_RULES.pack)).digest == BUILTIN_RULES.digest
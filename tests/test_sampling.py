@@ -0,0 +1,65 @@
+import pytest
+from diceroller.core import CustomRandom, DiceRoller
+
+from rpgcharacters.character_generator import validate_class, validate_race
+from rpgcharacters.rules import BUILTIN_RULES
+from rpgcharacters.sampling import (
+    THREE_D6_WEIGHTS,
+    ability_bounds,
+    is_feasible,
+    roll_conditioned_abilities,
+    sample_score,
+)
+
+
+def test_three_d6_weights_match_dice_outcomes():
+    assert len(THREE_D6_WEIGHTS) == 16
+    assert sum(THREE_D6_WEIGHTS) == 216
+    assert THREE_D6_WEIGHTS[0] == 1   # score 3
+    assert THREE_D6_WEIGHTS[7] == 27  # score 10
+
+
+def test_ability_bounds_combine_race_limits_and_prime_requisite():
+    rules = BUILTIN_RULES
+    bounds = ability_bounds(rules, rules.race_index("elf"), rules.class_index("fighter"))
+    # CHA, CON, DEX, INT, STR, WIS
+    assert bounds == ((3, 18), (3, 17), (3, 18), (9, 18), (9, 18), (3, 18))
+
+
+def test_is_feasible_rejects_disallowed_pairs():
+    rules = BUILTIN_RULES
+    assert is_feasible(rules, rules.race_index("human"), rules.class_index("thief"))
+    assert not is_feasible(rules, rules.race_index("dwarf"), rules.class_index("magic-user"))
+
+
+def test_sample_score_stays_within_bounds():
+    rng = DiceRoller(CustomRandom(11))
+    scores = {sample_score(rng, 16, 17) for _ in range(200)}
+    assert scores == {16, 17}
+
+
+def test_sample_score_rejects_empty_range():
+    with pytest.raises(ValueError):
+        sample_score(DiceRoller(CustomRandom(1)), 19, 20)
+
+
+@pytest.mark.parametrize(
+    "race,class_name",
+    [
+        ("dwarf", "cleric"),
+        ("elf", "magic-user"),
+        ("halfling", "thief"),
+        ("human", "fighter"),
+    ],
+)
+def test_roll_conditioned_abilities_always_qualify(race, class_name):
+    rng = DiceRoller(CustomRandom(5))
+    for _ in range(100):
+        abilities = roll_conditioned_abilities(race, class_name, rng)
+        assert validate_race(abilities, race) == []
+        assert validate_class(abilities, race, class_name) == []
+
+
+def test_roll_conditioned_abilities_rejects_disallowed_pair():
+    with pytest.raises(ValueError, match="No ability scores qualify a Halfling Magic-User."):
+        roll_conditioned_abilities("halfling", "magic-user", DiceRoller(CustomRandom(1)))
@@ -0,0 +1,57 @@
+import io
+import json
+
+import pytest
+from diceroller.core import CustomRandom, DiceRoller
+
+from rpgcharacters.bulk import BulkJob, iter_characters
+from rpgcharacters.character_generator import generate_random_character
+from rpgcharacters.serve import handle_request, serve
+
+
+def test_single_seeded_request_matches_cli_generation():
+    response = handle_request({"id": 9, "race": "Dwarf", "class": "fighter", "seed": 42})
+    expected = generate_random_character(DiceRoller(CustomRandom(42)), "dwarf", "fighter")
+    assert response == {
+        "id": 9,
+        "ok": True,
+        "seed": 42,
+        "characters": [expected.to_dict()],
+    }
+
+
+def test_multi_character_request_matches_bulk_generation():
+    response = handle_request({"id": "x", "seed": 3, "count": 4, "name": "Guard"})
+    job = BulkJob(seed=3, name="Guard")
+    assert response["characters"] == [c.to_dict() for c in iter_characters(job, 4)]
+
+
+def test_unseeded_request_reports_its_seed():
+    response = handle_request({"id": 1})
+    assert response["ok"] and isinstance(response["seed"], int)
+
+
+@pytest.mark.parametrize(
+    "request_,error",
+    [
+        ([1, 2], "JSON object"),
+        ({"id": 1, "race": "gnome"}, "Unknown race: 'gnome'"),
+        ({"id": 1, "count": 0}, "'count' must be between"),
+        ({"id": 1, "seed": "42"}, "'seed' must be an integer"),
+        ({"id": 1, "colour": "red"}, "Unknown request fields: colour"),
+    ],
+)
+def test_bad_requests_get_error_responses(request_, error):
+    response = handle_request(request_)
+    assert response["ok"] is False
+    assert error in response["error"]
+
+
+def test_serve_answers_pipelined_requests_in_order():
+    requests = "\n".join(
+        [json.dumps({"id": 1, "seed": 1}), "", "{oops", json.dumps({"id": 2, "seed": 2})]
+    )
+    stdout = io.StringIO()
+    assert serve(io.StringIO(requests + "\n"), stdout) == 3
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [(r["id"], r["ok"]) for r in responses] == [(1, True), (None, False), (2, True)]
@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from rpgcharacters.shards import (
+    Manifest,
+    ShardSpec,
+    ShardWriter,
+    iter_shard_records,
+    load_manifest,
+    read_shard,
+    remove_shards,
+)
+
+
+def records(count):
+    return [{"index": index, "pad": "x" * (index % 7)} for index in range(count)]
+
+
+def write_all(directory, spec, items, threads=2):
+    with ShardWriter(directory, spec, threads=threads) as writer:
+        for item in items:
+            writer.write((json.dumps(item) + "\n").encode("utf-8"))
+    return writer.manifest()
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip", "lzma"])
+def test_rotates_by_record_count(tmp_path, compression):
+    items = records(25)
+    manifest = write_all(tmp_path, ShardSpec(max_records=10, compression=compression), items)
+    assert [(shard.start, shard.stop) for shard in manifest.shards] == [(0, 10), (10, 20), (20, 25)]
+    assert load_manifest(tmp_path) == manifest
+    assert list(iter_shard_records(tmp_path)) == items
+
+
+def test_rotates_by_uncompressed_size(tmp_path):
+    items = records(40)
+    manifest = write_all(tmp_path, ShardSpec(max_records=None, max_bytes=200), items, threads=1)
+    assert len(manifest.shards) > 1
+    for shard in manifest.shards[:-1]:
+        data = read_shard(tmp_path, shard, manifest.compression)
+        assert len(data) >= 200
+        assert len(data) - len(data.splitlines(keepends=True)[-1]) < 200
+    assert list(iter_shard_records(tmp_path)) == items
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip", "lzma"])
+def test_streams_shards_in_bounded_blocks(tmp_path, monkeypatch, compression):
+    monkeypatch.setattr("rpgcharacters.shards.SHARD_BLOCK_BYTES", 64)
+    items = records(200)
+    largest = 0
+    with ShardWriter(tmp_path, ShardSpec(max_records=120, compression=compression)) as writer:
+        for item in items:
+            writer.write((json.dumps(item) + "\n").encode("utf-8"))
+            largest = max(largest, len(writer._block))
+    assert largest < 64 + 40
+    assert [shard.count for shard in writer.manifest().shards] == [120, 80]
+    assert list(iter_shard_records(tmp_path)) == items
+
+
+def test_failed_shard_write_is_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr("rpgcharacters.shards.SHARD_BLOCK_BYTES", 16)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("rpgcharacters.shards.os.replace", fail)
+    with pytest.raises(OSError, match="disk full"):
+        write_all(tmp_path, ShardSpec(max_records=50), records(200), threads=1)
+    assert not list(tmp_path.glob("characters-*"))
+
+
+def test_remove_shards_deletes_only_shard_files(tmp_path):
+    write_all(tmp_path, ShardSpec(max_records=3, compression="gzip"), records(10))
+    (tmp_path / "notes.txt").write_text("keep", encoding="utf-8")
+    (tmp_path / "party-00000.jsonl").write_text("", encoding="utf-8")
+    remove_shards(tmp_path)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["notes.txt", "party-00000.jsonl"]
+
+
+def test_read_shard_detects_corruption(tmp_path):
+    manifest = write_all(tmp_path, ShardSpec(max_records=5), records(5))
+    shard = manifest.shards[0]
+    (tmp_path / shard.path).write_bytes(b"{}\n")
+    with pytest.raises(ValueError, match="checksum"):
+        read_shard(tmp_path, shard, manifest.compression)
+
+
+def test_empty_writer_writes_empty_manifest(tmp_path):
+    manifest = write_all(tmp_path, ShardSpec(), [])
+    assert manifest == Manifest("none")
+    assert load_manifest(tmp_path).records == 0
+
+
+def test_on_shard_reports_shards_in_order(tmp_path):
+    seen = []
+    with ShardWriter(tmp_path, ShardSpec(max_records=3), threads=3, on_shard=seen.append) as writer:
+        for item in records(10):
+            writer.write((json.dumps(item) + "\n").encode("utf-8"))
+    assert [shard.start for shard in seen] == [0, 3, 6, 9]
+
+
+def test_aborted_writer_leaves_manifest_of_completed_shards(tmp_path):
+    with pytest.raises(RuntimeError):
+        with ShardWriter(tmp_path, ShardSpec(max_records=2), threads=1) as writer:
+            for item in records(7):
+                writer.write((json.dumps(item) + "\n").encode("utf-8"))
+            raise RuntimeError("interrupted")
+    manifest = load_manifest(tmp_path)
+    assert manifest.records <= 6
+    assert list(iter_shard_records(tmp_path)) == records(manifest.records)
+
+
+def test_rejects_invalid_spec(tmp_path):
+    with pytest.raises(ValueError, match="record limit or a size limit"):
+        ShardWriter(tmp_path, ShardSpec(max_records=None))
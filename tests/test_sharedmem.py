@@ -0,0 +1,52 @@
+import os
+from dataclasses import replace
+
+import pytest
+
+from rpgcharacters.bulk import BulkJob, generate_chunk, iter_characters
+from rpgcharacters.rules import BUILTIN_RULES
+from rpgcharacters.sharedmem import (
+    SharedBatch,
+    iter_shared_batches,
+    iter_shared_characters,
+    write_batch,
+)
+
+
+def test_write_batch_exposes_columns_and_lazy_extras():
+    characters = generate_chunk(BulkJob(seed=8), 0, 6)
+    characters[2] = replace(characters[2], name="Ilse", inventory=["Lantern"])
+    name = write_batch(characters, BUILTIN_RULES)
+    with SharedBatch(name) as batch:
+        try:
+            assert len(batch) == 6
+            assert batch.column("hp").tolist() == [c.hp for c in characters]
+            assert batch.column("abilities")[6:12].tolist() == [
+                getattr(characters[1].abilities, ability)
+                for ability in ("CHA", "CON", "DEX", "INT", "STR", "WIS")
+            ]
+            assert batch.character_name(2) == "Ilse"
+            assert batch.inventory(2) == ["Lantern"]
+            assert [batch.character(i, BUILTIN_RULES).to_dict() for i in range(6)] == [
+                c.to_dict() for c in characters
+            ]
+            with pytest.raises(KeyError):
+                batch.column("charisma")
+        finally:
+            batch.unlink()
+
+
+def test_shared_characters_match_inline_generation():
+    job = BulkJob(seed=31, class_name="thief")
+    inline = [c.to_dict() for c in iter_characters(job, 15)]
+    shared = [c.to_dict() for c in iter_shared_characters(job, 15, workers=2, chunk_size=4)]
+    assert shared == inline
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="needs POSIX shared memory")
+def test_abandoned_iteration_removes_segments():
+    batches = iter_shared_batches(BulkJob(seed=4), 40, workers=2, chunk_size=5)
+    first = next(batches)
+    prefix = first.name.rsplit("-", 1)[0].lstrip("/")
+    batches.close()
+    assert not [entry for entry in os.listdir("/dev/shm") if entry.startswith(prefix)]
@@ -0,0 +1,90 @@
+import io
+
+from rpgcharacters.bulk import BulkJob, iter_characters
+from rpgcharacters.character_generator import AbilityScores, Character
+from rpgcharacters.sheets import (
+    TextBuffer,
+    ability_line,
+    render_sheet,
+    saving_throw_label,
+    write_sheets,
+)
+
+
+def make_character(name=None):
+    return Character(
+        abilities=AbilityScores(CHA=9, CON=14, DEX=12, INT=5, STR=16, WIS=11),
+        ability_mods={"CHA": 0, "CON": 1, "DEX": 0, "INT": -2, "STR": 2, "WIS": 0},
+        ac=15,
+        attack_bonus=3,
+        class_name="fighter",
+        hp=9,
+        inventory=[],
+        level=1,
+        money_gp=30,
+        name=name,
+        race="dwarf",
+        saving_throws={"spells": 14, "death_ray_or_poison": 8, "magic_wands": 9},
+    )
+
+
+EXPECTED_SHEET = """\
+========================================
+ Brok the Dwarf Fighter (Level 1)
+========================================
+
+HP: 9
+AC: 15
+Attack Bonus: +3
+Money: 30 gp
+
+Abilities:
+CHA:  9 (+0)
+CON: 14 (+1)
+DEX: 12 (+0)
+INT:  5 (-2)
+STR: 16 (+2)
+WIS: 11 (+0)
+
+Saving Throws:
+  Death Ray or Poison:  8
+  Magic Wands:  9
+  Spells: 14
+
+"""
+
+
+def test_render_sheet_layout():
+    assert render_sheet(make_character("Brok")) == EXPECTED_SHEET
+    unnamed = render_sheet(make_character())
+    assert unnamed.splitlines()[1] == " Dwarf Fighter (Level 1)"
+
+
+def test_display_strings():
+    assert saving_throw_label("paralysis_or_petrify") == "Paralysis or Petrify"
+    assert saving_throw_label("dragon_breath") == "Dragon Breath"
+    assert ability_line("INT", 5, -2) == "INT:  5 (-2)\n"
+
+
+def test_text_buffer_writes_in_chunks():
+    class CountingStream(io.StringIO):
+        writes = 0
+
+        def write(self, text):
+            self.writes += 1
+            return super().write(text)
+
+    stream = CountingStream()
+    with TextBuffer(stream, limit=100) as buffer:
+        for _ in range(50):
+            buffer.write("x" * 30)
+        assert stream.writes == 12
+    assert stream.getvalue() == "x" * 1500
+    assert stream.writes == 13
+
+
+def test_write_sheets_matches_rendered_sheets():
+    characters = list(iter_characters(BulkJob(seed=8), 40))
+    stream = io.StringIO()
+    assert write_sheets(characters, stream, limit=500) == 40
+    assert stream.getvalue() == "".join(render_sheet(c) for c in characters)
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from rpgcharacters.bulk import BulkJob, iter_characters
+from rpgcharacters.teams import (
+    STAT_NAMES,
+    StatTable,
+    partition_scores,
+    partition_teams,
+    strength_scores,
+)
+
+
+@pytest.fixture(scope="module")
+def characters():
+    return list(iter_characters(BulkJob(seed=8), 600))
+
+
+def test_stat_table_matches_records(characters):
+    table = StatTable.from_characters(characters)
+    assert StatTable.from_records(c.to_dict() for c in characters).columns == table.columns
+    assert len(table) == 600
+    assert table.columns["str_mod"][5] == characters[5].ability_mods["STR"]
+
+
+def test_weighted_sum(characters):
+    table = StatTable.from_characters(characters[:3])
+    scores = strength_scores(table, {"hp": 2.0, "ac": 0.5})
+    assert list(scores) == [2 * c.hp + 0.5 * c.ac for c in characters[:3]]
+
+
+def test_unknown_stat_is_rejected(characters):
+    with pytest.raises(ValueError, match="Unknown stats: speed"):
+        strength_scores(StatTable.from_characters(characters), {"speed": 1.0})
+
+
+def test_custom_strength_function(characters):
+    def hp_only(table):
+        return table.columns["hp"]
+
+    partition = partition_teams(characters, 4, hp_only)
+    totals = [sum(characters[row].hp for row in team) for team in partition.teams]
+    assert tuple(totals) == partition.totals
+
+
+def test_strength_function_must_score_every_row(characters):
+    with pytest.raises(ValueError, match="returned 1 scores"):
+        partition_teams(characters, 2, lambda table: [1.0])
+
+
+@pytest.mark.parametrize("teams", [1, 3, 7, 50])
+def test_teams_cover_pool_with_balanced_sizes(characters, teams):
+    partition = partition_teams(characters, teams)
+    rows = sorted(row for team in partition.teams for row in team)
+    assert rows == list(range(len(characters)))
+    sizes = {len(team) for team in partition.teams}
+    assert max(sizes) - min(sizes) <= 1
+    scores = strength_scores(StatTable.from_characters(characters))
+    for team, total in zip(partition.teams, partition.totals):
+        assert sum(scores[row] for row in team) == pytest.approx(total)
+    assert partition.imbalance <= partition.initial_imbalance
+    assert partition.imbalance <= 1
+
+
+def test_local_search_improves_greedy():
+    rng = random.Random(5)
+    scores = [rng.uniform(0, 100) for _ in range(2000)]
+    partition = partition_scores(scores, 8)
+    assert partition.imbalance < partition.initial_imbalance
+    assert partition.relative_imbalance < 1e-5
+
+
+def test_team_sizes_take_priority_over_balance():
+    # {10} against {1, 1, 1, 1} would be closer, but sizes may differ by one.
+    partition = partition_scores([10, 1, 1, 1, 1], 2)
+    assert sorted(len(team) for team in partition.teams) == [2, 3]
+    assert partition.imbalance == 8
+
+
+def test_search_swaps_out_of_greedy_result():
+    partition = partition_scores([6, 5, 4, 3, 2], 2)
+    assert partition.initial_imbalance == 2
+    assert partition.imbalance == 0
+    assert partition.exchanges == 1
+
+
+def test_assignments():
+    partition = partition_scores([5, 5, 3, 3], 2)
+    team_of = partition.assignments()
+    assert sorted(team_of) == [0, 0, 1, 1]
+    assert team_of[0] != team_of[1]
+    assert partition.imbalance == 0
+
+
+def test_invalid_team_count():
+    with pytest.raises(ValueError, match="into 3 teams"):
+        partition_scores([1.0, 2.0], 3)
+    with pytest.raises(ValueError):
+        partition_scores([1.0], 0)
+
+
+def test_stat_names_cover_abilities():
+    assert {"hp", "ac", "attack_bonus", "str_mod", "cha_mod"} <= set(STAT_NAMES)
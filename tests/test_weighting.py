@@ -0,0 +1,76 @@
+from collections import Counter
+from typing import override
+
+import pytest
+from diceroller.core import CustomRandom, DiceRoller
+
+from rpgcharacters.character_generator import AbilityScores, auto_select_race
+from rpgcharacters.weighting import (
+    WeightedSelector,
+    build_alias_table,
+    integer_weights,
+    parse_weights,
+    selector_for,
+)
+
+
+class FixedRandom(CustomRandom):
+    def __init__(self, value: int):
+        self.value = value
+
+    @override
+    def randint(self, start: int, end: int) -> int:
+        assert start <= self.value <= end
+        return self.value
+
+
+def pick_counts(table):
+    draws = range(len(table.items) * table.scale)
+    return Counter(table.pick(DiceRoller(FixedRandom(draw))) for draw in draws)
+
+
+def test_alias_table_is_exact_over_every_draw():
+    weights = {"human": 60, "dwarf": 15, "elf": 15, "halfling": 10, "orc": 0}
+    table = build_alias_table(weights)
+    counts = pick_counts(table)
+    assert set(counts) == {"human", "dwarf", "elf", "halfling"}
+    total = sum(counts.values())
+    for name, count in counts.items():
+        assert count * 100 == weights[name] * total
+
+
+def test_alias_table_requires_a_positive_weight():
+    with pytest.raises(ValueError, match="positive"):
+        build_alias_table({"human": 0})
+
+
+def test_integer_weights_keep_ratios():
+    assert integer_weights({"a": 0.5, "b": 1.25, "c": 0}) == {"a": 2, "b": 5, "c": 0}
+
+
+@pytest.mark.parametrize("text", ["human", "human=-1", "human=lots", "=3"])
+def test_parse_weights_rejects_bad_entries(text):
+    with pytest.raises(ValueError, match="NAME=WEIGHT"):
+        parse_weights(text)
+
+
+def test_selector_caches_tables_per_mask():
+    selector = WeightedSelector(["human", "elf", "dwarf"], {"human": 3})
+    mask = selector.mask(["elf", "human"])
+    assert selector.table(mask) is selector.table(selector.mask(["human", "elf"]))
+    assert pick_counts(selector.table(mask)) == Counter({"human": 6, "elf": 2})
+    assert selector_for(["elf", "human", "dwarf"], {"human": 3}) is selector_for(
+        ["dwarf", "human", "elf"], {"HUMAN": 3}
+    )
+
+
+def test_selector_rejects_unknown_names():
+    with pytest.raises(ValueError, match="orc"):
+        WeightedSelector(["human"], {"orc": 1})
+
+
+def test_auto_select_race_honours_zero_weights():
+    abilities = AbilityScores(CHA=10, CON=12, DEX=10, INT=10, STR=10, WIS=10)
+    weights = {"human": 0, "elf": 0, "halfling": 0, "dwarf": 1}
+    rng = DiceRoller(CustomRandom(5))
+    assert {auto_select_race(abilities, rng, weights) for _ in range(20)} == {"dwarf"}